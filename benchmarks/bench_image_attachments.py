@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark screenshot preparation: payload bytes and processing time per image.
+
+Renders synthetic full-resolution UI screenshots as PNG and JPEG, runs them
+through process_image (decode, downscale, re-encode) and through
+ImageProcessor's process pool, and reports the bytes that would be sent to
+the model before and after processing.
+
+Usage:
+    python benchmarks/bench_image_attachments.py [images]
+"""
+
+import asyncio
+import io
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from src.attachments import ImageProcessor, process_image  # noqa: E402
+
+
+def render_screenshot(seed: int, size: Tuple[int, int], image_format: str) -> bytes:
+    """Render a UI-like screenshot: panels, text lines and a photo-like banner."""
+    rng = random.Random(seed)
+    width, height = size
+    image = Image.new("RGB", size, (245, 246, 248))
+    draw = ImageDraw.Draw(image)
+
+    # Header bar, sidebar and content cards
+    draw.rectangle((0, 0, width, 64), fill=(33, 37, 41))
+    draw.rectangle((0, 64, 280, height), fill=(230, 232, 236))
+    for row in range(4):
+        for col in range(3):
+            left = 320 + col * (width - 360) // 3
+            top = 100 + row * (height - 140) // 4
+            draw.rectangle(
+                (left, top, left + (width - 420) // 3, top + (height - 220) // 4),
+                fill=(255, 255, 255),
+                outline=(210, 212, 216),
+            )
+            for line in range(8):
+                text = " ".join(
+                    "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6))
+                    for _ in range(5)
+                )
+                draw.text((left + 16, top + 16 + line * 18), text, fill=(60, 60, 60))
+
+    # A photo-like region, the part that makes PNG screenshots heavy
+    banner = Image.effect_noise((width - 360, 180), 64).convert("RGB")
+    image.paste(banner, (320, height - 200))
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def measure_inline(images: List[bytes]) -> Tuple[float, int, int]:
+    """
+    Process images one by one in this process.
+
+    Returns:
+        Milliseconds per image, total input bytes and total output bytes
+    """
+    output_bytes = 0
+    start = time.perf_counter()
+    for data in images:
+        output_bytes += len(process_image(data).data)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(images) * 1000, sum(map(len, images)), output_bytes
+
+
+async def measure_pool(images: List[bytes], workers: int) -> Tuple[float, float]:
+    """
+    Process images concurrently in the pool, then again from the cache.
+
+    Returns:
+        Wall-clock milliseconds per image, uncached and cached
+    """
+    processor = ImageProcessor(max_workers=workers)
+    # Start the workers outside the timed region
+    warm_up = io.BytesIO()
+    Image.new("RGB", (64, 64)).save(warm_up, format="PNG")
+    await processor.process(warm_up.getvalue())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(processor.process(data) for data in images))
+    uncached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(processor.process(data) for data in images))
+    cached = time.perf_counter() - start
+
+    processor.close()
+    return uncached / len(images) * 1000, cached / len(images) * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print a table per screenshot size and format."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    workers = min(4, os.cpu_count() or 1)
+
+    print(
+        f"{'screenshot':<16} {'in KiB':>8} {'out KiB':>8} {'ratio':>6} "
+        f"{'ms/img':>7} {'pool ms/img':>12} {'cached ms':>10}"
+    )
+    for size in ((1920, 1080), (2880, 1800), (3840, 2160)):
+        for image_format in ("PNG", "JPEG"):
+            images = [render_screenshot(i, size, image_format) for i in range(count)]
+            inline_ms, in_bytes, out_bytes = measure_inline(images)
+            pool_ms, cached_ms = asyncio.run(measure_pool(images, workers))
+            label = f"{size[0]}x{size[1]} {image_format}"
+            print(
+                f"{label:<16} {in_bytes / count / 1024:>8.0f} "
+                f"{out_bytes / count / 1024:>8.0f} {in_bytes / out_bytes:>6.1f} "
+                f"{inline_ms:>7.1f} {pool_ms:>12.1f} {cached_ms:>10.3f}"
+            )
+    print(f"(pool: {workers} worker processes, {count} distinct images per row)")
+
+
+if __name__ == "__main__":
+    main()
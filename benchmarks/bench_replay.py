@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded cassette through GeminiService, offline.
+
+Every recorded prompt is generated again from the cassette and parsed as a
+bug report, so the retries, parse failures and upstream errors of the recorded
+traffic happen again, with the recorded latencies times the given scale.
+Record a cassette by running the API or CLI with LLM_RECORD_PATH set and
+ENRICHERS unset; enricher and field prompts would count as failures here.
+
+Usage:
+    python benchmarks/bench_replay.py calls.jsonl.gz [latency_scale]
+"""
+
+import os
+import statistics
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.core.exceptions import BugReporterError  # noqa: E402
+from src.core.models import AttemptUsage  # noqa: E402
+from src.replay import create_replay_service, load_cassette  # noqa: E402
+from src.services.gemini_service import parse_bug_report  # noqa: E402
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the value below which the given fraction of values fall."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main() -> None:
+    """Replay each recorded prompt once and print attempt and latency figures."""
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    path = sys.argv[1]
+    latency_scale = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+
+    # Each distinct prompt is replayed once; its retries come from the cassette.
+    # Screenshots are not recorded, so prompts that had some cannot be resent.
+    prompts = {
+        entry.key: entry.prompt for entry in load_cassette(path) if not entry.images
+    }
+    service = create_replay_service(path, latency_scale)
+
+    latencies = []
+    attempts: List[AttemptUsage] = []
+    failures = 0
+    for prompt in prompts.values():
+        started = time.perf_counter()
+        try:
+            # The recorded prompt is complete, so it is sent as it was
+            result = service._generate(
+                prompt, "replay", parse_bug_report, None, attempts.append
+            )
+        except BugReporterError:
+            result = None
+        if result is None:
+            failures += 1
+        latencies.append(time.perf_counter() - started)
+
+    if not latencies:
+        sys.exit(f"{path} has no recorded calls")
+    print(f"prompts          {len(latencies):>10}")
+    print(f"attempts         {len(attempts):>10}")
+    print(f"failed attempts  {sum(not a.succeeded for a in attempts):>10}")
+    print(f"mean attempts    {len(attempts) / len(latencies):>10.2f}")
+    print(f"failed prompts   {failures:>10}")
+    print(f"output tokens    {sum(a.output_tokens for a in attempts):>10}")
+    print(f"latency mean (s) {statistics.mean(latencies):>10.3f}")
+    for fraction in (0.5, 0.95, 0.99):
+        label = f"latency p{int(fraction * 100)} (s)"
+        print(f"{label:<16} {percentile(latencies, fraction):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-response cost of turning raw LLM text into the API payload.
+
+Compares the previous pipeline (json.loads -> dict -> BugReportSchema ->
+BugReport -> to_dict() in the formatter -> BugReportResponse -> FastAPI
+response_model re-validation -> jsonable_encoder -> json.dumps) with the
+current one (BugReportSchema.model_validate_json -> BugReport -> formatter ->
+BugReportResponse.model_construct -> model_dump_json).
+
+Usage:
+    python benchmarks/bench_response_pipeline.py [iterations]
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from src.api.models import BugReportResponse  # noqa: E402
+from src.core.models import BugReport  # noqa: E402
+from src.formatters.jira_formatter import JiraFormatter  # noqa: E402
+from src.schemas.bug_report import BugReportSchema  # noqa: E402
+
+RAW_RESPONSE = json.dumps(
+    {
+        "Title": "Missing header on main page",
+        "Description": "The main page header is not displayed and the JavaScript "
+        "console shows a 404 error for the header bundle.",
+        "Steps": "1. Open the main page\n2. Observe the header area\n"
+        "3. Open developer tools\n4. Check the console tab",
+        "Expected result": "Header is visible and the console has no errors",
+        "Actual result": "Header is missing and a 404 error appears in the console",
+    },
+    ensure_ascii=False,
+)
+
+FORMATTER = JiraFormatter()
+
+
+def _legacy_format(bug_report: BugReport) -> str:
+    """Jira formatting as it was done before, via to_dict()."""
+    sections = []
+    for label, value in bug_report.to_dict().items():
+        if label.lower() == "steps":
+            value = value.replace("\n", "\n").replace("\n", "\n\n")
+        sections.append(f"*{label}*:\n{value}")
+    return "\n\n".join(sections)
+
+
+def legacy_pipeline(raw_text: str) -> bytes:
+    """The previous request path, hop by hop."""
+    data = json.loads(raw_text)
+    validated = BugReportSchema(**data)
+    bug_report = BugReport(
+        title=validated.title,
+        description=validated.description_of_the_issue,
+        steps=validated.steps,
+        expected_result=validated.expected_result,
+        actual_result=validated.actual_result,
+    )
+    response = BugReportResponse(
+        title=bug_report.title,
+        description=bug_report.description,
+        steps=bug_report.steps,
+        expected_result=bug_report.expected_result,
+        actual_result=bug_report.actual_result,
+        formatted_report=_legacy_format(bug_report),
+    )
+    # What FastAPI does for a response_model: validate again, encode, dump
+    revalidated = BugReportResponse.model_validate(response.model_dump())
+    return json.dumps(
+        jsonable_encoder(revalidated),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def current_pipeline(raw_text: str) -> bytes:
+    """The current request path."""
+    bug_report = BugReportSchema.model_validate_json(raw_text).to_bug_report()
+    response = BugReportResponse.from_bug_report(
+        bug_report, FORMATTER.format(bug_report)
+    )
+    return response.model_dump_json().encode("utf-8")
+
+
+def measure(func: Callable[[str], bytes], iterations: int) -> Tuple[float, float]:
+    """
+    Measure time and allocations per call.
+
+    Returns:
+        Microseconds per call and average peak traced allocation (KiB) per call
+    """
+    for _ in range(200):
+        func(RAW_RESPONSE)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(RAW_RESPONSE)
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc slows calls down a lot, so sample allocations separately
+    samples = max(1, iterations // 20)
+    peak_total = 0
+    tracemalloc.start()
+    for _ in range(samples):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func(RAW_RESPONSE)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - baseline
+    tracemalloc.stop()
+
+    return elapsed / iterations * 1e6, peak_total / samples / 1024
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    assert json.loads(legacy_pipeline(RAW_RESPONSE)) == json.loads(
+        current_pipeline(RAW_RESPONSE)
+    ), "pipelines must produce identical payloads"
+
+    print(f"{'pipeline':<10} {'us/response':>12} {'peak KiB/response':>18}")
+    for name, func in (("legacy", legacy_pipeline), ("current", current_pipeline)):
+        micros, peak_kib = measure(func, iterations)
+        print(f"{name:<10} {micros:>12.1f} {peak_kib:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,114 @@
 """FastAPI application factory and main app instance."""
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator, Dict
+
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from ..attachments import ImageProcessor
+from ..config import settings
+from ..core.exceptions import ConfigurationError
+from ..formatters.registry import create_default_registry
+from ..jira import JiraClient, JiraOutbox
+from ..monitoring import EventLoopMonitor, EventLoopWatchMiddleware, MetricsRegistry
+from ..profiling import Profiler, ProfileStore
+from ..prompts import ContextRegistry
+from ..services.enrichment import EnrichmentTracker
+from ..services.export_service import ExportService
+from ..services.report_rendering_service import ReportRenderingService
+from ..services.scheduler import PriorityScheduler
+from ..services.similarity_index import SimilarityIndex
+from ..services.usage_meter import UsageMeter
+from ..storage import SQLiteIdempotencyStore, SQLiteOutboxStore, SQLiteReportStore
+from .idempotency import IdempotencyGuard
+from .routes import create_bug_report_service, router
+from .static_assets import StaticAssetCache
+from .warmup import FAILED, READY, ReadinessState, warm_up
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Build the shared service and warm it up in the background."""
+    readiness: ReadinessState = app.state.readiness
+    warmup_task = None
+    if app.state.loop_monitor is not None:
+        app.state.loop_monitor.watch()
+
+    try:
+        readiness.bug_report_service = create_bug_report_service(app.state.metrics)
+    except Exception as e:
+        logger.exception("Service initialization failed")
+        readiness.set_status(FAILED, f"Service initialization failed: {e}")
+    else:
+        if settings.warmup_enabled:
+            warmup_task = asyncio.create_task(
+                warm_up(
+                    readiness,
+                    readiness.bug_report_service,
+                    settings.warmup_probe,
+                    settings.warmup_retry_delay,
+                    settings.warmup_retry_max_delay,
+                )
+            )
+        else:
+            readiness.set_status(READY)
 
-from .routes import router
+    jira_client = None
+    outbox_store = None
+    if settings.jira_enabled:
+        jira_client = create_jira_client()
+        outbox_store = SQLiteOutboxStore(settings.report_store_path)
+        app.state.jira_outbox = JiraOutbox(
+            jira_client,
+            batch_size=settings.jira_batch_size,
+            flush_interval=settings.jira_flush_interval,
+            store=outbox_store,
+        )
+        app.state.jira_outbox.start()
+
+    yield
+
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    app.state.image_processor.close()
+    if readiness.bug_report_service is not None:
+        readiness.bug_report_service.close()
+    if app.state.loop_monitor is not None:
+        app.state.loop_monitor.stop()
+    if jira_client is not None:
+        await app.state.jira_outbox.stop()
+        app.state.jira_outbox = None
+        await jira_client.aclose()
+    if outbox_store is not None:
+        outbox_store.close()
+
+
+def create_jira_client() -> JiraClient:
+    """
+    Create the Jira client from settings.
+
+    Raises:
+        ConfigurationError: If the Jira URL or project key is not set
+    """
+    if not settings.jira_url or not settings.jira_project_key:
+        raise ConfigurationError("JIRA_URL and JIRA_PROJECT_KEY must be set")
+    return JiraClient(
+        settings.jira_url,
+        settings.jira_project_key,
+        email=settings.jira_email,
+        api_token=settings.jira_api_token,
+        issue_type=settings.jira_issue_type,
+        max_connections=settings.jira_max_connections,
+        max_retries=settings.jira_max_retries,
+    )
 
 
 def create_app() -> FastAPI:
@@ -17,6 +119,84 @@ def create_app() -> FastAPI:
         version="1.0.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
+    )
+    app.state.readiness = ReadinessState()
+    app.state.metrics = MetricsRegistry()
+    app.state.loop_monitor = (
+        EventLoopMonitor(
+            interval=settings.loop_monitor_interval,
+            threshold=settings.loop_block_threshold,
+            registry=app.state.metrics,
+        )
+        if settings.loop_monitor_enabled
+        else None
+    )
+    # Created in the lifespan, where the delivery worker's event loop runs
+    app.state.jira_outbox = None
+    app.state.report_store = SQLiteReportStore(settings.report_store_path)
+    # Point IDEMPOTENCY_STORE_PATH at a shared file when running several workers
+    app.state.idempotency_guard = IdempotencyGuard(
+        SQLiteIdempotencyStore(settings.idempotency_store_path),
+        ttl=settings.idempotency_ttl,
+        lease=settings.idempotency_lease,
+        poll_interval=settings.idempotency_poll_interval,
+    )
+    app.state.usage_meter = UsageMeter(
+        settings.usage_quotas,
+        default_quota=settings.usage_default_quota or None,
+        window=settings.usage_quota_window,
+    )
+    # Bounds concurrent LLM calls; interactive requests go ahead of bulk ones
+    app.state.scheduler = PriorityScheduler(
+        settings.llm_max_concurrency,
+        weights=settings.priority_weights,
+        starvation_timeout=settings.priority_starvation_timeout,
+        registry=app.state.metrics,
+    )
+    # Enrichers that finish after their report was returned are collected here
+    app.state.enrichment_tracker = EnrichmentTracker()
+    # Only admins holding PROFILE_TOKEN can profile API requests
+    app.state.profiler = (
+        Profiler(
+            ProfileStore(settings.profile_dir, settings.profile_max_files),
+            interval=settings.profile_interval,
+            token=settings.profile_token,
+        )
+        if settings.profile_token
+        else None
+    )
+    app.state.rendering_service = ReportRenderingService(
+        app.state.report_store,
+        create_default_registry(),
+        cache_size=settings.render_cache_size,
+    )
+    app.state.export_service = ExportService(
+        app.state.report_store,
+        batch_size=settings.export_batch_size,
+        chunk_size=settings.export_chunk_size,
+    )
+    # Worker processes are only started by the first screenshot
+    app.state.image_processor = ImageProcessor(
+        max_workers=settings.image_workers,
+        max_dimension=settings.image_max_dimension,
+        quality=settings.image_jpeg_quality,
+        max_bytes=settings.image_max_bytes,
+        cache_size=settings.image_cache_size,
+    )
+    app.state.context_registry = (
+        ContextRegistry(
+            settings.context_dir,
+            max_tokens=settings.context_max_tokens,
+            reload_interval=settings.context_reload_interval,
+        )
+        if settings.context_dir
+        else None
+    )
+    app.state.similarity_index = (
+        SimilarityIndex.from_store(app.state.report_store)
+        if settings.duplicate_detection_enabled
+        else None
     )
 
     app.add_middleware(
@@ -26,27 +206,58 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
+    if app.state.loop_monitor is not None:
+        # Also covers servers started without the lifespan, like TestClient
+        app.add_middleware(EventLoopWatchMiddleware, monitor=app.state.loop_monitor)
 
-    # Mount static files
+    # Static files are read and pre-compressed once, then served from memory
     static_dir = Path(__file__).parent.parent / "static"
-    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+    static_assets = StaticAssetCache(static_dir)
+    static_assets.load()
+    app.state.static_assets = static_assets
 
     app.include_router(router)
 
-    return app
+    @app.get("/")
+    async def serve_index(request: Request) -> Response:
+        """Serve the index.html file."""
+        # Always revalidate the entry page; the ETag makes that a cheap 304
+        return static_assets.response(request, "index.html", "no-cache")
 
+    @app.api_route("/static/{path:path}", methods=["GET", "HEAD"])
+    async def serve_static(request: Request, path: str) -> Response:
+        """Serve a pre-compressed static file."""
+        if static_assets.is_current_version(path, request.query_params.get("v")):
+            # The URL names this exact content, so it can be kept for long
+            cache_control = (
+                f"public, max-age={settings.static_cache_max_age}, immutable"
+            )
+        else:
+            # Plain URLs change content on deploy; the ETag makes revalidating cheap
+            cache_control = "no-cache"
+        return static_assets.response(request, path, cache_control)
 
-app = create_app()
+    @app.get("/health")
+    async def health_check() -> Dict[str, str]:
+        """Liveness endpoint: the process is up and serving HTTP."""
+        return {"status": "healthy", "service": "bug-reporter-api"}
 
+    @app.get("/ready")
+    async def readiness_check(request: Request) -> JSONResponse:
+        """Readiness endpoint: warm-up finished and the LLM upstream is reachable."""
+        status_code, body = request.app.state.readiness.report()
+        return JSONResponse(status_code=status_code, content=body)
 
-@app.get("/")
-async def serve_index():
-    """Serve the index.html file."""
-    static_dir = Path(__file__).parent.parent / "static"
-    return FileResponse(static_dir / "index.html")
+    @app.get("/metrics")
+    async def metrics(request: Request) -> PlainTextResponse:
+        """Metrics endpoint in the Prometheus text format."""
+        return PlainTextResponse(
+            request.app.state.metrics.render(),
+            media_type="text/plain; version=0.0.4",
+        )
+
+    return app
 
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "service": "bug-reporter-api"}
+app = create_app()
@@ -0,0 +1,198 @@
+"""Idempotency-Key handling for report generation requests."""
+
+import asyncio
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException, Response
+from starlette.concurrency import run_in_threadpool
+
+from ..core.deadline import Deadline
+from ..core.interfaces import IdempotencyStore
+from ..core.models import IdempotencyRecord
+
+# Header set on responses replayed from the store
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Statuses that are not remembered, so a retry runs the request again
+_RETRYABLE_MIN_STATUS = 499
+_TOO_MANY_REQUESTS = 429
+
+
+def request_fingerprint(payload: str) -> str:
+    """Hash a request payload so a key reused for another request is detected."""
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IdempotencyGuard:
+    """
+    Run each idempotent request once and give its response to every retry.
+
+    A retry of a request still in flight in this worker waits for it. A retry
+    of a request in flight in another worker polls the shared store until the
+    response is stored or the other worker's lease runs out; the running
+    request renews its lease, so only a dead worker's lease runs out. A retry after
+    completion gets the stored response. Failures with a 5xx, 499 or 429
+    status are not remembered, so they can be retried.
+    """
+
+    def __init__(
+        self,
+        store: IdempotencyStore,
+        ttl: float = 86400.0,
+        lease: float = 300.0,
+        poll_interval: float = 0.5,
+    ):
+        """
+        Initialize the guard.
+
+        Args:
+            store: Store shared by all workers
+            ttl: Seconds a key and its response are remembered
+            lease: Seconds a worker may hold a key before another takes over
+            poll_interval: Seconds between store checks while another worker runs
+        """
+        self.store = store
+        self.ttl = ttl
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._in_flight: Dict[str, asyncio.Future[None]] = {}
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        handler: Callable[[], Awaitable[Response]],
+        deadline: Optional[Deadline] = None,
+    ) -> Response:
+        """
+        Return the response for a keyed request, running handler at most once.
+
+        Args:
+            key: Idempotency-Key sent by the client
+            fingerprint: Hash of the request payload
+            handler: Produces the response when this call owns the key
+            deadline: Deadline of this call, bounding how long it waits for others
+
+        Returns:
+            The handler's response or the stored one
+
+        Raises:
+            HTTPException: 422 if the key was used for a different payload,
+                504 if the deadline passes while waiting, or whatever the
+                handler raises
+        """
+        while True:
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                await self._wait(asyncio.shield(in_flight), deadline)
+                continue
+
+            record = await run_in_threadpool(
+                self.store.begin, key, fingerprint, self.ttl, self.lease
+            )
+            while True:
+                if record.fingerprint != fingerprint:
+                    raise HTTPException(
+                        status_code=422,
+                        detail="Idempotency-Key was already used for a different "
+                        "request",
+                    )
+                if record.completed:
+                    return self._replay(record)
+                if record.claimed:
+                    return await self._execute(key, handler)
+
+                # Another worker holds the key; polling only reads the store
+                await self._wait(asyncio.sleep(self.poll_interval), deadline)
+                polled = await run_in_threadpool(self.store.get, key)
+                if polled is None or polled.lease_expired:
+                    # Released, or its worker died: try to claim it
+                    break
+                record = polled
+
+    async def _execute(
+        self, key: str, handler: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        """
+        Run the handler for a claimed key and store its response.
+
+        The lease is renewed while the handler runs, so a request that takes
+        longer than the lease is not taken over by another worker.
+
+        Args:
+            key: Claimed Idempotency-Key
+            handler: Produces the response
+
+        Returns:
+            The handler's response
+        """
+        done = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = done
+        heartbeat = asyncio.ensure_future(self._renew_lease(key))
+        try:
+            try:
+                response = await handler()
+            except HTTPException as e:
+                await self._finish(
+                    key,
+                    e.status_code,
+                    json.dumps({"detail": e.detail}).encode("utf-8"),
+                )
+                raise
+            except BaseException:
+                await run_in_threadpool(self.store.release, key)
+                raise
+            await self._finish(key, response.status_code, bytes(response.body))
+            return response
+        finally:
+            # Renewing after the key is completed or released changes nothing
+            heartbeat.cancel()
+            del self._in_flight[key]
+            done.set_result(None)
+
+    async def _renew_lease(self, key: str) -> None:
+        """Renew the lease of a claimed key until cancelled or no longer pending."""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            if not await run_in_threadpool(self.store.renew, key, self.lease):
+                return
+
+    async def _finish(self, key: str, status_code: int, body: bytes) -> None:
+        """Store a final response, or release the key if it should be retried."""
+        if status_code >= _RETRYABLE_MIN_STATUS or status_code == _TOO_MANY_REQUESTS:
+            await run_in_threadpool(self.store.release, key)
+        else:
+            await run_in_threadpool(
+                self.store.complete, key, status_code, body, self.ttl
+            )
+
+    @staticmethod
+    async def _wait(awaitable: Awaitable, deadline: Optional[Deadline]) -> None:
+        """
+        Wait for another request, giving up at this request's deadline.
+
+        Raises:
+            HTTPException: 504 if the deadline passes first
+        """
+        timeout = deadline.remaining() if deadline is not None else None
+        try:
+            await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=504,
+                detail="Timed out waiting for the original request with this "
+                "Idempotency-Key",
+            )
+
+    @staticmethod
+    def _replay(record: IdempotencyRecord) -> Response:
+        """Build a response from a stored record."""
+        assert record.status_code is not None, "completed records have a response"
+        return Response(
+            content=record.body,
+            status_code=record.status_code,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"},
+        )
@@ -1,7 +1,12 @@
 """API models for the Bug Reporter application."""
 
+from datetime import datetime
+from typing import Any, ClassVar, Dict, List, Literal, Optional, Sequence
+
 from pydantic import BaseModel, Field
 
+from ..core.models import BugReport, EnrichmentResult
+
 
 class BugReportRequest(BaseModel):
     """Request model for bug report generation."""
@@ -9,15 +14,56 @@ class BugReportRequest(BaseModel):
     user_input: str = Field(
         ..., description="User's description of the bug", min_length=1, max_length=5000
     )
+    reuse_duplicates: bool = Field(
+        False,
+        description=(
+            "Return a stored near-duplicate report instead of generating a new one"
+        ),
+    )
+    submit_to_jira: bool = Field(
+        False,
+        description="Queue the generated report for creation as a Jira issue",
+    )
+    context: Optional[str] = Field(
+        None,
+        description="Name of the application context added to the prompt",
+    )
 
     class Config:
-        json_schema_extra = {
+        json_schema_extra: ClassVar[Dict[str, Any]] = {
             "example": {
                 "user_input": "there is no header displayed on the main page, i can see error 404 in js console"
             }
         }
 
 
+class DuplicateCandidate(BaseModel):
+    """A previously generated report that looks like the same bug."""
+
+    id: str
+    title: str
+    score: float = Field(..., description="Estimated similarity between 0 and 1")
+
+
+class EnrichmentInfo(BaseModel):
+    """The state of one optional enricher of a report."""
+
+    name: str = Field(..., description="Enricher, e.g. root_cause or info_gaps")
+    status: str = Field(..., description="pending, done, failed or timed_out")
+    content: Optional[str] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_result(cls, result: EnrichmentResult) -> "EnrichmentInfo":
+        """Build the API model of an enrichment result."""
+        return cls.model_construct(
+            name=result.name,
+            status=result.status,
+            content=result.content,
+            error=result.error,
+        )
+
+
 class BugReportResponse(BaseModel):
     """Response model for bug report generation."""
 
@@ -27,9 +73,68 @@ class BugReportResponse(BaseModel):
     expected_result: str
     actual_result: str
     formatted_report: str
+    id: Optional[str] = Field(
+        None, description="ID of the stored report, usable with GET /bug-reports/{id}"
+    )
+    duplicates: List[DuplicateCandidate] = Field(
+        default_factory=list, description="Likely duplicates among stored reports"
+    )
+    reused: bool = Field(
+        False,
+        description="True if a stored duplicate was returned without calling the AI",
+    )
+    jira_status: Optional[str] = Field(
+        None,
+        description="Jira submission status if submission was requested",
+    )
+    enrichments: List[EnrichmentInfo] = Field(
+        default_factory=list,
+        description="Optional enrichers; pending ones are fetched later from "
+        "GET /bug-reports/{id}/enrichments",
+    )
+
+    @classmethod
+    def from_bug_report(
+        cls,
+        bug_report: BugReport,
+        formatted_report: str,
+        report_id: Optional[str] = None,
+        duplicates: Optional[List[DuplicateCandidate]] = None,
+        reused: bool = False,
+        jira_status: Optional[str] = None,
+        enrichments: Sequence[EnrichmentResult] = (),
+    ) -> "BugReportResponse":
+        """
+        Build a response from an already-validated bug report without re-validating.
+
+        Args:
+            bug_report: Bug report validated when parsing the LLM output
+            formatted_report: Output of the formatter
+            report_id: ID the report was stored under
+            duplicates: Likely duplicates found before generation
+            reused: Whether the report is a reused stored duplicate
+            jira_status: Jira submission status if submission was requested
+            enrichments: State of the report's enrichers when it was generated
+
+        Returns:
+            Response model instance
+        """
+        return cls.model_construct(
+            id=report_id,
+            duplicates=duplicates or [],
+            reused=reused,
+            jira_status=jira_status,
+            enrichments=[EnrichmentInfo.from_result(r) for r in enrichments],
+            title=bug_report.title,
+            description=bug_report.description,
+            steps=bug_report.steps,
+            expected_result=bug_report.expected_result,
+            actual_result=bug_report.actual_result,
+            formatted_report=formatted_report,
+        )
 
     class Config:
-        json_schema_extra = {
+        json_schema_extra: ClassVar[Dict[str, Any]] = {
             "example": {
                 "title": "Missing Header on Main Page with 404 Error",
                 "description": "The main page header is not displaying, and there's a 404 error in the JavaScript console",
@@ -37,5 +142,214 @@ class BugReportResponse(BaseModel):
                 "expected_result": "Header should be visible on the main page with no console errors",
                 "actual_result": "Header is missing and 404 error appears in JS console",
                 "formatted_report": "**Title:** Missing Header on Main Page...\n\n**Description:**...",
+                "id": "3f2b9c4e8a6d4b1f9e0c7a5d2b8e4f61",
+                "duplicates": [
+                    {
+                        "id": "9a1c0e7b2d5f4c3a8b6e1d0f7c2a5b94",
+                        "title": "Header missing on home page",
+                        "score": 0.71,
+                    }
+                ],
+                "reused": False,
+                "jira_status": None,
+                "enrichments": [
+                    {"name": "root_cause", "status": "pending"},
+                ],
+            }
+        }
+
+
+class BugReportFields(BaseModel):
+    """The structured fields of a bug report, as returned by the API."""
+
+    title: str = Field(..., max_length=5000)
+    description: str = Field(..., max_length=5000)
+    steps: str = Field(..., max_length=5000)
+    expected_result: str = Field(..., max_length=5000)
+    actual_result: str = Field(..., max_length=5000)
+
+    def to_bug_report(self) -> BugReport:
+        """Convert to the core BugReport model."""
+        return BugReport(**self.model_dump())
+
+
+class FieldRegenerationRequest(BaseModel):
+    """Request model for regenerating one field of an existing report."""
+
+    report: BugReportFields
+    field: Literal[
+        "title", "description", "steps", "expected_result", "actual_result"
+    ] = Field(..., description="Field to regenerate; the others are kept")
+    instruction: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=1000,
+        description="What to change, e.g. 'split step 2 into two steps'",
+    )
+
+    class Config:
+        json_schema_extra: ClassVar[Dict[str, Any]] = {
+            "example": {
+                "report": {
+                    "title": "Missing Header on Main Page with 404 Error",
+                    "description": "The main page header is not displaying",
+                    "steps": "1. Navigate to the main page",
+                    "expected_result": "Header should be visible",
+                    "actual_result": "Header is missing",
+                },
+                "field": "steps",
+                "instruction": "Mention that the console shows a 404",
+            }
+        }
+
+
+class RenderedReportResponse(BaseModel):
+    """Response model for a stored bug report rendered in a specific format."""
+
+    id: str
+    format: str
+    content: str
+
+    class Config:
+        json_schema_extra: ClassVar[Dict[str, Any]] = {
+            "example": {
+                "id": "3f2b9c4e8a6d4b1f9e0c7a5d2b8e4f61",
+                "format": "markdown",
+                "content": "# Missing Header on Main Page\n\n**Description**\n\n...",
+            }
+        }
+
+
+class JiraSubmissionResponse(BaseModel):
+    """Response model for the Jira submission status of a stored report."""
+
+    id: str
+    status: str = Field(..., description="pending, created or failed")
+    issue_key: Optional[str] = None
+    error: Optional[str] = None
+
+    class Config:
+        json_schema_extra: ClassVar[Dict[str, Any]] = {
+            "example": {
+                "id": "3f2b9c4e8a6d4b1f9e0c7a5d2b8e4f61",
+                "status": "created",
+                "issue_key": "BUG-123",
+                "error": None,
+            }
+        }
+
+
+class EnrichmentListResponse(BaseModel):
+    """Response model for the enrichments of a stored report."""
+
+    id: str
+    enrichments: List[EnrichmentInfo]
+
+    class Config:
+        json_schema_extra: ClassVar[Dict[str, Any]] = {
+            "example": {
+                "id": "3f2b9c4e8a6d4b1f9e0c7a5d2b8e4f61",
+                "enrichments": [
+                    {
+                        "name": "root_cause",
+                        "status": "done",
+                        "content": "- The header component fails to load "
+                        "its template (404); likely a wrong asset path.",
+                        "error": None,
+                    },
+                    {"name": "info_gaps", "status": "timed_out"},
+                ],
+            }
+        }
+
+
+class ApplicationContextInfo(BaseModel):
+    """Size of an application context in the registry."""
+
+    name: str
+    bytes: int = Field(..., description="Size of the context file")
+    tokens: int = Field(..., description="Estimated tokens of the compiled prefix")
+    max_tokens: int = Field(..., description="Token budget of each context")
+    error: Optional[str] = Field(
+        None, description="Why the context cannot be used, if it cannot"
+    )
+
+
+class ApplicationContextListResponse(BaseModel):
+    """Response model listing the application contexts."""
+
+    contexts: List[ApplicationContextInfo]
+
+    class Config:
+        json_schema_extra: ClassVar[Dict[str, Any]] = {
+            "example": {
+                "contexts": [
+                    {
+                        "name": "billing",
+                        "bytes": 1834,
+                        "tokens": 472,
+                        "max_tokens": 1000,
+                        "error": None,
+                    }
+                ]
+            }
+        }
+
+
+class UsageEntry(BaseModel):
+    """Token usage of one client with one model and prompt version."""
+
+    client: str
+    model: str
+    prompt_version: str
+    attempts: int = Field(..., description="LLM calls made, retries included")
+    failed_attempts: int = Field(..., description="LLM calls that raised an error")
+    prompt_tokens: int
+    output_tokens: int
+    total_tokens: int
+    mean_latency_seconds: float
+
+
+class ClientQuota(BaseModel):
+    """A client's token use in the current quota window."""
+
+    client: str
+    used: int = Field(..., description="Tokens used in the current window")
+    quota: Optional[int] = Field(None, description="Tokens allowed per window")
+    resets_at: datetime
+
+
+class UsageResponse(BaseModel):
+    """Response model of the usage report."""
+
+    window_seconds: float
+    usage: List[UsageEntry]
+    clients: List[ClientQuota]
+
+    class Config:
+        json_schema_extra: ClassVar[Dict[str, Any]] = {
+            "example": {
+                "window_seconds": 86400,
+                "usage": [
+                    {
+                        "client": "web",
+                        "model": "gemini-1.5-flash",
+                        "prompt_version": "compact-en/v1",
+                        "attempts": 42,
+                        "failed_attempts": 1,
+                        "prompt_tokens": 12800,
+                        "output_tokens": 7350,
+                        "total_tokens": 20150,
+                        "mean_latency_seconds": 1.84,
+                    }
+                ],
+                "clients": [
+                    {
+                        "client": "web",
+                        "used": 20150,
+                        "quota": 500000,
+                        "resets_at": "2024-05-02T00:00:00Z",
+                    }
+                ],
             }
         }
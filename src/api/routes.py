@@ -1,69 +1,1177 @@
 """API routes for bug report generation."""
 
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+import functools
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Mapping, Optional, Sequence
 
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from ..attachments import (
+    ImageProcessor,
+    LogExcerpt,
+    LogExcerptExtractor,
+    excerpt_budget,
+)
+from ..config import settings
+from ..core.deadline import Deadline
+from ..core.exceptions import (
+    BugReporterError,
+    DeadlineExceededError,
+    JiraError,
+    QuotaExceededError,
+    RequestCancelledError,
+    ValidationError,
+)
+from ..core.interfaces import LLMService, ReportStore
+from ..core.models import ImageAttachment
+from ..formatters.jira_formatter import JiraFormatter
+from ..jira import JiraOutbox
+from ..jira.outbox import FAILED as JIRA_FAILED
+from ..monitoring import MetricsRegistry
+from ..profiling import Profiler, ProfileSession, maybe_profile_async, profiled
+from ..prompts import ApplicationContext, ContextRegistry
+from ..replay import record_from_settings, replay_model_from_settings
 from ..services.bug_report_service import BugReportService
+from ..services.enrichment import EnrichmentTracker, create_enrichers
+from ..services.export_service import ExportService
 from ..services.gemini_service import GeminiService
-from ..formatters.jira_formatter import JiraFormatter
-from ..core.exceptions import BugReporterError
-from .models import BugReportRequest, BugReportResponse
+from ..services.key_pool import key_pool_from_settings
+from ..services.pipeline import PipelineContext
+from ..services.prompt_evaluation import resolve_version
+from ..services.report_rendering_service import ReportRenderingService
+from ..services.scheduler import (
+    BULK,
+    INTERACTIVE,
+    PriorityScheduler,
+    keep_slot_until,
+)
+from ..services.similarity_index import SimilarityIndex
+from ..services.traffic_split import TrafficArm, TrafficSplitService
+from ..services.usage_meter import DEFAULT_CLIENT, UsageMeter
+from .idempotency import IdempotencyGuard, request_fingerprint
+from .models import (
+    ApplicationContextInfo,
+    ApplicationContextListResponse,
+    BugReportRequest,
+    BugReportResponse,
+    ClientQuota,
+    DuplicateCandidate,
+    EnrichmentInfo,
+    EnrichmentListResponse,
+    FieldRegenerationRequest,
+    JiraSubmissionResponse,
+    RenderedReportResponse,
+    UsageEntry,
+    UsageResponse,
+)
+from .warmup import ReadinessState
 
 router = APIRouter(prefix="/api/v1", tags=["bug-reports"])
 
+# Non-standard status logged for requests whose client went away (as in nginx)
+CLIENT_CLOSED_REQUEST = 499
+
+# Seconds between client disconnect checks while the LLM is working
+DISCONNECT_POLL_INTERVAL = 0.25
+
+# Response header naming the profile file of a profiled request
+PROFILE_HEADER = "X-Profile-Id"
+
+
+def create_llm_service(registry: Optional[MetricsRegistry] = None) -> LLMService:
+    """
+    Create the LLM service, split across the canary and shadow arms in settings.
+
+    Args:
+        registry: Registry the per-arm metrics are added to
+    """
+    # Every arm calls with the same keys, so they share one pool and its quotas
+    key_pool = key_pool_from_settings() if settings.gemini_api_keys else None
+    # LLM_REPLAY_PATH serves calls from a cassette, LLM_RECORD_PATH records them
+    llm_service = record_from_settings(
+        GeminiService(model=replay_model_from_settings(), key_pool=key_pool)
+    )
+    arms = [
+        TrafficArm(
+            name,
+            GeminiService(
+                model=replay_model_from_settings(),
+                model_name=model_name,
+                key_pool=key_pool,
+            ),
+            percent,
+            prompt=resolve_version(prompt) if prompt else None,
+            shadow=shadow,
+        )
+        for name, percent, model_name, prompt, shadow in (
+            (
+                "canary",
+                settings.canary_percent,
+                settings.canary_model,
+                settings.canary_prompt,
+                False,
+            ),
+            (
+                "shadow",
+                settings.shadow_percent,
+                settings.shadow_model,
+                settings.shadow_prompt,
+                True,
+            ),
+        )
+        if percent > 0
+    ]
+    if not arms:
+        return llm_service
+    return TrafficSplitService(
+        llm_service,
+        arms,
+        shadow_workers=settings.shadow_max_concurrency,
+        shadow_max_pending=settings.shadow_max_pending,
+        shadow_timeout=settings.shadow_timeout,
+        registry=registry,
+    )
+
+
+def create_bug_report_service(
+    registry: Optional[MetricsRegistry] = None,
+) -> BugReportService:
+    """
+    Create a new bug report service instance.
 
-def get_bug_report_service() -> BugReportService:
-    """Dependency to create and return a bug report service instance."""
-    llm_service = GeminiService()
+    Args:
+        registry: Registry the pipeline stage durations are added to
+    """
+    llm_service = create_llm_service(registry)
     formatter = JiraFormatter()
-    return BugReportService(llm_service, formatter)
+    return BugReportService(
+        llm_service,
+        formatter,
+        enrichers=create_enrichers(llm_service, settings.enrichers),
+        enrichment_workers=settings.enrichment_workers,
+        cpu_workers=settings.pipeline_cpu_workers,
+        registry=registry,
+    )
+
+
+def get_bug_report_service(request: Request) -> BugReportService:
+    """
+    Dependency returning the app's shared, warmed-up bug report service.
+
+    Falls back to a fresh instance when the app was started without its
+    lifespan (e.g. a plain TestClient).
+    """
+    readiness: Optional[ReadinessState] = getattr(request.app.state, "readiness", None)
+    if readiness is not None and readiness.bug_report_service is not None:
+        return readiness.bug_report_service
+    return create_bug_report_service(request.app.state.metrics)
+
+
+def get_report_store(request: Request) -> ReportStore:
+    """Dependency returning the app's report store."""
+    store: ReportStore = request.app.state.report_store
+    return store
+
+
+def get_rendering_service(request: Request) -> ReportRenderingService:
+    """Dependency returning the app's report rendering service."""
+    service: ReportRenderingService = request.app.state.rendering_service
+    return service
+
+
+def get_export_service(request: Request) -> ExportService:
+    """Dependency returning the app's export service."""
+    service: ExportService = request.app.state.export_service
+    return service
+
+
+def get_jira_outbox(request: Request) -> Optional[JiraOutbox]:
+    """Dependency returning the Jira outbox, or None if Jira is not configured."""
+    outbox: Optional[JiraOutbox] = request.app.state.jira_outbox
+    return outbox
+
+
+def get_similarity_index(request: Request) -> Optional[SimilarityIndex]:
+    """Dependency returning the duplicate index, or None if detection is disabled."""
+    index: Optional[SimilarityIndex] = request.app.state.similarity_index
+    return index
+
+
+def get_image_processor(request: Request) -> ImageProcessor:
+    """Dependency returning the app's screenshot processor."""
+    processor: ImageProcessor = request.app.state.image_processor
+    return processor
+
+
+def get_context_registry(request: Request) -> Optional[ContextRegistry]:
+    """Dependency returning the context registry, or None if not configured."""
+    registry: Optional[ContextRegistry] = request.app.state.context_registry
+    return registry
+
+
+def get_idempotency_guard(request: Request) -> IdempotencyGuard:
+    """Dependency returning the app's Idempotency-Key guard."""
+    guard: IdempotencyGuard = request.app.state.idempotency_guard
+    return guard
+
+
+def get_usage_meter(request: Request) -> UsageMeter:
+    """Dependency returning the app's token usage meter."""
+    meter: UsageMeter = request.app.state.usage_meter
+    return meter
+
+
+def get_client_id(
+    x_client_id: Optional[str] = Header(
+        None,
+        min_length=1,
+        max_length=100,
+        description="Name of the calling client, used for usage accounting",
+    ),
+) -> str:
+    """Dependency returning the calling client's name."""
+    return x_client_id or DEFAULT_CLIENT
+
+
+def get_enrichment_tracker(request: Request) -> EnrichmentTracker:
+    """Dependency returning the app's tracker of enrichment runs."""
+    tracker: EnrichmentTracker = request.app.state.enrichment_tracker
+    return tracker
+
+
+def get_scheduler(request: Request) -> PriorityScheduler:
+    """Dependency returning the app's LLM call scheduler."""
+    scheduler: PriorityScheduler = request.app.state.scheduler
+    return scheduler
+
+
+def get_priority(default: Optional[str] = None) -> Callable[..., str]:
+    """
+    Return a dependency resolving the priority lane of an endpoint's requests.
+
+    Args:
+        default: Lane used without an X-Priority header; DEFAULT_PRIORITY if None
+    """
+
+    def priority(
+        request: Request,
+        x_priority: Optional[str] = Header(
+            None, description="Priority lane, e.g. interactive or bulk"
+        ),
+    ) -> str:
+        lane = x_priority or default or settings.default_priority
+        lanes = request.app.state.scheduler.lanes
+        if lane not in lanes:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown priority '{lane}'; expected one of {', '.join(lanes)}",
+            )
+        return lane
+
+    return priority
+
+
+def get_profile_session(
+    request: Request,
+    x_profile: Optional[str] = Header(
+        None, description="Admin profiling token; profiles this request"
+    ),
+    profile: Optional[str] = Query(
+        None, description="Admin profiling token, for clients that cannot set headers"
+    ),
+) -> Optional[ProfileSession]:
+    """
+    Dependency returning a profile session if an admin asked for one.
+
+    Raises:
+        HTTPException: 403 if profiling is disabled or the token is wrong
+    """
+    token = x_profile or profile
+    if token is None:
+        return None
+    profiler: Optional[Profiler] = request.app.state.profiler
+    if profiler is None:
+        raise HTTPException(status_code=403, detail="Profiling is not enabled")
+    if not profiler.authorize(token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+    return profiler.session("api-bug-report")
+
+
+def add_profile_header(
+    response: Response, profile: Optional[ProfileSession]
+) -> Response:
+    """Name the profile file of a profiled request in its response."""
+    if profile is not None and profile.path is not None:
+        response.headers[PROFILE_HEADER] = os.path.basename(profile.path)
+    return response
+
+
+def add_server_timing(response: Response, timings: Mapping[str, float]) -> Response:
+    """Report the time spent in each pipeline stage in a Server-Timing header."""
+    if timings:
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()
+        )
+    return response
+
+
+def get_deadline(
+    x_request_timeout: Optional[float] = Header(
+        None, gt=0, description="Seconds the client will wait for the report"
+    ),
+) -> Deadline:
+    """
+    Dependency returning the request's deadline.
+
+    The X-Request-Timeout header can shorten REQUEST_TIMEOUT but not extend it.
+    """
+    timeout = settings.request_timeout or None
+    if x_request_timeout is not None:
+        timeout = min(x_request_timeout, timeout or x_request_timeout)
+    return Deadline(timeout)
+
+
+async def call_until_disconnected(
+    http_request: Optional[Request],
+    deadline: Deadline,
+    func: Callable[..., Any],
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run a blocking call in a worker thread, giving up when the client leaves.
+
+    On disconnect the deadline is cancelled, so the call starts no further
+    retries, and the request stops waiting for it. A blocking SDK call already
+    in flight cannot be interrupted; it ends at its own timeout, which the
+    deadline caps, and its result is discarded. Until then it keeps the
+    request's scheduler slot, if any.
+
+    Args:
+        http_request: The HTTP request to watch, or None to only watch the deadline
+        deadline: The request's deadline
+        func: Blocking function to call
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The result of func
+
+    Raises:
+        RequestCancelledError: If the client disconnected first
+        DeadlineExceededError: If the deadline passed first
+    """
+    task = asyncio.ensure_future(run_in_threadpool(profiled(func), *args, **kwargs))
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+        if done:
+            return task.result()
+        if http_request is not None and await http_request.is_disconnected():
+            deadline.cancel()
+        if deadline.cancelled or deadline.expired:
+            # Retrieve the abandoned call's outcome so it is not reported as lost
+            task.add_done_callback(lambda finished: finished.exception())
+            # The thread still calls the LLM, so it keeps the request's slot
+            keep_slot_until(task)
+            deadline.check()
+
+
+def resolve_context(
+    name: Optional[str], context_registry: Optional[ContextRegistry]
+) -> Optional[ApplicationContext]:
+    """
+    Look up the precompiled application context a request asked for.
+
+    Args:
+        name: Requested context name, or None
+        context_registry: Registry of application contexts
+
+    Returns:
+        The context, or None if none was requested
+
+    Raises:
+        HTTPException: 400 if contexts are not configured or the context is
+            unknown or unusable
+    """
+    if name is None:
+        return None
+    if context_registry is None:
+        raise HTTPException(
+            status_code=400, detail="Application contexts are not configured"
+        )
+    try:
+        return context_registry.get(name)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def json_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    Serialize an already-valid model straight to JSON.
+
+    Returning a Response bypasses FastAPI's response_model re-validation and
+    jsonable_encoder pass; pydantic-core encodes the model in one step.
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+    )
 
 
 @router.post("/bug-reports", response_model=BugReportResponse)
 async def create_bug_report(
     request: BugReportRequest,
+    http_request: Request,
     service: BugReportService = Depends(get_bug_report_service),
-) -> BugReportResponse:
+    store: ReportStore = Depends(get_report_store),
+    similarity_index: Optional[SimilarityIndex] = Depends(get_similarity_index),
+    jira_outbox: Optional[JiraOutbox] = Depends(get_jira_outbox),
+    context_registry: Optional[ContextRegistry] = Depends(get_context_registry),
+    deadline: Deadline = Depends(get_deadline),
+    usage_meter: UsageMeter = Depends(get_usage_meter),
+    client_id: str = Depends(get_client_id),
+    scheduler: PriorityScheduler = Depends(get_scheduler),
+    priority: str = Depends(get_priority()),
+    enrichment_tracker: EnrichmentTracker = Depends(get_enrichment_tracker),
+    profile: Optional[ProfileSession] = Depends(get_profile_session),
+    idempotency_guard: IdempotencyGuard = Depends(get_idempotency_guard),
+    idempotency_key: Optional[str] = Header(
+        None,
+        min_length=1,
+        max_length=255,
+        description="Client-chosen key that makes retries of this request safe",
+    ),
+) -> Response:
     """
     Generate a formatted bug report from user input.
 
+    With an Idempotency-Key, the report is generated once per key: a retry
+    made while the original is still running waits for it, and a retry made
+    afterwards gets the stored response with Idempotent-Replayed set. A keyed
+    request keeps running when its client disconnects, so a retry can still
+    collect the result.
+
+    The LLM call waits for a slot in the request's priority lane: the
+    X-Priority header, or DEFAULT_PRIORITY. Batch clients should send
+    X-Priority: bulk so people waiting in the UI are served first.
+
     Args:
         request: The bug report request containing user input
+        http_request: The HTTP request, watched for client disconnects
         service: The bug report service dependency
+        store: Store the generated report is persisted to
+        similarity_index: Index of stored reports used to spot duplicates
+        jira_outbox: Outbox that submits reports to Jira in the background
+        context_registry: Registry of application contexts
+        deadline: Deadline from X-Request-Timeout or REQUEST_TIMEOUT
+        usage_meter: Meter the LLM's token usage is billed to
+        client_id: Client from the X-Client-ID header
+        scheduler: Scheduler admitting LLM calls by priority
+        priority: Priority lane from X-Priority or DEFAULT_PRIORITY
+        enrichment_tracker: Tracker the report's enrichment run is added to
+        profile: Profile session, if an admin asked for this request's profile
+        idempotency_guard: Guard running each Idempotency-Key once
+        idempotency_key: Idempotency-Key header
+
+    Returns:
+        A formatted bug report with structured fields, its stored ID and
+        likely duplicates
+
+    Raises:
+        HTTPException: 422 if the input is rejected locally or the
+            Idempotency-Key was used for a different request, 400 if Jira
+            submission is requested but not configured, the application
+            context is unavailable or the priority is unknown, 429 if the
+            client's token quota is used up, 504 if the deadline passes, 500
+            if the bug report generation fails, 403 if profiling is requested
+            without the admin token
+    """
+    async with maybe_profile_async(profile):
+        context = resolve_context(request.context, context_registry)
+        if idempotency_key is None:
+            response = await generate_report_response(
+                request,
+                service,
+                store,
+                similarity_index,
+                jira_outbox,
+                context=context,
+                deadline=deadline,
+                http_request=http_request,
+                usage_meter=usage_meter,
+                client_id=client_id,
+                scheduler=scheduler,
+                lane=priority,
+                enrichment_tracker=enrichment_tracker,
+            )
+        else:
+            response = await idempotency_guard.run(
+                idempotency_key,
+                request_fingerprint(request.model_dump_json()),
+                lambda: generate_report_response(
+                    request,
+                    service,
+                    store,
+                    similarity_index,
+                    jira_outbox,
+                    context=context,
+                    deadline=deadline,
+                    usage_meter=usage_meter,
+                    client_id=client_id,
+                    scheduler=scheduler,
+                    lane=priority,
+                    enrichment_tracker=enrichment_tracker,
+                ),
+                deadline,
+            )
+    return add_profile_header(response, profile)
+
+
+@router.post("/bug-reports/with-attachments", response_model=BugReportResponse)
+async def create_bug_report_with_attachments(
+    http_request: Request,
+    user_input: str = Form(..., min_length=1, max_length=5000),
+    reuse_duplicates: bool = Form(False),
+    submit_to_jira: bool = Form(False),
+    context: Optional[str] = Form(None),
+    logs: List[UploadFile] = File(
+        default_factory=list, description="Browser or server log files"
+    ),
+    screenshots: List[UploadFile] = File(
+        default_factory=list, description="PNG, JPEG or WebP screenshots"
+    ),
+    service: BugReportService = Depends(get_bug_report_service),
+    store: ReportStore = Depends(get_report_store),
+    similarity_index: Optional[SimilarityIndex] = Depends(get_similarity_index),
+    jira_outbox: Optional[JiraOutbox] = Depends(get_jira_outbox),
+    image_processor: ImageProcessor = Depends(get_image_processor),
+    context_registry: Optional[ContextRegistry] = Depends(get_context_registry),
+    deadline: Deadline = Depends(get_deadline),
+    usage_meter: UsageMeter = Depends(get_usage_meter),
+    client_id: str = Depends(get_client_id),
+    scheduler: PriorityScheduler = Depends(get_scheduler),
+    priority: str = Depends(get_priority(INTERACTIVE)),
+    enrichment_tracker: EnrichmentTracker = Depends(get_enrichment_tracker),
+    profile: Optional[ProfileSession] = Depends(get_profile_session),
+) -> Response:
+    """
+    Generate a bug report from a multipart form with attached logs and screenshots.
+
+    Uploads are spooled to disk by the multipart parser. Each log is scanned
+    as a stream in a worker thread, and only a deduplicated excerpt of its
+    errors, stack traces and failed HTTP calls is added to the prompt.
+    Screenshots are downscaled and re-encoded in a process pool and sent to
+    the model as image parts; identical screenshots are processed once.
+    Form uploads come from people, so the priority defaults to interactive.
+
+    Args:
+        http_request: The HTTP request, watched for client disconnects
+        user_input: The user's description of the bug
+        reuse_duplicates: Return a stored near-duplicate instead of generating
+        submit_to_jira: Queue the generated report for Jira
+        context: Name of the application context added to the prompt
+        logs: Attached log files
+        screenshots: Attached screenshots
+        service: The bug report service dependency
+        store: Store the generated report is persisted to
+        similarity_index: Index of stored reports used to spot duplicates
+        jira_outbox: Outbox that submits reports to Jira in the background
+        image_processor: Processor preparing screenshots for the model
+        context_registry: Registry of application contexts
+        deadline: Deadline from X-Request-Timeout or REQUEST_TIMEOUT
+        usage_meter: Meter the LLM's token usage is billed to
+        client_id: Client from the X-Client-ID header
+        scheduler: Scheduler admitting LLM calls by priority
+        priority: Priority lane from X-Priority, interactive by default
+        enrichment_tracker: Tracker the report's enrichment run is added to
+        profile: Profile session, if an admin asked for this request's profile
+
+    Returns:
+        A formatted bug report, as for POST /bug-reports
+
+    Raises:
+        HTTPException: 400 if too many files are attached, 413 if a screenshot
+            is too large, 422 if a screenshot cannot be decoded, otherwise as
+            for POST /bug-reports
+    """
+    if len(logs) > settings.log_max_attachments:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.log_max_attachments} log files can be attached",
+        )
+    if len(screenshots) > settings.image_max_attachments:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"At most {settings.image_max_attachments} screenshots "
+                "can be attached"
+            ),
+        )
+
+    async with maybe_profile_async(profile):
+        application_context = resolve_context(context, context_registry)
+        images = await process_screenshots(screenshots, image_processor)
+
+        extractor = LogExcerptExtractor(max_scan_bytes=settings.log_scan_max_bytes)
+        budget = excerpt_budget(settings.log_excerpt_max_tokens, len(logs))
+        log_excerpts = []
+        for upload in logs:
+            log_excerpts.append(
+                await run_in_threadpool(
+                    profiled(extractor.extract),
+                    upload.file,
+                    upload.filename or "log",
+                    budget,
+                )
+            )
+            await upload.close()
+
+        request = BugReportRequest.model_construct(
+            user_input=user_input,
+            reuse_duplicates=reuse_duplicates,
+            submit_to_jira=submit_to_jira,
+            context=context,
+        )
+        response = await generate_report_response(
+            request,
+            service,
+            store,
+            similarity_index,
+            jira_outbox,
+            log_excerpts,
+            images,
+            application_context,
+            deadline,
+            http_request,
+            usage_meter,
+            client_id,
+            scheduler,
+            priority,
+            enrichment_tracker,
+        )
+    return add_profile_header(response, profile)
+
+
+async def process_screenshots(
+    screenshots: Sequence[UploadFile], image_processor: ImageProcessor
+) -> List[ImageAttachment]:
+    """
+    Read and process uploaded screenshots concurrently, dropping duplicates.
+
+    Args:
+        screenshots: Uploaded screenshots
+        image_processor: Processor preparing screenshots for the model
+
+    Returns:
+        Distinct processed images in upload order
+
+    Raises:
+        HTTPException: 413 if a screenshot is too large, 422 if it cannot be
+            decoded
+    """
+    uploads = []
+    for upload in screenshots:
+        # One byte over the limit is enough to know the upload is too large
+        data = await upload.read(image_processor.max_bytes + 1)
+        await upload.close()
+        if len(data) > image_processor.max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Screenshot '{upload.filename}' is larger than "
+                f"{image_processor.max_bytes} bytes",
+            )
+        uploads.append((upload.filename or "screenshot", data))
+
+    results = await asyncio.gather(
+        *(image_processor.process(data) for _, data in uploads),
+        return_exceptions=True,
+    )
+    images: List[ImageAttachment] = []
+    digests = set()
+    for (filename, _), result in zip(uploads, results):
+        if isinstance(result, ValidationError):
+            raise HTTPException(
+                status_code=422, detail=f"Screenshot '{filename}': {result}"
+            )
+        if isinstance(result, BaseException):
+            raise result
+        if result.digest not in digests:
+            digests.add(result.digest)
+            images.append(result)
+    return images
+
+
+async def generate_report_response(
+    request: BugReportRequest,
+    service: BugReportService,
+    store: ReportStore,
+    similarity_index: Optional[SimilarityIndex],
+    jira_outbox: Optional[JiraOutbox],
+    log_excerpts: Sequence[LogExcerpt] = (),
+    images: Sequence[ImageAttachment] = (),
+    context: Optional[ApplicationContext] = None,
+    deadline: Optional[Deadline] = None,
+    http_request: Optional[Request] = None,
+    usage_meter: Optional[UsageMeter] = None,
+    client_id: str = DEFAULT_CLIENT,
+    scheduler: Optional[PriorityScheduler] = None,
+    lane: str = INTERACTIVE,
+    enrichment_tracker: Optional[EnrichmentTracker] = None,
+) -> Response:
+    """
+    Generate, store and return a bug report for a validated request.
+
+    Args:
+        request: The bug report request
+        service: Bug report service
+        store: Store the generated report is persisted to
+        similarity_index: Index of stored reports used to spot duplicates
+        jira_outbox: Outbox that submits reports to Jira in the background
+        log_excerpts: Excerpts of attached logs added to the prompt
+        images: Processed screenshots sent to the model
+        context: Application context placed before the prompt
+        deadline: Request deadline passed to the LLM service
+        http_request: The HTTP request, watched for client disconnects
+        usage_meter: Meter checking the client's quota and recording its usage
+        client_id: Client the LLM's token usage is billed to
+        scheduler: Scheduler the LLM call waits on for a slot, if any
+        lane: Priority lane of the request
+        enrichment_tracker: Tracker of enrichment runs; enrichers run only if set
 
     Returns:
-        A formatted bug report with structured fields
+        JSON response with the generated report, or an empty 499 response if
+        the client disconnected
 
     Raises:
-        HTTPException: If the bug report generation fails
+        HTTPException: As documented on POST /bug-reports
     """
+    deadline = deadline or Deadline()
+    if request.submit_to_jira and jira_outbox is None:
+        raise HTTPException(status_code=400, detail="Jira submission is not configured")
+
+    # Enrichers run in their own threads and never hold up the report
+    pipeline = service.build_pipeline(
+        store,
+        similarity_index,
+        usage_meter,
+        enrich=enrichment_tracker is not None,
+        duplicate_top_k=settings.duplicate_top_k,
+        duplicate_min_score=settings.duplicate_min_score,
+        duplicate_reuse_threshold=settings.duplicate_reuse_threshold,
+    )
+    ctx = PipelineContext(
+        request.user_input,
+        log_excerpts,
+        images,
+        context,
+        deadline,
+        client_id,
+        request.reuse_duplicates,
+    )
+    if scheduler is not None:
+        # Enrichers are background work, so they queue in the bulk lane
+        ctx.enrichment_slot = functools.partial(
+            scheduler.thread_slot, asyncio.get_running_loop(), BULK
+        )
+
     try:
-        # Generate the structured bug report
-        bug_report = service.llm_service.generate_bug_report(request.user_input)
+        # Blocking stages run off the event loop; the LLM call waits for a slot
+        await pipeline.run_async(
+            ctx,
+            run_blocking=functools.partial(
+                call_until_disconnected, http_request, deadline
+            ),
+            llm_slot=(lambda: scheduler.slot(lane, deadline)) if scheduler else None,
+        )
+        duplicates = [
+            DuplicateCandidate(id=m.report_id, title=m.title, score=m.score)
+            for m in ctx.duplicates
+        ]
 
-        if bug_report is None:
+        if ctx.reused is not None:
+            assert ctx.formatted_report is not None
+            response = json_response(
+                BugReportResponse.from_bug_report(
+                    ctx.reused.bug_report,
+                    ctx.formatted_report,
+                    ctx.reused.id,
+                    duplicates,
+                    reused=True,
+                )
+            )
+            return add_server_timing(response, ctx.timings)
+
+        if ctx.bug_report is None:
             raise HTTPException(
                 status_code=500,
                 detail="Failed to generate bug report. Please try again.",
             )
 
-        # Generate the formatted report
-        formatted_report = service.formatter.format(bug_report)
+        stored, formatted_report = ctx.stored, ctx.formatted_report
+        assert stored is not None and formatted_report is not None
+        if ctx.enrichment is not None and enrichment_tracker is not None:
+            enrichment_tracker.track(stored.id, ctx.enrichment)
+
+        # Only enqueued here; the outbox delivers to Jira in the background
+        jira_status = None
+        if request.submit_to_jira and jira_outbox is not None:
+            try:
+                await jira_outbox.submit(stored)
+                submission = jira_outbox.status(stored.id)
+                jira_status = submission.status if submission else None
+            except JiraError:
+                jira_status = JIRA_FAILED
 
         # Return the response with both structured and formatted data
-        return BugReportResponse(
-            title=bug_report.title,
-            description=bug_report.description,
-            steps=bug_report.steps,
-            expected_result=bug_report.expected_result,
-            actual_result=bug_report.actual_result,
-            formatted_report=formatted_report,
+        response = json_response(
+            BugReportResponse.from_bug_report(
+                ctx.bug_report,
+                formatted_report,
+                stored.id,
+                duplicates,
+                jira_status=jira_status,
+                enrichments=ctx.enrichment.results() if ctx.enrichment else (),
+            )
         )
+        return add_server_timing(response, ctx.timings)
 
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except RequestCancelledError:
+        # Nobody is listening; skip storing and submitting the report
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except DeadlineExceededError as e:
+        raise HTTPException(
+            status_code=504, detail=f"Bug report generation timed out: {e}"
+        )
     except BugReporterError as e:
         raise HTTPException(
-            status_code=500, detail=f"Bug report generation failed: {str(e)}"
+            status_code=500, detail=f"Bug report generation failed: {e}"
         )
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"An unexpected error occurred: {str(e)}"
+            status_code=500, detail=f"An unexpected error occurred: {e}"
+        )
+
+
+@router.post("/bug-reports/regenerate-field", response_model=BugReportResponse)
+async def regenerate_bug_report_field(
+    request: FieldRegenerationRequest,
+    http_request: Request,
+    service: BugReportService = Depends(get_bug_report_service),
+    deadline: Deadline = Depends(get_deadline),
+    usage_meter: UsageMeter = Depends(get_usage_meter),
+    client_id: str = Depends(get_client_id),
+    scheduler: PriorityScheduler = Depends(get_scheduler),
+    priority: str = Depends(get_priority(INTERACTIVE)),
+) -> Response:
+    """
+    Regenerate one field of a report, keeping the others as they are.
+
+    Only the report and the field's rules are sent to the model, and it
+    answers with the new field alone, so refining a title or the steps costs a
+    fraction of a full generation. The new value is validated against the
+    report schema before it is merged. The result is not stored.
+
+    Args:
+        request: The report, the field to regenerate and an optional instruction
+        http_request: The HTTP request, watched for client disconnects
+        service: The bug report service dependency
+        deadline: Deadline from X-Request-Timeout or REQUEST_TIMEOUT
+        usage_meter: Meter the LLM's token usage is billed to
+        client_id: Client from the X-Client-ID header
+        scheduler: Scheduler admitting LLM calls by priority
+        priority: Priority lane from X-Priority, interactive by default
+
+    Returns:
+        The report with the regenerated field, formatted
+
+    Raises:
+        HTTPException: 429 if the client's token quota is used up, 504 if the
+            deadline passes, 500 if the field cannot be regenerated
+    """
+    bug_report = request.report.to_bug_report()
+    ctx = PipelineContext(
+        " ".join(value for _, value in bug_report.labeled_fields()),
+        deadline=deadline,
+        client_id=client_id,
+        bug_report=bug_report,
+        field_name=request.field,
+        instruction=request.instruction,
+    )
+    try:
+        await service.build_field_pipeline(usage_meter).run_async(
+            ctx,
+            run_blocking=functools.partial(
+                call_until_disconnected, http_request, deadline
+            ),
+            llm_slot=lambda: scheduler.slot(priority, deadline),
+        )
+    except RequestCancelledError:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except DeadlineExceededError as e:
+        raise HTTPException(
+            status_code=504, detail=f"Field regeneration timed out: {e}"
+        )
+    except BugReporterError as e:
+        raise HTTPException(status_code=500, detail=f"Field regeneration failed: {e}")
+
+    if ctx.bug_report is None or ctx.formatted_report is None:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to regenerate {request.field}. Please try again.",
         )
+    response = json_response(
+        BugReportResponse.from_bug_report(ctx.bug_report, ctx.formatted_report)
+    )
+    return add_server_timing(response, ctx.timings)
+
+
+@router.get("/bug-reports/{report_id}", response_model=RenderedReportResponse)
+async def get_bug_report(
+    report_id: str,
+    format: str = Query("jira", description="Output format, e.g. jira or markdown"),
+    rendering_service: ReportRenderingService = Depends(get_rendering_service),
+) -> Response:
+    """
+    Render a stored bug report in the requested format without calling the LLM.
+
+    Args:
+        report_id: ID returned when the report was generated
+        format: Output format name (jira, markdown, github, html or text)
+        rendering_service: The report rendering service dependency
+
+    Returns:
+        The report rendered in the requested format
+
+    Raises:
+        HTTPException: If the format is unknown or the report does not exist
+    """
+    try:
+        content = rendering_service.render(report_id, format)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if content is None:
+        raise HTTPException(status_code=404, detail="Bug report not found")
+
+    return json_response(
+        RenderedReportResponse.model_construct(
+            id=report_id, format=format.lower(), content=content
+        )
+    )
+
+
+@router.get("/bug-reports/{report_id}/jira", response_model=JiraSubmissionResponse)
+async def get_jira_submission(
+    report_id: str,
+    jira_outbox: Optional[JiraOutbox] = Depends(get_jira_outbox),
+) -> Response:
+    """
+    Report the Jira submission status of a stored bug report.
+
+    Args:
+        report_id: ID returned when the report was generated
+        jira_outbox: The Jira outbox dependency
+
+    Returns:
+        Submission status and, once created, the Jira issue key
+
+    Raises:
+        HTTPException: If the report was never submitted to Jira
+    """
+    status = jira_outbox.status(report_id) if jira_outbox is not None else None
+    if status is None:
+        raise HTTPException(status_code=404, detail="No Jira submission for report")
+    return json_response(
+        JiraSubmissionResponse.model_construct(
+            id=report_id,
+            status=status.status,
+            issue_key=status.issue_key,
+            error=status.error,
+        )
+    )
+
+
+@router.get(
+    "/bug-reports/{report_id}/enrichments", response_model=EnrichmentListResponse
+)
+async def get_enrichments(
+    report_id: str,
+    wait: float = Query(
+        0, ge=0, le=30, description="Seconds to wait for pending enrichers"
+    ),
+    enrichment_tracker: EnrichmentTracker = Depends(get_enrichment_tracker),
+) -> Response:
+    """
+    Report the enrichments of a recently generated bug report.
+
+    Enrichers still running when the report was returned finish in the
+    background; poll this endpoint, or pass wait to hold the request until
+    they finish or time out.
+
+    Args:
+        report_id: ID returned when the report was generated
+        wait: Seconds to wait for pending enrichers
+        enrichment_tracker: The enrichment tracker dependency
+
+    Returns:
+        The state and content of each enricher
+
+    Raises:
+        HTTPException: 404 if the report has no tracked enrichments
+    """
+    run = enrichment_tracker.get(report_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="No enrichments for report")
+    results = await run_in_threadpool(run.wait, wait) if wait else run.results()
+    return json_response(
+        EnrichmentListResponse.model_construct(
+            id=report_id,
+            enrichments=[EnrichmentInfo.from_result(r) for r in results],
+        )
+    )
+
+
+@router.get("/contexts", response_model=ApplicationContextListResponse)
+async def list_contexts(
+    context_registry: Optional[ContextRegistry] = Depends(get_context_registry),
+) -> Response:
+    """
+    List application contexts with their size against the token budget.
+
+    Args:
+        context_registry: The context registry dependency
+
+    Returns:
+        Every context file, with the reason it is unusable if it is
+    """
+    sizes = context_registry.sizes() if context_registry is not None else []
+    return json_response(
+        ApplicationContextListResponse.model_construct(
+            contexts=[
+                ApplicationContextInfo.model_construct(
+                    name=size.name,
+                    bytes=size.bytes,
+                    tokens=size.tokens,
+                    max_tokens=size.max_tokens,
+                    error=size.error,
+                )
+                for size in sizes
+            ]
+        )
+    )
+
+
+@router.get("/usage", response_model=UsageResponse)
+async def get_usage(
+    client: Optional[str] = Query(None, description="Only report this client"),
+    usage_meter: UsageMeter = Depends(get_usage_meter),
+) -> Response:
+    """
+    Report LLM token usage per client, model and prompt version.
+
+    Args:
+        client: Only report this client
+        usage_meter: The usage meter dependency
+
+    Returns:
+        Usage totals since startup and each client's use of its quota in the
+        current window
+    """
+    totals = usage_meter.snapshot(client)
+    clients = {entry.client for entry in totals}
+    if client is not None:
+        clients.add(client)
+    return json_response(
+        UsageResponse.model_construct(
+            window_seconds=usage_meter.window,
+            usage=[
+                UsageEntry.model_construct(
+                    client=entry.client,
+                    model=entry.model,
+                    prompt_version=entry.prompt_version,
+                    attempts=entry.attempts,
+                    failed_attempts=entry.failed_attempts,
+                    prompt_tokens=entry.prompt_tokens,
+                    output_tokens=entry.output_tokens,
+                    total_tokens=entry.total_tokens,
+                    mean_latency_seconds=entry.latency / entry.attempts,
+                )
+                for entry in totals
+            ],
+            clients=[
+                ClientQuota.model_construct(
+                    client=status.client,
+                    used=status.used,
+                    quota=status.quota,
+                    resets_at=datetime.fromtimestamp(status.resets_at, timezone.utc),
+                )
+                for status in usage_meter.quota_statuses(sorted(clients))
+            ],
+        )
+    )
+
+
+@router.get("/exports/bug-reports")
+async def export_bug_reports(
+    format: str = Query("ndjson", description="ndjson, csv or jira-csv"),
+    since: Optional[datetime] = Query(None, description="Created at or after"),
+    until: Optional[datetime] = Query(None, description="Created before"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the last page"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum reports per page"),
+    export_service: ExportService = Depends(get_export_service),
+) -> StreamingResponse:
+    """
+    Stream stored bug reports in bulk, oldest first, in constant memory.
+
+    Args:
+        format: Export format name
+        since: Only reports created at or after this time
+        until: Only reports created before this time
+        cursor: Resume after the page that returned this cursor
+        limit: Page size; without it every matching report is exported
+        export_service: The export service dependency
+
+    Returns:
+        A chunked streaming response; X-Next-Cursor is set when more reports
+        follow the page
+
+    Raises:
+        HTTPException: If the format, date range or cursor is invalid
+    """
+    try:
+        stream = export_service.export(
+            format, since=since, until=until, after=cursor, limit=limit
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {"Content-Disposition": f'attachment; filename="{stream.filename}"'}
+    if stream.next_cursor is not None:
+        headers["X-Next-Cursor"] = stream.next_cursor
+    return StreamingResponse(
+        stream.chunks, media_type=stream.media_type, headers=headers
+    )
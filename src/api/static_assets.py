@@ -0,0 +1,231 @@
+"""In-memory, pre-compressed static asset serving with cache validation."""
+
+import gzip
+import hashlib
+import mimetypes
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - brotli is optional at runtime
+    brotli = None
+
+IDENTITY = "identity"
+GZIP = "gzip"
+BROTLI = "br"
+
+# Preferred encodings, best first, when the client accepts several equally
+ENCODING_PREFERENCE = (BROTLI, GZIP, IDENTITY)
+
+# Files smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 256
+
+
+@dataclass
+class StaticAsset:
+    """A static file loaded into memory together with its encoded variants."""
+
+    media_type: str
+    digest: str
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+    def etag(self, encoding: str) -> str:
+        """Return the strong ETag of one encoded representation."""
+        if encoding == IDENTITY:
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+
+class StaticAssetCache:
+    """Load, compress and serve the files of a static directory from memory."""
+
+    def __init__(self, directory: Path):
+        """
+        Initialize the asset cache.
+
+        Args:
+            directory: Directory whose files are served
+        """
+        self.directory = Path(directory)
+        self._assets: Dict[str, StaticAsset] = {}
+
+    def load(self) -> None:
+        """Read every file in the directory and pre-compress it once."""
+        assets: Dict[str, StaticAsset] = {}
+        for file_path in sorted(self.directory.rglob("*")):
+            if file_path.is_file():
+                relative_path = file_path.relative_to(self.directory).as_posix()
+                assets[relative_path] = self._build_asset(file_path)
+        self._assets = assets
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        """
+        Look up a loaded asset.
+
+        Args:
+            path: Path relative to the static directory
+
+        Returns:
+            The asset or None if it does not exist
+        """
+        return self._assets.get(path)
+
+    def url(self, path: str) -> str:
+        """
+        Build the versioned URL of an asset, which may be cached for good.
+
+        Args:
+            path: Path relative to the static directory
+
+        Returns:
+            /static/<path>?v=<content digest>
+
+        Raises:
+            KeyError: If the asset does not exist
+        """
+        return f"/static/{path}?v={self._assets[path].digest}"
+
+    def is_current_version(self, path: str, version: Optional[str]) -> bool:
+        """
+        Check whether a URL's version names the asset's current content.
+
+        Args:
+            path: Path relative to the static directory
+            version: The URL's v query parameter
+
+        Returns:
+            True if the asset exists and version is its digest
+        """
+        asset = self._assets.get(path)
+        return asset is not None and version == asset.digest
+
+    def response(self, request: Request, path: str, cache_control: str) -> Response:
+        """
+        Build the response for an asset, honouring Accept-Encoding and If-None-Match.
+
+        Args:
+            request: Incoming request
+            path: Path relative to the static directory
+            cache_control: Cache-Control header value
+
+        Returns:
+            200 with the best encoded variant, 304 if the client copy is current,
+            or 404 if the asset does not exist
+        """
+        asset = self.get(path)
+        if asset is None:
+            return Response(status_code=404, content="Not Found")
+
+        encoding = negotiate_encoding(
+            request.headers.get("accept-encoding", ""), list(asset.variants)
+        )
+        etag = asset.etag(encoding)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != IDENTITY:
+            headers["Content-Encoding"] = encoding
+        return Response(
+            content=asset.variants[encoding],
+            media_type=asset.media_type,
+            headers=headers,
+        )
+
+    @staticmethod
+    def _build_asset(file_path: Path) -> StaticAsset:
+        """Read a file and produce its compressed variants."""
+        content = file_path.read_bytes()
+        media_type = (
+            mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+        )
+        if media_type.startswith("text/"):
+            media_type += "; charset=utf-8"
+
+        asset = StaticAsset(
+            media_type=media_type,
+            digest=hashlib.sha256(content).hexdigest()[:32],
+            variants={IDENTITY: content},
+        )
+        if len(content) < MIN_COMPRESS_SIZE:
+            return asset
+
+        compressed = {GZIP: gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed[BROTLI] = brotli.compress(content, quality=11)
+
+        for encoding, body in compressed.items():
+            if len(body) < len(content):
+                asset.variants[encoding] = body
+        return asset
+
+
+def negotiate_encoding(accept_encoding: str, available: List[str]) -> str:
+    """
+    Pick the best available content encoding for an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+        available: Encodings the asset is available in
+
+    Returns:
+        The chosen encoding, falling back to identity
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name] = quality
+
+    wildcard = weights.get("*")
+    best_encoding = IDENTITY
+    best_quality = 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in available or encoding == IDENTITY:
+            continue
+        quality = weights.get(encoding, wildcard if wildcard is not None else 0.0)
+        if quality > best_quality:
+            best_encoding, best_quality = encoding, quality
+    return best_encoding
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag using weak comparison.
+
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: Current ETag of the representation
+
+    Returns:
+        True if the client's cached copy is still current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,101 @@
+"""Startup warm-up and readiness tracking for the API."""
+
+import asyncio
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+if TYPE_CHECKING:
+    from ..services.bug_report_service import BugReportService
+
+logger = logging.getLogger(__name__)
+
+NOT_STARTED = "not_started"
+WARMING_UP = "warming_up"
+READY = "ready"
+FAILED = "failed"
+DEGRADED = "degraded"
+
+
+class ReadinessState:
+    """Track whether the shared bug report service is ready for traffic."""
+
+    def __init__(self) -> None:
+        """Initialize the readiness state."""
+        self._lock = threading.Lock()
+        self._status = NOT_STARTED
+        self._error: Optional[str] = None
+        self.bug_report_service: Optional[BugReportService] = None
+
+    def set_status(self, status: str, error: Optional[str] = None) -> None:
+        """
+        Update the warm-up status.
+
+        Args:
+            status: New warm-up status
+            error: Error message when warm-up failed
+        """
+        with self._lock:
+            self._status = status
+            self._error = error
+
+    def report(self) -> Tuple[int, Dict[str, Any]]:
+        """
+        Build the readiness response.
+
+        Returns:
+            HTTP status code and response body
+        """
+        with self._lock:
+            status, error = self._status, self._error
+
+        if status == READY:
+            service = self.bug_report_service
+            if service is not None and not service.llm_service.is_available():
+                return 503, {
+                    "status": DEGRADED,
+                    "detail": "Circuit to the LLM provider is open",
+                }
+            return 200, {"status": READY}
+
+        body: Dict[str, Any] = {"status": status}
+        if error:
+            body["detail"] = error
+        return 503, body
+
+
+async def warm_up(
+    state: ReadinessState,
+    service: Any,
+    probe: bool = False,
+    retry_delay: float = 1.0,
+    max_retry_delay: float = 30.0,
+) -> None:
+    """
+    Warm up the LLM service off the event loop, retrying until it succeeds.
+
+    A failed attempt reports the service as degraded rather than failed for
+    good, so a transient upstream error at startup only keeps the worker out
+    of rotation until a retry gets through. Cancel the task to stop retrying.
+
+    Args:
+        state: Readiness state to update
+        service: Bug report service whose LLM service is warmed up
+        probe: Also run a tiny probe generation
+        retry_delay: Seconds before the first retry, doubled after each failure
+        max_retry_delay: Longest wait between retries
+    """
+    state.set_status(WARMING_UP)
+    while True:
+        try:
+            await run_in_threadpool(service.llm_service.warm_up, probe)
+        except Exception as e:
+            logger.exception("Warm-up failed, retrying in %.1fs", retry_delay)
+            state.set_status(DEGRADED, f"Warm-up failed: {e}")
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, max_retry_delay)
+            continue
+        state.set_status(READY)
+        return
@@ -0,0 +1,14 @@
+"""Attachment processing for the Bug Reporter application."""
+
+from .images import ImageProcessor, image_digest, process_image
+from .logs import LogExcerpt, LogExcerptExtractor, append_log_excerpts, excerpt_budget
+
+__all__ = [
+    "ImageProcessor",
+    "LogExcerpt",
+    "LogExcerptExtractor",
+    "append_log_excerpts",
+    "excerpt_budget",
+    "image_digest",
+    "process_image",
+]
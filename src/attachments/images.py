@@ -0,0 +1,208 @@
+"""Screenshot downscaling and re-encoding for multimodal generation."""
+
+import asyncio
+import hashlib
+import io
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Dict, Optional, Set
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from ..core.exceptions import ValidationError
+from ..core.models import ImageAttachment
+
+# Formats the model accepts as-is when the original is already small enough
+_PASSTHROUGH_MIME_TYPES = {
+    "PNG": "image/png",
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp",
+}
+
+
+def image_digest(data: bytes) -> str:
+    """Return the content hash identifying an uploaded image."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def process_image(
+    data: bytes,
+    max_dimension: int = 1536,
+    quality: int = 80,
+    max_pixels: int = 50_000_000,
+    digest: Optional[str] = None,
+) -> ImageAttachment:
+    """
+    Decode an image, downscale it to fit max_dimension and re-encode it as JPEG.
+
+    Runs in a worker process, so it only takes and returns picklable values.
+    The original bytes are kept when they are already a supported format
+    within max_dimension and smaller than the re-encoded image.
+
+    Args:
+        data: Uploaded image bytes
+        max_dimension: Maximum width and height of the result in pixels
+        quality: JPEG quality of the re-encoded image
+        max_pixels: Largest image, in pixels, that is decoded at all
+        digest: Content hash of data, computed here if not given
+
+    Returns:
+        The image prepared for the model
+
+    Raises:
+        ValidationError: If data is not a decodable image or is too large
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as opened:
+            # Only the header has been read so far; refuse before decoding
+            if opened.width * opened.height > max_pixels:
+                raise ValidationError(
+                    f"Image is too large ({opened.width}x{opened.height} pixels)"
+                )
+            source_format = opened.format
+            fits = max(opened.width, opened.height) <= max_dimension
+
+            # thumbnail() lets the JPEG decoder scale down while decoding
+            opened.thumbnail((max_dimension, max_dimension))
+            image = _flatten(ImageOps.exif_transpose(opened))
+
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=quality)
+            width, height = image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise ValidationError(f"Not a supported image: {e}")
+
+    encoded = buffer.getvalue()
+    mime_type = "image/jpeg"
+    if fits and source_format in _PASSTHROUGH_MIME_TYPES and len(data) <= len(encoded):
+        encoded = data
+        mime_type = _PASSTHROUGH_MIME_TYPES[source_format]
+
+    return ImageAttachment(
+        mime_type=mime_type,
+        data=encoded,
+        width=width,
+        height=height,
+        digest=digest or image_digest(data),
+        original_size=len(data),
+    )
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """Convert an image to RGB, compositing any transparency onto white."""
+    if image.mode == "RGB":
+        return image
+    if image.mode == "P" and "transparency" in image.info:
+        image = image.convert("RGBA")
+    if image.mode in ("RGBA", "LA"):
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+class ImageProcessor:
+    """Prepare uploaded screenshots in a process pool, once per distinct image."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = 2,
+        max_dimension: int = 1536,
+        quality: int = 80,
+        max_bytes: int = 10 * 1024 * 1024,
+        max_pixels: int = 50_000_000,
+        cache_size: int = 128,
+    ):
+        """
+        Initialize the processor.
+
+        Args:
+            max_workers: Worker processes; 0 processes images in threads instead
+            max_dimension: Maximum width and height of processed images
+            quality: JPEG quality of re-encoded images
+            max_bytes: Largest accepted upload in bytes
+            max_pixels: Largest image, in pixels, that is decoded at all
+            cache_size: Number of processed images kept by content hash
+        """
+        self.max_workers = max_workers
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.cache_size = cache_size
+        self._executor: Optional[Executor] = None
+        self._cache: OrderedDict[str, ImageAttachment] = OrderedDict()
+        self._pending: Dict[str, asyncio.Future[ImageAttachment]] = {}
+        self._submitted: Set[Future[ImageAttachment]] = set()
+
+    async def process(self, data: bytes) -> ImageAttachment:
+        """
+        Return the processed image, reusing earlier or in-flight work.
+
+        Args:
+            data: Uploaded image bytes
+
+        Returns:
+            The image prepared for the model
+
+        Raises:
+            ValidationError: If the upload is too large or not an image
+        """
+        if len(data) > self.max_bytes:
+            raise ValidationError(
+                f"Image is larger than {self.max_bytes // (1024 * 1024)} MB"
+            )
+
+        digest = image_digest(data)
+        cached = self._cache.get(digest)
+        if cached is not None:
+            self._cache.move_to_end(digest)
+            return cached
+
+        pending = self._pending.get(digest)
+        if pending is None:
+            pending = self._submit(data, digest)
+            self._pending[digest] = pending
+            pending.add_done_callback(lambda _: self._finish(digest, pending))
+
+        # Shielded so one cancelled request does not cancel the shared work
+        return await asyncio.shield(pending)
+
+    def close(self) -> None:
+        """Cancel images not yet started and shut down the worker processes."""
+        if self._executor is not None:
+            # Executor.shutdown only takes cancel_futures from Python 3.9 on
+            for submitted in list(self._submitted):
+                submitted.cancel()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _submit(self, data: bytes, digest: str) -> "asyncio.Future[ImageAttachment]":
+        """Start processing an image on the worker processes, or a thread."""
+        args = (data, self.max_dimension, self.quality, self.max_pixels, digest)
+        executor = self._get_executor()
+        if executor is None:
+            return asyncio.get_running_loop().run_in_executor(
+                None, process_image, *args
+            )
+        submitted = executor.submit(process_image, *args)
+        self._submitted.add(submitted)
+        submitted.add_done_callback(self._submitted.discard)
+        return asyncio.wrap_future(submitted)
+
+    def _get_executor(self) -> Optional[Executor]:
+        """Return the process pool, starting it on first use."""
+        if self.max_workers == 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _finish(self, digest: str, future: "asyncio.Future[ImageAttachment]") -> None:
+        """Move a finished image from the in-flight table into the cache."""
+        self._pending.pop(digest, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._cache[digest] = future.result()
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
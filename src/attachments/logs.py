@@ -0,0 +1,295 @@
+"""Bounded-memory extraction of error excerpts from log attachments."""
+
+import re
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, List, Optional, Sequence
+
+# Rough size of a prompt token, used to turn token budgets into characters
+CHARS_PER_TOKEN = 4
+
+# Cheap byte-level hints; only lines containing one are decoded and matched
+_KEYWORD_HINT = re.compile(
+    rb"error|exception|fatal|crit|severe|panic|emerg|alert|traceback"
+    rb"|caused by|net::err_"
+)
+_STATUS_HINT = re.compile(rb"[ \"=:(][45]\d\d\b")
+
+# Lines that carry a signal worth showing to the model
+_SIGNAL = re.compile(
+    # Stack traces and exceptions
+    r"Traceback \(most recent call last\)"
+    r"|^\s*(?:Uncaught\s+)?(?:\(in promise\)\s+)?[\w.$]*(?:Error|Exception)\b(?::|$)"
+    r"|^Caused by:"
+    # HTTP 4xx/5xx responses
+    r"|\bHTTP/\d(?:\.\d)?\"?\s+[45]\d\d\b"
+    r"|\"\s[45]\d\d\s"
+    r"|\b[Ss]tatus(?:[ _]?[Cc]ode)?[\"']?\s*[=:]\s*[45]\d\d\b"
+    r"|\bstatus of [45]\d\d\b"
+    r"|\bnet::ERR_\w+"
+    r"|\b[45]\d\d \(?(?:Bad Request|Unauthorized|Forbidden|Not Found|Method Not Allowed"
+    r"|Conflict|Too Many Requests|Internal Server Error|Bad Gateway"
+    r"|Service Unavailable|Gateway Timeout)\b"
+    # Error-level log lines
+    r"|\b(?:ERROR|FATAL|CRITICAL|SEVERE|PANIC|EMERG|ALERT)\b"
+    r"|\[(?:error|fatal|crit|critical|emerg|alert)\]"
+    r"|\blevel[\"']?\s*[=:]\s*[\"']?(?:error|fatal|critical|ERROR|FATAL|CRITICAL)\b"
+)
+
+# Stack frames and other lines that continue the previous signal line
+_CONTINUATION = re.compile(
+    r"^(?:\s+at\s|\s+File \"|\s*\.\.\. \d+ more|\s{4,}\S|\t|Caused by:|During handling)"
+)
+
+# Final line of a Python traceback
+_EXCEPTION_LINE = re.compile(r"^[\w.$]+(?:Error|Exception|Exit|Interrupt)\b")
+
+# Parts of a line that vary between otherwise identical messages
+_VOLATILE = re.compile(
+    r"\d{4}-\d\d-\d\d[T ][\d:.,]+(?:Z|[+-]\d\d:?\d\d)?"
+    r"|0x[0-9a-f]+"
+    r"|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+    r"|\d+",
+    re.IGNORECASE,
+)
+
+_REPEAT_NOTE_CHARS = len("\n[repeated 1000000 times]")
+
+
+@dataclass
+class LogExcerpt:
+    """The relevant, deduplicated lines of one log file."""
+
+    name: str
+    text: str
+    matched_blocks: int = 0
+    unique_blocks: int = 0
+    omitted_blocks: int = 0
+    bytes_scanned: int = 0
+    truncated: bool = False
+
+
+class LogExcerptExtractor:
+    """
+    Scan logs line by line and keep only error signals, within a size budget.
+
+    Memory stays flat regardless of log size: lines are read one at a time
+    with a length limit, the excerpt is capped at max_chars, and at most
+    max_signatures distinct messages are remembered for deduplication.
+    """
+
+    def __init__(
+        self,
+        max_chars: int = 6000,
+        max_line_chars: int = 400,
+        max_block_lines: int = 12,
+        max_scan_bytes: Optional[int] = None,
+        max_signatures: int = 50000,
+    ):
+        """
+        Initialize the extractor.
+
+        Args:
+            max_chars: Maximum excerpt size in characters
+            max_line_chars: Lines are cut to this many characters
+            max_block_lines: Maximum stack frames kept after a signal line
+            max_scan_bytes: Stop scanning after this many bytes (None scans all)
+            max_signatures: Distinct messages remembered for deduplication
+        """
+        self.max_chars = max_chars
+        self.max_line_chars = max_line_chars
+        self.max_block_lines = max_block_lines
+        self.max_scan_bytes = max_scan_bytes
+        self.max_signatures = max_signatures
+
+    def extract(
+        self, stream: BinaryIO, name: str, max_chars: Optional[int] = None
+    ) -> LogExcerpt:
+        """
+        Extract an excerpt from a binary log stream.
+
+        Args:
+            stream: Readable binary stream, e.g. a spooled upload
+            name: File name shown in the prompt
+            max_chars: Excerpt size override, e.g. a share of a shared budget
+
+        Returns:
+            The excerpt and scan statistics
+        """
+        budget = self.max_chars if max_chars is None else max_chars
+        scan = _Scan(budget, self.max_signatures)
+        # Longer lines are cut; ~4 bytes per character covers any UTF-8 text
+        line_limit = self.max_line_chars * 4
+        block: Optional[List[str]] = None
+        bytes_scanned = 0
+        truncated = False
+
+        while True:
+            if self.max_scan_bytes is not None and bytes_scanned >= self.max_scan_bytes:
+                truncated = bool(stream.read(1))
+                break
+            raw = stream.readline(line_limit)
+            if not raw:
+                break
+            bytes_scanned += len(raw)
+            if not raw.endswith(b"\n") and len(raw) == line_limit:
+                bytes_scanned += _skip_rest_of_line(stream, line_limit)
+
+            if block is not None:
+                line = self._decode(raw)
+                if _CONTINUATION.match(line) and len(block) <= self.max_block_lines:
+                    block.append(line)
+                    continue
+                if block[0].lstrip().startswith("Traceback") and _EXCEPTION_LINE.match(
+                    line
+                ):
+                    block.append(line)
+                    scan.add(block)
+                    block = None
+                    continue
+                scan.add(block)
+                block = None
+
+            # Most lines carry no signal; reject them before decoding
+            if not (_KEYWORD_HINT.search(raw.lower()) or _STATUS_HINT.search(raw)):
+                continue
+            line = self._decode(raw)
+            if _SIGNAL.search(line):
+                block = [line]
+
+        if block is not None:
+            scan.add(block)
+
+        return LogExcerpt(
+            name=name,
+            text=scan.render(),
+            matched_blocks=scan.matched,
+            unique_blocks=len(scan.entries),
+            omitted_blocks=scan.omitted,
+            bytes_scanned=bytes_scanned,
+            truncated=truncated,
+        )
+
+    def _decode(self, raw: bytes) -> str:
+        """Decode a raw line and cut it to max_line_chars."""
+        line = raw.decode("utf-8", errors="replace").rstrip()
+        if len(line) > self.max_line_chars:
+            line = line[: self.max_line_chars] + "..."
+        return line
+
+    def extract_path(self, path: str, max_chars: Optional[int] = None) -> LogExcerpt:
+        """
+        Extract an excerpt from a log file on disk.
+
+        Args:
+            path: Log file path
+            max_chars: Excerpt size override
+
+        Returns:
+            The excerpt and scan statistics
+        """
+        with open(path, "rb") as stream:
+            return self.extract(stream, _basename(path), max_chars)
+
+
+class _Scan:
+    """Deduplicated, size-capped excerpt being assembled during one scan."""
+
+    def __init__(self, budget: int, max_signatures: int):
+        """
+        Initialize an empty excerpt.
+
+        Args:
+            budget: Maximum excerpt size in characters
+            max_signatures: Distinct messages remembered for deduplication
+        """
+        self.budget = budget
+        self.max_signatures = max_signatures
+        self.entries: List[str] = []
+        self.counts: List[int] = []
+        self.used = 0
+        self.matched = 0
+        self.omitted = 0
+        # signature -> index into entries, or -1 if the block did not fit
+        self._seen: Dict[str, int] = {}
+
+    def add(self, block: List[str]) -> None:
+        """Add a signal block unless it repeats an earlier one or does not fit."""
+        text = "\n".join(block)
+        signature = _VOLATILE.sub("#", text)
+        self.matched += 1
+
+        index = self._seen.get(signature)
+        if index is not None:
+            if index >= 0:
+                self.counts[index] += 1
+            return
+
+        # Reserve room for a "[repeated N times]" note on every kept block
+        cost = len(text) + 1 + _REPEAT_NOTE_CHARS
+        fits = self.used + cost <= self.budget
+        if len(self._seen) < self.max_signatures:
+            self._seen[signature] = len(self.entries) if fits else -1
+        if not fits:
+            self.omitted += 1
+            return
+        self.entries.append(text)
+        self.counts.append(1)
+        self.used += cost
+
+    def render(self) -> str:
+        """Render the kept blocks, noting how often each one was seen."""
+        lines = []
+        for text, count in zip(self.entries, self.counts):
+            lines.append(text if count == 1 else f"{text}\n[repeated {count} times]")
+        return "\n".join(lines)
+
+
+def _skip_rest_of_line(stream: BinaryIO, chunk_size: int) -> int:
+    """Discard the remainder of an over-long line; return the bytes skipped."""
+    skipped = 0
+    while True:
+        chunk = stream.readline(chunk_size)
+        skipped += len(chunk)
+        if not chunk or chunk.endswith(b"\n"):
+            return skipped
+
+
+def _basename(path: str) -> str:
+    """Return the file name of a path."""
+    return path.replace("\\", "/").rsplit("/", 1)[-1]
+
+
+def excerpt_budget(max_tokens: int, file_count: int) -> int:
+    """
+    Split a prompt token budget into a per-file character budget.
+
+    Args:
+        max_tokens: Tokens available for all log excerpts together
+        file_count: Number of attached logs
+
+    Returns:
+        Characters available to each file's excerpt
+    """
+    return max_tokens * CHARS_PER_TOKEN // max(file_count, 1)
+
+
+def append_log_excerpts(user_input: str, excerpts: Sequence[LogExcerpt]) -> str:
+    """
+    Append log excerpts to a bug description for the prompt.
+
+    Args:
+        user_input: The user's description of the bug
+        excerpts: Excerpts of the attached logs
+
+    Returns:
+        The description followed by one section per non-empty excerpt
+    """
+    sections = [user_input]
+    for excerpt in excerpts:
+        if not excerpt.text:
+            continue
+        notes = f"{excerpt.unique_blocks} distinct errors"
+        if excerpt.omitted_blocks:
+            notes += f", {excerpt.omitted_blocks} more omitted"
+        sections.append(f"Log excerpt from {excerpt.name} ({notes}):\n{excerpt.text}")
+    return "\n\n".join(sections)
@@ -2,11 +2,27 @@
 
 import sys
 import argparse
-from typing import Optional
+from contextlib import ExitStack
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
 
-from ..services import GeminiService, BugReportService
+from ..attachments import LogExcerpt, LogExcerptExtractor, excerpt_budget
+from ..config import settings
+from ..services import GeminiService, BugReportService, ExportService
+from ..services.enrichment import create_enrichers
+from ..services.prompt_evaluation import (
+    PromptEvaluator,
+    format_report,
+    load_corpus,
+    resolve_version,
+)
 from ..formatters import JiraFormatter
-from ..core.exceptions import BugReporterError
+from ..core.exceptions import BugReporterError, ValidationError
+from ..storage import SQLiteReportStore
+from ..daemon import DaemonClient, DaemonServer
+from ..profiling import ProfileSession, Profiler, ProfileStore, maybe_profile
+from ..prompts import ApplicationContext, ContextRegistry
+from ..replay import record_from_settings, replay_model_from_settings
 
 
 class CLI:
@@ -14,9 +30,16 @@ class CLI:
 
     def __init__(self):
         """Initialize the CLI with default services."""
-        self.llm_service = GeminiService()
+        self.llm_service = record_from_settings(
+            GeminiService(model=replay_model_from_settings())
+        )
         self.formatter = JiraFormatter()
-        self.bug_report_service = BugReportService(self.llm_service, self.formatter)
+        self.bug_report_service = BugReportService(
+            self.llm_service,
+            self.formatter,
+            enrichers=create_enrichers(self.llm_service, settings.enrichers),
+            enrichment_workers=settings.enrichment_workers,
+        )
 
     def create_parser(self) -> argparse.ArgumentParser:
         """Create and configure the argument parser."""
@@ -27,11 +50,170 @@ class CLI:
             Examples:
               python -m src.cli.main "App closes after clicking save button"
               python -m src.cli.main "Login form doesn't validate email addresses properly"
+              python -m src.cli.main "Checkout fails" --log server.log --log console.log
+              python -m src.cli.main "Invoice totals are wrong" --context billing
+              python -m src.cli.main "Export hangs on large projects" --profile
+              python -m src.cli.main --list-contexts
+              python -m src.cli.main --daemon
+              python -m src.cli.main --repl
+              python -m src.cli.main --export jira-csv --output bugs.csv
+              python -m src.cli.main --export csv --since 2024-01-01 --limit 100
+              python -m src.cli.main --export ndjson --input-file descriptions.txt
+              python -m src.cli.main --evaluate corpus.jsonl
                         """,
         )
 
         parser.add_argument(
-            "input_text", help="Description of the bug or issue to be formatted"
+            "input_text",
+            nargs="?",
+            help="Description of the bug or issue to be formatted",
+        )
+
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument(
+            "--daemon",
+            action="store_true",
+            help=(
+                "Run a background daemon that serves later CLI calls "
+                "from a warm service"
+            ),
+        )
+        mode.add_argument(
+            "--stop-daemon",
+            action="store_true",
+            help="Stop the running daemon",
+        )
+        mode.add_argument(
+            "--repl",
+            action="store_true",
+            help="Start an interactive session that reuses one warm service",
+        )
+        mode.add_argument(
+            "--no-daemon",
+            action="store_true",
+            help="Always process the input in this process",
+        )
+        mode.add_argument(
+            "--list-contexts",
+            action="store_true",
+            help="List application contexts in CONTEXT_DIR with their token sizes",
+        )
+        mode.add_argument(
+            "--export",
+            metavar="FORMAT",
+            help="Export reports in bulk as ndjson, csv or jira-csv",
+        )
+        mode.add_argument(
+            "--evaluate",
+            metavar="CORPUS",
+            help=(
+                "Compare prompt versions on a corpus of bug descriptions "
+                "('-' for stdin)"
+            ),
+        )
+
+        parser.add_argument(
+            "--socket",
+            default=None,
+            help="Path of the daemon's Unix socket (defaults to BUG_REPORTER_SOCKET)",
+        )
+        parser.add_argument(
+            "--idle-timeout",
+            type=float,
+            default=None,
+            help="Seconds of inactivity before the daemon exits (0 disables)",
+        )
+
+        parser.add_argument(
+            "--log",
+            action="append",
+            default=None,
+            metavar="FILE",
+            help=(
+                "Attach a log file; only its errors are added to the prompt "
+                "(repeatable)"
+            ),
+        )
+
+        parser.add_argument(
+            "--context",
+            default=None,
+            metavar="NAME",
+            help="Add the named application context from CONTEXT_DIR to the prompt",
+        )
+
+        parser.add_argument(
+            "--timings",
+            action="store_true",
+            help="Print the time spent in each pipeline stage to stderr",
+        )
+
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help=(
+                "Sample this run and write a flamegraph-compatible profile "
+                "to PROFILE_DIR"
+            ),
+        )
+
+        export = parser.add_argument_group("export options")
+        export.add_argument(
+            "--store",
+            default=None,
+            help="Report database to export from (defaults to REPORT_STORE_PATH)",
+        )
+        export.add_argument(
+            "--input-file",
+            default=None,
+            help=(
+                "Generate and export a report for each line of this file "
+                "('-' for stdin)"
+            ),
+        )
+        export.add_argument(
+            "--output",
+            default=None,
+            help="Write the export to this file instead of stdout",
+        )
+        export.add_argument(
+            "--since",
+            type=datetime.fromisoformat,
+            default=None,
+            help="Only reports created at or after this ISO date/time",
+        )
+        export.add_argument(
+            "--until",
+            type=datetime.fromisoformat,
+            default=None,
+            help="Only reports created before this ISO date/time",
+        )
+        export.add_argument(
+            "--limit", type=int, default=None, help="Maximum reports per page"
+        )
+        export.add_argument(
+            "--cursor",
+            default=None,
+            help="Resume after the page that printed this cursor",
+        )
+
+        evaluation = parser.add_argument_group("evaluation options")
+        evaluation.add_argument(
+            "--prompt",
+            action="append",
+            default=None,
+            metavar="VERSION",
+            help=(
+                "Prompt version to evaluate: current, bilingual or a template "
+                "file containing {user_input} (repeatable; defaults to current "
+                "and bilingual)"
+            ),
+        )
+        evaluation.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Corpus cases evaluated at once",
         )
 
         return parser
@@ -62,28 +244,304 @@ class CLI:
 
         try:
             parsed_args = parser.parse_args(args)
+            if parsed_args.input_text is None and not (
+                parsed_args.daemon
+                or parsed_args.stop_daemon
+                or parsed_args.repl
+                or parsed_args.list_contexts
+                or parsed_args.export
+                or parsed_args.evaluate
+            ):
+                parser.error("the following arguments are required: input_text")
         except SystemExit:
             return
 
+        if parsed_args.daemon:
+            try:
+                self.run_daemon(parsed_args.socket, parsed_args.idle_timeout)
+            finally:
+                self.bug_report_service.close()
+            return
+        if parsed_args.stop_daemon:
+            self.stop_daemon(parsed_args.socket)
+            return
+        if parsed_args.repl:
+            try:
+                self.run_repl()
+            finally:
+                self.bug_report_service.close()
+            return
+        if parsed_args.export:
+            self.run_export(parsed_args)
+            return
+        if parsed_args.list_contexts:
+            self.list_contexts()
+            return
+        if parsed_args.evaluate:
+            self.run_evaluation(parsed_args)
+            return
+
         # Validate input
         if not self.validate_input(parsed_args.input_text):
             sys.exit(1)
 
         # Process the bug report
         try:
-            self.bug_report_service.process_bug_report(parsed_args.input_text)
+            # Options are only passed when given, keeping the plain call unchanged
+            options: Dict[str, Any] = {}
+            if parsed_args.log:
+                options["log_excerpts"] = self.extract_logs(parsed_args.log)
+            if parsed_args.context:
+                options["context"] = self.load_context(parsed_args.context)
+            if parsed_args.timings:
+                options["show_timings"] = True
+            profile = self.create_profile_session() if parsed_args.profile else None
+            with maybe_profile(profile):
+                self.bug_report_service.process_bug_report(
+                    parsed_args.input_text, **options
+                )
+            if profile is not None:
+                print(f"Profile written to {profile.path}", file=sys.stderr)
+        except OSError as e:
+            print(f"Error: cannot read log file: {e}")
+            sys.exit(1)
         except BugReporterError as e:
             print(f"Error: {e}")
             sys.exit(1)
         except Exception as e:
             print(f"Unexpected error: {e}")
             sys.exit(1)
+        finally:
+            self.bug_report_service.close()
+
+    @staticmethod
+    def extract_logs(paths: List[str]) -> List[LogExcerpt]:
+        """
+        Scan log files and extract excerpts within the prompt token budget.
+
+        Args:
+            paths: Log file paths
+
+        Returns:
+            One excerpt per log file
+        """
+        extractor = LogExcerptExtractor(max_scan_bytes=settings.log_scan_max_bytes)
+        budget = excerpt_budget(settings.log_excerpt_max_tokens, len(paths))
+        return [extractor.extract_path(path, budget) for path in paths]
+
+    @staticmethod
+    def create_profile_session() -> ProfileSession:
+        """Create a profile session for this run from settings."""
+        profiler = Profiler(
+            ProfileStore(settings.profile_dir, settings.profile_max_files),
+            interval=settings.profile_interval,
+        )
+        return profiler.session("cli")
+
+    @staticmethod
+    def create_context_registry() -> ContextRegistry:
+        """
+        Load the application contexts configured by CONTEXT_DIR.
+
+        Returns:
+            The context registry
+
+        Raises:
+            ValidationError: If CONTEXT_DIR is not set
+        """
+        if not settings.context_dir:
+            raise ValidationError("CONTEXT_DIR is not set")
+        return ContextRegistry(
+            settings.context_dir, max_tokens=settings.context_max_tokens
+        )
+
+    def load_context(self, name: str) -> ApplicationContext:
+        """
+        Load one application context.
+
+        Args:
+            name: Context name
+
+        Returns:
+            The compiled context
+
+        Raises:
+            ValidationError: If contexts are not configured or the context is
+                unknown or unusable
+        """
+        return self.create_context_registry().get(name)
+
+    def list_contexts(self) -> None:
+        """Print every application context with its size against the budget."""
+        try:
+            sizes = self.create_context_registry().sizes()
+        except BugReporterError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        for size in sizes:
+            status = size.error or "ok"
+            print(
+                f"{size.name:<24} {size.bytes:>8} bytes "
+                f"{size.tokens:>6}/{size.max_tokens} tokens  {status}"
+            )
+
+    def run_daemon(
+        self, socket_path: Optional[str] = None, idle_timeout: Optional[float] = None
+    ) -> None:
+        """
+        Serve bug report requests over a Unix socket until idle or stopped.
+
+        Args:
+            socket_path: Socket path override
+            idle_timeout: Idle auto-shutdown override in seconds
+        """
+        server = DaemonServer(
+            self.bug_report_service, socket_path=socket_path, idle_timeout=idle_timeout
+        )
+        print(f"Bug Reporter daemon listening on {server.socket_path}")
+        try:
+            server.serve()
+        except BugReporterError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            pass
+        print("Bug Reporter daemon stopped")
+
+    def stop_daemon(self, socket_path: Optional[str] = None) -> None:
+        """
+        Stop a running daemon.
+
+        Args:
+            socket_path: Socket path override
+        """
+        try:
+            DaemonClient(socket_path).shutdown()
+        except BugReporterError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print("Bug Reporter daemon stopping")
+
+    def run_repl(self) -> None:
+        """Read bug descriptions interactively, one per line, until EOF or 'exit'."""
+        print("Bug Reporter interactive mode. Enter one bug description per line.")
+        print("Type 'exit' or press Ctrl-D to quit.")
+
+        while True:
+            try:
+                line = input("bug> ")
+            except (EOFError, KeyboardInterrupt):
+                print()
+                break
+
+            input_text = line.strip()
+            if not input_text:
+                continue
+            if input_text.lower() in ("exit", "quit"):
+                break
+
+            self.bug_report_service.process_bug_report(input_text)
+
+    def run_export(self, parsed_args: argparse.Namespace) -> None:
+        """
+        Stream stored or batch-generated reports to a file or stdout.
+
+        Args:
+            parsed_args: Parsed arguments carrying the export options
+        """
+        store = SQLiteReportStore(parsed_args.store or settings.report_store_path)
+        export_service = ExportService(
+            store,
+            batch_size=settings.export_batch_size,
+            chunk_size=settings.export_chunk_size,
+        )
+        try:
+            with ExitStack() as files:
+                files.callback(store.close)
+                if parsed_args.input_file:
+                    input_file = (
+                        sys.stdin
+                        if parsed_args.input_file == "-"
+                        else files.enter_context(
+                            open(parsed_args.input_file, encoding="utf-8")
+                        )
+                    )
+                    reports = export_service.generate_reports(
+                        self.bug_report_service,
+                        input_file,
+                        on_error=lambda text, e: print(
+                            f"Skipped input {text[:40]!r}: {e}", file=sys.stderr
+                        ),
+                    )
+                    stream = export_service.export_reports(parsed_args.export, reports)
+                else:
+                    stream = export_service.export(
+                        parsed_args.export,
+                        since=parsed_args.since,
+                        until=parsed_args.until,
+                        after=parsed_args.cursor,
+                        limit=parsed_args.limit,
+                    )
+
+                output = (
+                    files.enter_context(open(parsed_args.output, "wb"))
+                    if parsed_args.output
+                    else sys.stdout.buffer
+                )
+                self._write_chunks(stream.chunks, output)
+        except (BugReporterError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        if stream.next_cursor is not None:
+            print(f"Next cursor: {stream.next_cursor}", file=sys.stderr)
+
+    def run_evaluation(self, parsed_args: argparse.Namespace) -> None:
+        """
+        Run a corpus through several prompt versions and print their outcomes.
+
+        Args:
+            parsed_args: Parsed arguments carrying the evaluation options
+        """
+        try:
+            versions = [
+                resolve_version(spec)
+                for spec in parsed_args.prompt or ["current", "bilingual"]
+            ]
+            if parsed_args.evaluate == "-":
+                cases = load_corpus(sys.stdin)
+            else:
+                with open(parsed_args.evaluate, encoding="utf-8") as corpus:
+                    cases = load_corpus(corpus)
+            evaluator = PromptEvaluator(
+                self.llm_service, versions, workers=parsed_args.workers
+            )
+            rows = evaluator.run(cases)
+        except (BugReporterError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            self.bug_report_service.close()
+
+        print(format_report(rows))
+
+    @staticmethod
+    def _write_chunks(chunks: Iterable[bytes], output: BinaryIO) -> None:
+        """Write streamed chunks as they are produced."""
+        output.writelines(chunks)
+        output.flush()
+
 
+def main(args: Optional[list] = None) -> None:
+    """
+    Main entry point for the CLI application.
 
-def main():
-    """Main entry point for the CLI application."""
+    Args:
+        args: Command line arguments (defaults to sys.argv)
+    """
     cli = CLI()
-    cli.run()
+    cli.run(args)
 
 
 if __name__ == "__main__":
@@ -1,26 +1,195 @@
 """Configuration settings for the Bug Reporter application."""
 
 import os
-from typing import Optional
+import tempfile
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 
+def _default_socket_path() -> str:
+    """Return the per-user default path of the daemon's Unix socket."""
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"bug-reporter-{uid}.sock")
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_list(name: str) -> List[str]:
+    """Read values separated by commas from the environment, skipping blanks."""
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
+def _env_int_map(name: str, default: str = "") -> Dict[str, int]:
+    """Read "name=number" pairs separated by commas from the environment."""
+    values = {}
+    for item in os.getenv(name, default).split(","):
+        key, sep, number = item.partition("=")
+        if sep and key.strip():
+            values[key.strip()] = int(number)
+    return values
+
+
+def _env_float_map(name: str, default: str = "") -> Dict[str, float]:
+    """Read "name=seconds" (or "name:seconds") pairs separated by commas."""
+    values = {}
+    for item in os.getenv(name, default).split(","):
+        key, sep, number = item.replace(":", "=", 1).partition("=")
+        if sep and key.strip():
+            values[key.strip()] = float(number)
+    return values
+
+
 class Settings:
     """Application configuration settings."""
 
     def __init__(self):
         """Initialize settings from environment variables."""
         self.gemini_api_key: Optional[str] = os.getenv("GEMINI_API_KEY")
+        # Keys spread over by the key pool; the single key if no list is given
+        self.gemini_api_keys: List[str] = _env_list("GEMINI_API_KEYS") or (
+            [self.gemini_api_key] if self.gemini_api_key else []
+        )
+        self.gemini_key_strategy: str = os.getenv("GEMINI_KEY_STRATEGY", "lru")
+        self.gemini_key_cooldown: float = float(os.getenv("GEMINI_KEY_COOLDOWN", "60"))
+        self.gemini_key_rpm: int = int(os.getenv("GEMINI_KEY_RPM", "0"))
         self.gemini_model: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
         self.max_retries: int = int(os.getenv("MAX_RETRIES", "3"))
+        self.llm_attempt_timeout: float = float(os.getenv("LLM_ATTEMPT_TIMEOUT", "60"))
+        self.request_timeout: float = float(os.getenv("REQUEST_TIMEOUT", "120"))
+        self.daemon_socket_path: str = os.getenv(
+            "BUG_REPORTER_SOCKET", _default_socket_path()
+        )
+        self.daemon_idle_timeout: float = float(os.getenv("DAEMON_IDLE_TIMEOUT", "900"))
+        self.daemon_request_timeout: float = float(
+            os.getenv("DAEMON_REQUEST_TIMEOUT", "300")
+        )
+        self.warmup_enabled: bool = _env_bool("WARMUP_ENABLED", True)
+        self.warmup_probe: bool = _env_bool("WARMUP_PROBE", False)
+        self.warmup_retry_delay: float = float(os.getenv("WARMUP_RETRY_DELAY", "1"))
+        self.warmup_retry_max_delay: float = float(
+            os.getenv("WARMUP_RETRY_MAX_DELAY", "30")
+        )
+        self.circuit_failure_threshold: int = int(
+            os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")
+        )
+        self.circuit_reset_timeout: float = float(
+            os.getenv("CIRCUIT_RESET_TIMEOUT", "30")
+        )
+        self.static_cache_max_age: int = int(os.getenv("STATIC_CACHE_MAX_AGE", "86400"))
+        self.gzip_minimum_size: int = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+        self.report_store_path: str = os.getenv("REPORT_STORE_PATH", ":memory:")
+        self.idempotency_store_path: str = os.getenv(
+            "IDEMPOTENCY_STORE_PATH", ":memory:"
+        )
+        self.idempotency_ttl: float = float(os.getenv("IDEMPOTENCY_TTL", "86400"))
+        self.idempotency_lease: float = float(os.getenv("IDEMPOTENCY_LEASE", "300"))
+        self.idempotency_poll_interval: float = float(
+            os.getenv("IDEMPOTENCY_POLL_INTERVAL", "0.5")
+        )
+        self.usage_quotas: Dict[str, int] = _env_int_map("USAGE_QUOTAS")
+        self.usage_default_quota: int = int(os.getenv("USAGE_DEFAULT_QUOTA", "0"))
+        self.usage_quota_window: float = float(os.getenv("USAGE_QUOTA_WINDOW", "86400"))
+        self.llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self.priority_weights: Dict[str, int] = _env_int_map(
+            "PRIORITY_WEIGHTS", "interactive=4,bulk=1"
+        )
+        self.priority_starvation_timeout: float = float(
+            os.getenv("PRIORITY_STARVATION_TIMEOUT", "30")
+        )
+        self.default_priority: str = os.getenv("DEFAULT_PRIORITY", "interactive")
+        # Enricher name -> timeout in seconds, e.g. "root_cause=20,info_gaps=7.5"
+        self.enrichers: Dict[str, float] = _env_float_map("ENRICHERS")
+        self.enrichment_workers: int = int(os.getenv("ENRICHMENT_WORKERS", "4"))
+        # Threads for CPU-bound pipeline stages; 0 runs them in the request's thread
+        self.pipeline_cpu_workers: int = int(os.getenv("PIPELINE_CPU_WORKERS", "0"))
+        self.profile_dir: str = os.getenv(
+            "PROFILE_DIR", os.path.join(tempfile.gettempdir(), "bug-reporter-profiles")
+        )
+        self.profile_max_files: int = int(os.getenv("PROFILE_MAX_FILES", "50"))
+        self.profile_interval: float = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+        self.profile_token: Optional[str] = os.getenv("PROFILE_TOKEN")
+        self.loop_monitor_enabled: bool = _env_bool("LOOP_MONITOR_ENABLED", True)
+        self.loop_monitor_interval: float = float(
+            os.getenv("LOOP_MONITOR_INTERVAL", "0.05")
+        )
+        self.loop_block_threshold: float = float(
+            os.getenv("LOOP_BLOCK_THRESHOLD", "0.25")
+        )
+        self.render_cache_size: int = int(os.getenv("RENDER_CACHE_SIZE", "1024"))
+        self.export_batch_size: int = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+        self.export_chunk_size: int = int(os.getenv("EXPORT_CHUNK_SIZE", "65536"))
+        self.duplicate_detection_enabled: bool = _env_bool(
+            "DUPLICATE_DETECTION_ENABLED", True
+        )
+        self.duplicate_top_k: int = int(os.getenv("DUPLICATE_TOP_K", "5"))
+        self.duplicate_min_score: float = float(os.getenv("DUPLICATE_MIN_SCORE", "0.3"))
+        self.duplicate_reuse_threshold: float = float(
+            os.getenv("DUPLICATE_REUSE_THRESHOLD", "0.85")
+        )
+        self.log_excerpt_max_tokens: int = int(
+            os.getenv("LOG_EXCERPT_MAX_TOKENS", "1500")
+        )
+        self.log_max_attachments: int = int(os.getenv("LOG_MAX_ATTACHMENTS", "5"))
+        self.log_scan_max_bytes: int = int(
+            os.getenv("LOG_SCAN_MAX_BYTES", str(1024 * 1024 * 1024))
+        )
+        self.image_max_attachments: int = int(os.getenv("IMAGE_MAX_ATTACHMENTS", "4"))
+        self.image_max_bytes: int = int(
+            os.getenv("IMAGE_MAX_BYTES", str(10 * 1024 * 1024))
+        )
+        self.image_max_dimension: int = int(os.getenv("IMAGE_MAX_DIMENSION", "1536"))
+        self.image_jpeg_quality: int = int(os.getenv("IMAGE_JPEG_QUALITY", "80"))
+        self.image_workers: int = int(os.getenv("IMAGE_WORKERS", "2"))
+        self.image_cache_size: int = int(os.getenv("IMAGE_CACHE_SIZE", "128"))
+        self.context_dir: Optional[str] = os.getenv("CONTEXT_DIR")
+        self.context_max_tokens: int = int(os.getenv("CONTEXT_MAX_TOKENS", "1000"))
+        self.context_reload_interval: float = float(
+            os.getenv("CONTEXT_RELOAD_INTERVAL", "2.0")
+        )
+        self.jira_url: Optional[str] = os.getenv("JIRA_URL")
+        self.jira_email: Optional[str] = os.getenv("JIRA_EMAIL")
+        self.jira_api_token: Optional[str] = os.getenv("JIRA_API_TOKEN")
+        self.jira_project_key: Optional[str] = os.getenv("JIRA_PROJECT_KEY")
+        self.jira_issue_type: str = os.getenv("JIRA_ISSUE_TYPE", "Bug")
+        self.jira_max_connections: int = int(os.getenv("JIRA_MAX_CONNECTIONS", "10"))
+        self.jira_max_retries: int = int(os.getenv("JIRA_MAX_RETRIES", "5"))
+        self.jira_batch_size: int = int(os.getenv("JIRA_BATCH_SIZE", "50"))
+        self.jira_flush_interval: float = float(os.getenv("JIRA_FLUSH_INTERVAL", "1.0"))
+        self.llm_record_path: Optional[str] = os.getenv("LLM_RECORD_PATH")
+        self.llm_replay_path: Optional[str] = os.getenv("LLM_REPLAY_PATH")
+        self.llm_replay_latency_scale: float = float(
+            os.getenv("LLM_REPLAY_LATENCY_SCALE", "1.0")
+        )
+        self.canary_percent: float = float(os.getenv("CANARY_PERCENT", "0"))
+        self.canary_model: Optional[str] = os.getenv("CANARY_MODEL")
+        self.canary_prompt: Optional[str] = os.getenv("CANARY_PROMPT")
+        self.shadow_percent: float = float(os.getenv("SHADOW_PERCENT", "0"))
+        self.shadow_model: Optional[str] = os.getenv("SHADOW_MODEL")
+        self.shadow_prompt: Optional[str] = os.getenv("SHADOW_PROMPT")
+        self.shadow_max_concurrency: int = int(os.getenv("SHADOW_MAX_CONCURRENCY", "2"))
+        self.shadow_max_pending: int = int(os.getenv("SHADOW_MAX_PENDING", "100"))
+        self.shadow_timeout: float = float(os.getenv("SHADOW_TIMEOUT", "60"))
+
+    @property
+    def jira_enabled(self) -> bool:
+        """Return True if direct Jira submission is configured."""
+        return bool(self.jira_url and self.jira_project_key)
 
     def validate(self) -> bool:
         """Validate that required settings are present."""
-        if not self.gemini_api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
+        if not self.gemini_api_keys:
+            raise ValueError(
+                "GEMINI_API_KEY or GEMINI_API_KEYS environment variable is required"
+            )
         return True
 
 
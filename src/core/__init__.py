@@ -1,14 +1,38 @@
 """Core components for the Bug Reporter application."""
 
-from .models import BugReport
-from .interfaces import LLMService, Formatter
-from .exceptions import BugReporterError, LLMServiceError, ValidationError
+from .deadline import Deadline
+from .exceptions import (
+    BugReporterError,
+    DeadlineExceededError,
+    LLMServiceError,
+    QuotaExceededError,
+    RequestCancelledError,
+    ValidationError,
+)
+from .interfaces import Formatter, IdempotencyStore, LLMService, ReportStore
+from .models import (
+    AttemptUsage,
+    BugReport,
+    IdempotencyRecord,
+    ImageAttachment,
+    StoredReport,
+)
 
 __all__ = [
     "BugReport",
+    "StoredReport",
+    "ImageAttachment",
+    "AttemptUsage",
     "LLMService",
     "Formatter",
+    "ReportStore",
+    "IdempotencyRecord",
+    "IdempotencyStore",
     "BugReporterError",
+    "Deadline",
+    "DeadlineExceededError",
+    "RequestCancelledError",
     "LLMServiceError",
+    "QuotaExceededError",
     "ValidationError",
 ]
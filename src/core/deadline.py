@@ -0,0 +1,79 @@
+"""Per-request deadlines and cancellation shared across threads."""
+
+import threading
+import time
+from typing import Callable, Optional
+
+from .exceptions import DeadlineExceededError, RequestCancelledError
+
+
+class Deadline:
+    """
+    A point in time by which a request must finish, plus a cancellation flag.
+
+    The request handler creates it and may cancel it (e.g. when the client
+    disconnects); the code doing the work checks it between steps and caps
+    each blocking call's timeout by the time remaining.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the deadline.
+
+        Args:
+            timeout: Seconds from now until the deadline, or None for no limit
+            clock: Monotonic clock returning seconds
+        """
+        self._clock = clock
+        self.expires_at = None if timeout is None else clock() + timeout
+        self._cancelled = threading.Event()
+
+    def remaining(self) -> Optional[float]:
+        """Return the seconds left (never negative), or None without a limit."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        """Return True once the deadline has passed."""
+        return self.expires_at is not None and self._clock() >= self.expires_at
+
+    @property
+    def cancelled(self) -> bool:
+        """Return True once the request has been cancelled."""
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Cancel the request; work stops at its next check."""
+        self._cancelled.set()
+
+    def cap(self, timeout: float) -> float:
+        """
+        Limit a timeout to the time remaining.
+
+        Args:
+            timeout: The timeout wanted in seconds
+
+        Returns:
+            The smaller of timeout and the time remaining
+        """
+        remaining = self.remaining()
+        return timeout if remaining is None else min(timeout, remaining)
+
+    def check(self) -> None:
+        """
+        Stop work that should not continue.
+
+        Raises:
+            RequestCancelledError: If the request was cancelled
+            DeadlineExceededError: If the deadline has passed
+        """
+        if self.cancelled:
+            raise RequestCancelledError("Request was cancelled by the client")
+        if self.expired:
+            raise DeadlineExceededError("Request deadline exceeded")
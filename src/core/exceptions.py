@@ -27,3 +27,51 @@ class ConfigurationError(BugReporterError):
     """Exception raised when there's a configuration error."""
 
     pass
+
+
+class DaemonError(BugReporterError):
+    """Exception raised when the background daemon cannot serve a request."""
+
+    pass
+
+
+class DaemonUnavailableError(DaemonError):
+    """Exception raised when no daemon is listening on the configured socket."""
+
+    pass
+
+
+class JiraError(BugReporterError):
+    """Exception raised when Jira rejects or fails an issue submission."""
+
+    pass
+
+
+class DeadlineExceededError(LLMServiceError):
+    """Exception raised when a request runs out of time before a report is made."""
+
+    pass
+
+
+class RequestCancelledError(BugReporterError):
+    """Exception raised when the client that asked for a report has gone away."""
+
+    pass
+
+
+class QuotaExceededError(BugReporterError):
+    """Exception raised when a client has used up its token quota."""
+
+    pass
+
+
+class CassetteMissError(LLMServiceError):
+    """Exception raised when a replayed LLM call has no recording."""
+
+    pass
+
+
+class KeyPoolExhaustedError(LLMServiceError):
+    """Exception raised when every API key is rate limited or cooling down."""
+
+    pass
@@ -1,25 +1,207 @@
 """Abstract interfaces for the Bug Reporter application."""
 
 from abc import ABC, abstractmethod
-from typing import Optional
-from .models import BugReport
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Sequence
+from .deadline import Deadline
+from .exceptions import LLMServiceError
+from .models import (
+    AttemptUsage,
+    BugReport,
+    IdempotencyRecord,
+    ImageAttachment,
+    StoredReport,
+)
 
 
 class LLMService(ABC):
     """Abstract interface for LLM services."""
 
     @abstractmethod
-    def generate_bug_report(self, user_input: str) -> Optional[BugReport]:
+    def generate_bug_report(
+        self,
+        user_input: str,
+        language: Optional[str] = None,
+        images: Sequence[ImageAttachment] = (),
+        context_prefix: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
         """
         Generate a structured bug report from user input.
 
+        Callers only pass images, context_prefix, deadline and on_attempt when
+        they are set, so implementations without those features can leave
+        them out.
+
         Args:
             user_input: The user's description of the bug
+            language: Detected input language, or None if unknown
+            images: Screenshots sent to the model alongside the prompt
+            context_prefix: Precompiled application context placed before the prompt
+            deadline: Request deadline; no call should outlive it
+            on_attempt: Called with the token usage of every attempt, retries included
+
+        Returns:
+            BugReport instance or None if generation failed
+        """
+
+    def regenerate_field(
+        self,
+        bug_report: BugReport,
+        field: str,
+        instruction: Optional[str] = None,
+        language: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
+        """
+        Regenerate one field of an existing report, leaving the others as they are.
+
+        Implementations that cannot do this keep the default, which refuses.
+
+        Args:
+            bug_report: The report to refine
+            field: BugReport attribute to regenerate, e.g. "steps"
+            instruction: What the user wants changed, if anything
+            language: Language of the report, or None if unknown
+            deadline: Request deadline; no call should outlive it
+            on_attempt: Called with the token usage of every attempt, retries included
+
+        Returns:
+            The report with the field replaced, or None if regeneration failed
+
+        Raises:
+            LLMServiceError: If the service does not support field regeneration
+        """
+        raise LLMServiceError(
+            f"{type(self).__name__} does not support field regeneration"
+        )
+
+    def generate_bug_report_from_prompt(
+        self,
+        prompt: str,
+        prompt_version: str,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
+        """
+        Generate a bug report from a complete prompt, e.g. a candidate version.
+
+        Implementations that cannot do this keep the default, which refuses.
+
+        Args:
+            prompt: Complete prompt asking for the bug report JSON
+            prompt_version: Name and version of the prompt, reported with the usage
+            deadline: Deadline of the call; no call should outlive it
+            on_attempt: Called with the token usage of every attempt, retries included
 
         Returns:
             BugReport instance or None if generation failed
+
+        Raises:
+            LLMServiceError: If the service does not support custom prompts
+        """
+        raise LLMServiceError(
+            f"{type(self).__name__} does not support custom bug report prompts"
+        )
+
+    def generate_text(
+        self,
+        prompt: str,
+        prompt_version: str,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[str]:
+        """
+        Answer a free-form prompt, e.g. for enrichers.
+
+        Implementations that cannot do this keep the default, which refuses.
+
+        Args:
+            prompt: Complete prompt
+            prompt_version: Name and version of the prompt, reported with the usage
+            deadline: Deadline of the call; no call should outlive it
+            on_attempt: Called with the token usage of every attempt, retries included
+
+        Returns:
+            The answer, or None if the model gave none
+
+        Raises:
+            LLMServiceError: If the service does not support free-form prompts
+        """
+        raise LLMServiceError(
+            f"{type(self).__name__} does not support free-form prompts"
+        )
+
+    def warm_up(self, probe: bool = False) -> None:
+        """
+        Prepare the service for traffic (configure clients, open connections).
+
+        Implementations that have nothing to prepare can keep this no-op.
+
+        Args:
+            probe: Also run a tiny generation to verify the model end to end
+        """
+
+    def is_available(self) -> bool:
+        """
+        Report whether the upstream is currently accepting calls.
+
+        Returns:
+            False while calls are being refused (e.g. an open circuit breaker)
+        """
+        return True
+
+    def close(self) -> None:
+        """
+        Release background resources such as worker threads.
+
+        Implementations without any can keep this no-op.
+        """
+
+
+class Enricher(ABC):
+    """Abstract interface for optional additions to a generated report."""
+
+    # Key of the enricher's result, e.g. "root_cause"
+    name: str = ""
+    # Heading shown above the result
+    title: str = ""
+    # Whether the enricher needs the generated report, or only the user input
+    needs_report: bool = False
+
+    def __init__(self, timeout: float):
+        """
+        Initialize the enricher.
+
+        Args:
+            timeout: Seconds the enricher may take once started
+        """
+        self.timeout = timeout
+
+    @abstractmethod
+    def enrich(
+        self,
+        user_input: str,
+        language: Optional[str],
+        bug_report: Optional[BugReport],
+        deadline: Deadline,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[str]:
+        """
+        Produce the enrichment; runs in a worker thread.
+
+        Args:
+            user_input: The prepared user input
+            language: Detected input language, or None if unknown
+            bug_report: The generated report if needs_report is set, else None
+            deadline: The enricher's own deadline
+            on_attempt: Called with the token usage of every LLM attempt
+
+        Returns:
+            Text to attach to the report, or None if there is nothing to add
         """
-        pass
 
 
 class Formatter(ABC):
@@ -36,4 +218,178 @@ class Formatter(ABC):
         Returns:
             Formatted string ready for the target platform
         """
-        pass
+
+
+class ReportStore(ABC):
+    """Abstract interface for persisting generated bug reports."""
+
+    @abstractmethod
+    def save(self, user_input: str, bug_report: BugReport) -> StoredReport:
+        """
+        Persist a generated bug report under a new ID.
+
+        Args:
+            user_input: The user's original description
+            bug_report: The generated bug report
+
+        Returns:
+            The stored report including its ID
+        """
+
+    @abstractmethod
+    def get(self, report_id: str) -> Optional[StoredReport]:
+        """
+        Load a stored bug report.
+
+        Args:
+            report_id: ID returned by save()
+
+        Returns:
+            The stored report or None if it does not exist
+        """
+
+    @abstractmethod
+    def iter_reports(
+        self,
+        batch_size: int = 500,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after: Optional[str] = None,
+    ) -> Iterator[StoredReport]:
+        """
+        Iterate over stored reports, oldest first, loading them in batches.
+
+        Args:
+            batch_size: Number of reports fetched per round trip
+            since: Only reports created at or after this time
+            until: Only reports created before this time
+            after: ID of a report; iteration resumes right after it
+
+        Returns:
+            Iterator over stored reports
+
+        Raises:
+            ValidationError: If `after` is not a stored report ID
+        """
+
+    @abstractmethod
+    def page_end(
+        self,
+        limit: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Find the cursor for the page following `limit` reports.
+
+        Args:
+            limit: Page size
+            since: Only reports created at or after this time
+            until: Only reports created before this time
+            after: ID of a report the page starts after
+
+        Returns:
+            ID of the page's last report, or None if no reports follow the page
+        """
+
+
+class IdempotencyStore(ABC):
+    """Abstract interface for responses remembered by Idempotency-Key."""
+
+    @abstractmethod
+    def begin(
+        self, key: str, fingerprint: str, ttl: float, lease: float
+    ) -> IdempotencyRecord:
+        """
+        Claim a key for a new request, or return the request already using it.
+
+        A pending claim whose lease has run out (its worker died) is taken over.
+
+        Args:
+            key: Idempotency-Key sent by the client
+            fingerprint: Hash of the request payload
+            ttl: Seconds the key is remembered
+            lease: Seconds the claiming worker may take before others take over
+
+        Returns:
+            The record; `claimed` is True if the caller must process the request
+        """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """
+        Load the current record of a key without claiming it.
+
+        Args:
+            key: Idempotency-Key sent by the client
+
+        Returns:
+            The record, or None if the key is unknown or expired; a pending
+            record whose lease has run out has `lease_expired` set
+        """
+
+    @abstractmethod
+    def renew(self, key: str, lease: float) -> bool:
+        """
+        Extend the lease of a claimed key whose request is still running.
+
+        Args:
+            key: Idempotency-Key sent by the client
+            lease: Seconds from now the claim is held
+
+        Returns:
+            True if the key is still pending, False if it was completed or released
+        """
+
+    @abstractmethod
+    def complete(self, key: str, status_code: int, body: bytes, ttl: float) -> None:
+        """
+        Store the final response of a claimed key.
+
+        Args:
+            key: Idempotency-Key sent by the client
+            status_code: HTTP status of the response
+            body: Response body
+            ttl: Seconds the response is replayed for
+        """
+
+    @abstractmethod
+    def release(self, key: str) -> None:
+        """
+        Forget a claimed key without a response, so a retry runs again.
+
+        Args:
+            key: Idempotency-Key sent by the client
+        """
+
+
+class OutboxStore(ABC):
+    """Abstract interface for reports accepted for Jira but not yet delivered."""
+
+    @abstractmethod
+    def add(self, stored_report: StoredReport) -> None:
+        """
+        Remember a report until its delivery is final.
+
+        Args:
+            stored_report: Report queued for delivery
+        """
+
+    @abstractmethod
+    def remove(self, report_ids: Sequence[str]) -> None:
+        """
+        Forget reports whose delivery succeeded or failed for good.
+
+        Args:
+            report_ids: IDs of the delivered reports
+        """
+
+    @abstractmethod
+    def pending(self) -> List[StoredReport]:
+        """
+        Load the reports still waiting for delivery, oldest first.
+
+        Returns:
+            The pending reports
+        """
@@ -1,26 +1,35 @@
 from dataclasses import dataclass
-from typing import Dict, Any
+from datetime import datetime
+from typing import ClassVar, Dict, Any, Iterator, Optional, Tuple
 
 
 @dataclass
 class BugReport:
     """Data model representing a structured bug report."""
 
+    # (label, attribute) pairs in report order
+    FIELD_LABELS: ClassVar[Tuple[Tuple[str, str], ...]] = (
+        ("Title", "title"),
+        ("Description", "description"),
+        ("Steps", "steps"),
+        ("Expected result", "expected_result"),
+        ("Actual result", "actual_result"),
+    )
+
     title: str
     description: str
     steps: str
     expected_result: str
     actual_result: str
 
+    def labeled_fields(self) -> Iterator[Tuple[str, str]]:
+        """Yield (label, value) pairs in report order without building a dict."""
+        for label, attribute in self.FIELD_LABELS:
+            yield label, getattr(self, attribute)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert the bug report to a dictionary."""
-        return {
-            "Title": self.title,
-            "Description": self.description,
-            "Steps": self.steps,
-            "Expected result": self.expected_result,
-            "Actual result": self.actual_result,
-        }
+        return dict(self.labeled_fields())
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "BugReport":
@@ -38,3 +47,60 @@ class BugReport:
         return (
             f"BugReport(title='{self.title}', description='{self.description[:50]}...')"
         )
+
+
+@dataclass
+class StoredReport:
+    """A generated bug report persisted under an ID together with its input."""
+
+    id: str
+    user_input: str
+    bug_report: BugReport
+    created_at: datetime
+
+
+@dataclass
+class ImageAttachment:
+    """An image prepared to be sent to the model as a multimodal part."""
+
+    mime_type: str
+    data: bytes
+    width: int
+    height: int
+    digest: str
+    original_size: int
+
+
+@dataclass
+class IdempotencyRecord:
+    """The state of a request identified by an Idempotency-Key."""
+
+    key: str
+    fingerprint: str
+    completed: bool
+    claimed: bool = False
+    status_code: Optional[int] = None
+    body: Optional[bytes] = None
+    lease_expired: bool = False
+
+
+@dataclass
+class AttemptUsage:
+    """Tokens and latency of one LLM call attempt."""
+
+    model: str
+    prompt_version: str
+    prompt_tokens: int
+    output_tokens: int
+    latency: float
+    succeeded: bool
+
+
+@dataclass
+class EnrichmentResult:
+    """The outcome of one optional enricher run for a report."""
+
+    name: str
+    status: str
+    content: Optional[str] = None
+    error: Optional[str] = None
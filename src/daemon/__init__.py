@@ -0,0 +1,6 @@
+"""Daemon mode for the Bug Reporter CLI."""
+
+from .client import DaemonClient
+from .server import DaemonServer
+
+__all__ = ["DaemonClient", "DaemonServer"]
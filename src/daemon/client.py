@@ -0,0 +1,152 @@
+"""Client for the bug reporter daemon and the daemon-aware CLI launcher.
+
+This module deliberately avoids importing the LLM SDK so that CLI calls served
+by a running daemon skip its import and configuration cost entirely.
+"""
+
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+from ..core.exceptions import BugReporterError, DaemonUnavailableError
+from .protocol import (
+    OP_GENERATE,
+    OP_PING,
+    OP_SHUTDOWN,
+    encode_message,
+    read_message,
+)
+
+CONNECT_TIMEOUT = 0.5
+
+
+class DaemonClient:
+    """Send requests to a bug reporter daemon over its Unix socket."""
+
+    def __init__(
+        self, socket_path: Optional[str] = None, timeout: Optional[float] = None
+    ):
+        """
+        Initialize the daemon client.
+
+        Args:
+            socket_path: Path of the daemon's Unix socket
+            timeout: Seconds to wait for a response once connected
+        """
+        self.socket_path = socket_path or settings.daemon_socket_path
+        self.timeout = settings.daemon_request_timeout if timeout is None else timeout
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a message to the daemon and wait for its response.
+
+        Args:
+            message: Request message
+
+        Returns:
+            The daemon's response message
+
+        Raises:
+            DaemonUnavailableError: If no daemon accepts the connection
+            BugReporterError: If the exchange fails after connecting
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonUnavailableError("Unix sockets are not supported here")
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(CONNECT_TIMEOUT)
+            try:
+                sock.connect(self.socket_path)
+            except (FileNotFoundError, ConnectionRefusedError, socket.timeout) as e:
+                raise DaemonUnavailableError(
+                    f"No daemon listening on {self.socket_path}: {e}"
+                )
+
+            sock.settimeout(self.timeout)
+            try:
+                sock.sendall(encode_message(message))
+                with sock.makefile("rb") as stream:
+                    return read_message(stream)
+            except (OSError, ValueError) as e:
+                raise BugReporterError(f"Daemon request failed: {e}")
+        finally:
+            sock.close()
+
+    def ping(self) -> bool:
+        """
+        Check that a daemon is listening and responsive.
+
+        Raises:
+            DaemonUnavailableError: If no daemon accepts the connection
+        """
+        return bool(self.request({"op": OP_PING}).get("ok"))
+
+    def is_running(self) -> bool:
+        """Return True if a daemon answers on the socket."""
+        try:
+            return self.ping()
+        except BugReporterError:
+            return False
+
+    def shutdown(self) -> None:
+        """Ask the daemon to stop serving."""
+        self.request({"op": OP_SHUTDOWN})
+
+    def generate_formatted_report(self, user_input: str) -> Optional[str]:
+        """
+        Generate a formatted bug report through the daemon.
+
+        Args:
+            user_input: The user's description of the bug
+
+        Returns:
+            Formatted bug report string or None if generation failed
+
+        Raises:
+            DaemonUnavailableError: If no daemon is running
+            BugReporterError: If the daemon reports a failure
+        """
+        response = self.request({"op": OP_GENERATE, "input": user_input})
+        if not response.get("ok"):
+            raise BugReporterError(response.get("error", "Unknown daemon error"))
+        return response.get("report")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point that prefers a running daemon and falls back to the full CLI.
+
+    Only plain ``bug-reporter "<description>"`` calls are forwarded; any
+    option switches straight to the in-process CLI.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+    """
+    args = list(sys.argv[1:] if argv is None else argv)
+
+    if len(args) == 1 and args[0].strip() and not args[0].startswith("-"):
+        try:
+            formatted_report = DaemonClient().generate_formatted_report(args[0])
+        except DaemonUnavailableError:
+            pass
+        except BugReporterError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        else:
+            if formatted_report:
+                print("Generated Bug Report:")
+                print("=" * 50)
+                print(formatted_report)
+            else:
+                print("Failed to generate bug report")
+            return
+
+    from ..cli.main import main as cli_main
+
+    cli_main(args)
+
+
+if __name__ == "__main__":
+    main()
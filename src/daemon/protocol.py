@@ -0,0 +1,54 @@
+"""Wire protocol shared by the bug reporter daemon and its clients.
+
+Every connection carries exactly one request and one response. Both are
+single-line UTF-8 JSON objects terminated by a newline.
+"""
+
+import io
+import json
+from typing import Any, Dict
+
+ENCODING = "utf-8"
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+OP_GENERATE = "generate"
+OP_PING = "ping"
+OP_SHUTDOWN = "shutdown"
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """
+    Encode a message for transmission over the daemon socket.
+
+    Args:
+        message: JSON-serializable message
+
+    Returns:
+        Newline-terminated UTF-8 bytes
+    """
+    return json.dumps(message, ensure_ascii=False).encode(ENCODING) + b"\n"
+
+
+def read_message(stream: io.BufferedIOBase) -> Dict[str, Any]:
+    """
+    Read a single message from a socket stream.
+
+    Args:
+        stream: Readable binary stream wrapping the socket
+
+    Returns:
+        The decoded message
+
+    Raises:
+        ValueError: If the message is missing, oversized or malformed
+    """
+    line = stream.readline(MAX_MESSAGE_SIZE + 1)
+    if not line:
+        raise ValueError("Connection closed before a message was received")
+    if len(line) > MAX_MESSAGE_SIZE:
+        raise ValueError("Message exceeds the maximum allowed size")
+
+    message = json.loads(line.decode(ENCODING))
+    if isinstance(message, dict):
+        return message
+    raise ValueError("Message must be a JSON object")
@@ -0,0 +1,166 @@
+"""Unix socket daemon that keeps a warm bug report service between CLI calls."""
+
+import logging
+import os
+import socketserver
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..config import settings
+from ..core.exceptions import BugReporterError, DaemonError, DaemonUnavailableError
+from .client import DaemonClient
+from .protocol import (
+    OP_GENERATE,
+    OP_PING,
+    OP_SHUTDOWN,
+    encode_message,
+    read_message,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle a single request/response exchange on a daemon connection."""
+
+    def handle(self) -> None:
+        owner: DaemonServer = self.server.owner  # type: ignore[attr-defined]
+        try:
+            request = read_message(self.rfile)
+        except ValueError as e:
+            response: Dict[str, Any] = {"ok": False, "error": f"Invalid request: {e}"}
+        else:
+            response = owner.dispatch(request)
+        self.wfile.write(encode_message(response))
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix stream server handling every connection on its own thread."""
+
+    daemon_threads = True
+
+
+class DaemonServer:
+    """Serve bug report requests from a long-lived, warm BugReportService."""
+
+    def __init__(
+        self,
+        bug_report_service: Any,
+        socket_path: Optional[str] = None,
+        idle_timeout: Optional[float] = None,
+        poll_interval: float = 0.5,
+    ):
+        """
+        Initialize the daemon server.
+
+        Args:
+            bug_report_service: Service used to generate formatted reports
+            socket_path: Path of the Unix socket to listen on
+            idle_timeout: Seconds without requests before shutting down
+                (0 or less disables auto-shutdown)
+            poll_interval: How often the serve loop checks for idle/stop
+        """
+        self.bug_report_service = bug_report_service
+        self.socket_path = socket_path or settings.daemon_socket_path
+        self.idle_timeout = (
+            settings.daemon_idle_timeout if idle_timeout is None else idle_timeout
+        )
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._active_requests = 0
+        self._last_activity = time.monotonic()
+        self._stop_event = threading.Event()
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute a decoded request and build its response.
+
+        Args:
+            request: Decoded request message
+
+        Returns:
+            Response message
+        """
+        op = request.get("op")
+        if op == OP_PING:
+            return {"ok": True, "pid": os.getpid()}
+        if op == OP_SHUTDOWN:
+            self.stop()
+            return {"ok": True}
+        if op != OP_GENERATE:
+            return {"ok": False, "error": f"Unknown operation: {op!r}"}
+
+        user_input = request.get("input")
+        if not isinstance(user_input, str) or not user_input.strip():
+            return {"ok": False, "error": "Input text cannot be empty."}
+
+        with self._lock:
+            self._active_requests += 1
+        try:
+            report = self.bug_report_service.generate_formatted_report(user_input)
+            return {"ok": True, "report": report}
+        except BugReporterError as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            logger.exception("Daemon request failed")
+            return {"ok": False, "error": f"Unexpected error: {e}"}
+        finally:
+            with self._lock:
+                self._active_requests -= 1
+                self._last_activity = time.monotonic()
+
+    def serve(self) -> None:
+        """
+        Listen on the socket until stopped or idle for longer than the timeout.
+
+        Raises:
+            DaemonError: If another daemon is already listening on the socket
+        """
+        self._prepare_socket_path()
+        server = _ThreadingUnixServer(self.socket_path, _RequestHandler)
+        server.owner = self  # type: ignore[attr-defined]
+        server.timeout = self.poll_interval
+        os.chmod(self.socket_path, 0o600)
+
+        self._last_activity = time.monotonic()
+        try:
+            while not self._stop_event.is_set() and not self._idle_expired():
+                server.handle_request()
+        finally:
+            server.server_close()
+            self._remove_socket_file()
+
+    def stop(self) -> None:
+        """Ask the serve loop to exit after the current poll interval."""
+        self._stop_event.set()
+
+    def _idle_expired(self) -> bool:
+        """Return True once the daemon has been idle past its timeout."""
+        if self.idle_timeout <= 0:
+            return False
+        with self._lock:
+            if self._active_requests:
+                return False
+            return time.monotonic() - self._last_activity >= self.idle_timeout
+
+    def _prepare_socket_path(self) -> None:
+        """Remove a stale socket file, refusing to replace a live daemon."""
+        if not os.path.exists(self.socket_path):
+            os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+            return
+
+        try:
+            DaemonClient(self.socket_path).ping()
+        except DaemonUnavailableError:
+            self._remove_socket_file()
+        else:
+            raise DaemonError(f"A daemon is already listening on {self.socket_path}")
+
+    def _remove_socket_file(self) -> None:
+        """Delete the socket file if it still exists."""
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,19 @@
+"""Export module for the Bug Reporter application."""
+
+from .exporters import (
+    EXPORTERS,
+    CsvExporter,
+    JiraCsvExporter,
+    NdjsonExporter,
+    ReportExporter,
+    create_exporter,
+)
+
+__all__ = [
+    "EXPORTERS",
+    "CsvExporter",
+    "JiraCsvExporter",
+    "NdjsonExporter",
+    "ReportExporter",
+    "create_exporter",
+]
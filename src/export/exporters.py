@@ -0,0 +1,215 @@
+"""Streaming exporters that serialize stored bug reports in bulk."""
+
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from ..core.exceptions import ValidationError
+from ..core.models import StoredReport
+from ..formatters.jira_formatter import JiraFormatter
+
+# Rows are buffered into chunks of about this many bytes before being yielded
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+RECORD_FIELDS = (
+    "id",
+    "created_at",
+    "user_input",
+    "title",
+    "description",
+    "steps",
+    "expected_result",
+    "actual_result",
+)
+
+
+def report_record(stored_report: StoredReport) -> Dict[str, str]:
+    """
+    Flatten a stored report into an export record.
+
+    Args:
+        stored_report: Stored report
+
+    Returns:
+        Mapping of RECORD_FIELDS to string values
+    """
+    bug_report = stored_report.bug_report
+    return {
+        "id": stored_report.id,
+        "created_at": stored_report.created_at.isoformat(),
+        "user_input": stored_report.user_input,
+        "title": bug_report.title,
+        "description": bug_report.description,
+        "steps": bug_report.steps,
+        "expected_result": bug_report.expected_result,
+        "actual_result": bug_report.actual_result,
+    }
+
+
+class ReportExporter(ABC):
+    """Serialize an iterable of stored reports as a stream of byte chunks."""
+
+    media_type = "application/octet-stream"
+    file_extension = "bin"
+
+    def header(self) -> str:
+        """Return text written before the first report."""
+        return ""
+
+    @abstractmethod
+    def row(self, stored_report: StoredReport) -> str:
+        """
+        Serialize one stored report.
+
+        Args:
+            stored_report: Stored report
+
+        Returns:
+            Serialized report, including its line terminator
+        """
+
+    def stream(
+        self, reports: Iterable[StoredReport], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Serialize reports lazily, holding at most one chunk in memory.
+
+        Args:
+            reports: Reports to export, typically a lazy store iterator
+            chunk_size: Approximate number of bytes per yielded chunk
+
+        Returns:
+            Iterator over UTF-8 encoded chunks
+        """
+        buffer: List[str] = []
+        buffered = 0
+        header = self.header()
+        if header:
+            buffer.append(header)
+            buffered = len(header)
+
+        for stored_report in reports:
+            row = self.row(stored_report)
+            buffer.append(row)
+            buffered += len(row)
+            if buffered >= chunk_size:
+                yield "".join(buffer).encode("utf-8")
+                buffer.clear()
+                buffered = 0
+
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
+
+
+class NdjsonExporter(ReportExporter):
+    """One JSON object per line."""
+
+    media_type = "application/x-ndjson"
+    file_extension = "ndjson"
+
+    def row(self, stored_report: StoredReport) -> str:
+        """Serialize a report as a JSON line."""
+        return json.dumps(report_record(stored_report), ensure_ascii=False) + "\n"
+
+
+class _CsvExporter(ReportExporter):
+    """Base for CSV exporters; reuses one in-memory line buffer."""
+
+    media_type = "text/csv; charset=utf-8"
+    file_extension = "csv"
+    columns: Sequence[str] = ()
+
+    def __init__(self) -> None:
+        """Initialize the line buffer and CSV writer."""
+        self._line = io.StringIO()
+        self._writer = csv.writer(self._line)
+
+    def header(self) -> str:
+        """Return the CSV header row."""
+        return self._render(self.columns)
+
+    def row(self, stored_report: StoredReport) -> str:
+        """Serialize a report as a CSV row."""
+        return self._render(self.values(stored_report))
+
+    @abstractmethod
+    def values(self, stored_report: StoredReport) -> Sequence[str]:
+        """Return the column values of one report."""
+
+    def _render(self, values: Sequence[str]) -> str:
+        """Render one CSV row with proper quoting."""
+        self._line.seek(0)
+        self._line.truncate()
+        self._writer.writerow(values)
+        return self._line.getvalue()
+
+
+class CsvExporter(_CsvExporter):
+    """Flat CSV with one column per report field."""
+
+    columns = RECORD_FIELDS
+
+    def values(self, stored_report: StoredReport) -> Sequence[str]:
+        """Return the report's fields in column order."""
+        record = report_record(stored_report)
+        return [record[column] for column in self.columns]
+
+
+class JiraCsvExporter(_CsvExporter):
+    """CSV laid out for Jira's CSV issue import, with Description in Jira markup."""
+
+    columns = ("Summary", "Issue Type", "Description", "Labels")
+
+    def __init__(self, issue_type: str = "Bug", label: str = "bug-reporter") -> None:
+        """
+        Initialize the exporter.
+
+        Args:
+            issue_type: Jira issue type of every imported row
+            label: Label attached to every imported issue
+        """
+        super().__init__()
+        self.issue_type = issue_type
+        self.label = label
+        self._formatter = JiraFormatter()
+
+    def values(self, stored_report: StoredReport) -> Sequence[str]:
+        """Return the Jira import columns of one report."""
+        bug_report = stored_report.bug_report
+        return [
+            bug_report.title,
+            self.issue_type,
+            self._formatter.format_description(bug_report),
+            self.label,
+        ]
+
+
+EXPORTERS = {
+    "ndjson": NdjsonExporter,
+    "csv": CsvExporter,
+    "jira-csv": JiraCsvExporter,
+}
+
+
+def create_exporter(name: Optional[str]) -> ReportExporter:
+    """
+    Create a fresh exporter for an export format.
+
+    Args:
+        name: Export format name (case-insensitive)
+
+    Returns:
+        New exporter instance
+
+    Raises:
+        ValidationError: If the format is unknown
+    """
+    try:
+        return EXPORTERS[(name or "").lower()]()
+    except KeyError:
+        raise ValidationError(
+            f"Unknown export format '{name}'. Available formats: "
+            f"{', '.join(sorted(EXPORTERS))}"
+        )
@@ -2,5 +2,18 @@
 
 from .base_formatter import BaseFormatter
 from .jira_formatter import JiraFormatter
+from .markdown_formatter import MarkdownFormatter, GitHubFormatter
+from .html_formatter import HtmlFormatter
+from .text_formatter import PlainTextFormatter
+from .registry import FormatterRegistry, create_default_registry
 
-__all__ = ["BaseFormatter", "JiraFormatter"]
+__all__ = [
+    "BaseFormatter",
+    "FormatterRegistry",
+    "GitHubFormatter",
+    "HtmlFormatter",
+    "JiraFormatter",
+    "MarkdownFormatter",
+    "PlainTextFormatter",
+    "create_default_registry",
+]
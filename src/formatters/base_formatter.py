@@ -1,6 +1,8 @@
 """Base formatter interface and common functionality."""
 
 from abc import ABC, abstractmethod
+from typing import Any
+
 from ..core.interfaces import Formatter
 from ..core.models import BugReport
 
@@ -17,7 +19,7 @@ class BaseFormatter(Formatter, ABC):
         """Format a bug report for a specific platform."""
         pass
 
-    def _format_field(self, label: str, value: str, **kwargs) -> str:
+    def _format_field(self, label: str, value: str, **kwargs: Any) -> str:
         """
         Format a single field. Can be overridden by subclasses.
 
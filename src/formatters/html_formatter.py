@@ -0,0 +1,39 @@
+"""HTML formatter implementation."""
+
+import html
+from typing import Any
+
+from ..core.models import BugReport
+from .base_formatter import BaseFormatter
+
+
+class HtmlFormatter(BaseFormatter):
+    """Formatter producing an escaped HTML fragment."""
+
+    def format(self, bug_report: BugReport) -> str:
+        """
+        Format the bug report as an HTML fragment.
+
+        Args:
+            bug_report: The bug report to format
+
+        Returns:
+            HTML string safe to embed in a page
+        """
+        formatted_sections = [f"<h1>{html.escape(bug_report.title)}</h1>"]
+
+        for label, value in bug_report.labeled_fields():
+            if label == "Title":
+                continue
+            formatted_sections.append(self._format_field(label, value))
+
+        return (
+            '<article class="bug-report">\n'
+            + "\n".join(formatted_sections)
+            + "\n</article>"
+        )
+
+    def _format_field(self, label: str, value: str, **kwargs: Any) -> str:
+        """Format a field as a heading and an escaped paragraph."""
+        body = html.escape(value).replace("\n", "<br>\n")
+        return f"<h2>{html.escape(label)}</h2>\n<p>{body}</p>"
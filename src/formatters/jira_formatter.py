@@ -1,5 +1,7 @@
 """Jira-specific formatter implementation."""
 
+from typing import Iterable, Tuple
+
 from ..core.models import BugReport
 from .base_formatter import BaseFormatter
 
@@ -17,13 +19,38 @@ class JiraFormatter(BaseFormatter):
         Returns:
             Jira-formatted string ready to be pasted into Jira
         """
+        return self._format_sections(bug_report.labeled_fields())
+
+    def format_description(self, bug_report: BugReport) -> str:
+        """
+        Format every field except the title, for Jira's Description field.
+
+        Args:
+            bug_report: The bug report to format
+
+        Returns:
+            Jira-formatted string without the Title section
+        """
+        return self._format_sections(
+            (label, value)
+            for label, value in bug_report.labeled_fields()
+            if label != "Title"
+        )
+
+    def _format_sections(self, fields: Iterable[Tuple[str, str]]) -> str:
+        """
+        Format labeled fields as Jira sections.
+
+        Args:
+            fields: (label, value) pairs
+
+        Returns:
+            Jira-formatted sections separated by blank lines
+        """
         formatted_sections = []
-        bug_dict = bug_report.to_dict()
 
-        for label, value in bug_dict.items():
-            # Ensure value is properly encoded and split into lines for multi-language text
-            if isinstance(value, str) and label.lower() == "steps":
-                value = value.replace('\n', '\n')
+        for label, value in fields:
+            if isinstance(value, str) and label == "Steps":
                 value = value.replace('\n', '\n\n')  # Add extra newline for better rendering
 
             # Using Jira's markup for bold text
@@ -0,0 +1,64 @@
+"""Markdown formatter implementations."""
+
+from typing import Any, ClassVar, Dict
+
+from ..core.models import BugReport
+from .base_formatter import BaseFormatter
+
+
+class MarkdownFormatter(BaseFormatter):
+    """Formatter producing a standalone Markdown document."""
+
+    def format(self, bug_report: BugReport) -> str:
+        """
+        Format the bug report as Markdown with the title as a heading.
+
+        Args:
+            bug_report: The bug report to format
+
+        Returns:
+            Markdown string
+        """
+        formatted_sections = [f"# {bug_report.title}"]
+
+        for label, value in bug_report.labeled_fields():
+            if label == "Title":
+                continue
+            formatted_sections.append(self._format_field(label, value))
+
+        return "\n\n".join(formatted_sections)
+
+    def _format_field(self, label: str, value: str, **kwargs: Any) -> str:
+        """Format a field as a bold label followed by its paragraph."""
+        return f"**{label}**\n\n{value}"
+
+
+class GitHubFormatter(MarkdownFormatter):
+    """Formatter producing a GitHub issue body (the title goes in the issue title)."""
+
+    SECTION_TITLES: ClassVar[Dict[str, str]] = {
+        "Description": "Description",
+        "Steps": "Steps to reproduce",
+        "Expected result": "Expected behavior",
+        "Actual result": "Actual behavior",
+    }
+
+    def format(self, bug_report: BugReport) -> str:
+        """
+        Format the bug report as a GitHub-flavored Markdown issue body.
+
+        Args:
+            bug_report: The bug report to format
+
+        Returns:
+            GitHub issue body string
+        """
+        return "\n\n".join(
+            self._format_field(self.SECTION_TITLES[label], value)
+            for label, value in bug_report.labeled_fields()
+            if label != "Title"
+        )
+
+    def _format_field(self, label: str, value: str, **kwargs: Any) -> str:
+        """Format a field as a level-3 section."""
+        return f"### {label}\n\n{value}"
@@ -0,0 +1,61 @@
+"""Registry mapping output format names to formatter instances."""
+
+from typing import Dict, List
+
+from ..core.exceptions import ValidationError
+from .base_formatter import BaseFormatter
+from .html_formatter import HtmlFormatter
+from .jira_formatter import JiraFormatter
+from .markdown_formatter import GitHubFormatter, MarkdownFormatter
+from .text_formatter import PlainTextFormatter
+
+
+class FormatterRegistry:
+    """Look up formatters by output format name."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._formatters: Dict[str, BaseFormatter] = {}
+
+    def register(self, name: str, formatter: BaseFormatter) -> None:
+        """
+        Register a formatter under a format name.
+
+        Args:
+            name: Output format name (case-insensitive)
+            formatter: Formatter instance
+        """
+        self._formatters[name.lower()] = formatter
+
+    def get(self, name: str) -> BaseFormatter:
+        """
+        Return the formatter registered for a format.
+
+        Args:
+            name: Output format name (case-insensitive)
+
+        Raises:
+            ValidationError: If no formatter is registered under the name
+        """
+        try:
+            return self._formatters[name.lower()]
+        except KeyError:
+            raise ValidationError(
+                f"Unknown format '{name}'. Available formats: "
+                f"{', '.join(self.names())}"
+            )
+
+    def names(self) -> List[str]:
+        """Return the registered format names."""
+        return sorted(self._formatters)
+
+
+def create_default_registry() -> FormatterRegistry:
+    """Create a registry with all built-in formatters."""
+    registry = FormatterRegistry()
+    registry.register("jira", JiraFormatter())
+    registry.register("markdown", MarkdownFormatter())
+    registry.register("github", GitHubFormatter())
+    registry.register("html", HtmlFormatter())
+    registry.register("text", PlainTextFormatter())
+    return registry
@@ -0,0 +1,23 @@
+"""Plain text formatter implementation."""
+
+from ..core.models import BugReport
+from .base_formatter import BaseFormatter
+
+
+class PlainTextFormatter(BaseFormatter):
+    """Formatter producing plain text suitable for chat messages."""
+
+    def format(self, bug_report: BugReport) -> str:
+        """
+        Format the bug report as plain text without any markup.
+
+        Args:
+            bug_report: The bug report to format
+
+        Returns:
+            Plain text string
+        """
+        return "\n\n".join(
+            self._format_field(label, value)
+            for label, value in bug_report.labeled_fields()
+        )
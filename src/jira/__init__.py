@@ -0,0 +1,6 @@
+"""Direct Jira delivery for the Bug Reporter application."""
+
+from .client import JiraClient, JiraIssueResult
+from .outbox import JiraOutbox, SubmissionStatus
+
+__all__ = ["JiraClient", "JiraIssueResult", "JiraOutbox", "SubmissionStatus"]
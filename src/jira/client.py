@@ -0,0 +1,250 @@
+"""Async Jira REST client that creates issues from bug reports."""
+
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from ..core.exceptions import JiraError
+from ..core.models import BugReport
+from ..formatters.jira_formatter import JiraFormatter
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+# Jira Cloud and Server accept at most 50 issues per bulk create call
+MAX_BULK_SIZE = 50
+
+# Creating issues is not idempotent: a 502/503/504 may come after Jira created
+# them, so only rate limiting, which guarantees nothing was created, is retried
+RETRYABLE_STATUSES = frozenset({429})
+
+# Transport errors raised before the request reached Jira, safe to retry
+RETRYABLE_TRANSPORT_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+)
+
+
+@dataclass
+class JiraIssueResult:
+    """Outcome of creating one issue."""
+
+    key: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def created(self) -> bool:
+        """Return True if the issue was created."""
+        return self.key is not None
+
+
+class JiraClient:
+    """Create Jira issues over one shared, pooled HTTP connection set."""
+
+    def __init__(
+        self,
+        base_url: str,
+        project_key: str,
+        email: Optional[str] = None,
+        api_token: Optional[str] = None,
+        issue_type: str = "Bug",
+        labels: Sequence[str] = ("bug-reporter",),
+        max_connections: int = 10,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: Jira site URL, e.g. https://example.atlassian.net
+            project_key: Key of the project issues are created in
+            email: Account email for basic authentication
+            api_token: API token for basic authentication
+            issue_type: Issue type name of created issues
+            labels: Labels attached to created issues
+            max_connections: Size of the shared connection pool
+            max_retries: Retries per call after rate limiting or transient errors
+            backoff_base: First retry delay in seconds, doubled per attempt
+            backoff_max: Upper bound of a single retry delay in seconds
+            timeout: Per-request timeout in seconds
+            transport: Custom httpx transport (mainly for tests)
+        """
+        self.project_key = project_key
+        self.issue_type = issue_type
+        self.labels = list(labels)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._formatter = JiraFormatter()
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            auth=(email, api_token) if email and api_token else None,
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "Self":
+        """Enter the async context."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the connection pool on exit."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        await self._client.aclose()
+
+    def issue_fields(self, bug_report: BugReport) -> Dict[str, Any]:
+        """
+        Map a bug report onto Jira issue fields.
+
+        Args:
+            bug_report: The bug report to submit
+
+        Returns:
+            The "fields" object of an issue create request
+        """
+        return {
+            "project": {"key": self.project_key},
+            "issuetype": {"name": self.issue_type},
+            # Jira rejects summaries longer than 255 characters
+            "summary": bug_report.title.replace("\n", " ")[:255],
+            "description": self._formatter.format_description(bug_report),
+            "labels": self.labels,
+        }
+
+    async def create_issue(self, bug_report: BugReport) -> str:
+        """
+        Create a single issue.
+
+        Args:
+            bug_report: The bug report to submit
+
+        Returns:
+            Key of the created issue
+
+        Raises:
+            JiraError: If Jira rejects the issue or retries are exhausted
+        """
+        body = await self._request(
+            "/rest/api/2/issue", {"fields": self.issue_fields(bug_report)}
+        )
+        key: str = body["key"]
+        return key
+
+    async def create_issues(
+        self, bug_reports: Sequence[BugReport]
+    ) -> List[JiraIssueResult]:
+        """
+        Create issues with bulk calls of at most MAX_BULK_SIZE issues each.
+
+        Args:
+            bug_reports: The bug reports to submit
+
+        Returns:
+            One result per bug report, in order; rejected issues carry an error
+
+        Raises:
+            JiraError: If a whole bulk call fails after retries
+        """
+        results: List[JiraIssueResult] = []
+        for start in range(0, len(bug_reports), MAX_BULK_SIZE):
+            batch = bug_reports[start : start + MAX_BULK_SIZE]
+            body = await self._request(
+                "/rest/api/2/issue/bulk",
+                {"issueUpdates": [{"fields": self.issue_fields(b)} for b in batch]},
+            )
+            results.extend(self._bulk_results(len(batch), body))
+        return results
+
+    @staticmethod
+    def _bulk_results(count: int, body: Dict[str, Any]) -> List[JiraIssueResult]:
+        """Align a bulk create response with the submitted issues."""
+        errors = {
+            error.get("failedElementNumber"): error for error in body.get("errors", [])
+        }
+        # Jira lists created issues in submission order, skipping failed ones
+        created = iter(body.get("issues", []))
+        results = []
+        for index in range(count):
+            if index in errors:
+                element_errors = errors[index].get("elementErrors", {})
+                message = "; ".join(
+                    element_errors.get("errorMessages", [])
+                    + [f"{k}: {v}" for k, v in element_errors.get("errors", {}).items()]
+                )
+                results.append(JiraIssueResult(error=message or "Rejected by Jira"))
+            else:
+                issue = next(created, None)
+                results.append(
+                    JiraIssueResult(key=issue["key"])
+                    if issue
+                    else JiraIssueResult(error="Missing from Jira response")
+                )
+        return results
+
+    async def _request(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST to Jira, retrying only failures that cannot have created issues.
+
+        Rate limiting and errors before the request was sent are retried; 5xx
+        responses and read errors are not, since a retry could duplicate issues.
+
+        Raises:
+            JiraError: On non-retryable errors or when retries are exhausted
+        """
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = await self._client.post(path, json=payload)
+            except RETRYABLE_TRANSPORT_ERRORS as e:
+                error = f"Jira request failed: {e}"
+            except httpx.TransportError as e:
+                raise JiraError(f"Jira request failed: {e}") from e
+            else:
+                # Bulk create answers 201, or 400 with per-issue errors
+                if response.status_code in (200, 201) or (
+                    response.status_code == 400 and path.endswith("/bulk")
+                ):
+                    body: Dict[str, Any] = response.json()
+                    return body
+                error = f"Jira returned {response.status_code}: {response.text[:500]}"
+                if response.status_code not in RETRYABLE_STATUSES:
+                    raise JiraError(error)
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+
+            if attempt == self.max_retries:
+                raise JiraError(f"{error} (after {attempt + 1} attempts)")
+            await asyncio.sleep(self._retry_delay(attempt, retry_after))
+
+        raise JiraError("Jira request failed")  # pragma: no cover
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Honour Retry-After, else back off exponentially with full jitter."""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
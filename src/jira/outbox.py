@@ -0,0 +1,212 @@
+"""Background outbox that batches Jira submissions off the request path."""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, TypeVar
+
+from ..core.exceptions import JiraError
+from ..core.interfaces import OutboxStore
+from ..core.models import StoredReport
+from .client import MAX_BULK_SIZE, JiraClient
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+CREATED = "created"
+FAILED = "failed"
+
+
+@dataclass
+class SubmissionStatus:
+    """Delivery state of one report's Jira submission."""
+
+    status: str
+    issue_key: Optional[str] = None
+    error: Optional[str] = None
+
+
+class JiraOutbox:
+    """
+    Queue stored reports and deliver them to Jira in bulk from a background task.
+
+    submit() only enqueues, so report generation never waits on Jira. The
+    worker groups queued reports into bulk create calls of up to batch_size,
+    waiting at most flush_interval for a batch to fill. With a store, accepted
+    submissions are persisted until their delivery is final and delivered when
+    the worker starts, so a restart or crash does not lose them.
+    """
+
+    def __init__(
+        self,
+        client: JiraClient,
+        batch_size: int = MAX_BULK_SIZE,
+        flush_interval: float = 1.0,
+        max_pending: int = 1000,
+        status_history: int = 10000,
+        store: Optional[OutboxStore] = None,
+    ):
+        """
+        Initialize the outbox.
+
+        Args:
+            client: Jira client used for delivery
+            batch_size: Maximum reports per bulk create call
+            flush_interval: Seconds to wait for a batch to fill
+            max_pending: Maximum queued reports before submit() refuses more
+            status_history: Number of submission statuses remembered
+            store: Store keeping undelivered submissions across restarts
+        """
+        self.client = client
+        self.batch_size = min(batch_size, MAX_BULK_SIZE)
+        self.flush_interval = flush_interval
+        self.status_history = status_history
+        self._queue: asyncio.Queue[StoredReport] = asyncio.Queue(maxsize=max_pending)
+        self._statuses: OrderedDict[str, SubmissionStatus] = OrderedDict()
+        self._worker: Optional[asyncio.Task] = None
+        self.store = store
+
+    async def submit(self, stored_report: StoredReport) -> None:
+        """
+        Queue a stored report for delivery without waiting for Jira.
+
+        The submission is persisted first, so it is delivered even if the
+        process stops before the worker gets to it.
+
+        Args:
+            stored_report: Report to create an issue for
+
+        Raises:
+            JiraError: If the outbox is full
+        """
+        if self._queue.full():
+            raise JiraError("Jira outbox is full, try again later")
+        await self._in_thread(self._persist, stored_report)
+        try:
+            self._queue.put_nowait(stored_report)
+        except asyncio.QueueFull:
+            # Filled up while the submission was being persisted
+            await self._in_thread(self._forget, [stored_report])
+            raise JiraError("Jira outbox is full, try again later") from None
+        self._set_status(stored_report.id, SubmissionStatus(PENDING))
+
+    def status(self, report_id: str) -> Optional[SubmissionStatus]:
+        """
+        Return the submission status of a report.
+
+        Args:
+            report_id: ID of a submitted report
+
+        Returns:
+            The status, or None if the report was never submitted or is too old
+        """
+        return self._statuses.get(report_id)
+
+    def start(self) -> None:
+        """Start the delivery worker on the running event loop."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Deliver what is queued, then stop the worker.
+
+        Args:
+            timeout: Seconds to wait for the queue to drain
+        """
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def _run(self) -> None:
+        """Deliver persisted submissions, then queued batches, until cancelled."""
+        if self.store is not None:
+            backlog = await self._in_thread(self.store.pending)
+            for stored_report in backlog:
+                self._set_status(stored_report.id, SubmissionStatus(PENDING))
+            # Delivered straight from the list: the backlog may exceed max_pending
+            for start in range(0, len(backlog), self.batch_size):
+                await self._deliver_final(backlog[start : start + self.batch_size])
+
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._deliver_final(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _deliver_final(self, batch: List[StoredReport]) -> None:
+        """Deliver a batch, then drop it from the store; its outcome is final."""
+        await self._deliver(batch)
+        await self._in_thread(self._forget, batch)
+
+    async def _deliver(self, batch: List[StoredReport]) -> None:
+        """Create issues for a batch and record each outcome."""
+        try:
+            results = await self.client.create_issues(
+                [stored_report.bug_report for stored_report in batch]
+            )
+        except Exception as e:
+            # Any failure fails the batch but must not kill the worker
+            logger.exception("Jira delivery of %d reports failed", len(batch))
+            for stored_report in batch:
+                self._set_status(
+                    stored_report.id, SubmissionStatus(FAILED, error=str(e))
+                )
+            return
+
+        for stored_report, result in zip(batch, results):
+            self._set_status(
+                stored_report.id,
+                (
+                    SubmissionStatus(CREATED, issue_key=result.key)
+                    if result.created
+                    else SubmissionStatus(FAILED, error=result.error)
+                ),
+            )
+
+    def _persist(self, stored_report: StoredReport) -> None:
+        """Save a submission to the store, if any."""
+        if self.store is not None:
+            self.store.add(stored_report)
+
+    def _forget(self, batch: List[StoredReport]) -> None:
+        """Drop submissions whose delivery is final from the store, if any."""
+        if self.store is not None:
+            self.store.remove([stored_report.id for stored_report in batch])
+
+    @staticmethod
+    async def _in_thread(func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking store call off the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _set_status(self, report_id: str, status: SubmissionStatus) -> None:
+        """Record a status, evicting the oldest beyond status_history."""
+        self._statuses[report_id] = status
+        self._statuses.move_to_end(report_id)
+        while len(self._statuses) > self.status_history:
+            self._statuses.popitem(last=False)
@@ -0,0 +1,14 @@
+"""Runtime monitoring: metrics and the event-loop watchdog."""
+
+from .loop_monitor import EventLoopMonitor, EventLoopWatchMiddleware, LoopBlock
+from .metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+__all__ = [
+    "Counter",
+    "EventLoopMonitor",
+    "EventLoopWatchMiddleware",
+    "Gauge",
+    "Histogram",
+    "LoopBlock",
+    "MetricsRegistry",
+]
@@ -0,0 +1,189 @@
+"""Watchdog that measures event-loop lag and reports blocking calls."""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+@dataclass
+class LoopBlock:
+    """An episode where the event loop ran no callbacks for too long."""
+
+    stack: str
+    duration: Optional[float] = None
+
+
+class _WatchedLoop:
+    """Ping state of one event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, thread_id: int):
+        """Remember the loop and the thread it runs on."""
+        self.loop = loop
+        self.thread_id = thread_id
+        self.sent_at: Optional[float] = None
+        self.block: Optional[LoopBlock] = None
+
+
+class EventLoopMonitor:
+    """
+    Measure how long event loops take to run a callback, from a watchdog thread.
+
+    Every interval the watchdog schedules a callback on each watched loop and
+    records the delay until it runs as event_loop_lag_seconds. When a callback
+    is still waiting after the threshold, the loop is blocked: the watchdog
+    captures the loop thread's stack while the blocking code is still on it,
+    logs it and keeps it in blocks.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        threshold: float = 0.25,
+        registry: Optional[MetricsRegistry] = None,
+        max_blocks: int = 100,
+    ):
+        """
+        Initialize the monitor; it starts when the first loop is watched.
+
+        Args:
+            interval: Seconds between pings of each loop
+            threshold: Seconds without a callback after which a loop is blocked
+            registry: Registry the lag metrics are added to
+            max_blocks: Number of recent blocks kept
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.max_blocks = max_blocks
+        self.blocks: List[LoopBlock] = []
+        registry = registry or MetricsRegistry()
+        self._lag = registry.histogram(
+            "event_loop_lag_seconds",
+            "Delay before the event loop ran a scheduled callback",
+            buckets=LAG_BUCKETS,
+        )
+        self._blocked = registry.counter(
+            "event_loop_blocks_total",
+            "Times the event loop ran no callbacks for longer than the threshold",
+        )
+        self._loops: Dict[asyncio.AbstractEventLoop, _WatchedLoop] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Start watching a loop; must be called from the loop's own thread.
+
+        Watching an already watched loop is a dictionary lookup, so this can
+        be called on every request.
+
+        Args:
+            loop: Loop to watch; defaults to the running loop
+        """
+        loop = loop or asyncio.get_running_loop()
+        if loop in self._loops:
+            return
+        with self._lock:
+            self._loops[loop] = _WatchedLoop(loop, threading.get_ident())
+            if self._thread is None:
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="event-loop-watchdog", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watchdog thread and forget all loops."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._loops.clear()
+        self._stopped.set()
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        """Ping the watched loops until stopped."""
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                watched = list(self._loops.values())
+            for state in watched:
+                self._check(state)
+
+    def _check(self, state: _WatchedLoop) -> None:
+        """Ping a loop, or report it as blocked if the last ping is overdue."""
+        loop = state.loop
+        if loop.is_closed():
+            with self._lock:
+                self._loops.pop(loop, None)
+            return
+        if not loop.is_running():
+            # Idle between runs (e.g. a stopped test loop) is not blocking
+            state.sent_at = None
+            return
+
+        now = time.monotonic()
+        if state.sent_at is None:
+            state.sent_at = now
+            try:
+                loop.call_soon_threadsafe(self._pong, state, now)
+            except RuntimeError:
+                # Closed in the meantime
+                state.sent_at = None
+            return
+
+        if state.block is None and now - state.sent_at > self.threshold:
+            frame = sys._current_frames().get(state.thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            state.block = LoopBlock(stack)
+            self.blocks.append(state.block)
+            del self.blocks[: -self.max_blocks]
+            self._blocked.inc()
+            logger.warning(
+                "Event loop blocked for more than %.3fs in:\n%s",
+                self.threshold,
+                stack,
+            )
+
+    def _pong(self, state: _WatchedLoop, sent_at: float) -> None:
+        """Record the lag of a ping; runs on the watched loop."""
+        if state.sent_at != sent_at:
+            return
+        lag = time.monotonic() - sent_at
+        self._lag.observe(lag)
+        if state.block is not None:
+            state.block.duration = lag
+            state.block = None
+        state.sent_at = None
+
+
+class EventLoopWatchMiddleware:
+    """ASGI middleware that watches the loop each request is served on."""
+
+    def __init__(self, app: ASGIApp, monitor: EventLoopMonitor) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            monitor: Monitor the serving loops are registered with
+        """
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Register the running loop, then serve the request."""
+        self.monitor.watch()
+        await self.app(scope, receive, send)
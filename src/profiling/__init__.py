@@ -0,0 +1,22 @@
+"""Opt-in profiling of single requests."""
+
+from .sampler import (
+    Profiler,
+    ProfileSession,
+    fold_stack,
+    maybe_profile,
+    maybe_profile_async,
+    profiled,
+)
+from .store import PROFILE_EXTENSION, ProfileStore
+
+__all__ = [
+    "PROFILE_EXTENSION",
+    "ProfileSession",
+    "ProfileStore",
+    "Profiler",
+    "fold_stack",
+    "maybe_profile",
+    "maybe_profile_async",
+    "profiled",
+]
@@ -0,0 +1,259 @@
+"""Sampling profiler for single requests."""
+
+import asyncio
+import functools
+import hmac
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar, Token
+from types import FrameType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    Optional,
+)
+
+from .store import ProfileStore
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+_session: ContextVar[Optional["ProfileSession"]] = ContextVar(
+    "profile_session", default=None
+)
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Name a frame as "function (package/module.py:line)"."""
+    code = frame.f_code
+    directory, filename = os.path.split(code.co_filename)
+    location = os.path.join(os.path.basename(directory), filename)
+    return f"{code.co_name} ({location}:{code.co_firstlineno})"
+
+
+def fold_stack(frame: Optional[FrameType]) -> str:
+    """
+    Render a thread's stack as one collapsed-stack line, outermost frame first.
+
+    Args:
+        frame: Innermost frame of the stack
+
+    Returns:
+        Frame labels joined by semicolons
+    """
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class ProfileSession:
+    """
+    Sample the stacks of the threads working on one request.
+
+    The thread that enters the session is sampled until it exits; other
+    threads join while running a function wrapped with profiled(). Entered
+    with `async with`, the event loop thread is only sampled while it runs the
+    entering task, not other requests' coroutines. Samples are written to the
+    store in collapsed-stack format when the session ends.
+    """
+
+    def __init__(self, label: str, store: ProfileStore, interval: float = 0.005):
+        """
+        Initialize the session.
+
+        Args:
+            label: Short name of what is profiled
+            store: Ring buffer the profile is written to
+            interval: Seconds between samples
+        """
+        self.label = label
+        self.store = store
+        self.interval = interval
+        self.path: Optional[str] = None
+        self.samples: Counter = Counter()
+        self._threads: Dict[int, int] = {}
+        self._threads_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._token: Optional[Token[Optional[ProfileSession]]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task[Any]] = None
+
+    def __enter__(self) -> "Self":
+        """Start sampling the current thread."""
+        self._token = _session.set(self)
+        self._add_thread(threading.get_ident())
+        self._start_sampler()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop sampling and write the profile."""
+        self._remove_thread(threading.get_ident())
+        self._stop_sampler()
+        self._reset_session()
+        self.path = self.store.write(self.label, self.folded())
+
+    async def __aenter__(self) -> "Self":
+        """Start sampling the current task and the threads it hands work to."""
+        self._token = _session.set(self)
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._task = asyncio.current_task()
+        self._start_sampler()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop sampling and write the profile without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._stop_sampler)
+        self._reset_session()
+        self.path = await loop.run_in_executor(
+            None, self.store.write, self.label, self.folded()
+        )
+
+    def _reset_session(self) -> None:
+        """Restore the session that was current before this one was entered."""
+        if self._token is not None:
+            _session.reset(self._token)
+            self._token = None
+
+    @contextmanager
+    def thread(self) -> Iterator[None]:
+        """Sample the current thread while the block runs."""
+        ident = threading.get_ident()
+        self._add_thread(ident)
+        try:
+            yield
+        finally:
+            self._remove_thread(ident)
+
+    def folded(self) -> str:
+        """Return the samples in collapsed-stack format, one stack per line."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in sorted(self.samples.items())
+        )
+
+    def _add_thread(self, ident: int) -> None:
+        """Start sampling a thread; nested registrations are counted."""
+        with self._threads_lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def _remove_thread(self, ident: int) -> None:
+        """Stop sampling a thread once its last registration ends."""
+        with self._threads_lock:
+            remaining = self._threads[ident] - 1
+            if remaining:
+                self._threads[ident] = remaining
+            else:
+                del self._threads[ident]
+
+    def _start_sampler(self) -> None:
+        """Start the sampling thread."""
+        self._sampler = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+        self._sampler.start()
+
+    def _stop_sampler(self) -> None:
+        """Stop the sampling thread and wait for its last sample."""
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def _run(self) -> None:
+        """Sample the registered threads until the session ends."""
+        while not self._stopped.wait(self.interval):
+            with self._threads_lock:
+                idents = list(self._threads)
+            if self._loop_thread is not None and self._runs_task():
+                idents.append(self._loop_thread)
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.samples[fold_stack(frame)] += 1
+
+    def _runs_task(self) -> bool:
+        """Return True if the event loop is running the profiled task."""
+        assert self._loop is not None
+        return asyncio.current_task(self._loop) is self._task
+
+
+class Profiler:
+    """Create profile sessions that share one store and sampling interval."""
+
+    def __init__(
+        self,
+        store: ProfileStore,
+        interval: float = 0.005,
+        token: Optional[str] = None,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            store: Ring buffer profiles are written to
+            interval: Seconds between samples
+            token: Secret that admins send to profile an API request
+        """
+        self.store = store
+        self.interval = interval
+        self.token = token
+
+    def authorize(self, token: str) -> bool:
+        """Return True if token matches the admin profiling token."""
+        return self.token is not None and hmac.compare_digest(
+            token.encode("utf-8"), self.token.encode("utf-8")
+        )
+
+    def session(self, label: str) -> ProfileSession:
+        """Create a session; sampling starts when it is entered."""
+        return ProfileSession(label, self.store, self.interval)
+
+
+def maybe_profile(session: Optional[ProfileSession]) -> ContextManager:
+    """Return the session to enter, or a no-op context if not profiling."""
+    return session if session is not None else nullcontext()
+
+
+def maybe_profile_async(session: Optional[ProfileSession]) -> AsyncContextManager:
+    """Return the session to enter with `async with`, or a no-op if not profiling."""
+    return session if session is not None else _no_profile()
+
+
+@asynccontextmanager
+async def _no_profile() -> AsyncIterator[None]:
+    """Do nothing; nullcontext only supports `async with` from Python 3.10."""
+    yield
+
+
+def profiled(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Make func sample the thread it runs on if a profile session is active.
+
+    Call this where the work is handed to another thread; the session is
+    looked up in the caller's context. Without a session, func is returned
+    unchanged.
+    """
+    session = _session.get()
+    if session is None:
+        return func
+
+    @functools.wraps(func)
+    def run(*args: Any, **kwargs: Any) -> Any:
+        with session.thread():
+            return func(*args, **kwargs)
+
+    return run
@@ -0,0 +1,78 @@
+"""Bounded on-disk ring buffer of profile files."""
+
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import List
+
+# Extension of collapsed-stack files, as read by flamegraph.pl and speedscope
+PROFILE_EXTENSION = ".folded"
+
+_UNSAFE_LABEL = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class ProfileStore:
+    """
+    Keep the most recent profiles in a directory, deleting the oldest.
+
+    File names start with a nanosecond timestamp, so name order is age order.
+    """
+
+    def __init__(self, directory: str, max_files: int = 50):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory profiles are written to; created on first write
+            max_files: Number of profiles kept
+        """
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def write(self, label: str, content: str) -> str:
+        """
+        Write a profile and drop the oldest ones beyond max_files.
+
+        Args:
+            label: Short name of what was profiled, e.g. "api" or "cli"
+            content: Profile in collapsed-stack format
+
+        Returns:
+            Path of the written file
+        """
+        safe_label = _UNSAFE_LABEL.sub("-", label) or "profile"
+        name = f"{time.time_ns()}-{os.getpid()}-{safe_label}{PROFILE_EXTENSION}"
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename, so readers never see a partial profile
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as profile_file:
+                profile_file.write(content)
+            os.replace(temp_path, path)
+            self._trim()
+        return path
+
+    def list(self) -> List[str]:
+        """Return the paths of stored profiles, oldest first."""
+        try:
+            names = sorted(
+                name
+                for name in os.listdir(self.directory)
+                if name.endswith(PROFILE_EXTENSION)
+            )
+        except OSError:
+            return []
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _trim(self) -> None:
+        """Delete the oldest profiles beyond max_files."""
+        paths = self.list()
+        for path in paths[: max(len(paths) - self.max_files, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -1,5 +1,20 @@
 """Prompts module for the Bug Reporter application."""
 
-from .bug_report_prompts import BugReportPrompts
+from .bug_report_prompts import PROMPT_VERSION, BugReportPrompts
+from .context_registry import (
+    ApplicationContext,
+    ContextRegistry,
+    ContextSize,
+    compile_context,
+)
+from .enrichment_prompts import EnrichmentPrompts
 
-__all__ = ["BugReportPrompts"]
+__all__ = [
+    "PROMPT_VERSION",
+    "ApplicationContext",
+    "BugReportPrompts",
+    "ContextRegistry",
+    "ContextSize",
+    "EnrichmentPrompts",
+    "compile_context",
+]
@@ -1,19 +1,158 @@
 """Prompts for the Bug Reporter application."""
 
+from typing import Optional, Sequence, Tuple
+
+# Bumped whenever a prompt's wording changes, so usage can be compared per version
+PROMPT_VERSION = "1"
+
+# Compact single-language prompts, used once the input language is known locally
+COMPACT_PROMPTS = {
+    "en": (
+        "Generate a bug report. Respond ONLY with JSON, no other text:\n"
+        '{{"Title": "string", "Description": "string", "Steps": "string", '
+        '"Expected result": "string", "Actual result": "string"}}\n'
+        "All values are non-empty strings in English. Title: 20-50 characters. "
+        "Steps: numbered, one per line.\n"
+        "Be concise; if information is missing, make reasonable assumptions "
+        "and say so.\n"
+        "\n"
+        "User input: {user_input}\n"
+    ),
+    "ru": (
+        "Составь баг-репорт. Ответь ТОЛЬКО JSON, без другого текста:\n"
+        '{{"Title": "string", "Description": "string", "Steps": "string", '
+        '"Expected result": "string", "Actual result": "string"}}\n'
+        "Ключи оставь на английском, значения - непустые строки на русском языке. "
+        "Title: 20-50 символов. Steps: нумерованные, по одному в строке.\n"
+        "Пиши кратко; если информации не хватает, сделай разумные допущения "
+        "и укажи это.\n"
+        "\n"
+        "Описание пользователя: {user_input}\n"
+    ),
+}
+
+
+# Minimal prompts that rewrite one field of an existing report
+FIELD_PROMPTS = {
+    "en": (
+        'Rewrite the "{label}" field of this bug report. '
+        'Respond ONLY with JSON, no other text: {{"{label}": "string"}}\n'
+        "The value is a non-empty string in English.{rules}\n"
+        "\n"
+        "{report}\n"
+        "{instruction}"
+    ),
+    "ru": (
+        'Перепиши поле "{label}" этого баг-репорта. '
+        'Ответь ТОЛЬКО JSON, без другого текста: {{"{label}": "string"}}\n'
+        "Ключ оставь на английском, значение - непустая строка на русском языке."
+        "{rules}\n"
+        "\n"
+        "{report}\n"
+        "{instruction}"
+    ),
+}
+
+# Style rules of fields that have them, as in the full prompts
+FIELD_RULES = {
+    "en": {
+        "Title": " 20-50 characters.",
+        "Steps": " Numbered, one per line.",
+    },
+    "ru": {
+        "Title": " 20-50 символов.",
+        "Steps": " Нумерованные, по одному в строке.",
+    },
+}
+
+INSTRUCTION_LABELS = {"en": "Instruction", "ru": "Указание"}
+
 
 class BugReportPrompts:
     """Container for bug report generation prompts."""
 
     @staticmethod
-    def create_bug_report_prompt(user_input: str) -> str:
+    def prompt_version(language: Optional[str] = None) -> str:
+        """
+        Name the prompt used for a language, e.g. "compact-en/v1".
+
+        Args:
+            language: Detected input language, or None if unknown
+
+        Returns:
+            Prompt variant and version
+        """
+        variant = f"compact-{language}" if language in COMPACT_PROMPTS else "bilingual"
+        return f"{variant}/v{PROMPT_VERSION}"
+
+    @staticmethod
+    def field_prompt_version(language: Optional[str] = None) -> str:
+        """
+        Name the field regeneration prompt used for a language, e.g. "field-en/v1".
+
+        Args:
+            language: Language of the report; English if unknown
+
+        Returns:
+            Prompt variant and version
+        """
+        return (
+            f"field-{language if language in FIELD_PROMPTS else 'en'}/v{PROMPT_VERSION}"
+        )
+
+    @staticmethod
+    def create_field_prompt(
+        report_fields: Sequence[Tuple[str, str]],
+        label: str,
+        instruction: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> str:
+        """
+        Build the prompt that regenerates a single field of a report.
+
+        Args:
+            report_fields: (label, value) pairs of the current report
+            label: Label of the field to regenerate, e.g. "Steps"
+            instruction: What the user wants changed, if anything
+            language: Language of the report; English if unknown
+
+        Returns:
+            Formatted prompt for the LLM
+        """
+        language = language if language in FIELD_PROMPTS else "en"
+        report = "\n".join(f"{name}: {value}" for name, value in report_fields)
+        return FIELD_PROMPTS[language].format(
+            label=label,
+            rules=FIELD_RULES[language].get(label, ""),
+            report=report,
+            instruction=(
+                f"{INSTRUCTION_LABELS[language]}: {instruction}\n"
+                if instruction
+                else ""
+            ),
+        )
+
+    @staticmethod
+    def create_bug_report_prompt(
+        user_input: str,
+        language: Optional[str] = None,
+        context_prefix: Optional[str] = None,
+    ) -> str:
         """
         Args:
             user_input: The user's bug description
+            language: Detected input language; the bilingual prompt is used if unknown
+            context_prefix: Precompiled application context placed before the prompt
 
         Returns:
             Formatted prompt for the LLM
         """
-        return f"""You are a bug report generator.
+        prefix = context_prefix or ""
+        compact_prompt = COMPACT_PROMPTS.get(language) if language else None
+        if compact_prompt is not None:
+            return prefix + compact_prompt.format(user_input=user_input)
+
+        return prefix + f"""You are a bug report generator.
                 You must respond ONLY with valid JSON in the following structure:
                 {{
                   "Title": "string",
@@ -0,0 +1,296 @@
+"""Per-application prompt context loaded from a directory of files."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ..attachments.logs import CHARS_PER_TOKEN
+from ..core.exceptions import ValidationError
+
+# Files in the context directory that define an application context
+CONTEXT_EXTENSIONS = (".md", ".txt", ".json")
+
+_CONTEXT_NAME = re.compile(r"^[a-z0-9][a-z0-9_.-]*$")
+
+
+@dataclass
+class ApplicationContext:
+    """An application context compiled into a ready-to-use prompt prefix."""
+
+    name: str
+    prefix: str
+    tokens: int
+    size: int
+    digest: str
+
+
+@dataclass
+class ContextSize:
+    """Size of a context as reported to operators."""
+
+    name: str
+    bytes: int
+    tokens: int
+    max_tokens: int
+    error: Optional[str] = None
+
+
+@dataclass
+class _Entry:
+    """A context file as last seen on disk."""
+
+    path: str
+    stat_key: Tuple[int, int]
+    digest: str
+    size: int
+    context: Optional[ApplicationContext] = None
+    tokens: int = 0
+    error: Optional[str] = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of prompt tokens in text."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def compile_context(name: str, source: str, is_json: bool = False) -> str:
+    """
+    Compile a context file into the prefix placed before the prompt.
+
+    Text and Markdown files are used as written. JSON files may define
+    "title", "glossary" (an object of term definitions), "environment" (a
+    string or an object) and "notes".
+
+    Args:
+        name: Context name
+        source: File contents
+        is_json: Whether source is a JSON context
+
+    Returns:
+        The prompt prefix
+
+    Raises:
+        ValidationError: If a JSON context is malformed
+    """
+    if not is_json:
+        body = source.strip()
+        title = name
+    else:
+        try:
+            data = json.loads(source)
+        except json.JSONDecodeError as e:
+            raise ValidationError(f"Invalid JSON: {e}")
+        if not isinstance(data, dict):
+            raise ValidationError("A JSON context must be an object")
+        title = str(data.get("title") or name)
+        sections = []
+        glossary = data.get("glossary") or {}
+        if not isinstance(glossary, dict):
+            raise ValidationError("'glossary' must be an object of term definitions")
+        if glossary:
+            sections.append(
+                "Glossary:\n"
+                + "\n".join(
+                    f"- {term}: {meaning}" for term, meaning in glossary.items()
+                )
+            )
+        environment = data.get("environment")
+        if isinstance(environment, dict):
+            environment = "\n".join(
+                f"- {key}: {value}" for key, value in environment.items()
+            )
+        if environment:
+            sections.append(f"Environment:\n{environment}")
+        if data.get("notes"):
+            sections.append(f"Notes:\n{data['notes']}")
+        body = "\n\n".join(sections)
+
+    if not body:
+        raise ValidationError("Context is empty")
+    return (
+        f"Application context for {title}. Use it to interpret the bug "
+        f"description and its terms:\n{body}\n\n"
+    )
+
+
+class ContextRegistry:
+    """
+    Serve precompiled application contexts, reloading files only when they change.
+
+    Requests never read or parse files. The directory is re-scanned at most
+    once per reload interval; a file is re-read only if its mtime or size
+    changed and recompiled only if its content hash changed.
+    """
+
+    def __init__(
+        self, directory: str, max_tokens: int = 1000, reload_interval: float = 2.0
+    ):
+        """
+        Initialize the registry and load the directory.
+
+        Args:
+            directory: Directory holding one file per application
+            max_tokens: Token budget of each compiled context
+            reload_interval: Minimum seconds between directory scans
+        """
+        self.directory = directory
+        self.max_tokens = max_tokens
+        self.reload_interval = reload_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._last_scan = float("-inf")
+        self.refresh()
+
+    def get(self, name: str) -> ApplicationContext:
+        """
+        Return a compiled context.
+
+        Args:
+            name: Context name, the file name without its extension
+
+        Returns:
+            The compiled context
+
+        Raises:
+            ValidationError: If the context is unknown, invalid or over budget
+        """
+        self._refresh_if_due()
+        entry = self._entries.get(name)
+        if entry is None:
+            raise ValidationError(f"Unknown application context '{name}'")
+        if entry.context is None:
+            raise ValidationError(
+                f"Application context '{name}' is unusable: {entry.error}"
+            )
+        return entry.context
+
+    def names(self) -> List[str]:
+        """Return the names of all usable contexts."""
+        self._refresh_if_due()
+        return sorted(
+            name for name, entry in self._entries.items() if entry.context is not None
+        )
+
+    def sizes(self) -> List[ContextSize]:
+        """Return the size of every context file, including unusable ones."""
+        self._refresh_if_due()
+        return [
+            ContextSize(
+                name=name,
+                bytes=entry.size,
+                tokens=entry.tokens,
+                max_tokens=self.max_tokens,
+                error=entry.error,
+            )
+            for name, entry in sorted(self._entries.items())
+        ]
+
+    def refresh(self) -> None:
+        """Scan the directory now and reload changed files."""
+        with self._lock:
+            self._scan()
+            self._last_scan = time.monotonic()
+
+    def _refresh_if_due(self) -> None:
+        """Scan the directory if the reload interval has passed."""
+        if time.monotonic() - self._last_scan < self.reload_interval:
+            return
+        with self._lock:
+            # Another thread may have scanned while this one waited
+            if time.monotonic() - self._last_scan < self.reload_interval:
+                return
+            self._scan()
+            self._last_scan = time.monotonic()
+
+    def _scan(self) -> None:
+        """Reload added and changed files and forget deleted ones."""
+        entries: Dict[str, _Entry] = {}
+        try:
+            files = list(os.scandir(self.directory))
+        except OSError:
+            files = []
+        for file in files:
+            stem, extension = os.path.splitext(file.name)
+            name = stem.lower()
+            if extension.lower() not in CONTEXT_EXTENSIONS or not _CONTEXT_NAME.match(
+                name
+            ):
+                continue
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            stat_key = (stat.st_mtime_ns, stat.st_size)
+            previous = self._entries.get(name)
+            if (
+                previous is not None
+                and previous.path == file.path
+                and previous.stat_key == stat_key
+            ):
+                entries[name] = previous
+                continue
+            entry = self._load(name, file.path, stat_key, previous)
+            if entry is not None:
+                entries[name] = entry
+        self._entries = entries
+
+    def _load(
+        self,
+        name: str,
+        path: str,
+        stat_key: Tuple[int, int],
+        previous: Optional[_Entry],
+    ) -> Optional[_Entry]:
+        """
+        Read a changed file and compile it unless its content is unchanged.
+
+        Args:
+            name: Context name
+            path: File path
+            stat_key: (mtime_ns, size) of the file
+            previous: The entry loaded from this name before, if any
+
+        Returns:
+            The new entry, or None if the file vanished
+        """
+        try:
+            with open(path, "rb") as context_file:
+                raw = context_file.read()
+        except OSError:
+            return None
+
+        digest = hashlib.sha256(raw).hexdigest()
+        if previous is not None and previous.path == path and previous.digest == digest:
+            # Touched but not modified; keep the compiled prefix
+            previous.stat_key = stat_key
+            return previous
+
+        entry = _Entry(path=path, stat_key=stat_key, digest=digest, size=len(raw))
+        try:
+            prefix = compile_context(
+                name, raw.decode("utf-8"), is_json=path.lower().endswith(".json")
+            )
+        except (ValidationError, UnicodeDecodeError) as e:
+            entry.error = str(e)
+            return entry
+
+        entry.tokens = estimate_tokens(prefix)
+        if entry.tokens > self.max_tokens:
+            entry.error = (
+                f"uses about {entry.tokens} tokens, "
+                f"over the budget of {self.max_tokens}"
+            )
+            return entry
+        entry.context = ApplicationContext(
+            name=name,
+            prefix=prefix,
+            tokens=entry.tokens,
+            size=len(raw),
+            digest=digest,
+        )
+        return entry
@@ -0,0 +1,105 @@
+"""Prompts of the optional report enrichers."""
+
+from typing import Optional, Sequence, Tuple
+
+from .bug_report_prompts import PROMPT_VERSION
+
+ROOT_CAUSE_PROMPTS = {
+    "en": (
+        "Suggest the most likely root causes of this bug, in English. "
+        "Plain text, at most 3 bullet points of one sentence each; "
+        "say how sure you are.\n"
+        "\n"
+        "Bug description: {user_input}\n"
+    ),
+    "ru": (
+        "Предположи наиболее вероятные причины этого бага, на русском языке. "
+        "Обычный текст, не более 3 пунктов по одному предложению; "
+        "укажи, насколько ты уверен.\n"
+        "\n"
+        "Описание бага: {user_input}\n"
+    ),
+}
+
+INFO_GAP_PROMPTS = {
+    "en": (
+        "This bug report was written from a short description. "
+        "List, in English, the missing information the reporter should add "
+        "to make it reproducible (e.g. environment, version, exact data). "
+        "Plain text, at most 3 bullet points. "
+        "Reply with NONE if nothing important is missing.\n"
+        "\n"
+        "{report}\n"
+    ),
+    "ru": (
+        "Этот баг-репорт составлен по краткому описанию. "
+        "Перечисли на русском языке, какой информации не хватает, "
+        "чтобы баг можно было воспроизвести "
+        "(например, окружение, версия, точные данные). "
+        "Обычный текст, не более 3 пунктов. "
+        "Ответь NONE, если ничего важного не упущено.\n"
+        "\n"
+        "{report}\n"
+    ),
+}
+
+# Answer of the info-gap prompt when nothing is missing
+NO_INFO_GAPS = "NONE"
+
+
+class EnrichmentPrompts:
+    """Container for enricher prompts."""
+
+    @staticmethod
+    def _language(language: Optional[str]) -> str:
+        """Return the prompt language for a detected language; English if unknown."""
+        return language if language in ROOT_CAUSE_PROMPTS else "en"
+
+    @staticmethod
+    def prompt_version(name: str, language: Optional[str] = None) -> str:
+        """
+        Name an enricher's prompt, e.g. "root_cause-en/v1".
+
+        Args:
+            name: Enricher name
+            language: Detected input language, or None if unknown
+
+        Returns:
+            Prompt variant and version
+        """
+        return f"{name}-{EnrichmentPrompts._language(language)}/v{PROMPT_VERSION}"
+
+    @staticmethod
+    def create_root_cause_prompt(
+        user_input: str, language: Optional[str] = None
+    ) -> str:
+        """
+        Build the prompt suggesting root causes from the user's description.
+
+        Args:
+            user_input: The user's bug description
+            language: Detected input language; English if unknown
+
+        Returns:
+            Formatted prompt for the LLM
+        """
+        template = ROOT_CAUSE_PROMPTS[EnrichmentPrompts._language(language)]
+        return template.format(user_input=user_input)
+
+    @staticmethod
+    def create_info_gap_prompt(
+        report_fields: Sequence[Tuple[str, str]], language: Optional[str] = None
+    ) -> str:
+        """
+        Build the prompt listing what the reporter should add to a report.
+
+        Args:
+            report_fields: (label, value) pairs of the generated report
+            language: Detected input language; English if unknown
+
+        Returns:
+            Formatted prompt for the LLM
+        """
+        template = INFO_GAP_PROMPTS[EnrichmentPrompts._language(language)]
+        report = "\n".join(f"{label}: {value}" for label, value in report_fields)
+        return template.format(report=report)
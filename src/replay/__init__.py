@@ -0,0 +1,39 @@
+"""Recording of live LLM traffic and its offline replay."""
+
+from .cassette import (
+    CassetteEntry,
+    CassetteWriter,
+    describe_contents,
+    load_cassette,
+    prompt_key,
+    redact,
+)
+from .recording import (
+    RecordingLLMService,
+    RecordingModel,
+    configured_secrets,
+    record_from_settings,
+)
+from .replay import (
+    ReplayedResponse,
+    ReplayModel,
+    create_replay_service,
+    replay_model_from_settings,
+)
+
+__all__ = [
+    "CassetteEntry",
+    "CassetteWriter",
+    "RecordingLLMService",
+    "RecordingModel",
+    "ReplayModel",
+    "ReplayedResponse",
+    "configured_secrets",
+    "create_replay_service",
+    "describe_contents",
+    "load_cassette",
+    "prompt_key",
+    "record_from_settings",
+    "redact",
+    "replay_model_from_settings",
+]
@@ -0,0 +1,202 @@
+"""Cassette files of recorded LLM calls, with secrets redacted."""
+
+import gzip
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
+
+REDACTED = "[REDACTED]"
+
+# Credentials that can turn up in bug descriptions, logs and model output.
+# Only the `secret` group is replaced, so the surrounding text stays readable.
+_SECRET_PATTERNS = (
+    # Google API keys
+    re.compile(r"(?P<secret>AIza[0-9A-Za-z_\-]{35})"),
+    # GitHub and Slack tokens, "sk-" style API keys, AWS access key IDs
+    re.compile(r"(?P<secret>\bgh[pousr]_[A-Za-z0-9]{36,})"),
+    re.compile(r"(?P<secret>\bxox[abprs]-[A-Za-z0-9\-]{10,})"),
+    re.compile(r"(?P<secret>\b(?:sk|rk)-[A-Za-z0-9_\-]{16,})"),
+    re.compile(r"(?P<secret>\bAKIA[0-9A-Z]{16}\b)"),
+    # JSON Web Tokens
+    re.compile(r"(?P<secret>\beyJ[\w\-]+\.[\w\-]+\.[\w\-]+)"),
+    # Authorization header values
+    re.compile(r"(?i)\b(?:bearer|basic)\s+(?P<secret>[\w.~+/\-]{8,}=*)"),
+    # key=value and key: value assignments of secret-looking names
+    re.compile(
+        r"(?i)\b(?:password|passwd|pwd|secret|token|api[_-]?key|access[_-]?key)"
+        r"\"?\s*[:=]\s*\"?(?P<secret>[^\s\"',;&]+)"
+    ),
+)
+
+
+def redact(text: str, secrets: Sequence[str] = ()) -> str:
+    """
+    Replace credentials in a text with a placeholder.
+
+    Args:
+        text: Prompt, model output or error message
+        secrets: Known secret values, e.g. the configured API keys
+
+    Returns:
+        The text with every secret value and secret-looking token redacted
+    """
+    for secret in secrets:
+        if secret:
+            text = text.replace(secret, REDACTED)
+    for pattern in _SECRET_PATTERNS:
+        text = pattern.sub(_redact_match, text)
+    return text
+
+
+def _redact_match(match: "re.Match[str]") -> str:
+    """Replace the `secret` group of a match, keeping the rest of it."""
+    start, end = match.span("secret")
+    offset = match.start()
+    whole = match.group(0)
+    return whole[: start - offset] + REDACTED + whole[end - offset :]
+
+
+def describe_contents(contents: Any) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Split generate_content contents into prompt text and image descriptions.
+
+    Images are described by type, size and digest only, which keeps
+    cassettes small and screenshots out of them.
+
+    Args:
+        contents: A prompt string, or a list of text and inline image parts
+
+    Returns:
+        The text parts joined by newlines, and one description per image
+    """
+    if isinstance(contents, str):
+        return contents, []
+    texts: List[str] = []
+    images: List[Dict[str, Any]] = []
+    for part in contents:
+        if isinstance(part, dict) and "data" in part:
+            data = part["data"]
+            images.append(
+                {
+                    "mime_type": part.get("mime_type", ""),
+                    "bytes": len(data),
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                }
+            )
+        else:
+            texts.append(str(part))
+    return "\n".join(texts), images
+
+
+def prompt_key(prompt: str, images: Sequence[Dict[str, Any]] = ()) -> str:
+    """
+    Return the key a call is matched by on replay.
+
+    Args:
+        prompt: Redacted prompt text
+        images: Image descriptions from describe_contents()
+
+    Returns:
+        Hex digest of the prompt and the images' digests
+    """
+    digest = hashlib.sha256(prompt.encode("utf-8"))
+    for image in images:
+        digest.update(image["sha256"].encode("ascii"))
+    return digest.hexdigest()
+
+
+@dataclass
+class CassetteEntry:
+    """One recorded model call."""
+
+    key: str
+    model: str
+    prompt: str
+    latency: float
+    text: Optional[str] = None
+    # Raised by the call itself, as "ExceptionType: message"
+    error: Optional[str] = None
+    # Raised when reading response.text, e.g. for a blocked response
+    text_error: Optional[str] = None
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    images: List[Dict[str, Any]] = field(default_factory=list)
+    recorded_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        """Serialize the entry as one compact JSON line, leaving out unset fields."""
+        values = {
+            name: value
+            for name, value in asdict(self).items()
+            if value is not None and value != []
+        }
+        return json.dumps(values, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, line: str) -> "CassetteEntry":
+        """Parse an entry written by to_json()."""
+        return cls(**json.loads(line))
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Open a cassette as text, gzip-compressed if its name ends with .gz."""
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.GzipFile(path, mode), encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class CassetteWriter:
+    """
+    Append recorded calls to a cassette file, one JSON line each.
+
+    Each entry is appended on its own, so a crash loses at most the call in
+    flight; compressed cassettes get one gzip member per entry, which gzip
+    readers concatenate.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Cassette file; compressed if the name ends with .gz
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, entry: CassetteEntry) -> None:
+        """
+        Append one entry to the cassette.
+
+        Args:
+            entry: Recorded call
+
+        Raises:
+            OSError: If the cassette cannot be written
+        """
+        line = entry.to_json() + "\n"
+        with self._lock, _open(self.path, "a") as cassette:
+            cassette.write(line)
+
+
+def load_cassette(path: str) -> List[CassetteEntry]:
+    """
+    Read every entry of a cassette, in recording order.
+
+    Args:
+        path: Cassette file written by CassetteWriter
+
+    Returns:
+        The recorded calls
+
+    Raises:
+        OSError: If the cassette cannot be read
+        ValueError: If a line is not a cassette entry
+    """
+    with _open(path, "r") as cassette:
+        return [CassetteEntry.from_json(line) for line in cassette if line.strip()]
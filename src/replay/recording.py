@@ -0,0 +1,223 @@
+"""Recording of live Gemini traffic into cassettes."""
+
+import logging
+import time
+from typing import Any, Callable, Optional, Sequence
+
+from ..config import settings
+from ..core.deadline import Deadline
+from ..core.interfaces import LLMService
+from ..core.models import AttemptUsage, BugReport, ImageAttachment
+from ..services.gemini_service import GeminiService
+from .cassette import (
+    CassetteEntry,
+    CassetteWriter,
+    describe_contents,
+    prompt_key,
+    redact,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def configured_secrets() -> Sequence[str]:
+    """Return the secret values from settings that must never be recorded."""
+    return [
+        secret
+        for secret in (
+            settings.gemini_api_key,
+            *settings.gemini_api_keys,
+            settings.jira_api_token,
+            settings.profile_token,
+        )
+        if secret
+    ]
+
+
+class RecordingModel:
+    """
+    Generative model wrapper that records every generate_content call.
+
+    The raw response text is recorded before any parsing, so output that
+    fails validation or comes back empty is kept exactly as the model sent
+    it; failed calls are recorded with their error and then re-raised.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        writer: CassetteWriter,
+        model_name: str,
+        secrets: Sequence[str] = (),
+    ):
+        """
+        Initialize the recording model.
+
+        Args:
+            model: Generative model the calls are passed to
+            writer: Cassette the calls are appended to
+            model_name: Name recorded with each call
+            secrets: Values redacted from prompts, responses and errors
+        """
+        self.model = model
+        self.writer = writer
+        self.model_name = model_name
+        self.secrets = secrets
+
+    def generate_content(self, contents: Any, **kwargs: Any) -> Any:
+        """Call the model and record the call, whether it succeeds or fails."""
+        prompt, images = describe_contents(contents)
+        prompt = redact(prompt, self.secrets)
+        entry = CassetteEntry(
+            key=prompt_key(prompt, images),
+            model=self.model_name,
+            prompt=prompt,
+            latency=0.0,
+            images=images,
+        )
+        started = time.perf_counter()
+        try:
+            response = self.model.generate_content(contents, **kwargs)
+        except Exception as e:
+            entry.latency = time.perf_counter() - started
+            entry.error = redact(f"{type(e).__name__}: {e}", self.secrets)
+            self._write(entry)
+            raise
+        entry.latency = time.perf_counter() - started
+
+        try:
+            entry.text = redact(response.text, self.secrets)
+        except ValueError as e:
+            # Blocked or empty candidates; the service fails reading text too
+            entry.text_error = redact(str(e), self.secrets)
+        metadata = getattr(response, "usage_metadata", None)
+        entry.prompt_tokens = _token_count(metadata, "prompt_token_count")
+        entry.output_tokens = _token_count(metadata, "candidates_token_count")
+        self._write(entry)
+        return response
+
+    def count_tokens(self, contents: Any, **kwargs: Any) -> Any:
+        """Pass token counting through unrecorded."""
+        return self.model.count_tokens(contents, **kwargs)
+
+    def _write(self, entry: CassetteEntry) -> None:
+        """Append an entry; a full disk must not fail the live request."""
+        try:
+            self.writer.write(entry)
+        except OSError:
+            logger.exception("Could not record LLM call to %s", self.writer.path)
+
+
+def _token_count(metadata: Any, name: str) -> int:
+    """Read a token count from usage metadata, 0 if it is missing."""
+    value = getattr(metadata, name, 0)
+    return value if isinstance(value, int) else 0
+
+
+class RecordingLLMService(LLMService):
+    """
+    LLM service that records the Gemini traffic of the service it wraps.
+
+    Calls are recorded at the model, below the retry and parsing logic, so a
+    cassette holds every attempt: replaying it through a GeminiService runs
+    the same retries and parse failures as the recorded traffic did.
+    """
+
+    def __init__(
+        self,
+        service: GeminiService,
+        writer: CassetteWriter,
+        secrets: Sequence[str] = (),
+    ):
+        """
+        Initialize the recording service.
+
+        Args:
+            service: Gemini service whose model calls are recorded
+            writer: Cassette the calls are appended to
+            secrets: Values redacted from prompts, responses and errors
+        """
+        self.service = service
+        self.writer = writer
+        service.wrap_model(
+            lambda model: RecordingModel(model, writer, service.model_name, secrets)
+        )
+
+    def generate_bug_report(
+        self,
+        user_input: str,
+        language: Optional[str] = None,
+        images: Sequence[ImageAttachment] = (),
+        context_prefix: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
+        """Generate a bug report with the wrapped service, recording its calls."""
+        return self.service.generate_bug_report(
+            user_input, language, images, context_prefix, deadline, on_attempt
+        )
+
+    def regenerate_field(
+        self,
+        bug_report: BugReport,
+        field: str,
+        instruction: Optional[str] = None,
+        language: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
+        """Regenerate a field with the wrapped service, recording its calls."""
+        return self.service.regenerate_field(
+            bug_report, field, instruction, language, deadline, on_attempt
+        )
+
+    def generate_bug_report_from_prompt(
+        self,
+        prompt: str,
+        prompt_version: str,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
+        """Generate from a prompt with the wrapped service, recording its calls."""
+        return self.service.generate_bug_report_from_prompt(
+            prompt, prompt_version, deadline, on_attempt
+        )
+
+    def generate_text(
+        self,
+        prompt: str,
+        prompt_version: str,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[str]:
+        """Answer a prompt with the wrapped service, recording its calls."""
+        return self.service.generate_text(prompt, prompt_version, deadline, on_attempt)
+
+    def warm_up(self, probe: bool = False) -> None:
+        """Warm up the wrapped service."""
+        self.service.warm_up(probe)
+
+    def is_available(self) -> bool:
+        """Report the wrapped service's availability."""
+        return self.service.is_available()
+
+    def close(self) -> None:
+        """Close the wrapped service."""
+        self.service.close()
+
+
+def record_from_settings(service: GeminiService) -> LLMService:
+    """
+    Wrap a service in a recorder if LLM_RECORD_PATH is set.
+
+    Args:
+        service: Gemini service built by the application
+
+    Returns:
+        A RecordingLLMService writing to LLM_RECORD_PATH, or the service itself
+    """
+    if not settings.llm_record_path:
+        return service
+    return RecordingLLMService(
+        service, CassetteWriter(settings.llm_record_path), configured_secrets()
+    )
@@ -0,0 +1,172 @@
+"""Offline replay of recorded Gemini traffic."""
+
+import threading
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..config import settings
+from ..core.exceptions import CassetteMissError, LLMServiceError
+from ..services.gemini_service import GeminiService
+from .cassette import (
+    CassetteEntry,
+    describe_contents,
+    load_cassette,
+    prompt_key,
+    redact,
+)
+from .recording import configured_secrets
+
+
+class ReplayedResponse:
+    """Stand-in for a generate_content response, built from a cassette entry."""
+
+    def __init__(self, entry: CassetteEntry):
+        """
+        Initialize the response.
+
+        Args:
+            entry: Recorded call the response plays back
+        """
+        self._entry = entry
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=entry.prompt_tokens,
+            candidates_token_count=entry.output_tokens,
+            total_token_count=entry.prompt_tokens + entry.output_tokens,
+        )
+
+    @property
+    def text(self) -> str:
+        """
+        Return the recorded response text.
+
+        Raises:
+            ValueError: If reading the text failed when it was recorded
+        """
+        if self._entry.text_error is not None:
+            raise ValueError(self._entry.text_error)
+        return self._entry.text or ""
+
+
+class ReplayModel:
+    """
+    Generative model stand-in that answers calls from a cassette.
+
+    Calls are matched by their redacted prompt and images. A prompt recorded
+    several times, e.g. a retry after malformed output, is answered with its
+    recordings in order, starting over after the last one, so replaying
+    reproduces the recorded retries. Each answer takes the recorded latency
+    times latency_scale, cut off by the call's timeout.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[CassetteEntry],
+        latency_scale: float = 1.0,
+        secrets: Sequence[str] = (),
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the replay model.
+
+        Args:
+            entries: Recorded calls, in recording order
+            latency_scale: Factor applied to recorded latencies; 0 answers at once
+            secrets: Values redacted from prompts before they are matched
+            sleep: Function used to wait out latencies
+        """
+        self.latency_scale = latency_scale
+        self.secrets = secrets
+        self._sleep = sleep
+        self._recordings: Dict[str, List[CassetteEntry]] = defaultdict(list)
+        for entry in entries:
+            self._recordings[entry.key].append(entry)
+        self._next: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def generate_content(
+        self,
+        contents: Any,
+        request_options: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> ReplayedResponse:
+        """
+        Play back the next recording of a prompt.
+
+        Args:
+            contents: Prompt, or prompt and image parts
+            request_options: Request options; their timeout cuts latencies off
+            **kwargs: Other generate_content arguments, ignored
+
+        Returns:
+            The recorded response
+
+        Raises:
+            CassetteMissError: If the prompt was never recorded
+            LLMServiceError: If the recorded call failed
+            TimeoutError: If the scaled latency exceeds the call's timeout
+        """
+        prompt, images = describe_contents(contents)
+        key = prompt_key(redact(prompt, self.secrets), images)
+        with self._lock:
+            recordings = self._recordings.get(key)
+            if not recordings:
+                raise CassetteMissError(
+                    f"No recording for prompt {key[:12]}: {prompt[:80]!r}"
+                )
+            entry = recordings[self._next[key] % len(recordings)]
+            self._next[key] += 1
+
+        delay = entry.latency * self.latency_scale
+        timeout = (request_options or {}).get("timeout")
+        if timeout is not None and delay > timeout:
+            self._sleep(timeout)
+            raise TimeoutError(f"Replayed call timed out after {timeout:.3f}s")
+        self._sleep(delay)
+
+        if entry.error is not None:
+            raise LLMServiceError(f"Recorded call failed: {entry.error}")
+        return ReplayedResponse(entry)
+
+    def count_tokens(self, contents: Any, **kwargs: Any) -> SimpleNamespace:
+        """Answer token counting, e.g. the warm-up ping, without a recording."""
+        return SimpleNamespace(total_tokens=0)
+
+
+def create_replay_service(
+    path: str,
+    latency_scale: float = 1.0,
+    secrets: Sequence[str] = (),
+) -> GeminiService:
+    """
+    Create a Gemini service that answers from a cassette instead of the API.
+
+    Args:
+        path: Cassette file written while recording
+        latency_scale: Factor applied to recorded latencies
+        secrets: Values redacted from prompts before they are matched
+
+    Returns:
+        A GeminiService with its retry and parsing logic, backed by the cassette
+
+    Raises:
+        OSError: If the cassette cannot be read
+    """
+    return GeminiService(model=ReplayModel(load_cassette(path), latency_scale, secrets))
+
+
+def replay_model_from_settings() -> Optional[ReplayModel]:
+    """
+    Load the cassette named by LLM_REPLAY_PATH, if set.
+
+    Returns:
+        A ReplayModel for GeminiService, or None to call the live API
+    """
+    if not settings.llm_replay_path:
+        return None
+    return ReplayModel(
+        load_cassette(settings.llm_replay_path),
+        settings.llm_replay_latency_scale,
+        configured_secrets(),
+    )
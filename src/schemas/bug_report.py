@@ -1,7 +1,11 @@
 """Pydantic schemas for bug report validation."""
 
+from typing import Any
+
 from pydantic import BaseModel, Field
 
+from ..core.models import BugReport
+
 
 class BugReportSchema(BaseModel):
     """Schema for validating bug report JSON from LLM."""
@@ -18,3 +22,33 @@ class BugReportSchema(BaseModel):
 
     class Config:
         validate_by_name = True
+
+    @classmethod
+    def merge_field(cls, bug_report: BugReport, label: str, value: Any) -> BugReport:
+        """
+        Replace one field of a report, validating the result against the schema.
+
+        Args:
+            bug_report: Report the field belongs to
+            label: Label of the field, e.g. "Steps"
+            value: New value, as parsed from the LLM output
+
+        Returns:
+            A new report with the field replaced
+
+        Raises:
+            pydantic.ValidationError: If the value violates the field's constraints
+        """
+        data = bug_report.to_dict()
+        data[label] = value
+        return cls.model_validate(data).to_bug_report()
+
+    def to_bug_report(self) -> BugReport:
+        """Convert the validated schema into the core BugReport model."""
+        return BugReport(
+            title=self.title,
+            description=self.description_of_the_issue,
+            steps=self.steps,
+            expected_result=self.expected_result,
+            actual_result=self.actual_result,
+        )
@@ -2,5 +2,13 @@
 
 from .gemini_service import GeminiService
 from .bug_report_service import BugReportService
+from .report_rendering_service import ReportRenderingService
+from .export_service import ExportService, ExportStream
 
-__all__ = ["GeminiService", "BugReportService"]
+__all__ = [
+    "BugReportService",
+    "ExportService",
+    "ExportStream",
+    "GeminiService",
+    "ReportRenderingService",
+]
@@ -1,65 +1,368 @@
 """Main bug report service that orchestrates the business logic."""
 
-from typing import Optional
+import sys
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
 
-from ..core.interfaces import LLMService, Formatter
-from ..core.models import BugReport
-from ..core.exceptions import BugReporterError
+from ..attachments import LogExcerpt, append_log_excerpts
+from ..core.deadline import Deadline
+from ..core.exceptions import (
+    BugReporterError,
+    DeadlineExceededError,
+    RequestCancelledError,
+    ValidationError,
+)
+from ..core.interfaces import Enricher, Formatter, LLMService, ReportStore
+from ..core.models import AttemptUsage, BugReport, ImageAttachment
+from ..monitoring import MetricsRegistry
+from ..prompts import ApplicationContext
+from .enrichment import EnrichmentRun, EnrichmentSlot
+from .pipeline import (
+    CPU_BOUND,
+    CacheLookupStage,
+    EnrichStage,
+    FieldPreprocessStage,
+    FormatStage,
+    GenerateStage,
+    PersistStage,
+    Pipeline,
+    PipelineContext,
+    PreprocessStage,
+    QuotaStage,
+    RegenerateFieldStage,
+    RepairStage,
+    Stage,
+    ValidateStage,
+    generation_options,
+)
+from .preprocessing import InputPreprocessor, PreparedInput
+from .similarity_index import SimilarityIndex
+from .usage_meter import UsageMeter
 
 
 class BugReportService:
     """Main service for generating and formatting bug reports."""
 
-    def __init__(self, llm_service: LLMService, formatter: Formatter):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        formatter: Formatter,
+        preprocessor: Optional[InputPreprocessor] = None,
+        enrichers: Sequence[Enricher] = (),
+        enrichment_workers: int = 4,
+        cpu_workers: int = 0,
+        registry: Optional[MetricsRegistry] = None,
+    ):
         """
         Initialize the bug report service.
 
         Args:
             llm_service: LLM service implementation
             formatter: Formatter implementation
+            preprocessor: Input preprocessor run before the LLM
+            enrichers: Optional enrichers run alongside each generation
+            enrichment_workers: Threads the enrichers share
+            cpu_workers: Threads CPU-bound pipeline stages run in; 0 runs them
+                in the caller's thread
+            registry: Registry the pipeline stage durations are added to
         """
         self.llm_service = llm_service
         self.formatter = formatter
+        self.preprocessor = preprocessor or InputPreprocessor()
+        self.enrichers = list(enrichers)
+        self.enrichment_workers = enrichment_workers
+        self._enrichment_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.registry = registry or MetricsRegistry()
+        self.pipeline_executors: Dict[str, Executor] = {}
+        if cpu_workers > 0:
+            self.pipeline_executors[CPU_BOUND] = ThreadPoolExecutor(
+                cpu_workers, thread_name_prefix="pipeline-cpu"
+            )
+        # Pipeline of the CLI and the daemon, which neither store nor bill reports
+        self.pipeline = self.build_pipeline()
 
-    def generate_formatted_report(self, user_input: str) -> Optional[str]:
+    def build_pipeline(
+        self,
+        store: Optional[ReportStore] = None,
+        similarity_index: Optional[SimilarityIndex] = None,
+        usage_meter: Optional[UsageMeter] = None,
+        enrich: bool = True,
+        duplicate_top_k: int = 5,
+        duplicate_min_score: float = 0.3,
+        duplicate_reuse_threshold: float = 0.85,
+    ) -> Pipeline:
         """
-        Generate a bug report and format it for the target platform.
+        Assemble the report pipeline for the given collaborators.
+
+        Stages whose collaborator is missing are left out, e.g. there is no
+        cache lookup without a similarity index and nothing is persisted
+        without a store.
+
+        Args:
+            store: Store generated reports are saved to and reused from
+            similarity_index: Index of stored reports used to spot duplicates
+            usage_meter: Meter checking quotas and recording token usage
+            enrich: Whether the configured enrichers run
+            duplicate_top_k: Most duplicates reported
+            duplicate_min_score: Lowest similarity reported as a duplicate
+            duplicate_reuse_threshold: Lowest similarity at which a stored
+                report is reused
+
+        Returns:
+            The pipeline
+        """
+        stages: List[Stage] = [PreprocessStage(self.preprocessor)]
+        if similarity_index is not None and store is not None:
+            stages.append(
+                CacheLookupStage(
+                    similarity_index,
+                    store,
+                    duplicate_top_k,
+                    duplicate_min_score,
+                    duplicate_reuse_threshold,
+                )
+            )
+        if usage_meter is not None:
+            enricher_calls = len(self.enrichers) if enrich else 0
+            stages.append(QuotaStage(usage_meter, enricher_calls))
+        stages += [GenerateStage(self.llm_service), RepairStage(), ValidateStage()]
+        if enrich and self.enrichers:
+            stages.append(EnrichStage(self.start_enrichment))
+        stages.append(FormatStage(self.formatter))
+        if store is not None:
+            stages.append(PersistStage(store, similarity_index))
+        return Pipeline(stages, self.pipeline_executors, self.registry)
+
+    def build_field_pipeline(
+        self, usage_meter: Optional[UsageMeter] = None
+    ) -> Pipeline:
+        """
+        Assemble the pipeline that regenerates one field of a report.
+
+        Run it over a PipelineContext whose user_input is the report's text,
+        with bug_report, field_name and optionally instruction set; the
+        regenerated report replaces bug_report and is formatted.
+
+        Args:
+            usage_meter: Meter checking quotas and recording token usage
+
+        Returns:
+            The pipeline
+        """
+        stages: List[Stage] = [FieldPreprocessStage()]
+        if usage_meter is not None:
+            stages.append(QuotaStage(usage_meter))
+        stages += [RegenerateFieldStage(self.llm_service), FormatStage(self.formatter)]
+        return Pipeline(stages, self.pipeline_executors, self.registry)
+
+    def prepare_input(self, user_input: str) -> PreparedInput:
+        """
+        Detect the input language and reject junk without calling the LLM.
 
         Args:
             user_input: The user's description of the bug
 
         Returns:
-            Formatted bug report string or None if generation failed
+            Prepared input
 
         Raises:
+            ValidationError: If the input cannot become a bug report
+        """
+        return self.preprocessor.preprocess(user_input)
+
+    def start_enrichment(
+        self,
+        prepared: PreparedInput,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+        slot: Optional[EnrichmentSlot] = None,
+    ) -> Optional[EnrichmentRun]:
+        """
+        Start the enrichers that only need the input, to overlap the generation.
+
+        Call report_ready() on the run once the report is generated, or
+        cancel() if it is not.
+
+        Args:
+            prepared: Input returned by prepare_input
+            on_attempt: Receives the token usage of every enricher LLM attempt
+            slot: Holds an LLM scheduler slot around each enricher call
+
+        Returns:
+            The enrichment run, or None if no enrichers are configured
+        """
+        if not self.enrichers:
+            return None
+        with self._executor_lock:
+            if self._enrichment_executor is None:
+                self._enrichment_executor = ThreadPoolExecutor(
+                    self.enrichment_workers, thread_name_prefix="enricher"
+                )
+        return EnrichmentRun(
+            self._enrichment_executor,
+            self.enrichers,
+            prepared.text,
+            prepared.language,
+            on_attempt,
+            slot,
+        )
+
+    def close(self) -> None:
+        """Stop enrichment, pipeline and LLM service threads once their work ends."""
+        with self._executor_lock:
+            executor, self._enrichment_executor = self._enrichment_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        for pipeline_executor in self.pipeline_executors.values():
+            pipeline_executor.shutdown(wait=False)
+        self.llm_service.close()
+
+    def generate_bug_report(
+        self,
+        prepared: PreparedInput,
+        log_excerpts: Sequence[LogExcerpt] = (),
+        images: Sequence[ImageAttachment] = (),
+        context: Optional[ApplicationContext] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[BugReport]:
+        """
+        Call the LLM with prepared input and any attachments.
+
+        Args:
+            prepared: Input returned by prepare_input
+            log_excerpts: Excerpts of attached logs added to the prompt
+            images: Processed screenshots sent to the model
+            context: Application context placed before the prompt
+            deadline: Request deadline enforced by the LLM service
+
+        Returns:
+            BugReport instance or None if generation failed
+        """
+        return self.llm_service.generate_bug_report(
+            append_log_excerpts(prepared.text, log_excerpts),
+            language=prepared.language,
+            **generation_options(images, context, deadline),
+        )
+
+    def run_pipeline(
+        self,
+        user_input: str,
+        log_excerpts: Sequence[LogExcerpt] = (),
+        images: Sequence[ImageAttachment] = (),
+        context: Optional[ApplicationContext] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> PipelineContext:
+        """
+        Run the CLI pipeline over one input in the calling thread.
+
+        Args:
+            user_input: The user's description of the bug
+            log_excerpts: Excerpts of attached logs added to the prompt
+            images: Processed screenshots sent to the model
+            context: Application context placed before the prompt
+            deadline: Request deadline enforced by the LLM service
+
+        Returns:
+            The pipeline context; its formatted_report is None if generation
+            failed
+
+        Raises:
+            ValidationError: If the input is rejected before generation
+            DeadlineExceededError: If the deadline passes first
+            RequestCancelledError: If the request is cancelled
             BugReporterError: If the process fails
         """
+        ctx = PipelineContext(
+            user_input, log_excerpts, images, context, deadline=deadline
+        )
         try:
-            bug_report: BugReport = self.llm_service.generate_bug_report(user_input)
+            return self.pipeline.run(ctx)
+        except (ValidationError, DeadlineExceededError, RequestCancelledError):
+            raise
+        except Exception as e:
+            raise BugReporterError(f"Failed to generate formatted report: {e}") from e
 
-            if bug_report is None:
-                return None
-            formatted_report = self.formatter.format(bug_report)
+    def generate_formatted_report(
+        self,
+        user_input: str,
+        log_excerpts: Sequence[LogExcerpt] = (),
+        images: Sequence[ImageAttachment] = (),
+        context: Optional[ApplicationContext] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[str]:
+        """
+        Generate a bug report and format it for the target platform.
 
-            return formatted_report
+        Args:
+            user_input: The user's description of the bug
+            log_excerpts: Excerpts of attached logs added to the prompt
+            images: Processed screenshots sent to the model
+            context: Application context placed before the prompt
+            deadline: Request deadline enforced by the LLM service
 
-        except Exception as e:
-            raise BugReporterError(f"Failed to generate formatted report: {e}")
+        Returns:
+            Formatted bug report string or None if generation failed
 
-    def process_bug_report(self, user_input: str) -> None:
+        Raises:
+            ValidationError: If the input is rejected before generation
+            DeadlineExceededError: If the deadline passes first
+            RequestCancelledError: If the request is cancelled
+            BugReporterError: If the process fails
+        """
+        ctx = self.run_pipeline(user_input, log_excerpts, images, context, deadline)
+        return ctx.formatted_report
+
+    def process_bug_report(
+        self,
+        user_input: str,
+        log_excerpts: Sequence[LogExcerpt] = (),
+        context: Optional[ApplicationContext] = None,
+        deadline: Optional[Deadline] = None,
+        show_timings: bool = False,
+    ) -> None:
         """
         Process a bug report and print the results.
 
+        Enrichments are printed after the report, each as soon as it arrives.
+
         Args:
             user_input: The user's description of the bug
+            log_excerpts: Excerpts of attached logs added to the prompt
+            context: Application context placed before the prompt
+            deadline: Request deadline enforced by the LLM service
+            show_timings: Print the time spent in each stage to stderr
         """
         try:
-            formatted_report = self.generate_formatted_report(user_input)
-            if formatted_report:
-                print("Generated Bug Report:")
-                print("=" * 50)
-                print(formatted_report)
-            else:
+            ctx = self.run_pipeline(
+                user_input, log_excerpts, context=context, deadline=deadline
+            )
+            if show_timings:
+                self._print_timings(ctx.timings)
+            if ctx.formatted_report is None:
                 print("Failed to generate bug report")
+                return
+            self._print_report(ctx.formatted_report)
+            if ctx.enrichment is None:
+                return
+            titles = {enricher.name: enricher.title for enricher in self.enrichers}
+            for result in ctx.enrichment.as_completed():
+                if result.content:
+                    print()
+                    print(f"{titles[result.name]}:")
+                    print(result.content)
         except Exception as e:
             print(f"Error processing bug report: {e}")
+
+    @staticmethod
+    def _print_report(formatted_report: str) -> None:
+        """Print a formatted report under a heading."""
+        print("Generated Bug Report:")
+        print("=" * 50)
+        print(formatted_report)
+
+    @staticmethod
+    def _print_timings(timings: Dict[str, float]) -> None:
+        """Print the time spent in each pipeline stage to stderr."""
+        for name, seconds in timings.items():
+            print(f"{name:>10}: {seconds * 1000:8.1f} ms", file=sys.stderr)
@@ -0,0 +1,88 @@
+"""Circuit breaker guarding calls to the upstream LLM provider."""
+
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing upstream until it has had time to recover.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are refused. Once ``reset_timeout`` seconds have passed a single
+    trial call is let through (half-open); its outcome closes or re-opens the
+    circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Return the current circuit state."""
+        with self._lock:
+            return self._state()
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while calls are being refused."""
+        return self.state == OPEN
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may be made now.
+
+        Returns:
+            True if the call may proceed
+        """
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful upstream call and close the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed upstream call, opening the circuit past the threshold."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Give back a call allowed by allow_request without recording an outcome."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _state(self) -> str:
+        """Compute the state; callers must hold the lock."""
+        if self._failures < self.failure_threshold:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
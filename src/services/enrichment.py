@@ -0,0 +1,367 @@
+"""Optional enrichers run alongside report generation, each with its own timeout."""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Executor, Future
+from concurrent.futures import wait as wait_futures
+from contextlib import nullcontext
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from ..core.deadline import Deadline
+from ..core.exceptions import DeadlineExceededError, RequestCancelledError
+from ..core.interfaces import Enricher, LLMService
+from ..core.models import AttemptUsage, BugReport, EnrichmentResult
+from ..prompts import EnrichmentPrompts
+from ..prompts.enrichment_prompts import NO_INFO_GAPS
+
+# Enrichment statuses
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+
+# Seconds between checks on enrichers still queued for a worker thread
+_QUEUED_POLL_INTERVAL = 0.05
+
+# Holds an LLM slot around one enricher call, given the enricher's deadline
+EnrichmentSlot = Callable[[Deadline], ContextManager[Any]]
+
+
+class RootCauseEnricher(Enricher):
+    """Suggests likely root causes from the user's description alone."""
+
+    name = "root_cause"
+    title = "Possible root cause"
+
+    def __init__(self, llm_service: LLMService, timeout: float):
+        """
+        Initialize the enricher.
+
+        Args:
+            llm_service: LLM service answering the prompt
+            timeout: Seconds the enricher may take once started
+        """
+        super().__init__(timeout)
+        self.llm_service = llm_service
+
+    def enrich(
+        self,
+        user_input: str,
+        language: Optional[str],
+        bug_report: Optional[BugReport],
+        deadline: Deadline,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[str]:
+        """Ask the LLM for likely root causes; see Enricher.enrich."""
+        return self.llm_service.generate_text(
+            EnrichmentPrompts.create_root_cause_prompt(user_input, language),
+            EnrichmentPrompts.prompt_version(self.name, language),
+            deadline=deadline,
+            on_attempt=on_attempt,
+        )
+
+
+class InfoGapEnricher(Enricher):
+    """Tells the reporter what information the generated report is missing."""
+
+    name = "info_gaps"
+    title = "Information worth adding"
+    needs_report = True
+
+    def __init__(self, llm_service: LLMService, timeout: float):
+        """
+        Initialize the enricher.
+
+        Args:
+            llm_service: LLM service answering the prompt
+            timeout: Seconds the enricher may take once started
+        """
+        super().__init__(timeout)
+        self.llm_service = llm_service
+
+    def enrich(
+        self,
+        user_input: str,
+        language: Optional[str],
+        bug_report: Optional[BugReport],
+        deadline: Deadline,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[str]:
+        """Ask the LLM what the report is missing; see Enricher.enrich."""
+        if bug_report is None:
+            raise ValueError(f"Enricher '{self.name}' needs the generated report")
+        tips = self.llm_service.generate_text(
+            EnrichmentPrompts.create_info_gap_prompt(
+                list(bug_report.labeled_fields()), language
+            ),
+            EnrichmentPrompts.prompt_version(self.name, language),
+            deadline=deadline,
+            on_attempt=on_attempt,
+        )
+        if tips is None or tips.strip().upper() == NO_INFO_GAPS:
+            return None
+        return tips
+
+
+# Enricher classes by the name used in ENRICHERS
+ENRICHER_TYPES = {
+    RootCauseEnricher.name: RootCauseEnricher,
+    InfoGapEnricher.name: InfoGapEnricher,
+}
+
+
+def create_enrichers(
+    llm_service: LLMService, timeouts: Mapping[str, float]
+) -> List[Enricher]:
+    """
+    Create the configured enrichers.
+
+    Args:
+        llm_service: LLM service the enrichers call
+        timeouts: Timeout in seconds by enricher name, e.g. {"root_cause": 20}
+
+    Returns:
+        The enrichers, in configuration order
+
+    Raises:
+        ValueError: If an enricher name is unknown
+    """
+    enrichers = []
+    for name, timeout in timeouts.items():
+        enricher_type = ENRICHER_TYPES.get(name)
+        if enricher_type is None:
+            raise ValueError(
+                f"Unknown enricher '{name}'; "
+                f"expected one of {', '.join(ENRICHER_TYPES)}"
+            )
+        enrichers.append(enricher_type(llm_service, timeout))
+    return enrichers
+
+
+class _Job:
+    """One enricher of a run."""
+
+    def __init__(self, enricher: Enricher):
+        """Remember the enricher; it is started later."""
+        self.enricher = enricher
+        self.future: Optional[Future] = None
+        self.deadline: Optional[Deadline] = None
+        self.cancelled = False
+
+
+class EnrichmentRun:
+    """
+    The enrichers working on one report.
+
+    Enrichers that only need the user input start when the run is created, so
+    they overlap the main generation; the others start at report_ready(). Each
+    runs in the executor under its own deadline, which starts when a worker
+    thread picks the enricher up, and nothing here blocks the caller unless
+    it asks to wait.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        enrichers: Sequence[Enricher],
+        user_input: str,
+        language: Optional[str] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+        slot: Optional[EnrichmentSlot] = None,
+    ):
+        """
+        Start the enrichers that do not need the report.
+
+        Args:
+            executor: Executor the enrichers run in
+            enrichers: Enrichers to run
+            user_input: The prepared user input
+            language: Detected input language, or None if unknown
+            on_attempt: Called with the token usage of every LLM attempt
+            slot: Holds an LLM scheduler slot around each enricher call
+        """
+        self._executor = executor
+        self._user_input = user_input
+        self._language = language
+        self._on_attempt = on_attempt
+        self._slot = slot
+        self._jobs = [_Job(enricher) for enricher in enrichers]
+        for job in self._jobs:
+            if not job.enricher.needs_report:
+                self._start(job, None)
+
+    @property
+    def names(self) -> List[str]:
+        """Return the names of the enrichers in the run."""
+        return [job.enricher.name for job in self._jobs]
+
+    def report_ready(self, bug_report: BugReport) -> None:
+        """
+        Start the enrichers that need the generated report.
+
+        Args:
+            bug_report: The generated report
+        """
+        for job in self._jobs:
+            if job.enricher.needs_report and job.future is None and not job.cancelled:
+                self._start(job, bug_report)
+
+    def cancel(self) -> None:
+        """Stop the run, e.g. because the report was not generated."""
+        for job in self._jobs:
+            job.cancelled = True
+            if job.deadline is not None:
+                job.deadline.cancel()
+            if job.future is not None:
+                job.future.cancel()
+
+    def results(self) -> List[EnrichmentResult]:
+        """Return the current state of every enricher without waiting."""
+        return [self._result(job) for job in self._jobs]
+
+    def wait(self, timeout: Optional[float] = None) -> List[EnrichmentResult]:
+        """
+        Wait until the started enrichers finish or time out.
+
+        Args:
+            timeout: Most seconds to wait, or None for up to the enrichers' timeouts
+
+        Returns:
+            The state of every enricher afterwards
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        for job in self._jobs:
+            while self._result(job).status == PENDING and job.future is not None:
+                wait_timeout = self._wait_timeout(job)
+                if end is not None:
+                    left = end - time.monotonic()
+                    if left <= 0:
+                        return self.results()
+                    wait_timeout = min(wait_timeout, left)
+                wait_futures([job.future], wait_timeout)
+        return self.results()
+
+    def as_completed(self) -> Iterator[EnrichmentResult]:
+        """
+        Yield the result of each started enricher as soon as it is final.
+
+        Returns:
+            Iterator over results, finished ones first; timed-out enrichers
+            are yielded once their deadline passes
+        """
+        pending = [job for job in self._jobs if job.future is not None]
+        while pending:
+            wait_futures(
+                [job.future for job in pending if job.future is not None],
+                min(self._wait_timeout(job) for job in pending),
+                return_when=FIRST_COMPLETED,
+            )
+            still_pending = []
+            for job in pending:
+                result = self._result(job)
+                if result.status == PENDING:
+                    still_pending.append(job)
+                else:
+                    yield result
+            pending = still_pending
+
+    def _start(self, job: _Job, bug_report: Optional[BugReport]) -> None:
+        """Submit an enricher to the executor."""
+        job.future = self._executor.submit(self._run_job, job, bug_report)
+
+    def _run_job(self, job: _Job, bug_report: Optional[BugReport]) -> Optional[str]:
+        """Run an enricher in a worker thread under a deadline starting now."""
+        deadline = job.deadline = Deadline(job.enricher.timeout)
+        if job.cancelled:
+            deadline.cancel()
+        kwargs = {"on_attempt": self._on_attempt} if self._on_attempt else {}
+        slot = self._slot(deadline) if self._slot is not None else nullcontext()
+        with slot:
+            # Skip the call if waiting for the slot used up the deadline
+            deadline.check()
+            return job.enricher.enrich(
+                self._user_input, self._language, bug_report, deadline, **kwargs
+            )
+
+    @staticmethod
+    def _wait_timeout(job: _Job) -> float:
+        """Return how long to wait for a job before checking it again."""
+        if job.deadline is None:
+            return _QUEUED_POLL_INTERVAL
+        remaining = job.deadline.remaining()
+        return _QUEUED_POLL_INTERVAL if remaining is None else remaining
+
+    @staticmethod
+    def _result(job: _Job) -> EnrichmentResult:
+        """Describe the state of one enricher."""
+        name = job.enricher.name
+        future = job.future
+        if future is None:
+            if job.cancelled:
+                return EnrichmentResult(name, FAILED, error="Cancelled")
+            return EnrichmentResult(name, PENDING)
+        if not future.done():
+            if job.deadline is not None and job.deadline.expired:
+                return EnrichmentResult(name, TIMED_OUT)
+            return EnrichmentResult(name, PENDING)
+        if future.cancelled():
+            return EnrichmentResult(name, FAILED, error="Cancelled")
+        error = future.exception()
+        if isinstance(error, DeadlineExceededError):
+            return EnrichmentResult(name, TIMED_OUT)
+        if isinstance(error, RequestCancelledError):
+            return EnrichmentResult(name, FAILED, error="Cancelled")
+        if error is not None:
+            return EnrichmentResult(name, FAILED, error=str(error))
+        return EnrichmentResult(name, DONE, content=future.result())
+
+
+class EnrichmentTracker:
+    """The enrichment runs of recent reports, by report ID."""
+
+    def __init__(self, max_runs: int = 1000):
+        """
+        Initialize the tracker.
+
+        Args:
+            max_runs: Number of recent runs kept; older ones are forgotten
+        """
+        self.max_runs = max_runs
+        self._runs: OrderedDict[str, EnrichmentRun] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def track(self, report_id: str, run: EnrichmentRun) -> None:
+        """
+        Remember the enrichment run of a stored report.
+
+        Args:
+            report_id: ID of the stored report
+            run: The report's enrichment run
+        """
+        with self._lock:
+            self._runs[report_id] = run
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+
+    def get(self, report_id: str) -> Optional[EnrichmentRun]:
+        """
+        Look up the enrichment run of a report.
+
+        Args:
+            report_id: ID of the stored report
+
+        Returns:
+            The run, or None if the report had none or it was forgotten
+        """
+        with self._lock:
+            return self._runs.get(report_id)
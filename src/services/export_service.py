@@ -0,0 +1,149 @@
+"""Bulk export of stored or freshly generated bug reports."""
+
+import itertools
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Optional
+
+from ..core.exceptions import BugReporterError, ValidationError
+from ..core.interfaces import ReportStore
+from ..core.models import StoredReport
+from ..export.exporters import DEFAULT_CHUNK_SIZE, create_exporter
+from .bug_report_service import BugReportService
+
+
+@dataclass
+class ExportStream:
+    """A lazily produced export and the metadata needed to serve it."""
+
+    media_type: str
+    filename: str
+    chunks: Iterator[bytes]
+    next_cursor: Optional[str] = None
+
+
+class ExportService:
+    """Stream reports out of a store in constant memory."""
+
+    def __init__(
+        self,
+        store: ReportStore,
+        batch_size: int = 500,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Initialize the export service.
+
+        Args:
+            store: Store holding generated bug reports
+            batch_size: Reports fetched from the store per round trip
+            chunk_size: Approximate bytes per streamed chunk
+        """
+        self.store = store
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+
+    def export(
+        self,
+        format_name: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> ExportStream:
+        """
+        Export stored reports created in [since, until), oldest first.
+
+        Args:
+            format_name: Export format (ndjson, csv or jira-csv)
+            since: Only reports created at or after this time
+            until: Only reports created before this time
+            after: Cursor from a previous page; resumes right after that report
+            limit: Maximum number of reports in this page
+
+        Returns:
+            Export stream; next_cursor is set if more reports follow the page
+
+        Raises:
+            ValidationError: If the format, range, cursor or limit is invalid
+        """
+        if since is not None and until is not None and since >= until:
+            raise ValidationError("'since' must be earlier than 'until'")
+        if limit is not None and limit < 1:
+            raise ValidationError("'limit' must be at least 1")
+        # Checked up front: once streaming starts, errors cannot change the status
+        if after is not None and self.store.get(after) is None:
+            raise ValidationError(f"Unknown cursor '{after}'")
+
+        batch_size = self.batch_size if limit is None else min(self.batch_size, limit)
+        reports: Iterable[StoredReport] = self.store.iter_reports(
+            batch_size=batch_size, since=since, until=until, after=after
+        )
+        next_cursor = None
+        if limit is not None:
+            reports = itertools.islice(reports, limit)
+            next_cursor = self.store.page_end(limit, since, until, after)
+
+        stream = self.export_reports(format_name, reports)
+        stream.next_cursor = next_cursor
+        return stream
+
+    def export_reports(
+        self, format_name: str, reports: Iterable[StoredReport]
+    ) -> ExportStream:
+        """
+        Export an arbitrary iterable of reports.
+
+        Args:
+            format_name: Export format (ndjson, csv or jira-csv)
+            reports: Reports to export; consumed lazily
+
+        Returns:
+            Export stream
+
+        Raises:
+            ValidationError: If the format is unknown
+        """
+        exporter = create_exporter(format_name)
+        return ExportStream(
+            media_type=exporter.media_type,
+            filename=f"bug-reports.{exporter.file_extension}",
+            chunks=exporter.stream(reports, self.chunk_size),
+        )
+
+    def generate_reports(
+        self,
+        bug_report_service: BugReportService,
+        inputs: Iterable[str],
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Iterator[StoredReport]:
+        """
+        Generate, store and yield a report for each input, one at a time.
+
+        Inputs that are blank are skipped. Inputs that fail are reported to
+        `on_error` and skipped, so one bad line does not abort a batch.
+
+        Args:
+            bug_report_service: Service used to generate the reports
+            inputs: Bug descriptions, e.g. the lines of a file
+            on_error: Called with the input and the error for failed inputs
+
+        Returns:
+            Iterator over the stored reports
+        """
+        for user_input in inputs:
+            user_input = user_input.strip()
+            if not user_input:
+                continue
+            try:
+                prepared = bug_report_service.prepare_input(user_input)
+                bug_report = bug_report_service.llm_service.generate_bug_report(
+                    prepared.text, language=prepared.language
+                )
+                if bug_report is None:
+                    raise ValidationError("Failed to generate bug report")
+            except BugReporterError as e:
+                if on_error is not None:
+                    on_error(user_input, e)
+                continue
+            yield self.store.save(user_input, bug_report)
@@ -1,54 +1,359 @@
 """Gemini AI service implementation."""
 
-from typing import Optional
-import json
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, TypeVar
+
 import google.generativeai as genai
-from pydantic import ValidationError
+from google.generativeai.types import RequestOptionsType
+from pydantic import TypeAdapter, ValidationError
 
-from ..core.interfaces import LLMService
-from ..core.models import BugReport
-from ..core.exceptions import LLMServiceError
 from ..config import settings
+from ..core.deadline import Deadline
+from ..core.exceptions import (
+    DeadlineExceededError,
+    KeyPoolExhaustedError,
+    LLMServiceError,
+    RequestCancelledError,
+)
+from ..core.interfaces import LLMService
+from ..core.models import AttemptUsage, BugReport, ImageAttachment
 from ..prompts import BugReportPrompts
 from ..schemas.bug_report import BugReportSchema
+from .circuit_breaker import CircuitBreaker
+from .key_pool import ApiKeyPool, KeyPoolModel, create_client, key_pool_from_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# JSON object returned by the field regeneration prompt
+_FIELD_VALUES = TypeAdapter(Dict[str, Any])
 
 
 class GeminiService(LLMService):
     """Gemini AI implementation of the LLM service."""
 
-    def __init__(self):
-        """Initialize the Gemini service."""
-        settings.validate()
-        genai.configure(api_key=settings.gemini_api_key)
-        self.model_name = settings.gemini_model
+    def __init__(
+        self,
+        model: Optional[Any] = None,
+        model_name: Optional[str] = None,
+        key_pool: Optional[ApiKeyPool] = None,
+    ) -> None:
+        """
+        Initialize the Gemini service.
+
+        Args:
+            model: Object standing in for the generative model, e.g. a replay
+                model; API keys are then neither required nor used
+            model_name: Gemini model to call instead of GEMINI_MODEL
+            key_pool: API keys to call with, shared with other services using
+                the same keys; built from settings if not given
+        """
+        self.key_pool: Optional[ApiKeyPool] = None
+        if model is None:
+            settings.validate()
+            self.key_pool = key_pool or key_pool_from_settings()
+        self.model_name = model_name or settings.gemini_model
         self.max_retries = settings.max_retries
+        self.attempt_timeout = settings.llm_attempt_timeout
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=settings.circuit_failure_threshold,
+            reset_timeout=settings.circuit_reset_timeout,
+        )
+        self._model: Optional[Any] = model
+
+    def wrap_model(self, wrapper: Callable[[Any], Any]) -> None:
+        """
+        Replace the model with a wrapper around it, e.g. one that records calls.
+
+        Args:
+            wrapper: Called with the current model; returns its replacement
+        """
+        self._model = wrapper(self._get_model())
+
+    def _get_model(self) -> Any:
+        """Return the generative model, creating it once and reusing it afterwards."""
+        if self._model is None:
+            assert self.key_pool is not None
+            self._model = KeyPoolModel(self.key_pool, self._create_model)
+        return self._model
 
-    def generate_bug_report(self, user_input: str) -> Optional[BugReport]:
+    def _create_model(self, api_key: str) -> Any:
+        """
+        Create the generative model of one API key.
+
+        Args:
+            api_key: Key the model's calls are made with
+
+        Returns:
+            A model with its own client, independent of genai.configure()
+        """
+        generation_config = genai.GenerationConfig(
+            temperature=0.1,
+        )
+        model = genai.GenerativeModel(
+            self.model_name, generation_config=generation_config
+        )
+        # The SDK only takes keys process-wide; a client set on the model wins
+        model._client = create_client(api_key)
+        return model
+
+    def warm_up(self, probe: bool = False) -> None:
+        """
+        Create the model and open the upstream connection before real traffic.
+
+        Args:
+            probe: Also run a one-token generation to verify the model works
+
+        Raises:
+            LLMServiceError: If the upstream cannot be reached
+        """
+        model = self._get_model()
+        try:
+            # count_tokens is a cheap RPC that establishes the connection
+            model.count_tokens("ping")
+            if probe:
+                model.generate_content(
+                    "Reply with OK.", generation_config={"max_output_tokens": 1}
+                )
+        except KeyPoolExhaustedError:
+            # No key was free, so the upstream was never asked
+            raise
+        except Exception as e:
+            self.circuit_breaker.record_failure()
+            raise LLMServiceError(f"Warm-up failed: {e}") from e
+        self.circuit_breaker.record_success()
+
+    def is_available(self) -> bool:
+        """Return False while the circuit to the Gemini API is open."""
+        return not self.circuit_breaker.is_open
+
+    def generate_bug_report(
+        self,
+        user_input: str,
+        language: Optional[str] = None,
+        images: Sequence[ImageAttachment] = (),
+        context_prefix: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
         """
         Generate a structured bug report from user input using Gemini API with JSON parsing.
 
         Args:
             user_input: The user's description of the bug
+            language: Detected input language; selects a compact prompt if known
+            images: Screenshots sent as inline image parts after the prompt
+            context_prefix: Precompiled application context placed before the prompt
+            deadline: Request deadline; caps each attempt's timeout and stops retries
+            on_attempt: Called with the token usage and latency of every attempt
+
+        Returns:
+            BugReport instance or None if generation failed
+
+        Raises:
+            LLMServiceError: If API calls fail after all retries
+            DeadlineExceededError: If the deadline passes before a report is made
+            RequestCancelledError: If the request is cancelled
+        """
+        prompt = BugReportPrompts.create_bug_report_prompt(
+            user_input, language, context_prefix
+        )
+
+        return self._generate(
+            self._contents(prompt, images),
+            BugReportPrompts.prompt_version(language),
+            parse_bug_report,
+            deadline,
+            on_attempt,
+        )
+
+    def regenerate_field(
+        self,
+        bug_report: BugReport,
+        field: str,
+        instruction: Optional[str] = None,
+        language: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
+        """
+        Regenerate one field with a minimal prompt that asks only for that field.
+
+        Args:
+            bug_report: The report to refine
+            field: BugReport attribute to regenerate, e.g. "steps"
+            instruction: What the user wants changed, if anything
+            language: Language of the report; English if unknown
+            deadline: Request deadline; caps each attempt's timeout and stops retries
+            on_attempt: Called with the token usage and latency of every attempt
+
+        Returns:
+            The report with the field replaced, or None if generation failed
+
+        Raises:
+            ValueError: If field is not a BugReport field
+            LLMServiceError: If API calls fail after all retries
+            DeadlineExceededError: If the deadline passes before a field is made
+            RequestCancelledError: If the request is cancelled
+        """
+        labels = {attribute: label for label, attribute in BugReport.FIELD_LABELS}
+        if field not in labels:
+            raise ValueError(f"Unknown bug report field '{field}'")
+        label = labels[field]
+        prompt = BugReportPrompts.create_field_prompt(
+            list(bug_report.labeled_fields()), label, instruction, language
+        )
+
+        def parse(response_text: str) -> Optional[BugReport]:
+            value = _FIELD_VALUES.validate_json(response_text).get(label)
+            merged = BugReportSchema.merge_field(bug_report, label, value)
+            return merged if getattr(merged, field).strip() else None
+
+        return self._generate(
+            prompt,
+            BugReportPrompts.field_prompt_version(language),
+            parse,
+            deadline,
+            on_attempt,
+        )
+
+    def generate_bug_report_from_prompt(
+        self,
+        prompt: str,
+        prompt_version: str,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
+        """
+        Generate a bug report from a complete prompt, with the usual retries.
+
+        Args:
+            prompt: Complete prompt asking for the bug report JSON
+            prompt_version: Name and version of the prompt, reported with the usage
+            deadline: Deadline of the call; caps each attempt's timeout and stops
+                retries
+            on_attempt: Called with the token usage and latency of every attempt
 
         Returns:
             BugReport instance or None if generation failed
 
         Raises:
             LLMServiceError: If API calls fail after all retries
+            DeadlineExceededError: If the deadline passes first
+            RequestCancelledError: If the deadline is cancelled
+        """
+        return self._generate(
+            prompt, prompt_version, parse_bug_report, deadline, on_attempt
+        )
+
+    def generate_text(
+        self,
+        prompt: str,
+        prompt_version: str,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[str]:
         """
-        prompt = BugReportPrompts.create_bug_report_prompt(user_input)
+        Answer a free-form prompt, retrying empty answers.
 
+        Args:
+            prompt: Complete prompt
+            prompt_version: Name and version of the prompt, reported with the usage
+            deadline: Deadline of the call; caps each attempt's timeout and stops
+                retries
+            on_attempt: Called with the token usage and latency of every attempt
+
+        Returns:
+            The answer, or None if every attempt came back empty
+
+        Raises:
+            LLMServiceError: If API calls fail after all retries
+            DeadlineExceededError: If the deadline passes first
+            RequestCancelledError: If the deadline is cancelled
+        """
+        return self._generate(
+            prompt, prompt_version, lambda text: text or None, deadline, on_attempt
+        )
+
+    def _generate(
+        self,
+        contents: Any,
+        prompt_version: str,
+        parse: Callable[[str], Optional[T]],
+        deadline: Optional[Deadline],
+        on_attempt: Optional[Callable[[AttemptUsage], None]],
+    ) -> Optional[T]:
+        """
+        Call the model until its output parses, retrying up to max_retries times.
+
+        Args:
+            contents: Request contents for generate_content
+            prompt_version: Version of the prompt, reported with the usage
+            parse: Turns the response text into the result; returns None for
+                output with empty fields and raises ValidationError for output
+                that does not match the schema, both of which are retried
+            deadline: Request deadline; caps each attempt's timeout and stops retries
+            on_attempt: Called with the token usage and latency of every attempt
+
+        Returns:
+            The parsed result, or None if no attempt produced a valid one
+
+        Raises:
+            LLMServiceError: If API calls fail after all retries
+            DeadlineExceededError: If the deadline passes first
+            RequestCancelledError: If the request is cancelled
+        """
         for attempt in range(self.max_retries):
-            try:
-                generation_config = genai.GenerationConfig(
-                    temperature=0.1,
+            # Never start an attempt for a client that is gone or out of time
+            if deadline is not None:
+                deadline.check()
+            if not self.circuit_breaker.allow_request():
+                raise LLMServiceError(
+                    "Gemini API is temporarily unavailable (circuit open)"
                 )
 
-                model = genai.GenerativeModel(
-                    self.model_name, generation_config=generation_config
-                )
+            try:
+                model = self._get_model()
 
-                response = model.generate_content(prompt)
+                started = time.perf_counter()
+                try:
+                    response = model.generate_content(
+                        contents, request_options=self._request_options(deadline)
+                    )
+                except KeyPoolExhaustedError:
+                    # Every key is locally rate limited or cooling down: the
+                    # upstream was never asked, and retrying at once cannot help
+                    self.circuit_breaker.release()
+                    raise
+                except Exception:
+                    if on_attempt is not None:
+                        on_attempt(
+                            AttemptUsage(
+                                self.model_name,
+                                prompt_version,
+                                0,
+                                0,
+                                time.perf_counter() - started,
+                                succeeded=False,
+                            )
+                        )
+                    if deadline is not None and (
+                        deadline.expired or deadline.cancelled
+                    ):
+                        # Cut short by this request's deadline, not an upstream fault
+                        self.circuit_breaker.release()
+                        deadline.check()
+                    self.circuit_breaker.record_failure()
+                    raise
+                self.circuit_breaker.record_success()
+                if on_attempt is not None:
+                    on_attempt(
+                        self._attempt_usage(
+                            response, prompt_version, time.perf_counter() - started
+                        )
+                    )
 
                 try:
                     # Parse the JSON response
@@ -60,41 +365,34 @@ class GeminiService(LLMService):
                     if response_text.endswith("```"):
                         response_text = response_text[:-3]
 
-                    response_text = response_text.strip()
-
-                    data = json.loads(response_text)
-
-                    validated_data = BugReportSchema(**data)
-
-                    bug_report = BugReport(
-                        title=validated_data.title,
-                        description=validated_data.description_of_the_issue,
-                        steps=validated_data.steps,
-                        expected_result=validated_data.expected_result,
-                        actual_result=validated_data.actual_result,
-                    )
-
-                    if (
-                        bug_report.title.strip()
-                        and bug_report.description.strip()
-                        and bug_report.steps.strip()
-                    ):
-                        return bug_report
+                    result = parse(response_text.strip())
+                    if result is not None:
+                        return result
                     else:
-                        print(
-                            f"Attempt {attempt + 1}: Generated bug report has empty fields, retrying..."
+                        logger.warning(
+                            "Attempt %d: generated output has empty fields, retrying",
+                            attempt + 1,
                         )
                         continue
 
-                except (json.JSONDecodeError, ValidationError) as e:
-                    print(f"Attempt {attempt + 1}: Schema validation failed - {e}")
-                    if attempt == self.max_retries - 1:
-                        print("Raw response that failed parsing:")
-                        print(response.text)
+                except ValidationError as e:
+                    logger.warning(
+                        "Attempt %d: schema validation failed: %s",
+                        attempt + 1,
+                        _describe_errors(e),
+                    )
+                    # The raw output may quote the user's report, so debug only
+                    logger.debug("Response that failed parsing: %s", response.text)
                     continue
 
+            except (
+                DeadlineExceededError,
+                RequestCancelledError,
+                KeyPoolExhaustedError,
+            ):
+                raise
             except Exception as e:
-                print(f"Attempt {attempt + 1}: API call failed - {e}")
+                logger.warning("Attempt %d: API call failed: %s", attempt + 1, e)
                 if attempt == self.max_retries - 1:
                     raise LLMServiceError(
                         f"Failed to generate bug report after {self.max_retries} attempts: {e}"
@@ -102,3 +400,99 @@ class GeminiService(LLMService):
                 continue
 
         return None
+
+    def _attempt_usage(
+        self, response: Any, prompt_version: str, latency: float
+    ) -> AttemptUsage:
+        """
+        Read the token counts of a completed attempt from its usage metadata.
+
+        Args:
+            response: Response returned by generate_content
+            prompt_version: Version of the prompt that was sent
+            latency: Seconds the call took
+
+        Returns:
+            Usage of the attempt; counts missing from the response are 0
+        """
+        metadata = getattr(response, "usage_metadata", None)
+
+        def count(name: str) -> int:
+            value = getattr(metadata, name, 0)
+            return value if isinstance(value, int) else 0
+
+        return AttemptUsage(
+            self.model_name,
+            prompt_version,
+            count("prompt_token_count"),
+            count("candidates_token_count"),
+            latency,
+            succeeded=True,
+        )
+
+    def _request_options(self, deadline: Optional[Deadline]) -> RequestOptionsType:
+        """
+        Build per-call request options with the attempt timeout.
+
+        Args:
+            deadline: Request deadline capping the timeout, if any
+
+        Returns:
+            Request options for generate_content
+        """
+        timeout = self.attempt_timeout
+        if deadline is not None:
+            timeout = deadline.cap(timeout)
+        return {"timeout": timeout}
+
+    @staticmethod
+    def _contents(prompt: str, images: Sequence[ImageAttachment]) -> Any:
+        """
+        Build the request contents: the prompt alone, or followed by image parts.
+
+        Args:
+            prompt: Text prompt
+            images: Screenshots to send inline
+
+        Returns:
+            Contents accepted by generate_content
+        """
+        if not images:
+            return prompt
+        return [
+            prompt,
+            "Screenshots attached by the user:",
+            *({"mime_type": image.mime_type, "data": image.data} for image in images),
+        ]
+
+
+def parse_bug_report(response_text: str) -> Optional[BugReport]:
+    """
+    Parse a bug report generation's output.
+
+    Args:
+        response_text: Model output without code fences
+
+    Returns:
+        The report, or None if its title, description or steps are empty
+
+    Raises:
+        ValidationError: If the output does not match the schema
+    """
+    # Parse and validate in one pass, without an intermediate dict
+    bug_report = BugReportSchema.model_validate_json(response_text).to_bug_report()
+    if (
+        bug_report.title.strip()
+        and bug_report.description.strip()
+        and bug_report.steps.strip()
+    ):
+        return bug_report
+    return None
+
+
+def _describe_errors(error: ValidationError) -> str:
+    """Summarize validation errors without the input values they quote."""
+    return "; ".join(
+        f"{'.'.join(map(str, details['loc'])) or 'response'}: {details['msg']}"
+        for details in error.errors(include_url=False, include_input=False)
+    )
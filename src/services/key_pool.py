@@ -0,0 +1,272 @@
+"""Pool of Gemini API keys, each with its own client, spread over by use."""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+import google.ai.generativelanguage as glm
+from google.api_core import exceptions as api_exceptions
+
+from ..config import settings
+from ..core.exceptions import KeyPoolExhaustedError
+
+logger = logging.getLogger(__name__)
+
+# Key selection strategies
+LRU = "lru"
+QUOTA = "quota"
+STRATEGIES = (LRU, QUOTA)
+
+# Gemini rate limits keys per minute
+QUOTA_WINDOW = 60.0
+
+# Errors that say the key, not the request, is the problem: rate limits and
+# keys that are revoked or not valid at all
+_KEY_ERRORS = (
+    api_exceptions.ResourceExhausted,
+    api_exceptions.TooManyRequests,
+    api_exceptions.Unauthenticated,
+)
+
+# Errors that only blame the key when their reason names it, e.g.
+# API_KEY_INVALID or API_KEY_SERVICE_BLOCKED; a 403 on a model the project
+# cannot use would fail the same way with every key
+_KEY_REASON_ERRORS = (api_exceptions.InvalidArgument, api_exceptions.PermissionDenied)
+_KEY_REASON_PREFIX = "API_KEY_"
+
+
+def is_key_error(error: BaseException) -> bool:
+    """
+    Check whether an API error should take the key that caused it out of use.
+
+    Args:
+        error: Error raised by a Gemini call
+
+    Returns:
+        True for rate limits and rejected keys
+    """
+    if isinstance(error, _KEY_ERRORS):
+        return True
+    # Malformed keys are rejected with 400 and restricted ones with 403
+    return isinstance(error, _KEY_REASON_ERRORS) and (error.reason or "").startswith(
+        _KEY_REASON_PREFIX
+    )
+
+
+def create_client(api_key: str) -> Any:
+    """
+    Create a generative service client bound to one API key.
+
+    Args:
+        api_key: Gemini API key
+
+    Returns:
+        A client that can be given to a GenerativeModel
+    """
+    return glm.GenerativeServiceClient(client_options={"api_key": api_key})
+
+
+@dataclass
+class _KeyState:
+    """Use and quarantine of one key."""
+
+    api_key: str
+    number: int
+    last_used: float = float("-inf")
+    quarantined_until: float = 0.0
+    calls: Deque[float] = field(default_factory=deque)
+
+
+class ApiKeyPool:
+    """
+    Spread Gemini calls over several API keys.
+
+    Each call takes the least recently used key, or with the quota strategy
+    the key with the most calls left in the current minute. Keys that hit a
+    rate limit or are rejected are quarantined for a cooldown and skipped
+    until it ends. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        api_keys: Sequence[str],
+        strategy: str = LRU,
+        cooldown: float = 60.0,
+        requests_per_minute: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            api_keys: Keys to spread calls over
+            strategy: "lru" or "quota"; quota needs requests_per_minute and
+                falls back to lru without it
+            cooldown: Seconds a quarantined key is skipped
+            requests_per_minute: Calls each key may make per minute; 0 if unknown.
+                Keys that used theirs are skipped until calls leave the window
+            clock: Returns monotonic seconds
+
+        Raises:
+            ValueError: If no keys or an unknown strategy are given
+        """
+        if not api_keys:
+            raise ValueError("An API key pool needs at least one key")
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown key strategy '{strategy}', expected one of {STRATEGIES}"
+            )
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self.requests_per_minute = requests_per_minute
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Duplicates would double a key's share and split its quota tracking
+        self._keys: List[_KeyState] = [
+            _KeyState(api_key, number)
+            for number, api_key in enumerate(dict.fromkeys(api_keys), 1)
+        ]
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return len(self._keys)
+
+    def acquire(self) -> str:
+        """
+        Pick the key for the next call and record its use.
+
+        Returns:
+            An API key
+
+        Raises:
+            KeyPoolExhaustedError: If every key is quarantined or out of calls
+        """
+        with self._lock:
+            now = self._clock()
+            usable = [
+                state
+                for state in self._keys
+                if state.quarantined_until <= now and self._remaining(state, now) != 0
+            ]
+            if not usable:
+                raise KeyPoolExhaustedError(
+                    f"All {len(self._keys)} Gemini API keys are rate limited "
+                    "or cooling down"
+                )
+            if self.strategy == QUOTA and self.requests_per_minute:
+                # Most calls left this minute, then least recently used
+                state = min(usable, key=lambda s: (len(s.calls), s.last_used))
+            else:
+                state = min(usable, key=lambda s: s.last_used)
+            state.last_used = now
+            if self.requests_per_minute:
+                state.calls.append(now)
+            return state.api_key
+
+    def quarantine(self, api_key: str, error: BaseException) -> None:
+        """
+        Skip a key for the cooldown after it was rate limited or rejected.
+
+        Args:
+            api_key: Key whose call failed
+            error: The failure, logged by type without the key
+        """
+        with self._lock:
+            for state in self._keys:
+                if state.api_key == api_key:
+                    state.quarantined_until = self._clock() + self.cooldown
+                    logger.warning(
+                        "Gemini API key #%d quarantined for %.0fs after %s",
+                        state.number,
+                        self.cooldown,
+                        type(error).__name__,
+                    )
+                    return
+
+    def available(self) -> int:
+        """Return how many keys are not quarantined."""
+        with self._lock:
+            now = self._clock()
+            return sum(state.quarantined_until <= now for state in self._keys)
+
+    def _remaining(self, state: _KeyState, now: float) -> Optional[int]:
+        """Calls a key has left this minute, None if unlimited; caller holds lock."""
+        if not self.requests_per_minute:
+            return None
+        while state.calls and state.calls[0] <= now - QUOTA_WINDOW:
+            state.calls.popleft()
+        return max(0, self.requests_per_minute - len(state.calls))
+
+
+def key_pool_from_settings() -> ApiKeyPool:
+    """
+    Build the key pool configured by the GEMINI_API_KEYS and GEMINI_KEY_* settings.
+
+    Raises:
+        ValueError: If no key is configured or the strategy is unknown
+    """
+    return ApiKeyPool(
+        settings.gemini_api_keys,
+        strategy=settings.gemini_key_strategy,
+        cooldown=settings.gemini_key_cooldown,
+        requests_per_minute=settings.gemini_key_rpm,
+    )
+
+
+class KeyPoolModel:
+    """
+    Generative model facade that sends each call with a key from a pool.
+
+    Every key gets its own model and client, created on first use, so
+    concurrent calls with different keys share no SDK configuration. A call
+    that hits a rate limit or a rejected key quarantines it and is repeated
+    at once with the next key; other errors are raised unchanged for the
+    service's retries.
+    """
+
+    def __init__(self, pool: ApiKeyPool, create_model: Callable[[str], Any]):
+        """
+        Initialize the facade.
+
+        Args:
+            pool: Keys to call with
+            create_model: Creates the generative model of one key
+        """
+        self.pool = pool
+        self._create_model = create_model
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def generate_content(self, contents: Any, **kwargs: Any) -> Any:
+        """Generate content with the next key."""
+        return self._call("generate_content", contents, **kwargs)
+
+    def count_tokens(self, contents: Any, **kwargs: Any) -> Any:
+        """Count tokens with the next key."""
+        return self._call("count_tokens", contents, **kwargs)
+
+    def _call(self, method: str, contents: Any, **kwargs: Any) -> Any:
+        """Call a model method, moving on to another key after key errors."""
+        error: Optional[Exception] = None
+        for _ in range(len(self.pool)):
+            api_key = self.pool.acquire()
+            try:
+                return getattr(self._model(api_key), method)(contents, **kwargs)
+            except Exception as e:
+                if not is_key_error(e):
+                    raise
+                self.pool.quarantine(api_key, e)
+                error = e
+        assert error is not None
+        raise error
+
+    def _model(self, api_key: str) -> Any:
+        """Return the model of a key, creating it once."""
+        with self._lock:
+            model = self._models.get(api_key)
+            if model is None:
+                model = self._models[api_key] = self._create_model(api_key)
+            return model
@@ -0,0 +1,607 @@
+"""Staged report pipeline shared by the CLI and the API."""
+
+import asyncio
+import re
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from ..attachments import LogExcerpt, append_log_excerpts
+from ..core.deadline import Deadline
+from ..core.interfaces import Formatter, LLMService, ReportStore
+from ..core.models import AttemptUsage, BugReport, ImageAttachment, StoredReport
+from ..monitoring import MetricsRegistry
+from ..prompts import ApplicationContext
+from ..prompts.context_registry import estimate_tokens
+from .enrichment import EnrichmentRun, EnrichmentSlot
+from .preprocessing import InputPreprocessor, PreparedInput, detect_language
+from .similarity_index import DuplicateMatch, SimilarityIndex
+from .usage_meter import DEFAULT_CLIENT, UsageMeter
+
+# How a stage runs
+CPU_BOUND = "cpu"
+IO_BOUND = "io"
+ASYNC = "async"
+
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Runs a blocking function off the event loop, e.g. in a thread pool
+BlockingRunner = Callable[..., Awaitable[Any]]
+
+
+def generation_options(
+    images: Sequence[ImageAttachment] = (),
+    context: Optional[ApplicationContext] = None,
+    deadline: Optional[Deadline] = None,
+    on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the optional keyword arguments of LLMService.generate_bug_report.
+
+    Only options that are set are included, so plain text requests keep the
+    original call signature for LLM services that predate them.
+
+    Args:
+        images: Processed screenshots sent to the model
+        context: Application context placed before the prompt
+        deadline: Request deadline enforced by the LLM service
+        on_attempt: Receives the token usage of every LLM attempt
+
+    Returns:
+        Keyword arguments to pass on
+    """
+    options: Dict[str, Any] = {}
+    if images:
+        options["images"] = images
+    if context is not None:
+        options["context_prefix"] = context.prefix
+    if deadline is not None:
+        options["deadline"] = deadline
+    if on_attempt is not None:
+        options["on_attempt"] = on_attempt
+    return options
+
+
+@dataclass
+class PipelineContext:
+    """The input of one report and everything the stages produce for it."""
+
+    user_input: str
+    log_excerpts: Sequence[LogExcerpt] = ()
+    images: Sequence[ImageAttachment] = ()
+    context: Optional[ApplicationContext] = None
+    deadline: Optional[Deadline] = None
+    client_id: str = DEFAULT_CLIENT
+    reuse_duplicates: bool = False
+    on_attempt: Optional[Callable[[AttemptUsage], None]] = None
+    enrichment_slot: Optional[EnrichmentSlot] = None
+    prepared: Optional[PreparedInput] = None
+    prompt_input: Optional[str] = None
+    # Field regeneration: the field of bug_report to rewrite and how
+    field_name: Optional[str] = None
+    instruction: Optional[str] = None
+    duplicates: List[DuplicateMatch] = field(default_factory=list)
+    reused: Optional[StoredReport] = None
+    bug_report: Optional[BugReport] = None
+    enrichment: Optional[EnrichmentRun] = None
+    formatted_report: Optional[str] = None
+    stored: Optional[StoredReport] = None
+    # Seconds spent in each stage that ran, in run order
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class Stage(ABC):
+    """One step of the pipeline."""
+
+    # Name used in timings, e.g. "generate"
+    name: str = ""
+    # CPU_BOUND stages run inline unless given an executor, IO_BOUND stages
+    # off the event loop, ASYNC stages are awaited on it
+    kind: str = CPU_BOUND
+    # Whether the stage calls the LLM and must hold an LLM slot while it does
+    uses_llm: bool = False
+
+    def applies(self, ctx: PipelineContext) -> bool:
+        """Return False to skip the stage for this report."""
+        return True
+
+    def start(self, ctx: PipelineContext) -> None:
+        """
+        Begin work that should overlap the LLM call; runs just before it.
+
+        Args:
+            ctx: The report being processed
+        """
+
+    def abort(self, ctx: PipelineContext) -> None:
+        """
+        Stop work begun in start() when the pipeline fails before this stage.
+
+        Args:
+            ctx: The report being processed
+        """
+
+    @abstractmethod
+    def run(self, ctx: PipelineContext) -> Any:
+        """
+        Do the stage's work, updating ctx; ASYNC stages define this as async.
+
+        Args:
+            ctx: The report being processed
+        """
+
+
+class Pipeline:
+    """
+    Stages run in order over a PipelineContext, with per-stage timings.
+
+    Each stage runs according to its kind: an executor configured for the
+    kind (or for the stage by name) takes precedence; otherwise CPU-bound
+    stages run in the calling thread and IO-bound stages run through the
+    caller's blocking runner (the event loop's default executor when run
+    asynchronously). A stage whose applies() is False is skipped, so a cache
+    hit skips generation and the stages that only make sense after it.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        executors: Optional[Mapping[str, Executor]] = None,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in run order
+            executors: Executor by stage kind or stage name
+            registry: Registry the stage durations are added to
+        """
+        self.stages = list(stages)
+        self.executors = dict(executors or {})
+        registry = registry or MetricsRegistry()
+        self._durations = registry.histogram(
+            "pipeline_stage_seconds",
+            "Time spent in each report pipeline stage",
+            ["stage"],
+            buckets=STAGE_BUCKETS,
+        )
+
+    @property
+    def stage_names(self) -> List[str]:
+        """Return the names of the stages in run order."""
+        return [stage.name for stage in self.stages]
+
+    def run(self, ctx: PipelineContext) -> PipelineContext:
+        """
+        Run the stages in the calling thread, e.g. from the CLI.
+
+        Args:
+            ctx: The report to process
+
+        Returns:
+            ctx, updated by the stages
+        """
+        started: List[Stage] = []
+        try:
+            for index, stage in enumerate(self.stages):
+                if not stage.applies(ctx):
+                    continue
+                if stage.uses_llm:
+                    started = self._start_later_stages(index, ctx)
+                began = time.perf_counter()
+                executor = self._executor(stage)
+                if stage.kind == ASYNC:
+                    asyncio.run(stage.run(ctx))
+                elif executor is not None:
+                    executor.submit(stage.run, ctx).result()
+                else:
+                    stage.run(ctx)
+                self._record(stage, ctx, began)
+                if stage in started:
+                    started.remove(stage)
+        except BaseException:
+            self._abort(started, ctx)
+            raise
+        self._abort(started, ctx)
+        return ctx
+
+    async def run_async(
+        self,
+        ctx: PipelineContext,
+        run_blocking: Optional[BlockingRunner] = None,
+        llm_slot: Optional[Callable[[], AsyncContextManager]] = None,
+    ) -> PipelineContext:
+        """
+        Run the stages from an event loop, e.g. in an API request.
+
+        Args:
+            ctx: The report to process
+            run_blocking: Runs IO-bound stages off the loop; awaited with the
+                function and its arguments
+            llm_slot: Returns the context manager LLM stages are run in, e.g. a
+                scheduler slot
+
+        Returns:
+            ctx, updated by the stages
+        """
+        loop = asyncio.get_running_loop()
+        started: List[Stage] = []
+        try:
+            for index, stage in enumerate(self.stages):
+                if not stage.applies(ctx):
+                    continue
+                if stage.uses_llm:
+                    started = self._start_later_stages(index, ctx)
+                began = time.perf_counter()
+                executor = self._executor(stage)
+                slot = llm_slot() if stage.uses_llm and llm_slot else _no_slot()
+                async with slot:
+                    if stage.kind == ASYNC:
+                        await stage.run(ctx)
+                    elif executor is not None:
+                        await loop.run_in_executor(executor, stage.run, ctx)
+                    elif stage.kind == IO_BOUND:
+                        if run_blocking is not None:
+                            await run_blocking(stage.run, ctx)
+                        else:
+                            await loop.run_in_executor(None, stage.run, ctx)
+                    else:
+                        stage.run(ctx)
+                self._record(stage, ctx, began)
+                if stage in started:
+                    started.remove(stage)
+        except BaseException:
+            self._abort(started, ctx)
+            raise
+        self._abort(started, ctx)
+        return ctx
+
+    def _executor(self, stage: Stage) -> Optional[Executor]:
+        """Return the executor configured for a stage or its kind."""
+        return self.executors.get(stage.name) or self.executors.get(stage.kind)
+
+    def _start_later_stages(self, index: int, ctx: PipelineContext) -> List[Stage]:
+        """Let the stages after an LLM stage begin work that overlaps it."""
+        started = []
+        for stage in self.stages[index + 1 :]:
+            if stage.applies(ctx):
+                stage.start(ctx)
+                started.append(stage)
+        return started
+
+    @staticmethod
+    def _abort(stages: Sequence[Stage], ctx: PipelineContext) -> None:
+        """Stop the early work of stages that never ran."""
+        for stage in stages:
+            stage.abort(ctx)
+
+    def _record(self, stage: Stage, ctx: PipelineContext, began: float) -> None:
+        """Record how long a stage took."""
+        elapsed = time.perf_counter() - began
+        ctx.timings[stage.name] = elapsed
+        self._durations.observe(elapsed, stage=stage.name)
+
+
+@asynccontextmanager
+async def _no_slot() -> AsyncIterator[None]:
+    """Hold nothing; nullcontext only supports `async with` from Python 3.10."""
+    yield
+
+
+class PreprocessStage(Stage):
+    """Rejects junk input, detects its language and builds the prompt input."""
+
+    name = "preprocess"
+
+    def __init__(self, preprocessor: InputPreprocessor):
+        """
+        Initialize the stage.
+
+        Args:
+            preprocessor: Input preprocessor
+        """
+        self.preprocessor = preprocessor
+
+    def run(self, ctx: PipelineContext) -> None:
+        """Prepare the input; raises ValidationError for junk."""
+        ctx.prepared = self.preprocessor.preprocess(ctx.user_input)
+        ctx.prompt_input = append_log_excerpts(ctx.prepared.text, ctx.log_excerpts)
+
+
+class FieldPreprocessStage(Stage):
+    """Detects the language of a report whose field is regenerated."""
+
+    name = "preprocess"
+
+    def run(self, ctx: PipelineContext) -> None:
+        """Prepare the report text; the instruction counts toward the quota."""
+        ctx.prepared = PreparedInput(ctx.user_input, detect_language(ctx.user_input))
+        ctx.prompt_input = f"{ctx.user_input} {ctx.instruction or ''}"
+
+
+class CacheLookupStage(Stage):
+    """Finds likely duplicates and reuses a near-identical stored report."""
+
+    name = "cache"
+    kind = IO_BOUND
+
+    def __init__(
+        self,
+        similarity_index: SimilarityIndex,
+        store: ReportStore,
+        top_k: int,
+        min_score: float,
+        reuse_threshold: float,
+    ):
+        """
+        Initialize the stage.
+
+        Args:
+            similarity_index: Index of stored reports
+            store: Store the reused reports are loaded from
+            top_k: Most duplicates reported
+            min_score: Lowest similarity reported as a duplicate
+            reuse_threshold: Lowest similarity at which a report is reused
+        """
+        self.similarity_index = similarity_index
+        self.store = store
+        self.top_k = top_k
+        self.min_score = min_score
+        self.reuse_threshold = reuse_threshold
+
+    def run(self, ctx: PipelineContext) -> None:
+        """Look up duplicates and, if asked for, reuse the best match."""
+        assert ctx.prepared is not None, "preprocess runs first"
+        ctx.duplicates = self.similarity_index.query(
+            ctx.prepared.text, top_k=self.top_k, min_score=self.min_score
+        )
+        if (
+            ctx.reuse_duplicates
+            and ctx.duplicates
+            and ctx.duplicates[0].score >= self.reuse_threshold
+        ):
+            ctx.reused = self.store.get(ctx.duplicates[0].report_id)
+            if ctx.reused is not None:
+                ctx.bug_report = ctx.reused.bug_report
+
+
+class QuotaStage(Stage):
+    """Checks the client's token quota and bills the LLM calls to it."""
+
+    name = "quota"
+
+    def __init__(self, usage_meter: UsageMeter, enrichers: int = 0):
+        """
+        Initialize the stage.
+
+        Args:
+            usage_meter: Meter checking quotas and recording usage
+            enrichers: Enricher LLM calls made per report besides generation
+        """
+        self.usage_meter = usage_meter
+        self.enrichers = enrichers
+
+    def applies(self, ctx: PipelineContext) -> bool:
+        """Skip reused reports, which cost no tokens."""
+        return ctx.reused is None
+
+    def run(self, ctx: PipelineContext) -> None:
+        """Raise QuotaExceededError if the prompts would not fit the quota."""
+        assert ctx.prompt_input is not None, "preprocess runs first"
+        assert ctx.prepared is not None, "preprocess runs first"
+        # Each enricher prompt carries the input, or the report built from it
+        estimated = estimate_tokens(ctx.prompt_input)
+        estimated += self.enrichers * estimate_tokens(ctx.prepared.text)
+        self.usage_meter.check_quota(ctx.client_id, estimated)
+        ctx.on_attempt = self.usage_meter.recorder(ctx.client_id)
+
+
+class GenerateStage(Stage):
+    """Calls the LLM to turn the prompt input into a report."""
+
+    name = "generate"
+    kind = IO_BOUND
+    uses_llm = True
+
+    def __init__(self, llm_service: LLMService):
+        """
+        Initialize the stage.
+
+        Args:
+            llm_service: LLM service generating the report
+        """
+        self.llm_service = llm_service
+
+    def applies(self, ctx: PipelineContext) -> bool:
+        """Skip generation when the cache already produced a report."""
+        return ctx.reused is None
+
+    def run(self, ctx: PipelineContext) -> None:
+        """Generate the report; leaves it None if generation failed."""
+        assert ctx.prepared is not None and ctx.prompt_input is not None
+        ctx.bug_report = self.llm_service.generate_bug_report(
+            ctx.prompt_input,
+            language=ctx.prepared.language,
+            **generation_options(ctx.images, ctx.context, ctx.deadline, ctx.on_attempt),
+        )
+
+
+class RegenerateFieldStage(Stage):
+    """Calls the LLM to rewrite one field of the report."""
+
+    name = "generate"
+    kind = IO_BOUND
+    uses_llm = True
+
+    def __init__(self, llm_service: LLMService):
+        """
+        Initialize the stage.
+
+        Args:
+            llm_service: LLM service regenerating the field
+        """
+        self.llm_service = llm_service
+
+    def run(self, ctx: PipelineContext) -> None:
+        """Replace the report with the merged one; None if regeneration failed."""
+        assert ctx.prepared is not None, "preprocess runs first"
+        assert ctx.bug_report is not None and ctx.field_name is not None
+        ctx.bug_report = self.llm_service.regenerate_field(
+            ctx.bug_report,
+            ctx.field_name,
+            ctx.instruction,
+            language=ctx.prepared.language,
+            deadline=ctx.deadline,
+            on_attempt=ctx.on_attempt,
+        )
+
+
+class _GeneratedReportStage(Stage):
+    """A stage that only applies to a freshly generated report."""
+
+    def applies(self, ctx: PipelineContext) -> bool:
+        """Skip reused reports and failed generations."""
+        return ctx.reused is None and ctx.bug_report is not None
+
+
+# A field label the model sometimes echoes at the start of the value
+_LABELS = "|".join(re.escape(label) for label, _ in BugReport.FIELD_LABELS)
+_ECHOED_LABEL = re.compile(rf"^\s*\**({_LABELS})\**\s*:\s*", re.IGNORECASE)
+
+
+class RepairStage(_GeneratedReportStage):
+    """Fixes harmless formatting slips in the model's output."""
+
+    name = "repair"
+
+    def run(self, ctx: PipelineContext) -> None:
+        """Trim whitespace, normalize line breaks and drop echoed labels."""
+        bug_report = ctx.bug_report
+        assert bug_report is not None
+        repaired: Dict[str, Any] = {}
+        for _, attribute in BugReport.FIELD_LABELS:
+            value = getattr(bug_report, attribute)
+            if isinstance(value, str):
+                value = _ECHOED_LABEL.sub("", value.replace("\r\n", "\n")).strip()
+            repaired[attribute] = value
+        if any(value != getattr(bug_report, name) for name, value in repaired.items()):
+            ctx.bug_report = replace(bug_report, **repaired)
+
+
+class ValidateStage(_GeneratedReportStage):
+    """Drops reports whose required fields ended up empty."""
+
+    name = "validate"
+
+    # Fields a usable report cannot do without
+    REQUIRED = ("title", "description", "steps")
+
+    def run(self, ctx: PipelineContext) -> None:
+        """Treat a report with an empty required field as not generated."""
+        if not all(getattr(ctx.bug_report, name) for name in self.REQUIRED):
+            ctx.bug_report = None
+
+
+class EnrichStage(Stage):
+    """Runs the optional enrichers; those needing only the input overlap generation."""
+
+    name = "enrich"
+
+    def __init__(self, start_enrichment: Callable[..., Optional[EnrichmentRun]]):
+        """
+        Initialize the stage.
+
+        Args:
+            start_enrichment: BugReportService.start_enrichment
+        """
+        self.start_enrichment = start_enrichment
+
+    def applies(self, ctx: PipelineContext) -> bool:
+        """Skip reused reports."""
+        return ctx.reused is None
+
+    def start(self, ctx: PipelineContext) -> None:
+        """Start the enrichers that need only the input, before the LLM call."""
+        ctx.enrichment = self.start_enrichment(
+            ctx.prepared, ctx.on_attempt, ctx.enrichment_slot
+        )
+
+    def abort(self, ctx: PipelineContext) -> None:
+        """Cancel the enrichers when no report is coming."""
+        if ctx.enrichment is not None:
+            ctx.enrichment.cancel()
+
+    def run(self, ctx: PipelineContext) -> None:
+        """Start the enrichers that need the report, or cancel all without one."""
+        if ctx.enrichment is None:
+            return
+        if ctx.bug_report is None:
+            ctx.enrichment.cancel()
+        else:
+            ctx.enrichment.report_ready(ctx.bug_report)
+
+
+class FormatStage(Stage):
+    """Renders the report for the target platform."""
+
+    name = "format"
+
+    def __init__(self, formatter: Formatter):
+        """
+        Initialize the stage.
+
+        Args:
+            formatter: Formatter of the target platform
+        """
+        self.formatter = formatter
+
+    def applies(self, ctx: PipelineContext) -> bool:
+        """Skip failed generations."""
+        return ctx.bug_report is not None
+
+    def run(self, ctx: PipelineContext) -> None:
+        """Format the report."""
+        assert ctx.bug_report is not None
+        ctx.formatted_report = self.formatter.format(ctx.bug_report)
+
+
+class PersistStage(_GeneratedReportStage):
+    """Stores the report and adds it to the duplicate index."""
+
+    name = "persist"
+    kind = IO_BOUND
+
+    def __init__(
+        self, store: ReportStore, similarity_index: Optional[SimilarityIndex] = None
+    ):
+        """
+        Initialize the stage.
+
+        Args:
+            store: Store the report is saved to
+            similarity_index: Index the stored report is added to, if any
+        """
+        self.store = store
+        self.similarity_index = similarity_index
+
+    def run(self, ctx: PipelineContext) -> None:
+        """Save the report under a new ID."""
+        assert ctx.bug_report is not None
+        ctx.stored = self.store.save(ctx.user_input, ctx.bug_report)
+        if self.similarity_index is not None:
+            self.similarity_index.add(ctx.stored)
@@ -0,0 +1,154 @@
+"""Local pre-processing of user input before any LLM call."""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from ..core.exceptions import ValidationError
+
+LANGUAGE_EN = "en"
+LANGUAGE_RU = "ru"
+
+_URL = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_LETTER_WORD = re.compile(r"[^\W\d_]+", re.UNICODE)
+_CYRILLIC = re.compile(r"[Ѐ-ӿ]")
+_LATIN = re.compile(r"[A-Za-z]")
+_VOWELS = frozenset("aeiouyаеёиоуыэюя")
+# Terse security reports ("XSS in src") are mostly vowel-less abbreviations
+_SECURITY_TERMS = frozenset(
+    {
+        "xss",
+        "csrf",
+        "xsrf",
+        "ssrf",
+        "sqli",
+        "rce",
+        "lfi",
+        "rfi",
+        "xxe",
+        "idor",
+        "cve",
+        "cwe",
+        "dos",
+        "ddos",
+        "mitm",
+        "jwt",
+        "csp",
+        "cors",
+        "vuln",
+        "exploit",
+        "injection",
+        "уязвимость",
+    }
+)
+
+
+@dataclass
+class PreparedInput:
+    """User input that passed pre-processing, with its detected language."""
+
+    text: str
+    language: Optional[str]
+
+
+def detect_language(text: str) -> Optional[str]:
+    """
+    Detect whether a bug description is Russian or English.
+
+    Counts Cyrillic against Latin letters, so English technical terms inside a
+    Russian description do not flip the result.
+
+    Args:
+        text: User input
+
+    Returns:
+        LANGUAGE_RU or LANGUAGE_EN, or None if the text is mostly in neither
+        script (e.g. only digits, or another alphabet)
+    """
+    cyrillic = len(_CYRILLIC.findall(text))
+    latin = len(_LATIN.findall(text))
+    other = sum(1 for char in text if char.isalpha()) - cyrillic - latin
+    if cyrillic + latin == 0 or other > cyrillic + latin:
+        return None
+    return LANGUAGE_RU if cyrillic and cyrillic >= latin / 2 else LANGUAGE_EN
+
+
+def _is_plausible_word(word: str) -> bool:
+    """Return True if a word has a vowel and no long consonant cluster."""
+    consonant_run = 0
+    has_vowel = False
+    for char in word.lower():
+        if char in _VOWELS:
+            has_vowel = True
+            consonant_run = 0
+        else:
+            consonant_run += 1
+            if consonant_run >= 5:
+                return False
+    return has_vowel
+
+
+class InputPreprocessor:
+    """Normalize input, detect its language and reject text unfit for a report."""
+
+    def __init__(self, min_letters: int = 5, min_plausible_ratio: float = 0.3):
+        """
+        Initialize the preprocessor.
+
+        Args:
+            min_letters: Minimum number of letters outside links
+            min_plausible_ratio: Minimum share of pronounceable words
+        """
+        self.min_letters = min_letters
+        self.min_plausible_ratio = min_plausible_ratio
+
+    def preprocess(self, user_input: str) -> PreparedInput:
+        """
+        Prepare user input for generation.
+
+        Args:
+            user_input: The user's description of the bug
+
+        Returns:
+            Normalized input and its language
+
+        Raises:
+            ValidationError: If the input cannot become a bug report
+        """
+        text = user_input.strip()
+        if not text:
+            raise ValidationError("Input text cannot be empty.")
+
+        without_links = _URL.sub(" ", text)
+        letters = [char for char in without_links if char.isalpha()]
+        if not letters and _URL.search(text):
+            raise ValidationError(
+                "Input contains only links. Describe what went wrong."
+            )
+        if len(letters) < self.min_letters:
+            raise ValidationError(
+                "Input is too short to describe a bug. Describe what went wrong."
+            )
+
+        compact = _WHITESPACE.sub("", without_links)
+        if len(set(compact.lower())) <= 3:
+            raise ValidationError(
+                "Input consists of repeated characters. Describe what went wrong."
+            )
+
+        # Vowel counting only makes sense for the Latin and Cyrillic alphabets
+        words = [
+            word
+            for word in _LETTER_WORD.findall(without_links)
+            if len(word) >= 3 and (_LATIN.search(word) or _CYRILLIC.search(word))
+        ]
+        if words and not any(word.lower() in _SECURITY_TERMS for word in words):
+            plausible = sum(1 for word in words if _is_plausible_word(word))
+            if plausible / len(words) < self.min_plausible_ratio:
+                raise ValidationError(
+                    "Input does not look like a bug description. "
+                    "Describe what went wrong."
+                )
+
+        return PreparedInput(text=text, language=detect_language(text))
@@ -0,0 +1,318 @@
+"""A/B evaluation of bug report prompt versions over a corpus of inputs."""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..core.exceptions import BugReporterError, ValidationError
+from ..core.interfaces import LLMService
+from ..core.models import AttemptUsage
+from ..prompts import BugReportPrompts
+from .preprocessing import detect_language
+
+# Language of the rows that summarize every case of a prompt version
+ALL_LANGUAGES = "all"
+
+# Placeholder replaced by the user input in prompt template files
+USER_INPUT_PLACEHOLDER = "{user_input}"
+
+
+@dataclass
+class EvaluationCase:
+    """One corpus input."""
+
+    user_input: str
+    language: Optional[str] = None
+
+
+@dataclass
+class PromptVersion:
+    """A candidate prompt: a name and how it turns an input into a prompt."""
+
+    name: str
+    build: Callable[[str, Optional[str]], str]
+
+    @classmethod
+    def from_template(cls, name: str, template: str) -> "PromptVersion":
+        """
+        Create a version from a template containing {user_input}.
+
+        Only the placeholder is replaced, so JSON braces need no escaping.
+
+        Args:
+            name: Version name shown in the report
+            template: Prompt text with one or more {user_input} placeholders
+
+        Raises:
+            ValidationError: If the template has no placeholder
+        """
+        if USER_INPUT_PLACEHOLDER not in template:
+            raise ValidationError(
+                f"Prompt template '{name}' has no {USER_INPUT_PLACEHOLDER} placeholder"
+            )
+        return cls(
+            name,
+            lambda user_input, language: template.replace(
+                USER_INPUT_PLACEHOLDER, user_input
+            ),
+        )
+
+
+# Prompts shipped with the application, selectable by name
+BUILTIN_VERSIONS = {
+    # What production sends: the compact prompt of the detected language
+    "current": PromptVersion("current", BugReportPrompts.create_bug_report_prompt),
+    # The bilingual prompt used when the language is unknown
+    "bilingual": PromptVersion(
+        "bilingual",
+        lambda user_input, language: BugReportPrompts.create_bug_report_prompt(
+            user_input
+        ),
+    ),
+}
+
+
+def resolve_version(spec: str) -> PromptVersion:
+    """
+    Resolve a built-in version name or a prompt template file.
+
+    Args:
+        spec: "current", "bilingual" or the path of a template file, which is
+            named after the file
+
+    Returns:
+        The prompt version
+
+    Raises:
+        ValidationError: If the template cannot be read or has no placeholder
+    """
+    if spec in BUILTIN_VERSIONS:
+        return BUILTIN_VERSIONS[spec]
+    path = Path(spec)
+    try:
+        template = path.read_text(encoding="utf-8")
+    except OSError as e:
+        raise ValidationError(f"Cannot read prompt template '{spec}': {e}") from e
+    return PromptVersion.from_template(path.stem, template)
+
+
+def load_corpus(lines: Iterable[str]) -> List[EvaluationCase]:
+    """
+    Parse an evaluation corpus.
+
+    Each line is either a JSON object with "input" and an optional
+    "language", or a plain text description. Missing languages are detected.
+
+    Args:
+        lines: Corpus lines; blank lines are skipped
+
+    Returns:
+        The corpus cases in order
+
+    Raises:
+        ValidationError: If a JSON line has no "input"
+    """
+    cases = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            try:
+                item = json.loads(line)
+                user_input = item["input"]
+            except (ValueError, KeyError) as e:
+                raise ValidationError(f"Corpus line {number} is invalid: {e}") from e
+            language = item.get("language")
+        else:
+            user_input, language = line, None
+        cases.append(
+            EvaluationCase(user_input, language or detect_language(user_input))
+        )
+    return cases
+
+
+@dataclass
+class VersionStats:
+    """Outcomes of one prompt version, over all cases or one language's."""
+
+    version: str
+    language: str
+    cases: int = 0
+    first_try_successes: int = 0
+    successes: int = 0
+    attempts: int = 0
+    output_tokens: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def first_try_rate(self) -> float:
+        """Share of cases that produced a valid report on the first attempt."""
+        return self.first_try_successes / self.cases if self.cases else 0.0
+
+    @property
+    def success_rate(self) -> float:
+        """Share of cases that produced a valid report within the retries."""
+        return self.successes / self.cases if self.cases else 0.0
+
+    @property
+    def mean_attempts(self) -> float:
+        """Model calls per case, retries included."""
+        return self.attempts / self.cases if self.cases else 0.0
+
+    @property
+    def mean_output_tokens(self) -> float:
+        """Output tokens per case, over every attempt."""
+        return self.output_tokens / self.cases if self.cases else 0.0
+
+    def latency_percentile(self, fraction: float) -> float:
+        """
+        Return a percentile of the per-case latency.
+
+        Args:
+            fraction: Percentile as a fraction, e.g. 0.95
+
+        Returns:
+            Seconds, nearest-rank; 0 without cases
+        """
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def add(
+        self, attempts: Sequence[AttemptUsage], succeeded: bool, latency: float
+    ) -> None:
+        """
+        Count one evaluated case.
+
+        Args:
+            attempts: Usage of every model call the case made
+            succeeded: Whether a valid report came back
+            latency: Seconds the case took, retries included
+        """
+        self.cases += 1
+        self.attempts += len(attempts)
+        self.output_tokens += sum(attempt.output_tokens for attempt in attempts)
+        if succeeded:
+            self.successes += 1
+            if len(attempts) == 1:
+                self.first_try_successes += 1
+        self.latencies.append(latency)
+
+
+class PromptEvaluator:
+    """
+    Run every corpus case through every prompt version and compare them.
+
+    Cases are interleaved across versions and run on a thread pool, so each
+    version sees the same upstream conditions. Any LLMService that implements
+    generate_bug_report_from_prompt can be evaluated, e.g. a replay service.
+    """
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        versions: Sequence[PromptVersion],
+        workers: int = 4,
+    ):
+        """
+        Initialize the evaluator.
+
+        Args:
+            llm_service: Service the prompts are sent to
+            versions: Prompt versions to compare
+            workers: Cases evaluated at once
+
+        Raises:
+            ValidationError: If fewer than two versions or duplicate names are given
+        """
+        names = [version.name for version in versions]
+        if len(versions) < 2 or len(set(names)) != len(names):
+            raise ValidationError(
+                "Give at least two prompt versions with distinct names"
+            )
+        self.llm_service = llm_service
+        self.versions = versions
+        self.workers = max(1, workers)
+
+    def run(self, cases: Sequence[EvaluationCase]) -> List[VersionStats]:
+        """
+        Evaluate the corpus.
+
+        Args:
+            cases: Corpus inputs
+
+        Returns:
+            Per version, the totals followed by one row per language
+        """
+        stats: Dict[Tuple[str, str], VersionStats] = {}
+        lock = threading.Lock()
+
+        def evaluate(version: PromptVersion, case: EvaluationCase) -> None:
+            attempts: List[AttemptUsage] = []
+            prompt = version.build(case.user_input, case.language)
+            started = time.perf_counter()
+            try:
+                bug_report = self.llm_service.generate_bug_report_from_prompt(
+                    prompt, f"eval-{version.name}", on_attempt=attempts.append
+                )
+            except BugReporterError:
+                bug_report = None
+            latency = time.perf_counter() - started
+            language = case.language or "unknown"
+            with lock:
+                for key in ((version.name, ALL_LANGUAGES), (version.name, language)):
+                    if key not in stats:
+                        stats[key] = VersionStats(*key)
+                    stats[key].add(attempts, bug_report is not None, latency)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(evaluate, version, case)
+                for case in cases
+                for version in self.versions
+            ]
+            for future in futures:
+                future.result()
+
+        order = {version.name: index for index, version in enumerate(self.versions)}
+        return sorted(
+            stats.values(),
+            key=lambda row: (
+                order[row.version],
+                row.language != ALL_LANGUAGES,
+                row.language,
+            ),
+        )
+
+
+def format_report(rows: Sequence[VersionStats]) -> str:
+    """
+    Render evaluation results as a plain-text table.
+
+    Args:
+        rows: Results of PromptEvaluator.run()
+
+    Returns:
+        One line per version and language, under a header line
+    """
+    header = (
+        f"{'version':<20} {'lang':<7} {'cases':>5} {'1st-try':>7} {'success':>7} "
+        f"{'attempts':>8} {'out tok':>8} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7}"
+    )
+    lines = [header]
+    for row in rows:
+        lines.append(
+            f"{row.version:<20} {row.language:<7} {row.cases:>5} "
+            f"{row.first_try_rate:>7.1%} {row.success_rate:>7.1%} "
+            f"{row.mean_attempts:>8.2f} {row.mean_output_tokens:>8.1f} "
+            f"{row.latency_percentile(0.5):>7.2f} "
+            f"{row.latency_percentile(0.95):>7.2f} "
+            f"{row.latency_percentile(0.99):>7.2f}"
+        )
+    return "\n".join(lines)
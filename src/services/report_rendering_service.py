@@ -0,0 +1,78 @@
+"""Render stored bug reports in any registered format without calling the LLM."""
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ..core.interfaces import ReportStore
+from ..formatters.registry import FormatterRegistry
+
+
+class ReportRenderingService:
+    """Render stored reports on demand, memoizing each (report ID, format) pair."""
+
+    def __init__(
+        self,
+        store: ReportStore,
+        registry: FormatterRegistry,
+        cache_size: int = 1024,
+    ):
+        """
+        Initialize the rendering service.
+
+        Args:
+            store: Store holding generated bug reports
+            registry: Formatter registry used to render them
+            cache_size: Maximum number of memoized renderings
+        """
+        self.store = store
+        self.registry = registry
+        self.cache_size = cache_size
+        self._cache: OrderedDict[Tuple[str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, report_id: str, format_name: str) -> Optional[str]:
+        """
+        Render a stored report in the requested format.
+
+        Args:
+            report_id: ID of the stored report
+            format_name: Output format name
+
+        Returns:
+            The rendered report, or None if the report does not exist
+
+        Raises:
+            ValidationError: If the format is unknown
+        """
+        formatter = self.registry.get(format_name)
+        key = (report_id, format_name.lower())
+
+        with self._lock:
+            rendered = self._cache.get(key)
+            if rendered is not None:
+                self._cache.move_to_end(key)
+                return rendered
+
+        stored = self.store.get(report_id)
+        if stored is None:
+            return None
+        rendered = formatter.format(stored.bug_report)
+
+        with self._lock:
+            self._cache[key] = rendered
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return rendered
+
+    def invalidate(self, report_id: str) -> None:
+        """
+        Drop every memoized rendering of a report (e.g. after it was edited).
+
+        Args:
+            report_id: ID of the stored report
+        """
+        with self._lock:
+            for key in [key for key in self._cache if key[0] == report_id]:
+                del self._cache[key]
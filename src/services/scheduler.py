@@ -0,0 +1,316 @@
+"""Priority lanes with weighted fair sharing in front of the LLM service."""
+
+import asyncio
+import concurrent.futures
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import (
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from ..core.deadline import Deadline
+from ..core.exceptions import DeadlineExceededError, ValidationError
+from ..monitoring import MetricsRegistry
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+DEFAULT_WEIGHTS = {INTERACTIVE: 4, BULK: 1}
+
+WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Longest a worker thread queues for a slot when it has no deadline
+THREAD_SLOT_TIMEOUT = 60.0
+
+
+class _Waiter:
+    """A request queued for an LLM slot."""
+
+    __slots__ = ("enqueued_at", "future", "lane")
+
+    def __init__(self, lane: str, enqueued_at: float, future: asyncio.Future):
+        """Remember the waiter's lane, arrival time and wake-up future."""
+        self.lane = lane
+        self.enqueued_at = enqueued_at
+        self.future = future
+
+
+class _SlotHold:
+    """The slot held by a task, and the work it must outlive, if any."""
+
+    __slots__ = ("pending",)
+
+    def __init__(self) -> None:
+        """Start without pending work."""
+        self.pending: Optional[asyncio.Future[object]] = None
+
+
+_slot_hold: ContextVar[Optional[_SlotHold]] = ContextVar("llm_slot", default=None)
+
+
+def keep_slot_until(future: "asyncio.Future[object]") -> None:
+    """
+    Keep the current task's LLM slot until future finishes.
+
+    Call this when a request stops waiting for work that keeps running, like
+    a blocking call in a worker thread, so the slot is not handed to another
+    request while that work still loads the LLM. Outside a slot it does
+    nothing.
+
+    Args:
+        future: The abandoned work
+    """
+    hold = _slot_hold.get()
+    if hold is not None:
+        hold.pending = future
+
+
+class PriorityScheduler:
+    """
+    Admit LLM calls by lane, sharing a fixed number of slots by weight.
+
+    When a slot frees, it goes to the lane with the lowest pass: each grant
+    advances a lane's pass by 1/weight, so under load a lane with weight 4
+    gets four slots for every one a lane with weight 1 gets (stride
+    scheduling). A lane that was idle starts level with the busy lanes rather
+    than with saved-up credit. A waiter queued longer than the starvation
+    timeout is served before anything else, oldest first.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        weights: Optional[Mapping[str, int]] = None,
+        starvation_timeout: float = 30.0,
+        registry: Optional[MetricsRegistry] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: LLM calls allowed at once
+            weights: Share of each lane; the first lane wins ties
+            starvation_timeout: Seconds after which a waiter jumps the queue
+            registry: Registry the per-lane metrics are added to
+            clock: Monotonic clock returning seconds
+        """
+        self.max_concurrency = max_concurrency
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.starvation_timeout = starvation_timeout
+        self._clock = clock
+        self._queues: Dict[str, Deque[_Waiter]] = {
+            lane: deque() for lane in self.weights
+        }
+        self._pass: Dict[str, float] = {lane: 0.0 for lane in self.weights}
+        self._virtual_time = 0.0
+        self._active = 0
+        registry = registry or MetricsRegistry()
+        self._depth = registry.gauge(
+            "llm_queue_depth", "Requests waiting for an LLM slot", ["lane"]
+        )
+        self._wait = registry.histogram(
+            "llm_queue_wait_seconds",
+            "Time requests waited for an LLM slot",
+            ["lane"],
+            buckets=WAIT_BUCKETS,
+        )
+        self._starved = registry.counter(
+            "llm_queue_starvation_grants_total",
+            "Slots given to a waiter past the starvation timeout",
+            ["lane"],
+        )
+        for lane in self.weights:
+            self._depth.set(0, lane=lane)
+
+    @property
+    def lanes(self) -> Tuple[str, ...]:
+        """Return the lane names, highest priority first."""
+        return tuple(self.weights)
+
+    @property
+    def active(self) -> int:
+        """Return the number of LLM calls holding a slot."""
+        return self._active
+
+    def depth(self, lane: str) -> int:
+        """Return the number of requests waiting in a lane."""
+        return len(self._queues[lane])
+
+    @asynccontextmanager
+    async def slot(
+        self, lane: str, deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[None]:
+        """
+        Hold an LLM slot for the duration of the block.
+
+        Work the block abandoned with keep_slot_until() keeps the slot until
+        it finishes.
+
+        Args:
+            lane: Lane the request belongs to
+            deadline: Request deadline bounding the wait
+
+        Raises:
+            ValidationError: If the lane is unknown
+            DeadlineExceededError: If the deadline passes while queued
+        """
+        await self.acquire(lane, deadline)
+        hold = _SlotHold()
+        token = _slot_hold.set(hold)
+        try:
+            yield
+        finally:
+            _slot_hold.reset(token)
+            if hold.pending is None:
+                self.release()
+            else:
+                hold.pending.add_done_callback(lambda _: self.release())
+
+    @contextmanager
+    def thread_slot(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        lane: str,
+        deadline: Optional[Deadline] = None,
+        timeout: float = THREAD_SLOT_TIMEOUT,
+    ) -> Iterator[None]:
+        """
+        Hold an LLM slot from a worker thread, e.g. around an enricher call.
+
+        Args:
+            loop: Event loop the scheduler runs on
+            lane: Lane the call belongs to
+            deadline: Deadline bounding the wait
+            timeout: Longest wait in seconds, capped by the deadline; the
+                thread stops waiting even if the loop never answers
+
+        Raises:
+            ValidationError: If the lane is unknown
+            DeadlineExceededError: If the deadline or timeout passes while queued
+        """
+        if deadline is not None:
+            timeout = deadline.cap(timeout)
+        future = asyncio.run_coroutine_threadsafe(self.acquire(lane, deadline), loop)
+        try:
+            future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # Cancelling takes the waiter out of its queue, or hands the slot
+            # on if it was granted just now
+            if future.cancel():
+                raise DeadlineExceededError(
+                    "Timed out waiting for an LLM slot"
+                ) from None
+            # The wait finished while timing out
+            future.result()
+        try:
+            yield
+        finally:
+            try:
+                loop.call_soon_threadsafe(self.release)
+            except RuntimeError:
+                # The loop closed meanwhile, so it has no waiters left to wake
+                self._active -= 1
+
+    async def acquire(self, lane: str, deadline: Optional[Deadline] = None) -> None:
+        """
+        Wait for an LLM slot; release() must be called afterwards.
+
+        Args:
+            lane: Lane the request belongs to
+            deadline: Request deadline bounding the wait
+
+        Raises:
+            ValidationError: If the lane is unknown
+            DeadlineExceededError: If the deadline passes while queued
+        """
+        queue = self._queues.get(lane)
+        if queue is None:
+            raise ValidationError(
+                f"Unknown priority '{lane}'; expected one of {', '.join(self.lanes)}"
+            )
+        if self._active < self.max_concurrency and not self._waiting():
+            self._grant(lane, 0.0)
+            return
+
+        waiter = _Waiter(
+            lane, self._clock(), asyncio.get_running_loop().create_future()
+        )
+        queue.append(waiter)
+        self._depth.set(len(queue), lane=lane)
+
+        timeout = deadline.remaining() if deadline is not None else None
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except BaseException as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as the wait ended; hand the slot on
+                self.release()
+            elif waiter in queue:
+                queue.remove(waiter)
+                self._depth.set(len(queue), lane=lane)
+            if isinstance(e, asyncio.TimeoutError):
+                raise DeadlineExceededError(
+                    "Request deadline exceeded while waiting for an LLM slot"
+                )
+            raise
+
+    def release(self) -> None:
+        """Free a slot and give it to the next waiter."""
+        self._active -= 1
+        self._dispatch()
+
+    def _waiting(self) -> bool:
+        """Return True if any lane has waiters."""
+        return any(self._queues.values())
+
+    def _grant(self, lane: str, waited: float) -> None:
+        """Account for a slot given to a request of a lane."""
+        self._active += 1
+        # A lane that was idle starts from the current pass, not its old one
+        start = max(self._pass[lane], self._virtual_time)
+        self._virtual_time = start
+        self._pass[lane] = start + 1 / self.weights[lane]
+        self._wait.observe(waited, lane=lane)
+
+    def _dispatch(self) -> None:
+        """Give free slots to waiters by starvation first, then by pass."""
+        while self._active < self.max_concurrency and self._waiting():
+            now = self._clock()
+            lane = self._starving_lane(now)
+            if lane is not None:
+                self._starved.inc(lane=lane)
+            else:
+                lane = min(
+                    (name for name, queue in self._queues.items() if queue),
+                    key=lambda name: self._pass[name],
+                )
+            queue = self._queues[lane]
+            waiter = queue.popleft()
+            self._depth.set(len(queue), lane=lane)
+            if waiter.future.done():
+                # Gave up (deadline or cancellation) before its turn came
+                continue
+            self._grant(lane, now - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def _starving_lane(self, now: float) -> Optional[str]:
+        """Return the lane of the oldest waiter past the starvation timeout."""
+        oldest = None
+        for lane, queue in self._queues.items():
+            if (
+                queue
+                and now - queue[0].enqueued_at >= self.starvation_timeout
+                and (oldest is None or queue[0].enqueued_at < oldest[1])
+            ):
+                oldest = (lane, queue[0].enqueued_at)
+        return oldest[0] if oldest else None
@@ -0,0 +1,238 @@
+"""MinHash similarity index for spotting duplicate bug reports."""
+
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from ..core.interfaces import ReportStore
+from ..core.models import StoredReport
+
+# Mersenne prime 2^31 - 1: keeps a * h + b below 2^62, so uint64 never overflows
+_PRIME = np.uint64((1 << 31) - 1)
+# Code points fit in 21 bits, so an n-gram of up to 3 code points packs exactly
+_CODE_POINT_BITS = np.uint64(21)
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+@dataclass
+class DuplicateMatch:
+    """A stored report similar to a query text."""
+
+    report_id: str
+    title: str
+    score: float
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for shingling, for both Latin and Cyrillic scripts.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Lowercased text with punctuation collapsed to single spaces
+    """
+    text = unicodedata.normalize("NFKC", text).lower().replace("ё", "е")
+    return _NON_WORD.sub(" ", text).strip()
+
+
+class MinHasher:
+    """Compute MinHash signatures of character n-gram sets with NumPy."""
+
+    def __init__(self, num_permutations: int = 128, ngram_size: int = 3, seed: int = 7):
+        """
+        Initialize the hasher.
+
+        Args:
+            num_permutations: Signature length; more gives lower estimate variance
+            ngram_size: Characters per shingle (at most 3)
+            seed: Seed of the hash permutations, fixed so signatures are stable
+        """
+        if not 1 <= ngram_size <= 3:
+            raise ValueError("ngram_size must be between 1 and 3")
+        self.num_permutations = num_permutations
+        self.ngram_size = ngram_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(
+            1, int(_PRIME), size=(num_permutations, 1), dtype=np.uint64
+        )
+        self._b = rng.integers(
+            0, int(_PRIME), size=(num_permutations, 1), dtype=np.uint64
+        )
+
+    def shingle_hashes(self, text: str) -> np.ndarray:
+        """
+        Hash the distinct character n-grams of normalized text.
+
+        Args:
+            text: Raw text
+
+        Returns:
+            Array of distinct shingle hashes (empty if the text has no words)
+        """
+        normalized = normalize_text(text)
+        if not normalized:
+            return np.empty(0, dtype=np.uint64)
+
+        code_points = np.frombuffer(
+            f" {normalized} ".encode("utf-32-le"), dtype=np.uint32
+        ).astype(np.uint64)
+        count = len(code_points) - self.ngram_size + 1
+        if count <= 0:
+            return np.empty(0, dtype=np.uint64)
+
+        packed = np.zeros(count, dtype=np.uint64)
+        for offset in range(self.ngram_size):
+            packed = (packed << _CODE_POINT_BITS) | code_points[offset : offset + count]
+        return np.unique(packed % _PRIME)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Raw text
+
+        Returns:
+            Signature of num_permutations uint32 values, or None for empty text
+        """
+        hashes = self.shingle_hashes(text)
+        if hashes.size == 0:
+            return None
+        permuted = (self._a * hashes[np.newaxis, :] + self._b) % _PRIME
+        signature: np.ndarray = permuted.min(axis=1).astype(np.uint32)
+        return signature
+
+
+class SimilarityIndex:
+    """
+    In-memory index of stored inputs and generated reports for near-duplicate lookup.
+
+    Each report contributes two signatures: one of the user's input and one of
+    the generated title and description. A query scores against both and keeps
+    the higher estimated Jaccard similarity.
+    """
+
+    def __init__(self, hasher: Optional[MinHasher] = None, initial_capacity: int = 256):
+        """
+        Initialize an empty index.
+
+        Args:
+            hasher: MinHasher used for all signatures
+            initial_capacity: Rows preallocated before the first resize
+        """
+        self.hasher = hasher or MinHasher()
+        width = self.hasher.num_permutations
+        self._input_signatures = np.zeros((initial_capacity, width), dtype=np.uint32)
+        self._report_signatures = np.zeros((initial_capacity, width), dtype=np.uint32)
+        self._report_ids: List[str] = []
+        self._titles: List[str] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_store(cls, store: ReportStore) -> "SimilarityIndex":
+        """
+        Build an index over every report already in a store.
+
+        Args:
+            store: Report store to index
+
+        Returns:
+            Populated index
+        """
+        index = cls()
+        for stored_report in store.iter_reports():
+            index.add(stored_report)
+        return index
+
+    def __len__(self) -> int:
+        """Return the number of indexed reports."""
+        return len(self._report_ids)
+
+    def add(self, stored_report: StoredReport) -> None:
+        """
+        Index a stored report.
+
+        Args:
+            stored_report: Report to index
+        """
+        bug_report = stored_report.bug_report
+        input_signature = self.hasher.signature(stored_report.user_input)
+        report_signature = self.hasher.signature(
+            f"{bug_report.title} {bug_report.description}"
+        )
+        if input_signature is None and report_signature is None:
+            return
+
+        with self._lock:
+            row = len(self._report_ids)
+            if row == len(self._input_signatures):
+                self._input_signatures = self._grow(self._input_signatures)
+                self._report_signatures = self._grow(self._report_signatures)
+            # An all-zero row never matches a real signature closely
+            self._input_signatures[row] = (
+                input_signature if input_signature is not None else 0
+            )
+            self._report_signatures[row] = (
+                report_signature if report_signature is not None else 0
+            )
+            self._report_ids.append(stored_report.id)
+            self._titles.append(bug_report.title)
+
+    def query(
+        self, text: str, top_k: int = 5, min_score: float = 0.0
+    ) -> List[DuplicateMatch]:
+        """
+        Find the indexed reports most similar to a text.
+
+        Args:
+            text: Query text, typically a new user input
+            top_k: Maximum number of matches
+            min_score: Minimum estimated similarity to report
+
+        Returns:
+            Matches ordered by descending score
+        """
+        signature = self.hasher.signature(text)
+        if signature is None or top_k <= 0:
+            return []
+
+        with self._lock:
+            count = len(self._report_ids)
+            if count == 0:
+                return []
+            input_signatures = self._input_signatures[:count]
+            report_signatures = self._report_signatures[:count]
+            report_ids = self._report_ids[:count]
+            titles = self._titles[:count]
+
+        scores = np.maximum(
+            (input_signatures == signature).mean(axis=1),
+            (report_signatures == signature).mean(axis=1),
+        )
+
+        k = min(top_k, count)
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [
+            DuplicateMatch(
+                report_id=report_ids[i],
+                title=titles[i],
+                score=round(float(scores[i]), 4),
+            )
+            for i in candidates
+            if scores[i] >= min_score
+        ]
+
+    @staticmethod
+    def _grow(matrix: np.ndarray) -> np.ndarray:
+        """Double the row capacity of a signature matrix."""
+        grown = np.zeros((len(matrix) * 2, matrix.shape[1]), dtype=matrix.dtype)
+        grown[: len(matrix)] = matrix
+        return grown
@@ -0,0 +1,309 @@
+"""Canary and shadow routing of report generation to candidate models and prompts."""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from ..core.deadline import Deadline
+from ..core.exceptions import BugReporterError
+from ..core.interfaces import LLMService
+from ..core.models import AttemptUsage, BugReport, ImageAttachment
+from ..monitoring import MetricsRegistry
+from .prompt_evaluation import PromptVersion
+
+logger = logging.getLogger(__name__)
+
+# Arm that serves every request not routed to a canary
+CONTROL = "control"
+
+# Outcomes of one generation on an arm
+VALID = "valid"
+EMPTY = "empty"
+ERROR = "error"
+
+# Generation takes seconds, not milliseconds
+LATENCY_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+
+@dataclass
+class TrafficArm:
+    """A candidate model or prompt that receives a share of the traffic."""
+
+    name: str
+    llm_service: LLMService
+    percent: float
+    # Prompt to send instead of the service's own; None keeps the production one
+    prompt: Optional[PromptVersion] = None
+    # Shadow arms get a copy of the request whose result is discarded; canary
+    # arms serve the response instead of the control arm
+    shadow: bool = False
+
+
+class TrafficSplitService(LLMService):
+    """
+    LLM service that routes a share of report generations to candidate arms.
+
+    Each generation is served by at most one canary arm, picked by its
+    percent, or else by the control service. Shadow arms independently get a
+    copy of a share of the generations, run in their own threads after the
+    served one is returned; when their concurrency and queue budget is used
+    up, the copy is dropped rather than queued without bound. Latency,
+    attempts and outcome are recorded per arm, control included, so
+    candidates can be compared with production. Requests with screenshots
+    are only sent to arms using their service's own prompt. Field
+    regeneration and free-form prompts always use the control service.
+    """
+
+    def __init__(
+        self,
+        control: LLMService,
+        arms: Sequence[TrafficArm],
+        shadow_workers: int = 2,
+        shadow_max_pending: int = 100,
+        shadow_timeout: float = 60.0,
+        registry: Optional[MetricsRegistry] = None,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        Initialize the traffic split.
+
+        Args:
+            control: Service serving requests that no canary arm takes
+            arms: Canary and shadow arms
+            shadow_workers: Shadow generations run at once
+            shadow_max_pending: Shadow generations running or queued at once;
+                further copies are dropped
+            shadow_timeout: Seconds a shadow generation may take
+            registry: Registry the per-arm metrics are added to
+            rng: Returns a uniform random number in [0, 1)
+
+        Raises:
+            ValueError: If the canary percentages add up to more than 100
+        """
+        canaries = [arm for arm in arms if not arm.shadow]
+        if sum(arm.percent for arm in canaries) > 100:
+            raise ValueError("Canary arms cannot take more than 100% of requests")
+        self.control = control
+        self.canaries = canaries
+        self.shadows = [arm for arm in arms if arm.shadow]
+        self.shadow_timeout = shadow_timeout
+        self._rng = rng
+        self._shadow_executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(
+                max_workers=shadow_workers, thread_name_prefix="llm-shadow"
+            )
+            if self.shadows
+            else None
+        )
+        self._shadow_budget = threading.BoundedSemaphore(shadow_max_pending)
+
+        registry = registry or MetricsRegistry()
+        self._generations = registry.counter(
+            "llm_arm_generations_total",
+            "Report generations per traffic arm and outcome",
+            ["arm", "outcome"],
+        )
+        self._attempts = registry.counter(
+            "llm_arm_attempts_total",
+            "Model calls per traffic arm, retries included",
+            ["arm"],
+        )
+        self._latency = registry.histogram(
+            "llm_arm_latency_seconds",
+            "Report generation time per traffic arm, retries included",
+            ["arm"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self._dropped = registry.counter(
+            "llm_shadow_dropped_total",
+            "Shadow generations dropped because the shadow budget was used up",
+            ["arm"],
+        )
+
+    def generate_bug_report(
+        self,
+        user_input: str,
+        language: Optional[str] = None,
+        images: Sequence[ImageAttachment] = (),
+        context_prefix: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
+        """
+        Generate a report on the control or a canary arm, then start shadows.
+
+        See LLMService.generate_bug_report; the served arm's attempts are
+        reported to on_attempt, shadow attempts are not.
+        """
+        arm = self._pick_canary(images)
+        bug_report = self._run(
+            arm,
+            user_input,
+            language,
+            images,
+            context_prefix,
+            deadline,
+            on_attempt,
+        )
+        for shadow in self.shadows:
+            if self._eligible(shadow, images) and self._rng() * 100 < shadow.percent:
+                self._start_shadow(shadow, user_input, language, images, context_prefix)
+        return bug_report
+
+    def regenerate_field(
+        self,
+        bug_report: BugReport,
+        field: str,
+        instruction: Optional[str] = None,
+        language: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
+        """Regenerate a field with the control service."""
+        return self.control.regenerate_field(
+            bug_report, field, instruction, language, deadline, on_attempt
+        )
+
+    def generate_bug_report_from_prompt(
+        self,
+        prompt: str,
+        prompt_version: str,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[BugReport]:
+        """Generate from a complete prompt with the control service."""
+        return self.control.generate_bug_report_from_prompt(
+            prompt, prompt_version, deadline, on_attempt
+        )
+
+    def generate_text(
+        self,
+        prompt: str,
+        prompt_version: str,
+        deadline: Optional[Deadline] = None,
+        on_attempt: Optional[Callable[[AttemptUsage], None]] = None,
+    ) -> Optional[str]:
+        """Answer a free-form prompt with the control service."""
+        return self.control.generate_text(prompt, prompt_version, deadline, on_attempt)
+
+    def warm_up(self, probe: bool = False) -> None:
+        """Warm up the control service and every arm."""
+        self.control.warm_up(probe)
+        for arm in self.canaries + self.shadows:
+            arm.llm_service.warm_up(probe)
+
+    def is_available(self) -> bool:
+        """Report the control service's availability."""
+        return self.control.is_available()
+
+    def close(self) -> None:
+        """Stop the shadow threads once the queued shadows finish."""
+        if self._shadow_executor is not None:
+            self._shadow_executor.shutdown(wait=False)
+        self.control.close()
+        for arm in self.canaries + self.shadows:
+            arm.llm_service.close()
+
+    def _pick_canary(self, images: Sequence[ImageAttachment]) -> Optional[TrafficArm]:
+        """Return the canary arm a request goes to, or None for the control."""
+        roll = self._rng() * 100
+        for arm in self.canaries:
+            if roll < arm.percent:
+                return arm if self._eligible(arm, images) else None
+            roll -= arm.percent
+        return None
+
+    @staticmethod
+    def _eligible(arm: TrafficArm, images: Sequence[ImageAttachment]) -> bool:
+        """Custom prompts are text only, so screenshots keep their own arms out."""
+        return arm.prompt is None or not images
+
+    def _run(
+        self,
+        arm: Optional[TrafficArm],
+        user_input: str,
+        language: Optional[str],
+        images: Sequence[ImageAttachment],
+        context_prefix: Optional[str],
+        deadline: Optional[Deadline],
+        on_attempt: Optional[Callable[[AttemptUsage], None]],
+    ) -> Optional[BugReport]:
+        """Generate on one arm, recording its latency, attempts and outcome."""
+        name = arm.name if arm is not None else CONTROL
+        attempts = 0
+
+        def count_attempt(usage: AttemptUsage) -> None:
+            nonlocal attempts
+            attempts += 1
+            if on_attempt is not None:
+                on_attempt(usage)
+
+        started = time.perf_counter()
+        outcome = ERROR
+        try:
+            if arm is not None and arm.prompt is not None:
+                prompt = (context_prefix or "") + arm.prompt.build(user_input, language)
+                bug_report = arm.llm_service.generate_bug_report_from_prompt(
+                    prompt, arm.prompt.name, deadline, count_attempt
+                )
+            else:
+                service = arm.llm_service if arm is not None else self.control
+                # Like the pipeline, only pass the options that are set
+                options: Dict[str, Any] = {}
+                if images:
+                    options["images"] = images
+                if context_prefix:
+                    options["context_prefix"] = context_prefix
+                if deadline is not None:
+                    options["deadline"] = deadline
+                bug_report = service.generate_bug_report(
+                    user_input, language, on_attempt=count_attempt, **options
+                )
+            outcome = VALID if bug_report is not None else EMPTY
+            return bug_report
+        finally:
+            self._generations.inc(arm=name, outcome=outcome)
+            self._attempts.inc(attempts, arm=name)
+            self._latency.observe(time.perf_counter() - started, arm=name)
+
+    def _start_shadow(
+        self,
+        arm: TrafficArm,
+        user_input: str,
+        language: Optional[str],
+        images: Sequence[ImageAttachment],
+        context_prefix: Optional[str],
+    ) -> None:
+        """Queue a shadow generation, or drop it if the budget is used up."""
+        assert self._shadow_executor is not None
+        if not self._shadow_budget.acquire(blocking=False):
+            self._dropped.inc(arm=arm.name)
+            return
+
+        def shadow() -> None:
+            try:
+                self._run(
+                    arm,
+                    user_input,
+                    language,
+                    images,
+                    context_prefix,
+                    Deadline(self.shadow_timeout),
+                    None,
+                )
+            except BugReporterError as e:
+                logger.info("Shadow generation on %s failed: %s", arm.name, e)
+            except Exception:
+                logger.exception("Shadow generation on %s failed", arm.name)
+            finally:
+                self._shadow_budget.release()
+
+        try:
+            self._shadow_executor.submit(shadow)
+        except RuntimeError:
+            # Shut down while the request was being served
+            self._shadow_budget.release()
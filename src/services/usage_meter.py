@@ -0,0 +1,220 @@
+"""Token usage accounting and per-client quotas."""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from ..core.exceptions import QuotaExceededError
+from ..core.models import AttemptUsage
+
+# Client name used when a request does not identify itself
+DEFAULT_CLIENT = "anonymous"
+
+_Key = Tuple[str, str, str]
+
+
+@dataclass
+class UsageTotals:
+    """Usage accumulated for one client, model and prompt version."""
+
+    client: str
+    model: str
+    prompt_version: str
+    attempts: int = 0
+    failed_attempts: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    latency: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        """Return prompt and output tokens together."""
+        return self.prompt_tokens + self.output_tokens
+
+
+@dataclass
+class QuotaStatus:
+    """A client's token use in the current quota window."""
+
+    client: str
+    used: int
+    quota: Optional[int]
+    resets_at: float
+
+
+class _Shard:
+    """Usage recorded by the threads mapped to one shard."""
+
+    def __init__(self) -> None:
+        """Initialize an empty shard."""
+        self.lock = threading.Lock()
+        self.totals: Dict[_Key, UsageTotals] = {}
+        self.window = 0
+        self.window_tokens: Dict[str, int] = {}
+
+
+class UsageMeter:
+    """
+    Aggregate LLM token usage per client, model and prompt version.
+
+    Threads record into a fixed set of shards picked by thread ID, so
+    recording rarely waits on another request and the shards do not grow with
+    the number of threads that ever recorded. Readers merge the shards; quota
+    checks only read one integer per shard and take no lock at all.
+    """
+
+    def __init__(
+        self,
+        quotas: Optional[Mapping[str, int]] = None,
+        default_quota: Optional[int] = None,
+        window: float = 86400.0,
+        clock: Callable[[], float] = time.time,
+        shards: int = 16,
+    ):
+        """
+        Initialize the meter.
+
+        Args:
+            quotas: Tokens each named client may use per window
+            default_quota: Tokens any other client may use per window, or None
+                for no limit
+            window: Length of the quota window in seconds
+            clock: Wall clock returning seconds
+            shards: Number of shards recording threads are spread over
+        """
+        self.quotas = dict(quotas or {})
+        self.default_quota = default_quota
+        self.window = window
+        self._clock = clock
+        self._shards: Tuple[_Shard, ...] = tuple(_Shard() for _ in range(shards))
+
+    def recorder(self, client: str) -> Callable[[AttemptUsage], None]:
+        """
+        Bind the meter to a client, for use as an LLM on_attempt callback.
+
+        Args:
+            client: Client the attempts are billed to
+
+        Returns:
+            Callable recording one attempt
+        """
+        return lambda usage: self.record(client, usage)
+
+    def record(self, client: str, usage: AttemptUsage) -> None:
+        """
+        Add one attempt to the client's totals.
+
+        Args:
+            client: Client the attempt is billed to
+            usage: Tokens and latency of the attempt
+        """
+        shard = self._shard()
+        key = (client, usage.model, usage.prompt_version)
+        tokens = usage.prompt_tokens + usage.output_tokens
+        window = self._current_window()
+        with shard.lock:
+            totals = shard.totals.get(key)
+            if totals is None:
+                totals = shard.totals[key] = UsageTotals(*key)
+            totals.attempts += 1
+            totals.failed_attempts += not usage.succeeded
+            totals.prompt_tokens += usage.prompt_tokens
+            totals.output_tokens += usage.output_tokens
+            totals.latency += usage.latency
+            if shard.window != window:
+                shard.window = window
+                shard.window_tokens = {}
+            shard.window_tokens[client] = shard.window_tokens.get(client, 0) + tokens
+
+    def quota_for(self, client: str) -> Optional[int]:
+        """Return the client's token quota per window, or None if unlimited."""
+        return self.quotas.get(client, self.default_quota)
+
+    def used(self, client: str) -> int:
+        """Return the tokens the client has used in the current window."""
+        window = self._current_window()
+        return sum(
+            shard.window_tokens.get(client, 0)
+            for shard in self._shards
+            if shard.window == window
+        )
+
+    def check_quota(self, client: str, estimated_tokens: int = 0) -> None:
+        """
+        Refuse a call the client's remaining quota cannot cover.
+
+        Args:
+            client: Client about to make an LLM call
+            estimated_tokens: Expected prompt tokens of the call
+
+        Raises:
+            QuotaExceededError: If the call would exceed the quota
+        """
+        quota = self.quota_for(client)
+        if quota is None:
+            return
+        used = self.used(client)
+        if used + estimated_tokens > quota:
+            raise QuotaExceededError(
+                f"Client '{client}' has used {used} of its {quota} tokens; "
+                f"the quota resets in {self._resets_at() - self._clock():.0f}s"
+            )
+
+    def snapshot(self, client: Optional[str] = None) -> List[UsageTotals]:
+        """
+        Merge all shards into totals per client, model and prompt version.
+
+        Args:
+            client: Only report this client
+
+        Returns:
+            Totals sorted by client, model and prompt version
+        """
+        merged: Dict[_Key, UsageTotals] = {}
+        for shard in self._shards:
+            with shard.lock:
+                entries = [
+                    (key, totals)
+                    for key, totals in shard.totals.items()
+                    if client is None or key[0] == client
+                ]
+                for key, totals in entries:
+                    target = merged.get(key)
+                    if target is None:
+                        target = merged[key] = UsageTotals(*key)
+                    target.attempts += totals.attempts
+                    target.failed_attempts += totals.failed_attempts
+                    target.prompt_tokens += totals.prompt_tokens
+                    target.output_tokens += totals.output_tokens
+                    target.latency += totals.latency
+        return [merged[key] for key in sorted(merged)]
+
+    def quota_statuses(self, clients: List[str]) -> List[QuotaStatus]:
+        """
+        Report the current window's use of each client.
+
+        Args:
+            clients: Clients to report
+
+        Returns:
+            One status per client, in the given order
+        """
+        resets_at = self._resets_at()
+        return [
+            QuotaStatus(client, self.used(client), self.quota_for(client), resets_at)
+            for client in clients
+        ]
+
+    def _shard(self) -> _Shard:
+        """Return the shard of the calling thread."""
+        # Native thread IDs are small and sequential, unlike get_ident() addresses
+        return self._shards[threading.get_native_id() % len(self._shards)]
+
+    def _current_window(self) -> int:
+        """Return the index of the current quota window."""
+        return int(self._clock() // self.window)
+
+    def _resets_at(self) -> float:
+        """Return when the current quota window ends."""
+        return (self._current_window() + 1) * self.window
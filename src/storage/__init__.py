@@ -0,0 +1,7 @@
+"""Storage backends for the Bug Reporter application."""
+
+from .idempotency_store import SQLiteIdempotencyStore
+from .outbox_store import SQLiteOutboxStore
+from .sqlite_store import SQLiteReportStore
+
+__all__ = ["SQLiteIdempotencyStore", "SQLiteOutboxStore", "SQLiteReportStore"]
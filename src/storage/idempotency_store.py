@@ -0,0 +1,148 @@
+"""SQLite-backed store of responses remembered by Idempotency-Key."""
+
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from ..core.interfaces import IdempotencyStore
+from ..core.models import IdempotencyRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    status_code INTEGER,
+    body BLOB,
+    expires_at REAL NOT NULL,
+    lease_expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at
+    ON idempotency_keys (expires_at);
+"""
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """
+    Keep idempotency records in SQLite.
+
+    A database file shared by several server workers lets a retry that lands
+    on another worker see the original request's claim and response.
+    """
+
+    def __init__(self, path: str = ":memory:", clock: Callable[[], float] = time.time):
+        """
+        Initialize the store and create its schema if needed.
+
+        Args:
+            path: Database file path, or ":memory:" for a process-local store
+            clock: Wall clock returning seconds, shared by all workers
+        """
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def begin(
+        self, key: str, fingerprint: str, ttl: float, lease: float
+    ) -> IdempotencyRecord:
+        """Claim a key for a new request, or return the request already using it."""
+        now = self._clock()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so workers claim in turn
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute(
+                    "DELETE FROM idempotency_keys WHERE expires_at <= ?", (now,)
+                )
+                row = self._connection.execute(
+                    "SELECT fingerprint, completed, status_code, body, "
+                    "lease_expires_at FROM idempotency_keys WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    self._connection.execute(
+                        "INSERT INTO idempotency_keys "
+                        "(key, fingerprint, expires_at, lease_expires_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, fingerprint, now + ttl, now + lease),
+                    )
+                    record = IdempotencyRecord(key, fingerprint, False, claimed=True)
+                elif not row[1] and row[4] <= now and row[0] == fingerprint:
+                    # The worker holding the claim stopped renewing it
+                    self._connection.execute(
+                        "UPDATE idempotency_keys SET lease_expires_at = ? "
+                        "WHERE key = ?",
+                        (now + lease, key),
+                    )
+                    record = IdempotencyRecord(key, fingerprint, False, claimed=True)
+                else:
+                    record = self._row_to_record(key, row)
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return record
+
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """Load the current record of a key without claiming it."""
+        now = self._clock()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fingerprint, completed, status_code, body, lease_expires_at "
+                "FROM idempotency_keys WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        if row is None:
+            return None
+        record = self._row_to_record(key, row)
+        record.lease_expired = not record.completed and row[4] <= now
+        return record
+
+    def renew(self, key: str, lease: float) -> bool:
+        """Extend the lease of a claimed key whose request is still running."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE idempotency_keys SET lease_expires_at = ? "
+                "WHERE key = ? AND completed = 0",
+                (self._clock() + lease, key),
+            )
+        return cursor.rowcount > 0
+
+    def complete(self, key: str, status_code: int, body: bytes, ttl: float) -> None:
+        """Store the final response of a claimed key."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE idempotency_keys SET completed = 1, status_code = ?, "
+                "body = ?, expires_at = ? WHERE key = ?",
+                (status_code, body, self._clock() + ttl, key),
+            )
+
+    def release(self, key: str) -> None:
+        """Forget a claimed key without a response, so a retry runs again."""
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM idempotency_keys WHERE key = ? AND completed = 0", (key,)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _row_to_record(key: str, row: tuple) -> IdempotencyRecord:
+        """Build an IdempotencyRecord from a database row."""
+        return IdempotencyRecord(
+            key=key,
+            fingerprint=row[0],
+            completed=bool(row[1]),
+            status_code=row[2],
+            body=row[3],
+        )
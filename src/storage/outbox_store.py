@@ -0,0 +1,90 @@
+"""SQLite-backed store of Jira submissions that are not delivered yet."""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import List, Sequence
+
+from ..core.interfaces import OutboxStore
+from ..core.models import BugReport, StoredReport
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jira_outbox (
+    report_id TEXT PRIMARY KEY,
+    queued_at INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    user_input TEXT NOT NULL,
+    bug_report TEXT NOT NULL
+);
+"""
+
+
+class SQLiteOutboxStore(OutboxStore):
+    """
+    Keep pending Jira submissions in SQLite so they survive a restart.
+
+    The table can live in the report database file; each submission is stored
+    whole, so the outbox does not depend on the report store's schema.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Initialize the store and create its schema if needed.
+
+        Args:
+            path: Database file path, or ":memory:" for a process-local store
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def add(self, stored_report: StoredReport) -> None:
+        """Remember a report until its delivery is final."""
+        with self._lock, self._connection:
+            # queued_at numbers submissions so they reload in order
+            self._connection.execute(
+                "INSERT OR REPLACE INTO jira_outbox "
+                "(report_id, queued_at, created_at, user_input, bug_report) "
+                "VALUES (?, (SELECT COALESCE(MAX(queued_at), 0) + 1 "
+                "FROM jira_outbox), ?, ?, ?)",
+                (
+                    stored_report.id,
+                    stored_report.created_at.timestamp(),
+                    stored_report.user_input,
+                    json.dumps(stored_report.bug_report.to_dict()),
+                ),
+            )
+
+    def remove(self, report_ids: Sequence[str]) -> None:
+        """Forget reports whose delivery is final."""
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM jira_outbox WHERE report_id = ?",
+                [(report_id,) for report_id in report_ids],
+            )
+
+    def pending(self) -> List[StoredReport]:
+        """Load the reports still waiting for delivery, oldest first."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT report_id, created_at, user_input, bug_report "
+                "FROM jira_outbox ORDER BY queued_at"
+            ).fetchall()
+        return [
+            StoredReport(
+                id=row[0],
+                created_at=datetime.fromtimestamp(row[1], tz=timezone.utc),
+                user_input=row[2],
+                bug_report=BugReport.from_dict(json.loads(row[3])),
+            )
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,180 @@
+"""SQLite-backed store for generated bug reports."""
+
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Tuple
+
+from ..core.exceptions import ValidationError
+from ..core.interfaces import ReportStore
+from ..core.models import BugReport, StoredReport
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bug_reports (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    user_input TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    steps TEXT NOT NULL,
+    expected_result TEXT NOT NULL,
+    actual_result TEXT NOT NULL
+);
+DROP INDEX IF EXISTS idx_bug_reports_created_at;
+CREATE INDEX IF NOT EXISTS idx_bug_reports_created_at_id
+    ON bug_reports (created_at, id);
+"""
+
+_COLUMNS = (
+    "id, created_at, user_input, title, description, steps, "
+    "expected_result, actual_result"
+)
+
+
+def _timestamp(value: datetime) -> float:
+    """Convert a datetime to a UNIX timestamp, treating naive values as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class SQLiteReportStore(ReportStore):
+    """Persist bug reports in a SQLite database shared by all request threads."""
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Initialize the store and create its schema if needed.
+
+        Args:
+            path: Database file path, or ":memory:" for a process-local store
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def save(self, user_input: str, bug_report: BugReport) -> StoredReport:
+        """Persist a generated bug report under a new ID."""
+        stored = StoredReport(
+            id=uuid.uuid4().hex,
+            user_input=user_input,
+            bug_report=bug_report,
+            created_at=datetime.fromtimestamp(time.time(), tz=timezone.utc),
+        )
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT INTO bug_reports ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    stored.id,
+                    stored.created_at.timestamp(),
+                    user_input,
+                    bug_report.title,
+                    bug_report.description,
+                    bug_report.steps,
+                    bug_report.expected_result,
+                    bug_report.actual_result,
+                ),
+            )
+        return stored
+
+    def get(self, report_id: str) -> Optional[StoredReport]:
+        """Load a stored bug report by ID."""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM bug_reports WHERE id = ?", (report_id,)
+            ).fetchone()
+        return self._row_to_report(row) if row else None
+
+    def iter_reports(
+        self,
+        batch_size: int = 500,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after: Optional[str] = None,
+    ) -> Iterator[StoredReport]:
+        """Iterate over stored reports, oldest first, in keyset-paginated batches."""
+        where, params = self._range_filter(since, until)
+        last_key = self._report_key(after) if after else (float("-inf"), "")
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    f"SELECT {_COLUMNS} FROM bug_reports "
+                    f"WHERE (created_at, id) > (?, ?){where} "
+                    "ORDER BY created_at, id LIMIT ?",
+                    (last_key[0], last_key[1], *params, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_report(row)
+            last_key = (rows[-1][1], rows[-1][0])
+
+    def page_end(
+        self,
+        limit: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after: Optional[str] = None,
+    ) -> Optional[str]:
+        """Return the ID ending a page of `limit` reports if more reports follow it."""
+        where, params = self._range_filter(since, until)
+        last_key = self._report_key(after) if after else (float("-inf"), "")
+        with self._lock:
+            # Only touches the (created_at, id) index, never the report rows
+            rows = self._connection.execute(
+                "SELECT id FROM bug_reports "
+                f"WHERE (created_at, id) > (?, ?){where} "
+                "ORDER BY created_at, id LIMIT 2 OFFSET ?",
+                (last_key[0], last_key[1], *params, limit - 1),
+            ).fetchall()
+        return rows[0][0] if len(rows) == 2 else None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _report_key(self, report_id: str) -> Tuple[float, str]:
+        """Return the (created_at, id) sort key of a report used as a cursor."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT created_at, id FROM bug_reports WHERE id = ?", (report_id,)
+            ).fetchone()
+        if row is None:
+            raise ValidationError(f"Unknown cursor '{report_id}'")
+        return float(row[0]), str(row[1])
+
+    @staticmethod
+    def _range_filter(
+        since: Optional[datetime], until: Optional[datetime]
+    ) -> Tuple[str, List[float]]:
+        """Build the SQL condition for a [since, until) creation time range."""
+        where = ""
+        params: List[float] = []
+        if since is not None:
+            where += " AND created_at >= ?"
+            params.append(_timestamp(since))
+        if until is not None:
+            where += " AND created_at < ?"
+            params.append(_timestamp(until))
+        return where, params
+
+    @staticmethod
+    def _row_to_report(row: tuple) -> StoredReport:
+        """Build a StoredReport from a database row."""
+        return StoredReport(
+            id=row[0],
+            created_at=datetime.fromtimestamp(row[1], tz=timezone.utc),
+            user_input=row[2],
+            bug_report=BugReport(
+                title=row[3],
+                description=row[4],
+                steps=row[5],
+                expected_result=row[6],
+                actual_result=row[7],
+            ),
+        )
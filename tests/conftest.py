@@ -6,11 +6,12 @@ from unittest.mock import Mock, patch
 import sys
 import os
 
+from src.api.app import app
+from src.monitoring import EventLoopMonitor
+
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from src.api.app import app
-
 
 @pytest.fixture
 def client():
@@ -57,3 +58,29 @@ def sample_bug_report_response():
         "priority": "high",
         "formatted_report": "**Bug Report**\n\n**Title:** Missing Header on Main Page with 404 Console Error\n...",
     }
+
+
+@pytest.fixture(autouse=True)
+def fail_on_blocked_event_loop():
+    """
+    Fail any test during which a route blocked an app's event loop.
+
+    Covers the module-level app and every app a test builds with create_app().
+    """
+    monitors = [app.state.loop_monitor] if app.state.loop_monitor is not None else []
+    seen = {id(monitor): len(monitor.blocks) for monitor in monitors}
+
+    def track(*args, **kwargs):
+        monitor = EventLoopMonitor(*args, **kwargs)
+        monitors.append(monitor)
+        return monitor
+
+    with patch("src.api.app.EventLoopMonitor", side_effect=track):
+        yield
+    for monitor in monitors:
+        blocks = monitor.blocks[seen.get(id(monitor), 0) :]
+        if blocks:
+            pytest.fail(
+                f"The event loop was blocked for more than {monitor.threshold}s "
+                f"{len(blocks)} time(s); first blocking stack:\n{blocks[0].stack}"
+            )
@@ -3,7 +3,7 @@
 import pytest
 from unittest.mock import Mock, MagicMock
 from src.services.bug_report_service import BugReportService
-from src.core.exceptions import BugReporterError
+from src.core.exceptions import BugReporterError, ValidationError
 from src.core.models import BugReport
 
 
@@ -43,7 +43,9 @@ class TestBugReportService:
         result = service.generate_formatted_report("Test user input")
 
         assert result == "Formatted bug report"
-        mock_llm_service.generate_bug_report.assert_called_once_with("Test user input")
+        mock_llm_service.generate_bug_report.assert_called_once_with(
+            "Test user input", language="en"
+        )
         mock_formatter.format.assert_called_once_with(mock_bug_report)
 
     def test_generate_formatted_report_llm_returns_none(self):
@@ -57,7 +59,9 @@ class TestBugReportService:
         result = service.generate_formatted_report("Test user input")
 
         assert result is None
-        mock_llm_service.generate_bug_report.assert_called_once_with("Test user input")
+        mock_llm_service.generate_bug_report.assert_called_once_with(
+            "Test user input", language="en"
+        )
         mock_formatter.format.assert_not_called()
 
     def test_generate_formatted_report_llm_service_error(self):
@@ -96,3 +100,26 @@ class TestBugReportService:
             BugReporterError, match="Failed to generate formatted report"
         ):
             service.generate_formatted_report("Test user input")
+
+    def test_junk_input_rejected_before_llm(self):
+        """Test that junk input raises ValidationError without an LLM call."""
+        mock_llm_service = Mock()
+        mock_formatter = Mock()
+
+        service = BugReportService(mock_llm_service, mock_formatter)
+
+        with pytest.raises(ValidationError):
+            service.generate_formatted_report("https://example.com/page")
+        mock_llm_service.generate_bug_report.assert_not_called()
+
+    def test_russian_input_passes_language(self):
+        """Test that the detected language is passed to the LLM service."""
+        mock_llm_service = Mock()
+        mock_llm_service.generate_bug_report.return_value = None
+
+        service = BugReportService(mock_llm_service, Mock())
+        service.generate_formatted_report("Кнопка Submit не работает на странице")
+
+        mock_llm_service.generate_bug_report.assert_called_once_with(
+            "Кнопка Submit не работает на странице", language="ru"
+        )
@@ -0,0 +1,46 @@
+"""Tests for the circuit breaker."""
+
+from unittest.mock import patch
+
+from src.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state transitions."""
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.allow_request() is False
+
+    def test_success_resets_failures(self):
+        """Test that a success clears the failure count."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    @patch("src.services.circuit_breaker.time")
+    def test_half_open_allows_single_trial(self, mock_time):
+        """Test that only one trial call is let through after the timeout."""
+        mock_time.monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record_failure()
+
+        mock_time.monotonic.return_value = 111.0
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
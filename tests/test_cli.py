@@ -141,3 +141,63 @@ class TestCLIMain:
 
         mock_cli_class.assert_called_once()
         mock_cli.run.assert_called_once()
+
+
+class TestCLIModes:
+    """Tests for the daemon and REPL modes of the CLI."""
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    @patch("src.cli.main.DaemonServer")
+    def test_run_daemon(
+        self, mock_daemon_class, mock_bug_service_class, mock_formatter, mock_gemini
+    ):
+        """Test that --daemon serves the CLI's warm service."""
+        mock_bug_service = Mock()
+        mock_bug_service_class.return_value = mock_bug_service
+
+        cli = CLI()
+
+        with patch("builtins.print"):
+            cli.run(["--daemon", "--socket", "/tmp/test.sock", "--idle-timeout", "5"])
+
+        mock_daemon_class.assert_called_once_with(
+            mock_bug_service, socket_path="/tmp/test.sock", idle_timeout=5.0
+        )
+        mock_daemon_class.return_value.serve.assert_called_once()
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    def test_run_repl(self, mock_bug_service_class, mock_formatter, mock_gemini):
+        """Test that the REPL processes each non-empty line until exit."""
+        mock_bug_service = Mock()
+        mock_bug_service_class.return_value = mock_bug_service
+
+        cli = CLI()
+
+        with patch(
+            "builtins.input", side_effect=["First bug", "", "Second bug", "exit"]
+        ), patch("builtins.print"):
+            cli.run(["--repl"])
+
+        assert mock_bug_service.process_bug_report.call_count == 2
+        mock_bug_service.process_bug_report.assert_called_with("Second bug")
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    def test_run_without_input(
+        self, mock_bug_service_class, mock_formatter, mock_gemini
+    ):
+        """Test that a missing input without a mode does nothing."""
+        mock_bug_service = Mock()
+        mock_bug_service_class.return_value = mock_bug_service
+
+        cli = CLI()
+
+        with patch("sys.stderr"):
+            cli.run([])
+
+        mock_bug_service.process_bug_report.assert_not_called()
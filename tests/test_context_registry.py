@@ -0,0 +1,299 @@
+"""Tests for the per-application context registry."""
+
+import json
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.cli.main import CLI
+from src.core.exceptions import ValidationError
+from src.core.models import BugReport
+from src.prompts import BugReportPrompts, ContextRegistry, compile_context
+from src.prompts import context_registry as registry_module
+from src.services.bug_report_service import BugReportService
+
+BILLING = """Invoices are generated nightly by the ledger service.
+"Dunning" means the reminder emails for unpaid invoices."""
+
+
+@pytest.fixture
+def context_dir(tmp_path):
+    """Create a context directory with a text and a JSON context."""
+    (tmp_path / "billing.md").write_text(BILLING, encoding="utf-8")
+    (tmp_path / "crm.json").write_text(
+        json.dumps(
+            {
+                "title": "CRM",
+                "glossary": {"Lead": "a contact not yet qualified"},
+                "environment": {"Browser": "Chrome 120", "Build": "2024.05"},
+                "notes": "Staging data resets every Monday.",
+            }
+        ),
+        encoding="utf-8",
+    )
+    (tmp_path / "README").write_text("not a context", encoding="utf-8")
+    return tmp_path
+
+
+def bump_mtime(path) -> None:
+    """Move a file's modification time forward so a change is always visible."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestCompileContext:
+    """Tests for compile_context."""
+
+    def test_text_context(self):
+        """Test that text contexts are used as written."""
+        prefix = compile_context("billing", BILLING)
+
+        assert prefix.startswith("Application context for billing.")
+        assert prefix.endswith(BILLING + "\n\n")
+
+    def test_json_context(self):
+        """Test that JSON contexts are rendered into labelled sections."""
+        prefix = compile_context(
+            "crm",
+            json.dumps({"glossary": {"Lead": "a contact"}, "environment": "Chrome"}),
+            is_json=True,
+        )
+
+        assert "Glossary:\n- Lead: a contact" in prefix
+        assert "Environment:\nChrome" in prefix
+
+    @pytest.mark.parametrize(
+        "source,message",
+        [("{", "Invalid JSON"), ("[]", "must be an object"), ("{}", "empty")],
+    )
+    def test_invalid_json_context(self, source, message):
+        """Test that malformed JSON contexts are rejected."""
+        with pytest.raises(ValidationError, match=message):
+            compile_context("crm", source, is_json=True)
+
+
+class TestContextRegistry:
+    """Tests for ContextRegistry."""
+
+    def test_loads_directory(self, context_dir):
+        """Test that supported files become contexts named after the file."""
+        registry = ContextRegistry(str(context_dir))
+
+        assert registry.names() == ["billing", "crm"]
+        assert "- Build: 2024.05" in registry.get("crm").prefix
+        with pytest.raises(ValidationError, match="Unknown application context"):
+            registry.get("readme")
+
+    def test_requests_never_recompile(self, context_dir):
+        """Test that unchanged files are served from memory."""
+        registry = ContextRegistry(str(context_dir), reload_interval=0)
+
+        with patch.object(
+            registry_module, "compile_context", wraps=registry_module.compile_context
+        ) as mock_compile:
+            first = registry.get("billing")
+            second = registry.get("billing")
+
+        assert first is second
+        mock_compile.assert_not_called()
+
+    def test_changed_file_is_reloaded(self, context_dir):
+        """Test that a modified file is recompiled on the next scan."""
+        registry = ContextRegistry(str(context_dir), reload_interval=0)
+        path = context_dir / "billing.md"
+
+        path.write_text("Invoices are monthly.", encoding="utf-8")
+        bump_mtime(path)
+
+        assert "Invoices are monthly." in registry.get("billing").prefix
+
+    def test_touched_file_is_not_recompiled(self, context_dir):
+        """Test that a new mtime with identical content keeps the compiled prefix."""
+        registry = ContextRegistry(str(context_dir), reload_interval=0)
+        before = registry.get("billing")
+        bump_mtime(context_dir / "billing.md")
+
+        with patch.object(registry_module, "compile_context") as mock_compile:
+            after = registry.get("billing")
+
+        assert after is before
+        mock_compile.assert_not_called()
+
+    def test_reload_interval(self, context_dir):
+        """Test that the directory is not re-scanned before the interval passes."""
+        registry = ContextRegistry(str(context_dir), reload_interval=3600)
+        (context_dir / "billing.md").unlink()
+
+        assert "billing" in registry.names()
+        registry.refresh()
+        assert "billing" not in registry.names()
+
+    def test_token_budget(self, context_dir):
+        """Test that contexts over budget are reported and refused."""
+        (context_dir / "huge.txt").write_text("word " * 2000, encoding="utf-8")
+        registry = ContextRegistry(str(context_dir), max_tokens=500)
+
+        sizes = {size.name: size for size in registry.sizes()}
+
+        assert sizes["billing"].error is None
+        assert 0 < sizes["billing"].tokens <= 500
+        assert sizes["billing"].bytes == len(BILLING.encode("utf-8"))
+        assert "over the budget of 500" in sizes["huge"].error
+        with pytest.raises(ValidationError, match="unusable"):
+            registry.get("huge")
+
+    def test_missing_directory(self, tmp_path):
+        """Test that a missing directory yields an empty registry."""
+        assert ContextRegistry(str(tmp_path / "missing")).names() == []
+
+
+class TestContextInPrompt:
+    """Tests for placing the context before the prompt."""
+
+    def test_prefix_comes_first(self):
+        """Test that the context prefix precedes the prompt instructions."""
+        prompt = BugReportPrompts.create_bug_report_prompt(
+            "Login fails", "en", "Application context for crm.\n\n"
+        )
+
+        assert prompt.startswith("Application context for crm.\n\nGenerate")
+
+    def test_service_passes_context(self, context_dir):
+        """Test that the service sends the compiled prefix to the LLM."""
+        llm_service = Mock()
+        llm_service.generate_bug_report.return_value = None
+        context = ContextRegistry(str(context_dir)).get("billing")
+
+        BugReportService(llm_service, Mock()).generate_formatted_report(
+            "Invoice totals are wrong", context=context
+        )
+
+        assert llm_service.generate_bug_report.call_args[1] == {
+            "language": "en",
+            "context_prefix": context.prefix,
+        }
+
+
+class TestContextAPI:
+    """Tests for application contexts in the API."""
+
+    @pytest.fixture
+    def registry(self, context_dir):
+        """Install a context registry on the app."""
+        original = app.state.context_registry
+        app.state.context_registry = ContextRegistry(str(context_dir))
+        yield app.state.context_registry
+        app.state.context_registry = original
+
+    @patch("src.api.routes.GeminiService")
+    @patch("src.api.routes.JiraFormatter")
+    def test_request_with_context(
+        self, mock_formatter_class, mock_gemini_class, registry
+    ):
+        """Test that the requested context reaches the LLM."""
+        mock_gemini = Mock()
+        mock_gemini_class.return_value = mock_gemini
+        mock_gemini.generate_bug_report.return_value = BugReport(
+            title="Test Bug",
+            description="Test description",
+            steps="1. Test step",
+            expected_result="Expected result",
+            actual_result="Actual result",
+        )
+        mock_formatter_class.return_value.format.return_value = "Formatted report"
+
+        response = TestClient(app).post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Invoice totals are wrong", "context": "billing"},
+        )
+
+        assert response.status_code == 200
+        assert (
+            mock_gemini.generate_bug_report.call_args[1]["context_prefix"]
+            == registry.get("billing").prefix
+        )
+
+    @patch("src.api.routes.GeminiService")
+    def test_unknown_context(self, mock_gemini_class, registry):
+        """Test that an unknown context is rejected before generation."""
+        response = TestClient(app).post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Invoice totals are wrong", "context": "nope"},
+        )
+
+        assert response.status_code == 400
+        mock_gemini_class.return_value.generate_bug_report.assert_not_called()
+
+    @patch("src.api.routes.GeminiService")
+    def test_contexts_not_configured(self, mock_gemini_class):
+        """Test that requesting a context without a registry fails clearly."""
+        with patch.object(app.state, "context_registry", None):
+            response = TestClient(app).post(
+                "/api/v1/bug-reports",
+                json={"user_input": "Invoice totals are wrong", "context": "billing"},
+            )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Application contexts are not configured"
+
+    def test_list_contexts(self, registry):
+        """Test that context sizes are reported."""
+        response = TestClient(app).get("/api/v1/contexts")
+
+        assert response.status_code == 200
+        contexts = response.json()["contexts"]
+        assert [context["name"] for context in contexts] == ["billing", "crm"]
+        assert contexts[0]["max_tokens"] == 1000
+        assert contexts[0]["tokens"] > 0
+
+
+class TestContextCLI:
+    """Tests for the --context and --list-contexts CLI options."""
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    def test_context_option(
+        self, mock_bug_service_class, mock_formatter, mock_gemini, context_dir
+    ):
+        """Test that --context loads the context and passes it on."""
+        mock_bug_service = Mock()
+        mock_bug_service_class.return_value = mock_bug_service
+
+        with patch("src.cli.main.settings.context_dir", str(context_dir)):
+            CLI().run(["Invoice totals are wrong", "--context", "billing"])
+
+        call = mock_bug_service.process_bug_report.call_args
+        assert call[0] == ("Invoice totals are wrong",)
+        assert call[1]["context"].name == "billing"
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    def test_list_contexts(
+        self, mock_bug_service_class, mock_formatter, mock_gemini, context_dir, capsys
+    ):
+        """Test that --list-contexts prints each context's size."""
+        with patch("src.cli.main.settings.context_dir", str(context_dir)):
+            CLI().run(["--list-contexts"])
+
+        output = capsys.readouterr().out
+        assert "billing" in output and "crm" in output
+        assert "/1000 tokens  ok" in output
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    def test_context_not_configured(
+        self, mock_bug_service_class, mock_formatter, mock_gemini
+    ):
+        """Test that --context without CONTEXT_DIR exits with an error."""
+        with patch("src.cli.main.settings.context_dir", None), patch(
+            "builtins.print"
+        ) as mock_print, pytest.raises(SystemExit):
+            CLI().run(["Invoice totals are wrong", "--context", "billing"])
+
+        mock_print.assert_called_with("Error: CONTEXT_DIR is not set")
@@ -0,0 +1,159 @@
+"""Tests for the CLI daemon and its client."""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.core.exceptions import BugReporterError, DaemonError, DaemonUnavailableError
+from src.daemon.client import DaemonClient, main
+from src.daemon.server import DaemonServer
+
+
+@pytest.fixture
+def socket_path():
+    """Short socket path (Unix socket paths are length limited)."""
+    directory = tempfile.mkdtemp(prefix="br-")
+    yield os.path.join(directory, "d.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def start_server(service, socket_path, **kwargs):
+    """Start a daemon on a background thread and wait until it answers."""
+    server = DaemonServer(
+        service, socket_path=socket_path, poll_interval=0.05, **kwargs
+    )
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+
+    client = DaemonClient(socket_path)
+    for _ in range(100):
+        if client.is_running():
+            break
+        time.sleep(0.02)
+    return server, thread
+
+
+class TestDaemonServer:
+    """Tests for DaemonServer."""
+
+    def test_generate_through_daemon(self, socket_path):
+        """Test that the daemon answers with the service's formatted report."""
+        service = Mock()
+        service.generate_formatted_report.return_value = "Formatted bug report"
+        server, thread = start_server(service, socket_path, idle_timeout=0)
+
+        try:
+            result = DaemonClient(socket_path).generate_formatted_report("Test input")
+        finally:
+            server.stop()
+            thread.join(timeout=2)
+
+        assert result == "Formatted bug report"
+        service.generate_formatted_report.assert_called_once_with("Test input")
+
+    def test_service_error_is_reported_to_client(self, socket_path):
+        """Test that service errors are raised on the client side."""
+        service = Mock()
+        service.generate_formatted_report.side_effect = BugReporterError("LLM down")
+        server, thread = start_server(service, socket_path, idle_timeout=0)
+
+        try:
+            with pytest.raises(BugReporterError, match="LLM down"):
+                DaemonClient(socket_path).generate_formatted_report("Test input")
+        finally:
+            server.stop()
+            thread.join(timeout=2)
+
+    def test_shutdown_request_stops_daemon(self, socket_path):
+        """Test that a shutdown request stops the daemon and removes the socket."""
+        _server, thread = start_server(Mock(), socket_path, idle_timeout=0)
+
+        DaemonClient(socket_path).shutdown()
+        thread.join(timeout=2)
+
+        assert not thread.is_alive()
+        assert not os.path.exists(socket_path)
+
+    def test_idle_timeout_stops_daemon(self, socket_path):
+        """Test that the daemon exits on its own after the idle timeout."""
+        _server, thread = start_server(Mock(), socket_path, idle_timeout=0.2)
+
+        thread.join(timeout=3)
+
+        assert not thread.is_alive()
+
+    def test_refuses_to_replace_running_daemon(self, socket_path):
+        """Test that a second daemon does not steal a live socket."""
+        server, thread = start_server(Mock(), socket_path, idle_timeout=0)
+
+        try:
+            with pytest.raises(DaemonError, match="already listening"):
+                DaemonServer(Mock(), socket_path=socket_path).serve()
+        finally:
+            server.stop()
+            thread.join(timeout=2)
+
+    def test_empty_input_is_rejected(self):
+        """Test that empty input never reaches the service."""
+        service = Mock()
+        server = DaemonServer(service, socket_path="unused")
+
+        response = server.dispatch({"op": "generate", "input": "   "})
+
+        assert response["ok"] is False
+        service.generate_formatted_report.assert_not_called()
+
+
+class TestDaemonClient:
+    """Tests for DaemonClient and the daemon-aware launcher."""
+
+    def test_unavailable_without_daemon(self, socket_path):
+        """Test that a missing daemon raises DaemonUnavailableError."""
+        client = DaemonClient(socket_path)
+
+        assert client.is_running() is False
+        with pytest.raises(DaemonUnavailableError):
+            client.generate_formatted_report("Test input")
+
+    def test_launcher_falls_back_to_cli(self, socket_path):
+        """Test that the launcher runs in-process when no daemon is running."""
+        with patch("src.daemon.client.settings") as mock_settings, patch(
+            "src.cli.main.main"
+        ) as mock_cli_main:
+            mock_settings.daemon_socket_path = socket_path
+            mock_settings.daemon_request_timeout = 1
+            main(["Test bug description"])
+
+        mock_cli_main.assert_called_once_with(["Test bug description"])
+
+    def test_launcher_uses_daemon(self, socket_path):
+        """Test that the launcher prints the daemon's report."""
+        service = Mock()
+        service.generate_formatted_report.return_value = "Formatted bug report"
+        server, thread = start_server(service, socket_path, idle_timeout=0)
+
+        try:
+            with patch("src.daemon.client.settings") as mock_settings, patch(
+                "src.cli.main.main"
+            ) as mock_cli_main, patch("builtins.print") as mock_print:
+                mock_settings.daemon_socket_path = socket_path
+                mock_settings.daemon_request_timeout = 5
+                main(["Test bug description"])
+        finally:
+            server.stop()
+            thread.join(timeout=2)
+
+        mock_cli_main.assert_not_called()
+        mock_print.assert_called_with("Formatted bug report")
+
+    def test_launcher_passes_options_to_cli(self):
+        """Test that option switches always go to the in-process CLI."""
+        with patch("src.cli.main.main") as mock_cli_main:
+            main(["--repl"])
+
+        mock_cli_main.assert_called_once_with(["--repl"])
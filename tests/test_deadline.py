@@ -0,0 +1,243 @@
+"""Tests for request deadlines and cancellation."""
+
+import asyncio
+import os
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import routes
+from src.api.app import app
+from src.api.models import BugReportRequest
+from src.core.deadline import Deadline
+from src.core.exceptions import DeadlineExceededError, RequestCancelledError
+from src.services.bug_report_service import BugReportService
+from src.services.gemini_service import GeminiService
+
+VALID_RESPONSE = (
+    '{"Title": "Test Bug", "Description": "Test description", '
+    '"Steps": "1. Test step", "Expected result": "Expected", '
+    '"Actual result": "Actual"}'
+)
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class TestDeadline:
+    """Tests for Deadline."""
+
+    def test_remaining_and_cap(self):
+        """Test that timeouts are capped by the time remaining."""
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+        clock.now = 4
+
+        assert deadline.remaining() == 6
+        assert deadline.cap(60) == 6
+        assert deadline.cap(2) == 2
+        assert not deadline.expired
+
+    def test_expired(self):
+        """Test that check raises once the deadline has passed."""
+        clock = FakeClock()
+        deadline = Deadline(1, clock=clock)
+        clock.now = 1
+
+        assert deadline.remaining() == 0
+        with pytest.raises(DeadlineExceededError):
+            deadline.check()
+
+    def test_cancel(self):
+        """Test that a cancelled deadline stops work."""
+        deadline = Deadline()
+        deadline.cancel()
+
+        with pytest.raises(RequestCancelledError):
+            deadline.check()
+
+    def test_unbounded(self):
+        """Test that a deadline without a timeout never expires."""
+        deadline = Deadline()
+
+        assert deadline.remaining() is None
+        assert deadline.cap(30) == 30
+        deadline.check()
+
+
+@patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+@patch("src.services.gemini_service.genai")
+class TestGeminiDeadline:
+    """Tests for deadlines in GeminiService."""
+
+    def make_service(self, mock_genai, generate_content):
+        """Build a GeminiService whose model calls generate_content."""
+        mock_model = MagicMock()
+        mock_model.generate_content.side_effect = generate_content
+        mock_genai.GenerativeModel.return_value = mock_model
+        service = GeminiService()
+        service.attempt_timeout = 30
+        service.max_retries = 3
+        return service, mock_model
+
+    def test_attempt_timeout_is_capped(self, mock_genai):
+        """Test that each attempt's timeout is capped by the time remaining."""
+        response = MagicMock(text=VALID_RESPONSE)
+        service, mock_model = self.make_service(mock_genai, [response])
+
+        service.generate_bug_report("Test", deadline=Deadline(5))
+        timeout = mock_model.generate_content.call_args[1]["request_options"]["timeout"]
+
+        assert 0 < timeout <= 5
+
+    def test_no_retry_after_deadline(self, mock_genai):
+        """Test that no attempt starts once the deadline has passed."""
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+
+        def timed_out(*args, **kwargs):
+            clock.now = 10
+            raise TimeoutError("deadline exceeded")
+
+        service, mock_model = self.make_service(mock_genai, timed_out)
+
+        with pytest.raises(DeadlineExceededError):
+            service.generate_bug_report("Test", deadline=deadline)
+
+        assert mock_model.generate_content.call_count == 1
+        # Running out of our own time is not an upstream failure
+        assert service.circuit_breaker._failures == 0
+
+    def test_cancelled_before_retry(self, mock_genai):
+        """Test that cancellation stops retries after a failed attempt."""
+        deadline = Deadline(60)
+
+        def fails_after_disconnect(*args, **kwargs):
+            deadline.cancel()
+            raise ConnectionError("upstream reset")
+
+        service, mock_model = self.make_service(mock_genai, fails_after_disconnect)
+
+        with pytest.raises(RequestCancelledError):
+            service.generate_bug_report("Test", deadline=deadline)
+
+        assert mock_model.generate_content.call_count == 1
+
+    def test_retries_within_deadline(self, mock_genai):
+        """Test that failures before the deadline are still retried."""
+        response = MagicMock(text=VALID_RESPONSE)
+        service, mock_model = self.make_service(
+            mock_genai, [ConnectionError("reset"), response]
+        )
+
+        result = service.generate_bug_report("Test", deadline=Deadline(60))
+
+        assert result.title == "Test Bug"
+        assert mock_model.generate_content.call_count == 2
+
+
+class DisconnectedRequest:
+    """Stand-in for a Starlette request whose client has gone away."""
+
+    async def is_disconnected(self) -> bool:
+        """Report the client as disconnected."""
+        return True
+
+
+class TestRouteDeadline:
+    """Tests for deadlines and disconnects in the API."""
+
+    @patch("src.api.routes.GeminiService")
+    def test_header_sets_deadline(self, mock_gemini_class):
+        """Test that X-Request-Timeout bounds the deadline passed to the LLM."""
+        mock_gemini = mock_gemini_class.return_value
+        mock_gemini.generate_bug_report.return_value = None
+
+        TestClient(app).post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Test bug description"},
+            headers={"X-Request-Timeout": "5"},
+        )
+
+        deadline = mock_gemini.generate_bug_report.call_args[1]["deadline"]
+        assert 0 < deadline.remaining() <= 5
+
+    @patch("src.api.routes.GeminiService")
+    def test_header_cannot_extend_server_limit(self, mock_gemini_class):
+        """Test that the header cannot exceed REQUEST_TIMEOUT."""
+        mock_gemini = mock_gemini_class.return_value
+        mock_gemini.generate_bug_report.return_value = None
+
+        with patch.object(routes.settings, "request_timeout", 2):
+            TestClient(app).post(
+                "/api/v1/bug-reports",
+                json={"user_input": "Test bug description"},
+                headers={"X-Request-Timeout": "600"},
+            )
+
+        deadline = mock_gemini.generate_bug_report.call_args[1]["deadline"]
+        assert deadline.remaining() <= 2
+
+    def test_invalid_header(self):
+        """Test that a non-positive timeout is rejected."""
+        response = TestClient(app).post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Test bug description"},
+            headers={"X-Request-Timeout": "0"},
+        )
+
+        assert response.status_code == 422
+
+    @patch("src.api.routes.GeminiService")
+    def test_slow_generation_times_out(self, mock_gemini_class):
+        """Test that the request returns 504 at its deadline."""
+        mock_gemini_class.return_value.generate_bug_report.side_effect = (
+            lambda *args, **kwargs: time.sleep(1)
+        )
+
+        start = time.monotonic()
+        response = TestClient(app).post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Test bug description"},
+            headers={"X-Request-Timeout": "0.1"},
+        )
+
+        assert response.status_code == 504
+        assert time.monotonic() - start < 1
+
+    def test_disconnect_cancels_generation(self):
+        """Test that a client disconnect cancels the deadline and skips storing."""
+        llm_service = Mock()
+        llm_service.generate_bug_report.side_effect = (
+            lambda *args, **kwargs: time.sleep(0.5)
+        )
+        service = BugReportService(llm_service, Mock())
+        store = Mock()
+        deadline = Deadline(60)
+
+        response = asyncio.run(
+            routes.generate_report_response(
+                BugReportRequest(user_input="Test bug"),
+                service,
+                store,
+                None,
+                None,
+                deadline=deadline,
+                http_request=DisconnectedRequest(),
+            )
+        )
+
+        assert response.status_code == routes.CLIENT_CLOSED_REQUEST
+        assert deadline.cancelled
+        store.save.assert_not_called()
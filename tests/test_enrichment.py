@@ -0,0 +1,371 @@
+"""Tests for optional report enrichers."""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.config.settings import Settings
+from src.core.interfaces import Enricher
+from src.core.models import BugReport
+from src.prompts.context_registry import estimate_tokens
+from src.services.bug_report_service import BugReportService
+from src.services.enrichment import (
+    DONE,
+    FAILED,
+    PENDING,
+    TIMED_OUT,
+    EnrichmentRun,
+    InfoGapEnricher,
+    create_enrichers,
+)
+from src.services.gemini_service import GeminiService
+from src.services.pipeline import PipelineContext
+from src.services.scheduler import BULK, PriorityScheduler
+
+REPORT = BugReport(
+    title="Header missing on main page",
+    description="The header is not displayed",
+    steps="1. Open the main page",
+    expected_result="Header is visible",
+    actual_result="Header is missing",
+)
+
+
+class FakeEnricher(Enricher):
+    """Enricher returning a fixed answer, optionally after a delay or an error."""
+
+    def __init__(
+        self,
+        name,
+        answer="tip",
+        timeout=5.0,
+        delay=0.0,
+        error=None,
+        needs_report=False,
+    ):
+        """Configure the fake."""
+        super().__init__(timeout)
+        self.name = name
+        self.title = name.title()
+        self.answer = answer
+        self.delay = delay
+        self.error = error
+        self.needs_report = needs_report
+        self.started = threading.Event()
+        self.calls = []
+
+    def enrich(self, user_input, language, bug_report, deadline, on_attempt=None):
+        """Record the call, then answer."""
+        self.calls.append((user_input, language, bug_report))
+        self.started.set()
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.answer
+
+
+@pytest.fixture
+def executor():
+    """Provide a thread pool for enrichment runs."""
+    with ThreadPoolExecutor(4) as pool:
+        yield pool
+
+
+class TestEnrichmentRun:
+    """Tests for EnrichmentRun."""
+
+    def test_input_enrichers_start_before_the_report(self, executor):
+        """Test that only enrichers needing the report wait for it."""
+        early = FakeEnricher("root_cause")
+        late = FakeEnricher("info_gaps", needs_report=True)
+
+        run = EnrichmentRun(executor, [early, late], "Header missing", "en")
+
+        assert early.started.wait(1)
+        assert late.calls == []
+        assert run.results()[1].status == PENDING
+
+        run.report_ready(REPORT)
+        results = run.wait()
+
+        assert [r.status for r in results] == [DONE, DONE]
+        assert late.calls == [("Header missing", "en", REPORT)]
+
+    def test_slow_enricher_times_out_alone(self, executor):
+        """Test that a timed-out enricher does not hold up the others."""
+        slow = FakeEnricher("slow", timeout=0.05, delay=0.5)
+        fast = FakeEnricher("fast")
+
+        run = EnrichmentRun(executor, [slow, fast], "input")
+        started = time.monotonic()
+        results = run.wait()
+
+        assert time.monotonic() - started < 0.4
+        assert [(r.name, r.status) for r in results] == [
+            ("slow", TIMED_OUT),
+            ("fast", DONE),
+        ]
+
+    def test_failure_is_reported(self, executor):
+        """Test that an enricher error is kept as its result."""
+        run = EnrichmentRun(
+            executor, [FakeEnricher("broken", error=RuntimeError("boom"))], "input"
+        )
+
+        (result,) = run.wait()
+
+        assert result.status == FAILED
+        assert result.error == "boom"
+
+    def test_cancel_before_report(self, executor):
+        """Test that enrichers needing the report never start after cancel()."""
+        late = FakeEnricher("info_gaps", needs_report=True)
+        run = EnrichmentRun(executor, [late], "input")
+
+        run.cancel()
+        run.report_ready(REPORT)
+
+        assert late.calls == []
+        assert run.results()[0].status == FAILED
+
+    def test_as_completed_yields_fastest_first(self, executor):
+        """Test that results are streamed in the order they finish."""
+        run = EnrichmentRun(
+            executor,
+            [FakeEnricher("slow", delay=0.1), FakeEnricher("fast")],
+            "input",
+        )
+
+        assert [r.name for r in run.as_completed()] == ["fast", "slow"]
+
+    def test_timeout_starts_when_enricher_runs(self):
+        """Test that time queued for a worker thread does not count."""
+        with ThreadPoolExecutor(1) as single:
+            run = EnrichmentRun(
+                single,
+                [
+                    FakeEnricher("first", delay=0.2),
+                    FakeEnricher("second", timeout=0.15, delay=0.05),
+                ],
+                "input",
+            )
+
+            assert [r.status for r in run.wait()] == [DONE, DONE]
+
+    def test_calls_hold_a_slot(self, executor):
+        """Test that each enricher call runs inside the slot under its deadline."""
+        deadlines = []
+
+        @contextmanager
+        def slot(deadline):
+            deadlines.append(deadline)
+            yield
+
+        enricher = FakeEnricher("root_cause")
+        run = EnrichmentRun(executor, [enricher], "input", slot=slot)
+
+        assert [r.status for r in run.wait()] == [DONE]
+        assert deadlines[0].remaining() <= enricher.timeout
+
+    def test_deadline_spent_waiting_for_slot(self, executor):
+        """Test that an enricher whose deadline passed in the queue is skipped."""
+
+        @contextmanager
+        def slow_slot(deadline):
+            time.sleep(0.1)
+            yield
+
+        enricher = FakeEnricher("root_cause", timeout=0.05)
+        run = EnrichmentRun(executor, [enricher], "input", slot=slow_slot)
+
+        assert [r.status for r in run.wait()] == [TIMED_OUT]
+        assert enricher.calls == []
+
+    def test_scheduler_slot_from_thread(self, executor):
+        """Test that enrichers take bulk-lane slots from the request's scheduler."""
+        scheduler = PriorityScheduler(max_concurrency=1)
+        active = []
+
+        class SlotProbe(FakeEnricher):
+            def enrich(self, *args, **kwargs):
+                active.append(scheduler.active)
+                return super().enrich(*args, **kwargs)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            run = EnrichmentRun(
+                executor,
+                [SlotProbe("root_cause")],
+                "input",
+                slot=functools.partial(scheduler.thread_slot, loop, BULK),
+            )
+            await loop.run_in_executor(None, run.wait)
+            while scheduler.active:
+                await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+
+        assert active == [1]
+        assert scheduler.active == 0
+
+
+class TestEnrichers:
+    """Tests for the built-in enrichers."""
+
+    def test_create_enrichers(self):
+        """Test that enrichers are created by name with their own timeouts."""
+        root_cause, info_gaps = create_enrichers(
+            Mock(), {"root_cause": 20, "info_gaps": 5}
+        )
+
+        assert (root_cause.name, root_cause.timeout) == ("root_cause", 20)
+        assert (info_gaps.name, info_gaps.timeout) == ("info_gaps", 5)
+        with pytest.raises(ValueError):
+            create_enrichers(Mock(), {"severity": 5})
+
+    def test_info_gaps_needs_report(self):
+        """Test that the info gap enricher refuses to run without a report."""
+        with pytest.raises(ValueError, match="needs the generated report"):
+            InfoGapEnricher(Mock(), 5).enrich("input", "en", None, Mock())
+
+    def test_timeouts_may_be_fractional(self):
+        """Test that ENRICHERS accepts fractional timeouts."""
+        with patch.dict(os.environ, {"ENRICHERS": "root_cause:0.5,info_gaps=2.5"}):
+            assert Settings().enrichers == {"root_cause": 0.5, "info_gaps": 2.5}
+
+    def test_info_gaps_none(self):
+        """Test that a NONE answer means there is nothing to add."""
+        llm_service = Mock()
+        llm_service.generate_text.return_value = "NONE"
+
+        result = InfoGapEnricher(llm_service, 5).enrich("input", "ru", REPORT, Mock())
+
+        assert result is None
+        prompt, version = llm_service.generate_text.call_args.args
+        assert "Title: Header missing on main page" in prompt
+        assert version == "info_gaps-ru/v1"
+
+    @patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+    @patch("src.services.gemini_service.genai")
+    def test_gemini_generate_text(self, mock_genai):
+        """Test that free-form prompts return the model's text."""
+        mock_model = MagicMock()
+        mock_model.generate_content.return_value = MagicMock(text="- Stale cache\n")
+        mock_genai.GenerativeModel.return_value = mock_model
+
+        assert GeminiService().generate_text("prompt", "test/v1") == "- Stale cache"
+
+
+class TestBugReportServiceEnrichment:
+    """Tests for enrichment in BugReportService."""
+
+    def test_cli_prints_enrichments_after_report(self, capsys):
+        """Test that the report is printed first and failed enrichers are skipped."""
+        llm_service = Mock()
+        llm_service.generate_bug_report.return_value = REPORT
+        formatter = Mock()
+        formatter.format.return_value = "Formatted report"
+        service = BugReportService(
+            llm_service,
+            formatter,
+            enrichers=[
+                FakeEnricher("root_cause", "Stale cache"),
+                FakeEnricher("broken", error=RuntimeError("boom")),
+            ],
+        )
+
+        service.process_bug_report("The header is missing on the main page")
+
+        output = capsys.readouterr().out
+        assert output.index("Formatted report") < output.index("Root_Cause:")
+        assert "Stale cache" in output
+        assert "Broken" not in output
+
+    def test_quota_counts_enricher_prompts(self):
+        """Test that the quota check estimates one prompt per enricher."""
+        usage_meter = Mock()
+        service = BugReportService(
+            Mock(), Mock(), enrichers=[FakeEnricher("a"), FakeEnricher("b")]
+        )
+        user_input = "The header is missing on the main page"
+
+        service.build_pipeline(usage_meter=usage_meter).run(PipelineContext(user_input))
+        with_enrichers = usage_meter.check_quota.call_args.args[1]
+        service.build_pipeline(usage_meter=usage_meter, enrich=False).run(
+            PipelineContext(user_input)
+        )
+        without_enrichers = usage_meter.check_quota.call_args.args[1]
+
+        assert with_enrichers == without_enrichers + 2 * estimate_tokens(user_input)
+
+    def test_close_stops_enrichment_threads(self):
+        """Test that close() shuts the enrichment executor down."""
+        service = BugReportService(Mock(), Mock(), enrichers=[FakeEnricher("a")])
+        service.start_enrichment(service.prepare_input("Header is missing")).wait()
+        executor = service._enrichment_executor
+
+        service.close()
+
+        assert executor._shutdown
+        assert service._enrichment_executor is None
+
+    def test_failed_generation_cancels_enrichers(self, capsys):
+        """Test that enrichers needing the report are not started without one."""
+        llm_service = Mock()
+        llm_service.generate_bug_report.return_value = None
+        late = FakeEnricher("info_gaps", needs_report=True)
+        service = BugReportService(llm_service, Mock(), enrichers=[late])
+
+        service.process_bug_report("The header is missing on the main page")
+
+        assert "Failed to generate bug report" in capsys.readouterr().out
+        assert late.calls == []
+
+
+class TestEnrichmentAPI:
+    """Tests for enrichments in the API."""
+
+    @patch("src.api.routes.settings.enrichers", {"root_cause": 5})
+    @patch("src.api.routes.GeminiService")
+    def test_enrichments_are_attached_later(self, mock_gemini_class):
+        """Test that a slow enricher is fetched after the report was returned."""
+        release = threading.Event()
+        mock_gemini = mock_gemini_class.return_value
+        mock_gemini.generate_bug_report.return_value = REPORT
+        mock_gemini.generate_text.side_effect = lambda *args, **kwargs: (
+            release.wait(5) and "- Missing template"
+        )
+        client = TestClient(app)
+
+        response = client.post(
+            "/api/v1/bug-reports", json={"user_input": "Test bug description"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["enrichments"] == [
+            {"name": "root_cause", "status": "pending", "content": None, "error": None}
+        ]
+
+        release.set()
+        response = client.get(f"/api/v1/bug-reports/{data['id']}/enrichments?wait=5")
+
+        assert response.status_code == 200
+        (enrichment,) = response.json()["enrichments"]
+        assert enrichment["status"] == "done"
+        assert enrichment["content"] == "- Missing template"
+
+    def test_unknown_report(self):
+        """Test that reports without enrichments are a 404."""
+        response = TestClient(app).get("/api/v1/bug-reports/missing/enrichments")
+
+        assert response.status_code == 404
@@ -0,0 +1,297 @@
+"""Tests for streaming bulk export."""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import create_app
+from src.cli.main import CLI
+from src.core.exceptions import ValidationError
+from src.core.models import BugReport
+from src.export import CsvExporter, JiraCsvExporter, NdjsonExporter, create_exporter
+from src.services.export_service import ExportService
+from src.services.preprocessing import PreparedInput
+from src.storage import SQLiteReportStore
+
+
+def make_report(index: int) -> BugReport:
+    """Build a distinct sample bug report."""
+    return BugReport(
+        title=f"Bug {index}",
+        description=f'Description "{index}", with comma',
+        steps="1. Open page\n2. Click save",
+        expected_result="Saved",
+        actual_result="Crash",
+    )
+
+
+@pytest.fixture
+def store():
+    """Store holding five reports created one day apart."""
+    store = SQLiteReportStore()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for index in range(5):
+        created_at = start + timedelta(days=index)
+        with patch("src.storage.sqlite_store.time.time") as mock_time:
+            mock_time.return_value = created_at.timestamp()
+            store.save(f"input {index}", make_report(index))
+    return store
+
+
+def read_ndjson(chunks) -> list:
+    """Decode NDJSON chunks into records."""
+    return [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+
+
+class TestExporters:
+    """Tests for the individual exporters."""
+
+    def test_ndjson_rows(self, store):
+        """Test that NDJSON has one full record per line."""
+        records = read_ndjson(NdjsonExporter().stream(store.iter_reports()))
+
+        assert [record["title"] for record in records] == [f"Bug {i}" for i in range(5)]
+        assert records[0]["user_input"] == "input 0"
+        assert records[0]["created_at"].startswith("2024-01-01")
+
+    def test_csv_round_trips_quoting(self, store):
+        """Test that CSV quotes commas, quotes and newlines."""
+        content = b"".join(CsvExporter().stream(store.iter_reports())).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+
+        assert len(rows) == 5
+        assert rows[1]["description"] == 'Description "1", with comma'
+        assert rows[1]["steps"] == "1. Open page\n2. Click save"
+
+    def test_jira_csv_layout(self, store):
+        """Test the Jira import columns and Jira markup description."""
+        content = b"".join(JiraCsvExporter().stream(store.iter_reports())).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+
+        assert list(rows[0]) == ["Summary", "Issue Type", "Description", "Labels"]
+        assert rows[0]["Summary"] == "Bug 0"
+        assert rows[0]["Issue Type"] == "Bug"
+        assert rows[0]["Description"].startswith("*Description*:")
+        assert "*Title*" not in rows[0]["Description"]
+
+    def test_stream_is_chunked(self, store):
+        """Test that rows are grouped into chunks of about chunk_size bytes."""
+        chunks = list(NdjsonExporter().stream(store.iter_reports(), chunk_size=200))
+
+        assert len(chunks) > 1
+        assert len(read_ndjson(chunks)) == 5
+
+    def test_stream_is_lazy(self):
+        """Test that reports are consumed only as chunks are requested."""
+        reports = Mock()
+        reports.__iter__ = Mock(return_value=iter([]))
+
+        stream = NdjsonExporter().stream(reports)
+
+        reports.__iter__.assert_not_called()
+        assert list(stream) == []
+
+    def test_unknown_format(self):
+        """Test that unknown formats raise ValidationError."""
+        with pytest.raises(ValidationError, match="Available formats"):
+            create_exporter("xml")
+
+
+class TestExportService:
+    """Tests for ExportService filters and pagination."""
+
+    def test_date_range(self, store):
+        """Test that since is inclusive and until is exclusive."""
+        stream = ExportService(store).export(
+            "ndjson",
+            since=datetime(2024, 1, 2, tzinfo=timezone.utc),
+            until=datetime(2024, 1, 4, tzinfo=timezone.utc),
+        )
+
+        assert [r["title"] for r in read_ndjson(stream.chunks)] == ["Bug 1", "Bug 2"]
+        assert stream.next_cursor is None
+
+    def test_naive_dates_are_utc(self, store):
+        """Test that naive datetimes are treated as UTC."""
+        stream = ExportService(store).export("ndjson", since=datetime(2024, 1, 5))
+
+        assert [r["title"] for r in read_ndjson(stream.chunks)] == ["Bug 4"]
+
+    def test_pagination(self, store):
+        """Test that cursors walk every report exactly once."""
+        service = ExportService(store, batch_size=1)
+        titles = []
+        cursor = None
+        pages = 0
+        while True:
+            stream = service.export("ndjson", after=cursor, limit=2)
+            titles += [r["title"] for r in read_ndjson(stream.chunks)]
+            pages += 1
+            cursor = stream.next_cursor
+            if cursor is None:
+                break
+
+        assert titles == [f"Bug {i}" for i in range(5)]
+        assert pages == 3
+
+    def test_exact_last_page_has_no_cursor(self, store):
+        """Test that a page ending at the last report returns no cursor."""
+        assert ExportService(store).export("csv", limit=5).next_cursor is None
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"after": "missing"},
+            {"limit": 0},
+            {
+                "since": datetime(2024, 1, 3, tzinfo=timezone.utc),
+                "until": datetime(2024, 1, 2, tzinfo=timezone.utc),
+            },
+        ],
+    )
+    def test_invalid_arguments(self, store, kwargs):
+        """Test that invalid cursors, limits and ranges fail before streaming."""
+        with pytest.raises(ValidationError):
+            ExportService(store).export("ndjson", **kwargs)
+
+    def test_generate_reports_skips_failures(self):
+        """Test that batch generation stores successes and reports failures."""
+        store = SQLiteReportStore()
+        bug_report_service = Mock()
+        bug_report_service.prepare_input.side_effect = lambda text: PreparedInput(
+            text, "en"
+        )
+        bug_report_service.llm_service.generate_bug_report.side_effect = [
+            make_report(0),
+            None,
+        ]
+        on_error = Mock()
+
+        reports = list(
+            ExportService(store).generate_reports(
+                bug_report_service, ["first bug\n", "\n", "second bug\n"], on_error
+            )
+        )
+
+        assert [r.user_input for r in reports] == ["first bug"]
+        assert store.get(reports[0].id) is not None
+        on_error.assert_called_once()
+        assert on_error.call_args[0][0] == "second bug"
+
+
+class TestExportAPI:
+    """Tests for the export endpoint."""
+
+    def test_streams_ndjson_with_cursor(self, store):
+        """Test a paged NDJSON export with its next cursor header."""
+        app = create_app()
+        app.state.export_service = ExportService(store)
+        client = TestClient(app)
+
+        response = client.get(
+            "/api/v1/exports/bug-reports", params={"format": "ndjson", "limit": 3}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert "bug-reports.ndjson" in response.headers["content-disposition"]
+        assert len(response.text.splitlines()) == 3
+
+        next_page = client.get(
+            "/api/v1/exports/bug-reports",
+            params={"limit": 3, "cursor": response.headers["x-next-cursor"]},
+        )
+        assert len(next_page.text.splitlines()) == 2
+        assert "x-next-cursor" not in next_page.headers
+
+    def test_jira_csv_with_date_filter(self, store):
+        """Test a Jira CSV export filtered by date."""
+        app = create_app()
+        app.state.export_service = ExportService(store)
+        client = TestClient(app)
+
+        response = client.get(
+            "/api/v1/exports/bug-reports",
+            params={"format": "jira-csv", "since": "2024-01-04T00:00:00Z"},
+        )
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert response.status_code == 200
+        assert [row["Summary"] for row in rows] == ["Bug 3", "Bug 4"]
+
+    def test_invalid_format(self):
+        """Test that an unknown format is rejected with 400."""
+        client = TestClient(create_app())
+
+        response = client.get("/api/v1/exports/bug-reports", params={"format": "xml"})
+
+        assert response.status_code == 400
+
+
+class TestExportCLI:
+    """Tests for the --export CLI mode."""
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    def test_export_stored_reports(
+        self, mock_bug_service_class, mock_formatter, mock_gemini, tmp_path
+    ):
+        """Test exporting a file-backed store to an output file."""
+        db_path = str(tmp_path / "reports.db")
+        file_store = SQLiteReportStore(db_path)
+        for index in range(3):
+            file_store.save(f"input {index}", make_report(index))
+        file_store.close()
+        output = tmp_path / "export.csv"
+
+        CLI().run(["--export", "csv", "--store", db_path, "--output", str(output)])
+
+        rows = list(csv.DictReader(io.StringIO(output.read_text())))
+        assert [row["title"] for row in rows] == ["Bug 0", "Bug 1", "Bug 2"]
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    def test_export_generated_reports(
+        self, mock_bug_service_class, mock_formatter, mock_gemini, tmp_path
+    ):
+        """Test generating reports from an input file and exporting them."""
+        mock_bug_service = Mock()
+        mock_bug_service.prepare_input.side_effect = lambda text: PreparedInput(
+            text, "en"
+        )
+        mock_bug_service.llm_service.generate_bug_report.return_value = make_report(7)
+        mock_bug_service_class.return_value = mock_bug_service
+        input_file = tmp_path / "inputs.txt"
+        input_file.write_text("first bug\nsecond bug\n")
+        output = tmp_path / "export.ndjson"
+
+        CLI().run(
+            [
+                "--export",
+                "ndjson",
+                "--input-file",
+                str(input_file),
+                "--output",
+                str(output),
+            ]
+        )
+
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [r["user_input"] for r in records] == ["first bug", "second bug"]
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    def test_export_unknown_format_exits(
+        self, mock_bug_service_class, mock_formatter, mock_gemini
+    ):
+        """Test that an unknown export format exits with an error."""
+        with patch("sys.stderr"), pytest.raises(SystemExit):
+            CLI().run(["--export", "xml"])
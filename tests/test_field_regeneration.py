@@ -0,0 +1,185 @@
+"""Tests for regenerating a single field of a bug report."""
+
+import os
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.core.exceptions import QuotaExceededError
+from src.core.models import BugReport
+from src.prompts import BugReportPrompts
+from src.services.bug_report_service import BugReportService
+from src.services.gemini_service import GeminiService
+from src.services.pipeline import PipelineContext
+from src.services.usage_meter import UsageMeter
+
+REPORT = BugReport(
+    title="Header missing on main page",
+    description="The header is not displayed",
+    steps="1. Open the main page",
+    expected_result="Header is visible",
+    actual_result="Header is missing",
+)
+
+
+def gemini_with_responses(mock_genai, *texts):
+    """Make the mocked model answer with the given texts in turn."""
+    mock_model = MagicMock()
+    mock_model.generate_content.side_effect = [MagicMock(text=text) for text in texts]
+    mock_genai.GenerativeModel.return_value = mock_model
+    return mock_model
+
+
+class TestFieldPrompt:
+    """Tests for the field regeneration prompt."""
+
+    def test_asks_for_one_field(self):
+        """Test that the prompt requests only the chosen field, with its rules."""
+        prompt = BugReportPrompts.create_field_prompt(
+            list(REPORT.labeled_fields()), "Title", "Mention the 404"
+        )
+
+        assert '{"Title": "string"}' in prompt
+        assert "20-50 characters" in prompt
+        assert "Steps: 1. Open the main page" in prompt
+        assert prompt.endswith("Instruction: Mention the 404\n")
+
+    def test_russian_prompt(self):
+        """Test that Russian reports get the Russian prompt."""
+        prompt = BugReportPrompts.create_field_prompt(
+            list(REPORT.labeled_fields()), "Steps", language="ru"
+        )
+
+        assert "на русском языке" in prompt
+        assert "Указание" not in prompt
+        assert BugReportPrompts.field_prompt_version("ru") == "field-ru/v1"
+
+
+class TestGeminiFieldRegeneration:
+    """Tests for GeminiService.regenerate_field."""
+
+    @patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+    @patch("src.services.gemini_service.genai")
+    def test_merges_regenerated_field(self, mock_genai):
+        """Test that only the chosen field changes."""
+        gemini_with_responses(mock_genai, '{"Steps": "1. Open\\n2. Scroll up"}')
+        usage = []
+
+        result = GeminiService().regenerate_field(
+            REPORT, "steps", on_attempt=usage.append
+        )
+
+        assert result.steps == "1. Open\n2. Scroll up"
+        assert result.title == REPORT.title
+        assert result.actual_result == REPORT.actual_result
+        assert usage[0].prompt_version == "field-en/v1"
+
+    @patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+    @patch("src.services.gemini_service.genai")
+    def test_invalid_values_are_retried(self, mock_genai):
+        """Test that missing, mistyped and empty values are retried."""
+        mock_model = gemini_with_responses(
+            mock_genai, '{"Title": "Wrong field"}', '{"Steps": 3}', '{"Steps": " "}'
+        )
+        service = GeminiService()
+        service.max_retries = 3
+
+        assert service.regenerate_field(REPORT, "steps") is None
+        assert mock_model.generate_content.call_count == 3
+
+
+class TestFieldPipeline:
+    """Tests for BugReportService.build_field_pipeline."""
+
+    def context(self, instruction=None):
+        """Build the context of a title regeneration."""
+        return PipelineContext(
+            "Header missing",
+            client_id="team-a",
+            bug_report=REPORT,
+            field_name="title",
+            instruction=instruction,
+        )
+
+    def test_regenerates_and_formats(self):
+        """Test that the regenerated report is billed and formatted."""
+        llm_service = Mock()
+        llm_service.regenerate_field.return_value = REPORT
+        formatter = Mock()
+        formatter.format.return_value = "formatted"
+        service = BugReportService(llm_service, formatter)
+        pipeline = service.build_field_pipeline(UsageMeter())
+
+        ctx = pipeline.run(self.context("Mention the 404"))
+
+        assert pipeline.stage_names == ["preprocess", "quota", "generate", "format"]
+        assert ctx.formatted_report == "formatted"
+        args = llm_service.regenerate_field.call_args
+        assert args.args == (REPORT, "title", "Mention the 404")
+        assert args.kwargs["language"] == "en"
+        assert args.kwargs["on_attempt"] is not None
+
+    def test_quota_is_checked_first(self):
+        """Test that a client over its quota is refused before the LLM call."""
+        llm_service = Mock()
+        service = BugReportService(llm_service, Mock())
+        pipeline = service.build_field_pipeline(UsageMeter(default_quota=1))
+
+        with pytest.raises(QuotaExceededError):
+            pipeline.run(self.context())
+
+        llm_service.regenerate_field.assert_not_called()
+
+
+class TestFieldRegenerationAPI:
+    """Tests for POST /api/v1/bug-reports/regenerate-field."""
+
+    @patch("src.api.routes.GeminiService")
+    def test_regenerate_field(self, mock_gemini_class):
+        """Test that the merged report is returned formatted."""
+        regenerated = BugReport(
+            **{**REPORT.__dict__, "title": "Header 404 on main page"}
+        )
+        mock_gemini = mock_gemini_class.return_value
+        mock_gemini.regenerate_field.return_value = regenerated
+
+        response = TestClient(app).post(
+            "/api/v1/bug-reports/regenerate-field",
+            json={
+                "report": REPORT.__dict__,
+                "field": "title",
+                "instruction": "Mention the 404",
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["title"] == "Header 404 on main page"
+        assert "Header 404 on main page" in data["formatted_report"]
+        args = mock_gemini.regenerate_field.call_args
+        assert args.args[1:] == ("title", "Mention the 404")
+        assert args.kwargs["language"] == "en"
+        assert "generate;dur=" in response.headers["Server-Timing"]
+
+    def test_unknown_field(self):
+        """Test that only report fields can be regenerated."""
+        response = TestClient(app).post(
+            "/api/v1/bug-reports/regenerate-field",
+            json={"report": REPORT.__dict__, "field": "severity"},
+        )
+
+        assert response.status_code == 422
+
+    @patch("src.api.routes.GeminiService")
+    def test_regeneration_failure(self, mock_gemini_class):
+        """Test that a field the model never produced validly is a 500."""
+        mock_gemini_class.return_value.regenerate_field.return_value = None
+
+        response = TestClient(app).post(
+            "/api/v1/bug-reports/regenerate-field",
+            json={"report": REPORT.__dict__, "field": "steps"},
+        )
+
+        assert response.status_code == 500
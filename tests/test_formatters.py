@@ -3,6 +3,14 @@
 import pytest
 from src.formatters.jira_formatter import JiraFormatter
 from src.formatters.base_formatter import BaseFormatter
+from src.formatters import (
+    GitHubFormatter,
+    HtmlFormatter,
+    MarkdownFormatter,
+    PlainTextFormatter,
+    create_default_registry,
+)
+from src.core.exceptions import ValidationError
 from src.core.models import BugReport
 
 
@@ -92,3 +100,64 @@ class TestBaseFormatter:
         formatter = ValidFormatter()
         assert formatter is not None
         assert formatter.format(None) == "formatted"
+
+
+class TestAdditionalFormatters:
+    """Smoke tests for the Markdown, GitHub, HTML and text formatters."""
+
+    @pytest.fixture
+    def bug_report(self):
+        """Sample bug report with markup-sensitive characters."""
+        return BugReport(
+            title="Save <button> broken",
+            description="Clicking save does nothing & shows no error",
+            steps="1. Open editor\n2. Click save",
+            expected_result="Document is saved",
+            actual_result="Nothing happens",
+        )
+
+    def test_markdown_formatter(self, bug_report):
+        """Test Markdown output uses the title as a heading."""
+        formatted = MarkdownFormatter().format(bug_report)
+
+        assert formatted.startswith("# Save <button> broken")
+        assert "**Steps**\n\n1. Open editor\n2. Click save" in formatted
+
+    def test_github_formatter(self, bug_report):
+        """Test GitHub output omits the title and uses issue sections."""
+        formatted = GitHubFormatter().format(bug_report)
+
+        assert "Save <button> broken" not in formatted
+        assert formatted.startswith("### Description")
+        assert "### Expected behavior\n\nDocument is saved" in formatted
+
+    def test_html_formatter_escapes(self, bug_report):
+        """Test HTML output escapes user content."""
+        formatted = HtmlFormatter().format(bug_report)
+
+        assert "<h1>Save &lt;button&gt; broken</h1>" in formatted
+        assert "does nothing &amp; shows" in formatted
+        assert "1. Open editor<br>" in formatted
+
+    def test_text_formatter(self, bug_report):
+        """Test plain text output uses the base field format."""
+        formatted = PlainTextFormatter().format(bug_report)
+
+        assert formatted.startswith("Title:\nSave <button> broken")
+        assert "*" not in formatted
+
+
+class TestFormatterRegistry:
+    """Smoke tests for FormatterRegistry."""
+
+    def test_default_registry_names(self):
+        """Test that all built-in formats are registered."""
+        registry = create_default_registry()
+
+        assert registry.names() == ["github", "html", "jira", "markdown", "text"]
+        assert isinstance(registry.get("JIRA"), JiraFormatter)
+
+    def test_unknown_format(self):
+        """Test that unknown formats raise ValidationError."""
+        with pytest.raises(ValidationError, match="Available formats"):
+            create_default_registry().get("pdf")
@@ -2,6 +2,7 @@
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+import logging
 import os
 from src.core.exceptions import LLMServiceError
 from src.services.gemini_service import GeminiService
@@ -77,3 +78,51 @@ class TestGeminiService:
 
         # The service returns None for invalid JSON after all retries fail
         assert result is None
+
+    @patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+    @patch("src.services.gemini_service.genai")
+    def test_failed_attempts_are_logged(self, mock_genai, caplog, capsys):
+        """Test that retries are logged, not printed, and raw output is debug only."""
+        mock_response = MagicMock()
+        mock_response.text = "Invalid JSON response"
+        mock_genai.GenerativeModel.return_value.generate_content.return_value = (
+            mock_response
+        )
+
+        with caplog.at_level(logging.WARNING, logger="src.services.gemini_service"):
+            GeminiService().generate_bug_report("Test user input")
+
+        assert capsys.readouterr().out == ""
+        assert "schema validation failed" in caplog.text
+        assert "Invalid JSON response" not in caplog.text
+
+    @patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+    @patch("src.services.gemini_service.genai")
+    def test_warm_up_opens_connection(self, mock_genai):
+        """Test that warm-up creates the model and makes a cheap call."""
+        mock_model = MagicMock()
+        mock_genai.GenerativeModel.return_value = mock_model
+
+        service = GeminiService()
+        service.warm_up()
+
+        mock_model.count_tokens.assert_called_once()
+        mock_model.generate_content.assert_not_called()
+        assert service.is_available() is True
+
+    @patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+    @patch("src.services.gemini_service.genai")
+    def test_open_circuit_skips_api_calls(self, mock_genai):
+        """Test that an open circuit fails fast without calling the API."""
+        mock_model = MagicMock()
+        mock_genai.GenerativeModel.return_value = mock_model
+
+        service = GeminiService()
+        for _ in range(service.circuit_breaker.failure_threshold):
+            service.circuit_breaker.record_failure()
+
+        with pytest.raises(LLMServiceError, match="circuit open"):
+            service.generate_bug_report("Test user input")
+
+        assert service.is_available() is False
+        mock_model.generate_content.assert_not_called()
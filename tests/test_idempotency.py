@@ -0,0 +1,301 @@
+"""Tests for Idempotency-Key handling."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import HTTPException, Response
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.api.idempotency import REPLAYED_HEADER, IdempotencyGuard
+from src.core.deadline import Deadline
+from src.core.models import BugReport
+from src.storage import SQLiteIdempotencyStore
+
+
+class FakeClock:
+    """A manually advanced wall clock."""
+
+    def __init__(self):
+        """Start the clock at an arbitrary time."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class TestSQLiteIdempotencyStore:
+    """Tests for SQLiteIdempotencyStore."""
+
+    def test_first_begin_claims(self):
+        """Test that the first request with a key claims it."""
+        store = SQLiteIdempotencyStore()
+
+        first = store.begin("key", "abc", ttl=60, lease=10)
+        second = store.begin("key", "abc", ttl=60, lease=10)
+
+        assert first.claimed
+        assert not second.claimed and not second.completed
+
+    def test_completed_response_is_returned(self):
+        """Test that a completed key returns its stored response."""
+        store = SQLiteIdempotencyStore()
+        store.begin("key", "abc", ttl=60, lease=10)
+        store.complete("key", 200, b'{"ok": true}', ttl=60)
+
+        record = store.begin("key", "abc", ttl=60, lease=10)
+
+        assert record.completed
+        assert (record.status_code, record.body) == (200, b'{"ok": true}')
+
+    def test_ttl_expiry(self):
+        """Test that a key can be reused once its TTL has passed."""
+        clock = FakeClock()
+        store = SQLiteIdempotencyStore(clock=clock)
+        store.begin("key", "abc", ttl=60, lease=10)
+        store.complete("key", 200, b"{}", ttl=60)
+
+        clock.now += 61
+
+        assert store.get("key") is None
+        assert store.begin("key", "other", ttl=60, lease=10).claimed
+
+    def test_expired_lease_is_taken_over(self):
+        """Test that a claim abandoned by a crashed worker can be taken over."""
+        clock = FakeClock()
+        store = SQLiteIdempotencyStore(clock=clock)
+        store.begin("key", "abc", ttl=60, lease=10)
+
+        clock.now += 11
+
+        assert store.begin("key", "abc", ttl=60, lease=10).claimed
+        assert not store.begin("key", "abc", ttl=60, lease=10).claimed
+
+    def test_renew_extends_lease(self):
+        """Test that a renewed claim is not taken over and get() does not claim."""
+        clock = FakeClock()
+        store = SQLiteIdempotencyStore(clock=clock)
+        store.begin("key", "abc", ttl=60, lease=10)
+
+        clock.now += 8
+        assert store.renew("key", lease=10)
+        clock.now += 8
+        assert not store.get("key").lease_expired
+        assert not store.begin("key", "abc", ttl=60, lease=10).claimed
+        clock.now += 11
+        assert store.get("key").lease_expired
+        assert store.begin("key", "abc", ttl=60, lease=10).claimed
+
+    def test_release(self):
+        """Test that a released key can be claimed again."""
+        store = SQLiteIdempotencyStore()
+        store.begin("key", "abc", ttl=60, lease=10)
+
+        store.release("key")
+
+        assert store.begin("key", "abc", ttl=60, lease=10).claimed
+
+    def test_shared_between_workers(self, tmp_path):
+        """Test that two connections to one file see each other's claims."""
+        path = str(tmp_path / "idempotency.db")
+        worker_a = SQLiteIdempotencyStore(path)
+        worker_b = SQLiteIdempotencyStore(path)
+
+        assert worker_a.begin("key", "abc", ttl=60, lease=10).claimed
+        assert not worker_b.begin("key", "abc", ttl=60, lease=10).claimed
+        worker_a.complete("key", 201, b"{}", ttl=60)
+        assert worker_b.get("key").completed
+
+
+def ok_handler(calls):
+    """Build a handler that records its calls and returns a JSON response."""
+
+    async def handler():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return Response(content=b'{"n": 1}', media_type="application/json")
+
+    return handler
+
+
+class TestIdempotencyGuard:
+    """Tests for IdempotencyGuard."""
+
+    def test_concurrent_retry_attaches(self):
+        """Test that a retry during the original waits for and shares its result."""
+        guard = IdempotencyGuard(SQLiteIdempotencyStore())
+        calls = []
+
+        async def scenario():
+            return await asyncio.gather(
+                guard.run("key", "abc", ok_handler(calls)),
+                guard.run("key", "abc", ok_handler(calls)),
+            )
+
+        first, second = asyncio.run(scenario())
+
+        assert len(calls) == 1
+        assert first.body == second.body == b'{"n": 1}'
+        assert second.headers[REPLAYED_HEADER] == "true"
+
+    def test_fingerprint_mismatch(self):
+        """Test that reusing a key for another payload is rejected."""
+        guard = IdempotencyGuard(SQLiteIdempotencyStore())
+        asyncio.run(guard.run("key", "abc", ok_handler([])))
+
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(guard.run("key", "xyz", ok_handler([])))
+
+        assert e.value.status_code == 422
+
+    def test_server_error_is_not_remembered(self):
+        """Test that a 5xx outcome lets the retry run again."""
+        guard = IdempotencyGuard(SQLiteIdempotencyStore())
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            raise HTTPException(status_code=500, detail="boom")
+
+        with pytest.raises(HTTPException):
+            asyncio.run(guard.run("key", "abc", failing))
+        response = asyncio.run(guard.run("key", "abc", ok_handler(calls)))
+
+        assert len(calls) == 2
+        assert REPLAYED_HEADER not in response.headers
+
+    def test_client_error_is_remembered(self):
+        """Test that a 4xx outcome is replayed with its detail."""
+        guard = IdempotencyGuard(SQLiteIdempotencyStore())
+
+        async def rejected():
+            raise HTTPException(status_code=422, detail="too short")
+
+        with pytest.raises(HTTPException):
+            asyncio.run(guard.run("key", "abc", rejected))
+        response = asyncio.run(guard.run("key", "abc", ok_handler([])))
+
+        assert response.status_code == 422
+        assert response.body == b'{"detail": "too short"}'
+
+    def test_waits_for_other_worker(self, tmp_path):
+        """Test that a retry polls the shared store while another worker runs."""
+        path = str(tmp_path / "idempotency.db")
+        other_worker = SQLiteIdempotencyStore(path)
+        other_worker.begin("key", "abc", ttl=60, lease=60)
+        guard = IdempotencyGuard(SQLiteIdempotencyStore(path), poll_interval=0.01)
+        handler = Mock()
+
+        timer = threading.Timer(
+            0.1, other_worker.complete, ("key", 200, b'{"n": 2}', 60)
+        )
+        timer.start()
+        with patch.object(guard.store, "begin", wraps=guard.store.begin) as begin:
+            response = asyncio.run(guard.run("key", "abc", handler))
+        timer.join()
+
+        assert response.body == b'{"n": 2}'
+        handler.assert_not_called()
+        # Polling reads the store instead of retrying the claim
+        assert begin.call_count == 1
+
+    def test_lease_renewed_while_handler_runs(self, tmp_path):
+        """Test that a request outliving its lease is not taken over."""
+        path = str(tmp_path / "idempotency.db")
+        guard = IdempotencyGuard(SQLiteIdempotencyStore(path), lease=0.1)
+        other_worker = SQLiteIdempotencyStore(path)
+        claims = []
+
+        async def slow_handler():
+            await asyncio.sleep(0.3)
+            claims.append(other_worker.begin("key", "abc", ttl=60, lease=0.1).claimed)
+            return Response(b"{}", status_code=200)
+
+        response = asyncio.run(guard.run("key", "abc", slow_handler))
+
+        assert response.status_code == 200
+        assert claims == [False]
+
+    def test_wait_bounded_by_deadline(self, tmp_path):
+        """Test that waiting for another worker gives up at the deadline."""
+        path = str(tmp_path / "idempotency.db")
+        SQLiteIdempotencyStore(path).begin("key", "abc", ttl=60, lease=60)
+        guard = IdempotencyGuard(SQLiteIdempotencyStore(path), poll_interval=0.01)
+
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(guard.run("key", "abc", Mock(), Deadline(0.05)))
+
+        assert e.value.status_code == 504
+
+
+class TestIdempotencyAPI:
+    """Tests for the Idempotency-Key header on POST /bug-reports."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_guard(self):
+        """Give each test an empty idempotency store."""
+        original = app.state.idempotency_guard
+        app.state.idempotency_guard = IdempotencyGuard(SQLiteIdempotencyStore())
+        yield
+        app.state.idempotency_guard = original
+
+    @patch("src.api.routes.GeminiService")
+    def test_retry_returns_stored_report(self, mock_gemini_class):
+        """Test that a retry after completion replays the report without the LLM."""
+
+        def slow_report(*args, **kwargs):
+            time.sleep(0.1)
+            return BugReport(
+                title="Test Bug",
+                description="Test description",
+                steps="1. Test step",
+                expected_result="Expected result",
+                actual_result="Actual result",
+            )
+
+        mock_gemini = mock_gemini_class.return_value
+        mock_gemini.generate_bug_report.side_effect = slow_report
+        client = TestClient(app)
+        request = {
+            "json": {"user_input": "Test bug description"},
+            "headers": {"Idempotency-Key": "retry-1"},
+        }
+
+        first = client.post("/api/v1/bug-reports", **request)
+        second = client.post("/api/v1/bug-reports", **request)
+
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert second.headers[REPLAYED_HEADER] == "true"
+        assert mock_gemini.generate_bug_report.call_count == 1
+
+    @patch("src.api.routes.GeminiService")
+    def test_key_reused_for_other_input(self, mock_gemini_class):
+        """Test that a key reused with a different body is rejected."""
+        mock_gemini_class.return_value.generate_bug_report.return_value = BugReport(
+            title="Test Bug",
+            description="Test description",
+            steps="1. Test step",
+            expected_result="Expected result",
+            actual_result="Actual result",
+        )
+        client = TestClient(app)
+        headers = {"Idempotency-Key": "reused"}
+
+        client.post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Test bug description"},
+            headers=headers,
+        )
+        response = client.post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Another bug description"},
+            headers=headers,
+        )
+
+        assert response.status_code == 422
+        assert "different request" in response.json()["detail"]
@@ -0,0 +1,271 @@
+"""Tests for screenshot attachments."""
+
+import asyncio
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from src.api.app import app
+from src.attachments import ImageProcessor, process_image
+from src.attachments import images as images_module
+from src.core.exceptions import ValidationError
+from src.core.models import BugReport, ImageAttachment
+from src.services.gemini_service import GeminiService
+
+
+def encode(size, image_format="PNG", mode="RGB", color=(200, 30, 30)) -> bytes:
+    """Encode a solid-color image of the given size."""
+    buffer = io.BytesIO()
+    Image.new(mode, size, color).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def make_report() -> BugReport:
+    """Build a minimal generated bug report."""
+    return BugReport(
+        title="Test Bug",
+        description="Test description",
+        steps="1. Test step",
+        expected_result="Expected result",
+        actual_result="Actual result",
+    )
+
+
+class TestProcessImage:
+    """Tests for process_image."""
+
+    def test_large_screenshot_is_downscaled(self):
+        """Test that a large PNG is downscaled and re-encoded as JPEG."""
+        data = encode((3000, 1500))
+
+        image = process_image(data, max_dimension=1000)
+
+        assert image.mime_type == "image/jpeg"
+        assert (image.width, image.height) == (1000, 500)
+        assert Image.open(io.BytesIO(image.data)).size == (1000, 500)
+        assert image.original_size == len(data)
+        assert len(image.digest) == 64
+
+    def test_small_image_keeps_original_bytes(self):
+        """Test that a small, already compact image is passed through."""
+        data = encode((100, 80), "JPEG")
+
+        image = process_image(data, max_dimension=1000)
+
+        assert image.data == data
+        assert image.mime_type == "image/jpeg"
+
+    def test_transparency_is_flattened(self):
+        """Test that transparent screenshots are composited onto white."""
+        data = encode((2000, 100), mode="RGBA", color=(0, 0, 0, 0))
+
+        image = process_image(data, max_dimension=1000)
+
+        decoded = Image.open(io.BytesIO(image.data))
+        assert decoded.mode == "RGB"
+        assert decoded.getpixel((10, 10))[0] > 240
+
+    def test_invalid_image(self):
+        """Test that undecodable data raises ValidationError."""
+        with pytest.raises(ValidationError, match="Not a supported image"):
+            process_image(b"not an image")
+
+    def test_too_many_pixels_are_refused_before_decoding(self):
+        """Test that the pixel limit is checked on the header."""
+        with pytest.raises(ValidationError, match="too large"):
+            process_image(encode((500, 500)), max_pixels=1000)
+
+
+class TestImageProcessor:
+    """Tests for ImageProcessor."""
+
+    def test_same_image_is_processed_once(self):
+        """Test that repeated and concurrent uploads share one processing run."""
+        processor = ImageProcessor(max_workers=0, max_dimension=100)
+        data = encode((400, 400))
+
+        async def run():
+            first, second = await asyncio.gather(
+                processor.process(data), processor.process(data)
+            )
+            third = await processor.process(data)
+            return first, second, third
+
+        with patch.object(
+            images_module, "process_image", wraps=images_module.process_image
+        ) as mock_process:
+            first, second, third = asyncio.run(run())
+
+        assert mock_process.call_count == 1
+        assert first is second is third
+
+    def test_cache_is_bounded(self):
+        """Test that least recently used images are evicted."""
+        processor = ImageProcessor(max_workers=0, cache_size=2)
+
+        async def run():
+            for color in ((1, 1, 1), (2, 2, 2), (3, 3, 3)):
+                await processor.process(encode((10, 10), color=color))
+
+        asyncio.run(run())
+
+        assert len(processor._cache) == 2
+
+    def test_upload_size_cap(self):
+        """Test that oversized uploads are refused without decoding."""
+        processor = ImageProcessor(max_workers=0, max_bytes=10)
+
+        with pytest.raises(ValidationError, match="larger than"):
+            asyncio.run(processor.process(encode((10, 10))))
+
+    def test_process_pool(self):
+        """Test that images are processed in worker processes."""
+        processor = ImageProcessor(max_workers=1, max_dimension=100)
+
+        try:
+            image = asyncio.run(processor.process(encode((400, 200))))
+            with pytest.raises(ValidationError):
+                asyncio.run(processor.process(b"not an image"))
+        finally:
+            processor.close()
+
+        assert (image.width, image.height) == (100, 50)
+
+    def test_close_cancels_queued_images(self):
+        """Test that close cancels images still waiting for a worker."""
+        processor = ImageProcessor(max_workers=1)
+        processor._executor = ThreadPoolExecutor(max_workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_process(*args):
+            started.set()
+            release.wait()
+
+        async def run():
+            processor._submit(b"first", "first")
+            started.wait(1)
+            processor._submit(b"second", "second")
+            submitted = list(processor._submitted)
+            threading.Timer(0.05, release.set).start()
+            processor.close()
+            return submitted
+
+        with patch("src.attachments.images.process_image", side_effect=slow_process):
+            submitted = asyncio.run(run())
+
+        assert sorted(future.cancelled() for future in submitted) == [False, True]
+        assert processor._executor is None
+
+
+class TestMultimodalGeneration:
+    """Tests for sending screenshots to Gemini."""
+
+    @patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+    @patch("src.services.gemini_service.genai")
+    def test_images_are_sent_as_parts(self, mock_genai):
+        """Test that images follow the prompt as inline parts."""
+        mock_model = MagicMock()
+        mock_model.generate_content.return_value.text = (
+            '{"Title": "Test Bug", "Description": "Test description", '
+            '"Steps": "1. Test step", "Expected result": "Expected", '
+            '"Actual result": "Actual"}'
+        )
+        mock_genai.GenerativeModel.return_value = mock_model
+        image = ImageAttachment("image/jpeg", b"jpeg-bytes", 10, 10, "abc", 100)
+
+        GeminiService().generate_bug_report("Test user input", images=[image])
+
+        contents = mock_model.generate_content.call_args[0][0]
+        assert "Test user input" in contents[0]
+        assert contents[-1] == {"mime_type": "image/jpeg", "data": b"jpeg-bytes"}
+
+
+class TestScreenshotAPI:
+    """Tests for screenshots on the multipart bug report endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def inline_processor(self):
+        """Process screenshots in threads instead of worker processes."""
+        original = app.state.image_processor
+        app.state.image_processor = ImageProcessor(max_workers=0, max_dimension=200)
+        yield
+        app.state.image_processor = original
+
+    @patch("src.api.routes.GeminiService")
+    @patch("src.api.routes.JiraFormatter")
+    def test_upload_screenshots(self, mock_formatter_class, mock_gemini_class):
+        """Test that distinct processed screenshots reach the LLM."""
+        mock_gemini = Mock()
+        mock_gemini_class.return_value = mock_gemini
+        mock_gemini.generate_bug_report.return_value = make_report()
+        mock_formatter_class.return_value.format.return_value = "Formatted report"
+        screenshot = encode((800, 600))
+
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/bug-reports/with-attachments",
+            data={"user_input": "The header overlaps the page content"},
+            files=[
+                ("screenshots", ("a.png", screenshot, "image/png")),
+                ("screenshots", ("b.png", screenshot, "image/png")),
+                ("screenshots", ("c.jpg", encode((50, 50), "JPEG"), "image/jpeg")),
+            ],
+        )
+
+        assert response.status_code == 200
+        images = mock_gemini.generate_bug_report.call_args[1]["images"]
+        assert [(image.width, image.height) for image in images] == [
+            (200, 150),
+            (50, 50),
+        ]
+
+    @patch("src.api.routes.GeminiService")
+    def test_invalid_screenshot(self, mock_gemini_class):
+        """Test that an undecodable screenshot is rejected with 422."""
+        client = TestClient(app)
+
+        response = client.post(
+            "/api/v1/bug-reports/with-attachments",
+            data={"user_input": "The header overlaps the page content"},
+            files=[("screenshots", ("a.png", b"garbage", "image/png"))],
+        )
+
+        assert response.status_code == 422
+        assert "a.png" in response.json()["detail"]
+        mock_gemini_class.return_value.generate_bug_report.assert_not_called()
+
+    @patch("src.api.routes.GeminiService")
+    def test_screenshot_too_large(self, mock_gemini_class):
+        """Test that an oversized screenshot is rejected with 413."""
+        app.state.image_processor.max_bytes = 100
+        client = TestClient(app)
+
+        response = client.post(
+            "/api/v1/bug-reports/with-attachments",
+            data={"user_input": "The header overlaps the page content"},
+            files=[("screenshots", ("a.png", encode((400, 400)), "image/png"))],
+        )
+
+        assert response.status_code == 413
+
+    def test_too_many_screenshots(self):
+        """Test that the number of screenshots is limited."""
+        client = TestClient(app)
+
+        with patch("src.api.routes.settings.image_max_attachments", 1):
+            response = client.post(
+                "/api/v1/bug-reports/with-attachments",
+                data={"user_input": "The header overlaps the page content"},
+                files=[
+                    ("screenshots", ("a.png", encode((10, 10)), "image/png")),
+                    ("screenshots", ("b.png", encode((20, 20)), "image/png")),
+                ],
+            )
+
+        assert response.status_code == 400
@@ -0,0 +1,382 @@
+"""Tests for direct Jira submission against a local stand-in Jira server."""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import create_app
+from src.config import settings
+from src.core.exceptions import JiraError
+from src.core.models import BugReport, StoredReport
+from src.jira import JiraClient, JiraOutbox
+from src.jira.outbox import CREATED, FAILED, PENDING
+from src.storage import SQLiteOutboxStore
+
+
+class StandInJira:
+    """Minimal Jira REST server implementing issue create and bulk create."""
+
+    def __init__(self):
+        """Start the server on a free local port."""
+        self.requests = []
+        self.client_ports = set()
+        self.rate_limited_responses = 0
+        self.fail_with_status = None
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _create(self, fields):
+        """Create one issue, or return the errors Jira would report."""
+        if "reject" in fields["summary"]:
+            return None, {"errors": {"summary": "Summary is not allowed"}}
+        with self._lock:
+            issue_id = self._next_id
+            self._next_id += 1
+        return {"id": str(issue_id), "key": f"BUG-{issue_id}"}, None
+
+    def _handler_class(self):
+        jira = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, headers=None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with jira._lock:
+                    jira.requests.append((self.path, body))
+                    jira.client_ports.add(self.client_address[1])
+                    rate_limited = jira.rate_limited_responses > 0
+                    if rate_limited:
+                        jira.rate_limited_responses -= 1
+
+                if rate_limited:
+                    self._send(
+                        429, {"errorMessages": ["Rate limited"]}, {"Retry-After": "0"}
+                    )
+                elif jira.fail_with_status:
+                    self._send(jira.fail_with_status, {"errorMessages": ["Failure"]})
+                elif self.path == "/rest/api/2/issue":
+                    issue, errors = jira._create(body["fields"])
+                    self._send(201 if issue else 400, issue or errors)
+                elif self.path == "/rest/api/2/issue/bulk":
+                    issues, errors = [], []
+                    for index, update in enumerate(body["issueUpdates"]):
+                        issue, error = jira._create(update["fields"])
+                        if issue:
+                            issues.append(issue)
+                        else:
+                            errors.append(
+                                {
+                                    "status": 400,
+                                    "elementErrors": error,
+                                    "failedElementNumber": index,
+                                }
+                            )
+                    self._send(
+                        201 if not errors else 400, {"issues": issues, "errors": errors}
+                    )
+                else:
+                    self._send(404, {"errorMessages": ["Not found"]})
+
+        return Handler
+
+
+@pytest.fixture
+def jira():
+    """Running stand-in Jira server."""
+    server = StandInJira()
+    yield server
+    server.close()
+
+
+def make_report(title: str = "Save button crashes app") -> BugReport:
+    """Build a sample bug report."""
+    return BugReport(
+        title=title,
+        description="The app closes",
+        steps="1. Open editor\n2. Click save",
+        expected_result="Document is saved",
+        actual_result="App closes",
+    )
+
+
+def make_client(jira, **kwargs) -> JiraClient:
+    """Build a client for the stand-in server with fast retries."""
+    kwargs.setdefault("backoff_base", 0.001)
+    return JiraClient(jira.url, "BUG", email="dev@example.com", api_token="t", **kwargs)
+
+
+class TestJiraClient:
+    """Tests for JiraClient."""
+
+    def test_issue_fields(self, jira):
+        """Test the mapping of bug report fields onto Jira fields."""
+        client = make_client(jira)
+
+        fields = client.issue_fields(make_report())
+
+        assert fields["project"] == {"key": "BUG"}
+        assert fields["issuetype"] == {"name": "Bug"}
+        assert fields["summary"] == "Save button crashes app"
+        assert fields["description"].startswith("*Description*:\nThe app closes")
+        assert "*Steps*:\n1. Open editor\n\n2. Click save" in fields["description"]
+        asyncio.run(client.aclose())
+
+    def test_create_issue_reuses_connection(self, jira):
+        """Test that sequential calls share one pooled connection."""
+
+        async def scenario():
+            async with make_client(jira) as client:
+                return [await client.create_issue(make_report()) for _ in range(5)]
+
+        keys = asyncio.run(scenario())
+
+        assert keys == [f"BUG-{i}" for i in range(1, 6)]
+        assert len(jira.client_ports) == 1
+
+    def test_bulk_create_splits_batches_and_reports_rejections(self, jira):
+        """Test bulk calls of at most 50 issues with per-issue errors."""
+        reports = [make_report(f"Bug {i}") for i in range(60)]
+        reports[3] = make_report("reject me")
+
+        async def scenario():
+            async with make_client(jira) as client:
+                return await client.create_issues(reports)
+
+        results = asyncio.run(scenario())
+
+        assert [path for path, _ in jira.requests] == ["/rest/api/2/issue/bulk"] * 2
+        assert len(jira.requests[0][1]["issueUpdates"]) == 50
+        assert len(results) == 60
+        assert not results[3].created
+        assert "Summary is not allowed" in results[3].error
+        assert results[4].key == "BUG-4"
+        assert sum(result.created for result in results) == 59
+
+    def test_retries_after_rate_limit(self, jira):
+        """Test that 429 responses are retried honouring Retry-After."""
+        jira.rate_limited_responses = 2
+
+        async def scenario():
+            async with make_client(jira) as client:
+                return await client.create_issue(make_report())
+
+        assert asyncio.run(scenario()) == "BUG-1"
+        assert len(jira.requests) == 3
+
+    def test_gives_up_after_max_retries(self, jira):
+        """Test that persistent rate limiting raises JiraError."""
+        jira.rate_limited_responses = 10
+
+        async def scenario():
+            async with make_client(jira, max_retries=2) as client:
+                await client.create_issue(make_report())
+
+        with pytest.raises(JiraError, match="after 3 attempts"):
+            asyncio.run(scenario())
+
+    def test_client_errors_are_not_retried(self, jira):
+        """Test that non-retryable statuses fail immediately."""
+        jira.fail_with_status = 401
+
+        async def scenario():
+            async with make_client(jira) as client:
+                await client.create_issue(make_report())
+
+        with pytest.raises(JiraError, match="401"):
+            asyncio.run(scenario())
+        assert len(jira.requests) == 1
+
+    def test_server_errors_on_create_are_not_retried(self, jira):
+        """Test that a 503 on bulk create fails at once instead of duplicating."""
+        jira.fail_with_status = 503
+
+        async def scenario():
+            async with make_client(jira) as client:
+                await client.create_issues([make_report(), make_report()])
+
+        with pytest.raises(JiraError, match="503"):
+            asyncio.run(scenario())
+        assert len(jira.requests) == 1
+
+
+class TestJiraOutbox:
+    """Tests for JiraOutbox."""
+
+    @staticmethod
+    def stored(index: int, title: str = "Save button crashes app") -> StoredReport:
+        """Build a stored report."""
+        return StoredReport(
+            id=f"report-{index}",
+            user_input="input",
+            bug_report=make_report(title),
+            created_at=datetime.now(timezone.utc),
+        )
+
+    def test_batches_queued_reports(self, jira):
+        """Test that queued reports are delivered in one bulk call."""
+
+        async def scenario():
+            async with make_client(jira) as client:
+                outbox = JiraOutbox(client, flush_interval=0.05)
+                outbox.start()
+                for index in range(3):
+                    await outbox.submit(self.stored(index))
+                await outbox.submit(self.stored(3, "reject me"))
+                pending = outbox.status("report-0").status
+                await outbox.stop()
+                return outbox, pending
+
+        outbox, pending = asyncio.run(scenario())
+
+        assert pending == PENDING
+        assert len(jira.requests) == 1
+        assert outbox.status("report-0").status == CREATED
+        assert outbox.status("report-2").issue_key == "BUG-3"
+        assert outbox.status("report-3").status == FAILED
+        assert outbox.status("missing") is None
+
+    def test_failed_batch_keeps_worker_running(self, jira):
+        """Test that a failing batch is marked failed and later batches succeed."""
+
+        async def scenario():
+            async with make_client(jira, max_retries=0) as client:
+                outbox = JiraOutbox(client, flush_interval=0.01)
+                outbox.start()
+                jira.fail_with_status = 500
+                await outbox.submit(self.stored(0))
+                await asyncio.sleep(0.2)
+                jira.fail_with_status = None
+                await outbox.submit(self.stored(1))
+                await outbox.stop()
+                return outbox
+
+        outbox = asyncio.run(scenario())
+
+        assert outbox.status("report-0").status == FAILED
+        assert outbox.status("report-1").status == CREATED
+
+    def test_full_outbox_refuses_submissions(self, jira):
+        """Test that submit raises JiraError instead of blocking when full."""
+
+        async def scenario():
+            async with make_client(jira) as client:
+                outbox = JiraOutbox(client, max_pending=1)
+                await outbox.submit(self.stored(0))
+                with pytest.raises(JiraError, match="full"):
+                    await outbox.submit(self.stored(1))
+
+        asyncio.run(scenario())
+
+    def test_persisted_submissions_survive_restart(self, jira, tmp_path):
+        """Test that submissions left by a stopped outbox are delivered on start."""
+        path = str(tmp_path / "reports.db")
+
+        async def submit_without_worker():
+            async with make_client(jira) as client:
+                store = SQLiteOutboxStore(path)
+                outbox = JiraOutbox(client, max_pending=5, store=store)
+                for index in range(3):
+                    await outbox.submit(self.stored(index))
+                store.close()
+
+        async def restart():
+            async with make_client(jira) as client:
+                store = SQLiteOutboxStore(path)
+                # Backlog larger than the queue must not block the worker
+                outbox = JiraOutbox(client, batch_size=2, max_pending=1, store=store)
+                outbox.start()
+                await outbox.submit(self.stored(3))
+                await outbox.stop()
+                remaining = store.pending()
+                store.close()
+                return outbox, remaining
+
+        asyncio.run(submit_without_worker())
+        assert jira.requests == []
+
+        outbox, remaining = asyncio.run(restart())
+
+        assert [outbox.status(f"report-{i}").status for i in range(4)] == [CREATED] * 4
+        assert remaining == []
+
+
+class TestJiraAPI:
+    """Tests for Jira submission through the API."""
+
+    @patch("src.api.routes.GeminiService")
+    @patch("src.api.routes.JiraFormatter")
+    def test_submit_and_poll_status(
+        self, mock_formatter_class, mock_gemini_class, jira
+    ):
+        """Test that a generated report is queued and then created in Jira."""
+        mock_gemini_class.return_value.generate_bug_report.return_value = make_report()
+        mock_formatter_class.return_value.format.return_value = "Formatted report"
+
+        with patch.multiple(
+            settings,
+            jira_url=jira.url,
+            jira_project_key="BUG",
+            jira_flush_interval=0.01,
+            warmup_enabled=False,
+        ), TestClient(create_app()) as client:
+            response = client.post(
+                "/api/v1/bug-reports",
+                json={"user_input": "Save button crashes", "submit_to_jira": True},
+            )
+            report_id = response.json()["id"]
+            for _ in range(100):
+                status = client.get(f"/api/v1/bug-reports/{report_id}/jira")
+                if status.json()["status"] != PENDING:
+                    break
+                time.sleep(0.01)
+
+        assert response.status_code == 200
+        assert response.json()["jira_status"] == PENDING
+        assert status.json() == {
+            "id": report_id,
+            "status": CREATED,
+            "issue_key": "BUG-1",
+            "error": None,
+        }
+
+    def test_submit_without_configuration(self):
+        """Test that submission is refused when Jira is not configured."""
+        client = TestClient(create_app())
+
+        response = client.post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Save button crashes", "submit_to_jira": True},
+        )
+
+        assert response.status_code == 400
+        assert client.get("/api/v1/bug-reports/x/jira").status_code == 404
@@ -0,0 +1,224 @@
+"""Tests for the Gemini API key pool."""
+
+import os
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+from google.rpc.error_details_pb2 import ErrorInfo
+
+from src.config.settings import Settings
+from src.core.exceptions import KeyPoolExhaustedError, LLMServiceError
+from src.services.circuit_breaker import CLOSED
+from src.services.gemini_service import GeminiService
+from src.services.key_pool import (
+    LRU,
+    QUOTA,
+    ApiKeyPool,
+    KeyPoolModel,
+    is_key_error,
+)
+
+VALID_RESPONSE = (
+    '{"Title": "Test Bug", "Description": "Test description", '
+    '"Steps": "1. Test step", "Expected result": "Expected", '
+    '"Actual result": "Actual"}'
+)
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+class TestApiKeyPool:
+    """Tests for key selection and quarantine."""
+
+    def test_least_recently_used(self):
+        """Test that keys are taken in turn."""
+        clock = Clock()
+        pool = ApiKeyPool(["a", "b", "c"], strategy=LRU, clock=clock)
+        keys = []
+        for _ in range(4):
+            clock.now += 1
+            keys.append(pool.acquire())
+
+        assert keys == ["a", "b", "c", "a"]
+
+    def test_most_remaining_quota(self):
+        """Test that the key with the most calls left this minute is taken."""
+        clock = Clock()
+        pool = ApiKeyPool(
+            ["a", "b"], strategy=QUOTA, requests_per_minute=2, clock=clock
+        )
+
+        assert [pool.acquire() for _ in range(4)] == ["a", "b", "a", "b"]
+        with pytest.raises(LLMServiceError, match="rate limited or cooling down"):
+            pool.acquire()
+
+        clock.now += 60
+        assert pool.acquire() == "a"
+
+    def test_quota_remaining_decides_over_recency(self):
+        """Test that a key with calls left wins over a less recently used one."""
+        clock = Clock()
+        pool = ApiKeyPool(
+            ["a", "b"], strategy=QUOTA, requests_per_minute=3, clock=clock
+        )
+        assert [pool.acquire() for _ in range(2)] == ["a", "b"]
+        clock.now = 30
+        assert pool.acquire() == "a"
+        clock.now = 61
+        # Only a's call at 30 is still in the window
+        assert pool.acquire() == "b"
+
+    def test_quarantine_and_cooldown(self):
+        """Test that a quarantined key is skipped until its cooldown ends."""
+        clock = Clock()
+        pool = ApiKeyPool(["a", "b"], cooldown=30, clock=clock)
+
+        pool.quarantine("a", api_exceptions.ResourceExhausted("quota"))
+
+        assert pool.available() == 1
+        assert [pool.acquire() for _ in range(2)] == ["b", "b"]
+        clock.now = 30
+        assert pool.acquire() == "a"
+
+    def test_all_keys_quarantined(self):
+        """Test that a call fails fast when no key can be used."""
+        pool = ApiKeyPool(["a"], clock=Clock())
+        pool.quarantine("a", api_exceptions.Unauthenticated("bad key"))
+
+        with pytest.raises(KeyPoolExhaustedError):
+            pool.acquire()
+
+    def test_invalid_configuration(self):
+        """Test that an empty pool or unknown strategy is rejected."""
+        with pytest.raises(ValueError):
+            ApiKeyPool([])
+        with pytest.raises(ValueError, match="strategy"):
+            ApiKeyPool(["a"], strategy="random")
+
+    def test_key_errors(self):
+        """Test which API errors quarantine a key."""
+        invalid_key = api_exceptions.InvalidArgument(
+            "API key not valid", error_info=ErrorInfo(reason="API_KEY_INVALID")
+        )
+        blocked_key = api_exceptions.PermissionDenied(
+            "API key blocked", error_info=ErrorInfo(reason="API_KEY_SERVICE_BLOCKED")
+        )
+
+        assert is_key_error(api_exceptions.ResourceExhausted("quota"))
+        assert is_key_error(invalid_key)
+        assert is_key_error(blocked_key)
+        assert not is_key_error(api_exceptions.PermissionDenied("denied"))
+        assert not is_key_error(api_exceptions.InvalidArgument("bad request"))
+        assert not is_key_error(api_exceptions.ServiceUnavailable("down"))
+
+
+class TestKeyPoolModel:
+    """Tests for calling through the key pool."""
+
+    def test_rate_limited_key_is_replaced_in_the_same_call(self):
+        """Test that a 429 quarantines the key and the call moves on."""
+        models = {"a": Mock(), "b": Mock()}
+        models["a"].generate_content.side_effect = api_exceptions.ResourceExhausted(
+            "quota"
+        )
+        pool = ApiKeyPool(["a", "b"], clock=Clock())
+        model = KeyPoolModel(pool, models.__getitem__)
+
+        assert model.generate_content("Prompt") is models["b"].generate_content()
+        assert pool.available() == 1
+
+    def test_other_errors_are_raised(self):
+        """Test that errors unrelated to the key do not quarantine it."""
+        broken = Mock()
+        broken.generate_content.side_effect = api_exceptions.ServiceUnavailable("x")
+        pool = ApiKeyPool(["a", "b"], clock=Clock())
+
+        with pytest.raises(api_exceptions.ServiceUnavailable):
+            KeyPoolModel(pool, lambda api_key: broken).generate_content("Prompt")
+
+        assert pool.available() == 2
+
+    def test_permission_denied_without_key_reason_is_raised(self):
+        """Test that a 403 not naming the key leaves every key in use."""
+        denied = Mock()
+        denied.generate_content.side_effect = api_exceptions.PermissionDenied(
+            "Model not available", error_info=ErrorInfo(reason="SERVICE_DISABLED")
+        )
+        pool = ApiKeyPool(["a", "b"], clock=Clock())
+
+        with pytest.raises(api_exceptions.PermissionDenied):
+            KeyPoolModel(pool, lambda api_key: denied).generate_content("Prompt")
+
+        assert denied.generate_content.call_count == 1
+        assert pool.available() == 2
+
+    def test_one_model_per_key(self):
+        """Test that each key's model is created once and reused."""
+        clock = Clock()
+        create_model = Mock(side_effect=lambda api_key: Mock())
+        model = KeyPoolModel(ApiKeyPool(["a", "b"], clock=clock), create_model)
+
+        for _ in range(4):
+            clock.now += 1
+            model.count_tokens("ping")
+
+        assert [call[0][0] for call in create_model.call_args_list] == ["a", "b"]
+
+
+class TestGeminiKeys:
+    """Tests for the service's per-key clients."""
+
+    @patch("src.services.gemini_service.create_client")
+    @patch("src.services.gemini_service.genai")
+    def test_calls_use_per_key_clients(self, mock_genai, mock_create_client):
+        """Test that each key gets its own client and nothing is configured globally."""
+        mock_genai.GenerativeModel.side_effect = lambda *args, **kwargs: MagicMock(
+            **{"generate_content.return_value.text": VALID_RESPONSE}
+        )
+        service = GeminiService(key_pool=ApiKeyPool(["key-1", "key-2"]))
+
+        service.generate_bug_report("Save fails")
+        service.generate_bug_report("Login fails")
+
+        mock_genai.configure.assert_not_called()
+        assert [call[0][0] for call in mock_create_client.call_args_list] == [
+            "key-1",
+            "key-2",
+        ]
+
+    def test_keys_from_settings(self):
+        """Test that GEMINI_API_KEYS is used, falling back to GEMINI_API_KEY."""
+        with patch.dict(
+            os.environ, {"GEMINI_API_KEY": "one", "GEMINI_API_KEYS": "a, b,,a"}
+        ):
+            assert Settings().gemini_api_keys == ["a", "b", "a"]
+        with patch.dict(os.environ, {"GEMINI_API_KEY": "one", "GEMINI_API_KEYS": ""}):
+            assert Settings().gemini_api_keys == ["one"]
+
+    @patch("src.services.gemini_service.create_client")
+    @patch("src.services.gemini_service.genai")
+    def test_exhausted_pool_leaves_breaker_closed(self, mock_genai, mock_create_client):
+        """Test that running out of keys is neither retried nor a breaker failure."""
+        pool = ApiKeyPool(["key-1"], clock=Clock())
+        pool.quarantine("key-1", api_exceptions.ResourceExhausted("quota"))
+        service = GeminiService(key_pool=pool)
+        attempts = []
+
+        for _ in range(service.circuit_breaker.failure_threshold):
+            with pytest.raises(KeyPoolExhaustedError):
+                service.generate_bug_report("Save fails", on_attempt=attempts.append)
+
+        assert service.circuit_breaker.state == CLOSED
+        assert attempts == []
+        mock_create_client.assert_not_called()
@@ -0,0 +1,250 @@
+"""Tests for log attachments and error excerpt extraction."""
+
+import io
+import tracemalloc
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.attachments import (
+    LogExcerpt,
+    LogExcerptExtractor,
+    append_log_excerpts,
+    excerpt_budget,
+)
+from src.cli.main import CLI
+from src.core.models import BugReport
+from src.services.bug_report_service import BugReportService
+
+SAMPLE_LOG = b"""2024-05-01T10:00:00Z INFO Starting server
+2024-05-01T10:00:01Z ERROR Database connection failed id=123
+2024-05-01T10:00:02Z ERROR Database connection failed id=456
+127.0.0.1 - - [01/May/2024:10:00:03 +0000] "GET /api/users HTTP/1.1" 500 123
+127.0.0.1 - - [01/May/2024:10:00:03 +0000] "GET /index HTTP/1.1" 200 123
+Traceback (most recent call last):
+  File "app.py", line 10, in <module>
+    main()
+ValueError: bad value
+Uncaught TypeError: Cannot read properties of undefined (reading 'x')
+    at render (bundle.js:10:5)
+    at main (bundle.js:20:3)
+Failed to load resource: the server responded with a status of 404 ()
+2024-05-01T10:00:09Z INFO no error occurred, request took 450 ms
+"""
+
+
+def extract(data: bytes, **kwargs) -> LogExcerpt:
+    """Extract an excerpt from in-memory log bytes."""
+    return LogExcerptExtractor(**kwargs).extract(io.BytesIO(data), "app.log")
+
+
+class TestLogExcerptExtractor:
+    """Tests for LogExcerptExtractor."""
+
+    def test_extracts_signals_only(self):
+        """Test that errors, stack traces and 4xx/5xx lines are kept."""
+        excerpt = extract(SAMPLE_LOG)
+
+        assert "ERROR Database connection failed" in excerpt.text
+        assert '"GET /api/users HTTP/1.1" 500' in excerpt.text
+        assert "Traceback (most recent call last):\n" in excerpt.text
+        assert "ValueError: bad value" in excerpt.text
+        assert "    at render (bundle.js:10:5)" in excerpt.text
+        assert "status of 404" in excerpt.text
+        assert "INFO" not in excerpt.text
+        assert "GET /index" not in excerpt.text
+
+    def test_deduplicates_messages_differing_in_numbers(self):
+        """Test that repeated messages are kept once with a count."""
+        excerpt = extract(SAMPLE_LOG)
+
+        assert excerpt.text.count("Database connection failed") == 1
+        assert "[repeated 2 times]" in excerpt.text
+        assert excerpt.matched_blocks == 6
+        assert excerpt.unique_blocks == 5
+
+    def test_excerpt_respects_budget(self):
+        """Test that the excerpt never exceeds its character budget."""
+        data = "".join(
+            f"ERROR distinct failure {chr(65 + i % 26)}{chr(65 + i // 26 % 26)}\n"
+            for i in range(2000)
+        ).encode()
+
+        excerpt = extract(data, max_chars=500)
+
+        assert 0 < len(excerpt.text) <= 500
+        assert excerpt.omitted_blocks > 0
+
+    def test_long_lines_are_cut(self):
+        """Test that over-long lines are cut without reading them whole."""
+        data = b"ERROR " + b"x" * 100000 + b"\nERROR second line\n"
+
+        excerpt = extract(data, max_line_chars=50)
+
+        first, second = excerpt.text.split("\n")
+        assert len(first) == 53
+        assert second == "ERROR second line"
+        assert excerpt.bytes_scanned == len(data)
+
+    def test_scan_limit(self):
+        """Test that scanning stops after max_scan_bytes."""
+        excerpt = extract(SAMPLE_LOG * 10, max_scan_bytes=len(SAMPLE_LOG))
+
+        assert excerpt.truncated
+        assert excerpt.bytes_scanned == len(SAMPLE_LOG)
+
+    def test_memory_is_flat(self, tmp_path):
+        """Test that peak memory does not grow with the log size."""
+        peaks = []
+        for repeats in (2000, 20000):
+            path = tmp_path / f"{repeats}.log"
+            with open(path, "wb") as log_file:
+                log_file.writelines(
+                    SAMPLE_LOG.replace(b"bad value", b"bad %d" % i)
+                    for i in range(repeats)
+                )
+
+            tracemalloc.start()
+            LogExcerptExtractor(max_signatures=1000).extract_path(str(path))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        assert peaks[1] < peaks[0] * 2
+        assert peaks[1] < 1024 * 1024
+
+    def test_budget_is_shared_between_files(self):
+        """Test that the token budget is split across attached files."""
+        assert excerpt_budget(1000, 2) == 2000
+        assert excerpt_budget(1000, 0) == 4000
+
+
+class TestLogExcerptsInPrompt:
+    """Tests for adding excerpts to the generation input."""
+
+    def test_append_log_excerpts(self):
+        """Test that non-empty excerpts are appended under their file name."""
+        text = append_log_excerpts(
+            "Checkout fails",
+            [
+                LogExcerpt(name="server.log", text="ERROR boom", unique_blocks=1),
+                LogExcerpt(name="empty.log", text=""),
+            ],
+        )
+
+        assert text == (
+            "Checkout fails\n\n"
+            "Log excerpt from server.log (1 distinct errors):\nERROR boom"
+        )
+
+    def test_service_passes_excerpts_to_llm(self):
+        """Test that the service sends the excerpt but detects language on the text."""
+        llm_service = Mock()
+        llm_service.generate_bug_report.return_value = None
+        service = BugReportService(llm_service, Mock())
+
+        service.generate_formatted_report(
+            "Оплата не проходит",
+            [LogExcerpt(name="app.log", text="ERROR payment declined")],
+        )
+
+        prompt_input = llm_service.generate_bug_report.call_args[0][0]
+        assert prompt_input.startswith("Оплата не проходит\n\nLog excerpt from app.log")
+        assert llm_service.generate_bug_report.call_args[1] == {"language": "ru"}
+
+
+class TestLogAttachmentAPI:
+    """Tests for the multipart bug report endpoint."""
+
+    @patch("src.api.routes.GeminiService")
+    @patch("src.api.routes.JiraFormatter")
+    def test_upload_logs(self, mock_formatter_class, mock_gemini_class):
+        """Test that uploaded logs reach the LLM as excerpts."""
+        mock_gemini = Mock()
+        mock_gemini_class.return_value = mock_gemini
+        mock_gemini.generate_bug_report.return_value = BugReport(
+            title="Test Bug",
+            description="Test description",
+            steps="1. Test step",
+            expected_result="Expected result",
+            actual_result="Actual result",
+        )
+        mock_formatter_class.return_value.format.return_value = "Formatted report"
+
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/bug-reports/with-attachments",
+            data={"user_input": "Users page shows an error"},
+            files=[
+                ("logs", ("server.log", SAMPLE_LOG, "text/plain")),
+                ("logs", ("console.log", b"INFO all good\n", "text/plain")),
+            ],
+        )
+
+        assert response.status_code == 200
+        assert response.json()["title"] == "Test Bug"
+        prompt_input = mock_gemini.generate_bug_report.call_args[0][0]
+        assert "Log excerpt from server.log" in prompt_input
+        assert "console.log" not in prompt_input
+
+    def test_too_many_logs(self):
+        """Test that the number of attachments is limited."""
+        client = TestClient(app)
+
+        with patch("src.api.routes.settings.log_max_attachments", 1):
+            response = client.post(
+                "/api/v1/bug-reports/with-attachments",
+                data={"user_input": "Users page shows an error"},
+                files=[
+                    ("logs", ("a.log", b"ERROR a\n", "text/plain")),
+                    ("logs", ("b.log", b"ERROR b\n", "text/plain")),
+                ],
+            )
+
+        assert response.status_code == 400
+
+    def test_missing_description(self):
+        """Test that the description is still required."""
+        client = TestClient(app)
+
+        response = client.post(
+            "/api/v1/bug-reports/with-attachments",
+            files=[("logs", ("a.log", b"ERROR a\n", "text/plain"))],
+        )
+
+        assert response.status_code == 422
+
+
+class TestLogAttachmentCLI:
+    """Tests for the --log CLI option."""
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    def test_log_option(
+        self, mock_bug_service_class, mock_formatter, mock_gemini, tmp_path
+    ):
+        """Test that --log files are scanned and passed as excerpts."""
+        mock_bug_service = Mock()
+        mock_bug_service_class.return_value = mock_bug_service
+        log_path = tmp_path / "server.log"
+        log_path.write_bytes(SAMPLE_LOG)
+
+        CLI().run(["Users page shows an error", "--log", str(log_path)])
+
+        call = mock_bug_service.process_bug_report.call_args
+        assert call[0] == ("Users page shows an error",)
+        excerpts = call[1]["log_excerpts"]
+        assert excerpts[0].name == "server.log"
+        assert "ERROR Database connection failed" in excerpts[0].text
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    def test_missing_log_file(
+        self, mock_bug_service_class, mock_formatter, mock_gemini
+    ):
+        """Test that an unreadable log file exits with an error."""
+        with patch("builtins.print"), pytest.raises(SystemExit):
+            CLI().run(["Users page shows an error", "--log", "/nonexistent.log"])
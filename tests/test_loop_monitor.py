@@ -0,0 +1,146 @@
+"""Tests for the event-loop watchdog and the metrics registry."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.monitoring import EventLoopMonitor, EventLoopWatchMiddleware, MetricsRegistry
+
+
+def blocking_handler() -> None:
+    """Block the calling thread the way a sync SDK call would."""
+    time.sleep(0.3)
+
+
+class TestEventLoopMonitor:
+    """Tests for EventLoopMonitor."""
+
+    def test_blocking_call_is_reported_with_its_stack(self):
+        """Test that a blocked loop is caught while the blocking code runs."""
+        monitor = EventLoopMonitor(interval=0.01, threshold=0.1)
+
+        async def route():
+            monitor.watch()
+            await asyncio.sleep(0.05)
+            blocking_handler()
+            await asyncio.sleep(0.05)
+
+        try:
+            asyncio.run(route())
+        finally:
+            monitor.stop()
+
+        (block,) = monitor.blocks
+        assert "blocking_handler" in block.stack
+        assert "in route" in block.stack
+        assert block.duration >= 0.2
+
+    def test_awaiting_does_not_block(self):
+        """Test that a loop that keeps yielding only records lag."""
+        registry = MetricsRegistry()
+        monitor = EventLoopMonitor(interval=0.01, threshold=0.1, registry=registry)
+
+        async def route():
+            monitor.watch()
+            await asyncio.sleep(0.2)
+
+        try:
+            asyncio.run(route())
+        finally:
+            monitor.stop()
+
+        assert monitor.blocks == []
+        assert monitor._lag.count() > 0
+        assert "event_loop_lag_seconds_count" in registry.render()
+
+    def test_closed_loops_are_forgotten(self):
+        """Test that loops are dropped once they are closed."""
+        monitor = EventLoopMonitor(interval=0.01, threshold=0.1)
+
+        async def route():
+            monitor.watch()
+
+        try:
+            asyncio.run(route())
+            time.sleep(0.05)
+            assert monitor._loops == {}
+        finally:
+            monitor.stop()
+
+    def test_blocking_route(self):
+        """Test that the middleware catches an async route that blocks."""
+        test_app = FastAPI()
+        monitor = EventLoopMonitor(interval=0.01, threshold=0.1)
+        test_app.add_middleware(EventLoopWatchMiddleware, monitor=monitor)
+
+        @test_app.get("/slow")
+        async def slow():
+            blocking_handler()
+            return {}
+
+        try:
+            TestClient(test_app).get("/slow")
+        finally:
+            monitor.stop()
+
+        assert len(monitor.blocks) == 1
+        assert "in slow" in monitor.blocks[0].stack
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry."""
+
+    def test_render(self):
+        """Test counters, gauges and histograms in the Prometheus text format."""
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests", ["lane"]).inc(lane="bulk")
+        registry.gauge("queue_depth", "Queued").set(3)
+        histogram = registry.histogram("wait_seconds", "Wait", buckets=(0.1, 1))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+
+        text = registry.render()
+
+        assert 'requests_total{lane="bulk"} 1' in text
+        assert "# TYPE queue_depth gauge\nqueue_depth 3" in text
+        assert 'wait_seconds_bucket{le="0.1"} 1' in text
+        assert 'wait_seconds_bucket{le="1"} 2' in text
+        assert 'wait_seconds_bucket{le="+Inf"} 2' in text
+        assert "wait_seconds_sum 0.55" in text
+        assert "wait_seconds_count 2" in text
+
+    def test_same_name_returns_same_metric(self):
+        """Test that registering a name twice shares the metric."""
+        registry = MetricsRegistry()
+
+        assert registry.counter("a", "A") is registry.counter("a", "A")
+        with pytest.raises(ValueError):
+            registry.gauge("a", "A")
+
+    def test_labels_are_checked(self):
+        """Test that samples must carry exactly the declared labels."""
+        counter = MetricsRegistry().counter("a", "A", ["lane"])
+
+        with pytest.raises(ValueError):
+            counter.inc(priority="high")
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_exposes_loop_lag(self):
+        """Test that the loop lag histogram is scraped from the app."""
+        client = TestClient(app)
+        client.get("/health")
+        time.sleep(0.2)
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE event_loop_lag_seconds histogram" in response.text
+        assert "event_loop_blocks_total" in response.text
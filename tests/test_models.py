@@ -4,6 +4,7 @@ import pytest
 from pydantic import ValidationError
 from src.api.models import BugReportRequest, BugReportResponse
 from src.core.models import BugReport
+from src.schemas.bug_report import BugReportSchema
 
 
 class TestBugReportSchemas:
@@ -76,3 +77,76 @@ class TestBugReportModel:
         assert isinstance(result, dict)
         assert result["Title"] == "Test Bug"
         assert result["Description"] == "Test description"
+
+    def test_bug_report_labeled_fields_order(self):
+        """Test that labeled_fields yields labels in report order."""
+        bug_report = BugReport(
+            title="Test Bug",
+            description="Test description",
+            steps="1. Step one",
+            expected_result="Expected",
+            actual_result="Actual",
+        )
+
+        labels = [label for label, _ in bug_report.labeled_fields()]
+
+        assert labels == [
+            "Title",
+            "Description",
+            "Steps",
+            "Expected result",
+            "Actual result",
+        ]
+
+
+class TestBugReportSchemaConversion:
+    """Tests for parsing LLM output straight into the schema."""
+
+    def test_schema_from_raw_json(self):
+        """Test that raw JSON text validates and converts to a BugReport."""
+        raw = (
+            '{"Title": "Test Bug", "Description": "Test description", '
+            '"Steps": "1. Step", "Expected result": "Expected", '
+            '"Actual result": "Actual"}'
+        )
+
+        bug_report = BugReportSchema.model_validate_json(raw).to_bug_report()
+
+        assert bug_report == BugReport(
+            title="Test Bug",
+            description="Test description",
+            steps="1. Step",
+            expected_result="Expected",
+            actual_result="Actual",
+        )
+
+    def test_schema_rejects_non_object_json(self):
+        """Test that a JSON array is a validation error, not a crash."""
+        with pytest.raises(ValidationError):
+            BugReportSchema.model_validate_json('["not", "an", "object"]')
+
+    def test_response_from_bug_report(self):
+        """Test that the response model serializes the bug report fields."""
+        bug_report = BugReport(
+            title="Test Bug",
+            description="Test description",
+            steps="1. Step",
+            expected_result="Expected",
+            actual_result="Actual",
+        )
+
+        response = BugReportResponse.from_bug_report(bug_report, "Formatted")
+
+        assert response.model_dump() == {
+            "title": "Test Bug",
+            "description": "Test description",
+            "steps": "1. Step",
+            "expected_result": "Expected",
+            "actual_result": "Actual",
+            "formatted_report": "Formatted",
+            "id": None,
+            "duplicates": [],
+            "reused": False,
+            "jira_status": None,
+            "enrichments": [],
+        }
@@ -0,0 +1,212 @@
+"""Tests for the staged report pipeline."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.core.models import BugReport
+from src.services.bug_report_service import BugReportService
+from src.services.pipeline import (
+    ASYNC,
+    CPU_BOUND,
+    IO_BOUND,
+    Pipeline,
+    PipelineContext,
+    RepairStage,
+    Stage,
+    ValidateStage,
+)
+
+REPORT = BugReport(
+    title="Header missing on main page",
+    description="The header is not displayed",
+    steps="1. Open the main page",
+    expected_result="Header is visible",
+    actual_result="Header is missing",
+)
+
+
+class RecordingStage(Stage):
+    """Stage recording the thread it ran on."""
+
+    def __init__(self, name, kind=CPU_BOUND, uses_llm=False):
+        """Configure the stage."""
+        self.name = name
+        self.kind = kind
+        self.uses_llm = uses_llm
+        self.threads = []
+
+    def run(self, ctx):
+        """Record the current thread."""
+        self.threads.append(threading.current_thread().name)
+
+
+class AsyncStage(Stage):
+    """Stage awaited on the event loop."""
+
+    name = "notify"
+    kind = ASYNC
+
+    async def run(self, ctx):
+        """Mark the context."""
+        ctx.formatted_report = "notified"
+
+
+def make_service(report=REPORT):
+    """Build a service whose LLM returns the given report."""
+    llm_service = Mock()
+    llm_service.generate_bug_report.return_value = report
+    formatter = Mock()
+    formatter.format.side_effect = lambda bug_report: f"[{bug_report.title}]"
+    return BugReportService(llm_service, formatter)
+
+
+class TestPipeline:
+    """Tests for Pipeline."""
+
+    def test_stages_run_on_their_executors(self):
+        """Test that CPU stages run inline and IO stages off the event loop."""
+        cpu = RecordingStage("cpu")
+        io = RecordingStage("io", IO_BOUND)
+        pipeline = Pipeline([cpu, io, AsyncStage()])
+
+        async def run():
+            """Run the pipeline from the event loop."""
+            return await pipeline.run_async(PipelineContext("input"))
+
+        ctx = asyncio.run(run())
+
+        assert cpu.threads == ["MainThread"]
+        assert io.threads != ["MainThread"]
+        assert ctx.formatted_report == "notified"
+        assert list(ctx.timings) == ["cpu", "io", "notify"]
+
+    def test_configured_executor(self):
+        """Test that an executor configured for a kind takes its stages."""
+        cpu = RecordingStage("cpu")
+        with ThreadPoolExecutor(1, thread_name_prefix="cpu-pool") as pool:
+            Pipeline([cpu], {CPU_BOUND: pool}).run(PipelineContext("input"))
+
+        assert cpu.threads[0].startswith("cpu-pool")
+
+    def test_llm_stages_hold_a_slot(self):
+        """Test that only stages calling the LLM run inside the slot."""
+        entered = []
+
+        @asynccontextmanager
+        async def slot():
+            """Record the slot being held."""
+            entered.append(True)
+            yield
+
+        stages = [RecordingStage("cpu"), RecordingStage("llm", IO_BOUND, True)]
+        asyncio.run(Pipeline(stages).run_async(PipelineContext("input"), llm_slot=slot))
+
+        assert entered == [True]
+
+    def test_stages_run_without_a_slot(self):
+        """Test that LLM stages run from the event loop when there is no scheduler."""
+        cpu = RecordingStage("cpu")
+        llm = RecordingStage("llm", IO_BOUND, True)
+
+        ctx = asyncio.run(Pipeline([cpu, llm]).run_async(PipelineContext("input")))
+
+        assert list(ctx.timings) == ["cpu", "llm"]
+        assert len(llm.threads) == 1
+
+    def test_failure_aborts_started_stages(self):
+        """Test that work started before the LLM call is stopped on failure."""
+        llm = RecordingStage("llm", uses_llm=True)
+        llm.run = Mock(side_effect=RuntimeError("boom"))
+        later = RecordingStage("later")
+        later.start = Mock()
+        later.abort = Mock()
+
+        with pytest.raises(RuntimeError):
+            Pipeline([llm, later]).run(PipelineContext("input"))
+
+        later.start.assert_called_once()
+        later.abort.assert_called_once()
+        assert later.threads == []
+
+
+class TestStages:
+    """Tests for the built-in stages."""
+
+    def test_repair_strips_echoed_labels(self):
+        """Test that labels echoed into values and stray whitespace are removed."""
+        ctx = PipelineContext("input")
+        ctx.bug_report = BugReport(
+            **{
+                **REPORT.__dict__,
+                "title": "Title: Header missing ",
+                "steps": "1.\r\n2.",
+            }
+        )
+
+        RepairStage().run(ctx)
+
+        assert ctx.bug_report.title == "Header missing"
+        assert ctx.bug_report.steps == "1.\n2."
+
+    def test_validate_drops_empty_reports(self):
+        """Test that a report without steps counts as not generated."""
+        ctx = PipelineContext("input")
+        ctx.bug_report = BugReport(**{**REPORT.__dict__, "steps": ""})
+
+        ValidateStage().run(ctx)
+
+        assert ctx.bug_report is None
+
+
+class TestBugReportServicePipeline:
+    """Tests for the pipeline behind BugReportService."""
+
+    def test_cli_pipeline_stages(self):
+        """Test that the CLI pipeline neither looks up, bills nor stores reports."""
+        assert make_service().pipeline.stage_names == [
+            "preprocess",
+            "generate",
+            "repair",
+            "validate",
+            "format",
+        ]
+
+    def test_timings_are_printed(self, capsys):
+        """Test that --timings prints each stage's duration to stderr."""
+        make_service().process_bug_report(
+            "The header is missing on the main page", show_timings=True
+        )
+
+        captured = capsys.readouterr()
+        assert "[Header missing on main page]" in captured.out
+        assert "generate:" in captured.err
+        assert "format:" in captured.err
+
+
+class TestPipelineAPI:
+    """Tests for the pipeline behind POST /api/v1/bug-reports."""
+
+    @patch("src.api.routes.GeminiService")
+    def test_server_timing_header(self, mock_gemini_class):
+        """Test that the response reports the time spent in each stage."""
+        mock_gemini_class.return_value.generate_bug_report.return_value = REPORT
+
+        response = TestClient(app).post(
+            "/api/v1/bug-reports", json={"user_input": "Test bug description"}
+        )
+
+        assert response.status_code == 200
+        stages = [
+            entry.split(";")[0]
+            for entry in response.headers["Server-Timing"].split(", ")
+        ]
+        assert stages[0] == "preprocess"
+        assert "generate" in stages
+        assert stages[-1] == "persist"
@@ -0,0 +1,121 @@
+"""Tests for local input pre-processing."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from src.core.exceptions import ValidationError
+from src.prompts.bug_report_prompts import BugReportPrompts
+from src.services.bug_report_service import BugReportService
+from src.services.preprocessing import (
+    LANGUAGE_EN,
+    LANGUAGE_RU,
+    InputPreprocessor,
+    detect_language,
+)
+
+
+class TestDetectLanguage:
+    """Tests for detect_language."""
+
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            ("The header is missing on the main page", LANGUAGE_EN),
+            ("Не отображается шапка на главной странице", LANGUAGE_RU),
+            ("При нажатии Submit в Chrome появляется ошибка 404", LANGUAGE_RU),
+            ("Login fails", LANGUAGE_EN),
+            ("12345", None),
+            ("登录页面报错 500", None),
+        ],
+    )
+    def test_detect_language(self, text, expected):
+        """Test Cyrillic/Latin detection, including mixed technical text."""
+        assert detect_language(text) == expected
+
+
+class TestInputPreprocessor:
+    """Tests for InputPreprocessor."""
+
+    def test_valid_input_is_normalized(self):
+        """Test that valid input is stripped and tagged with its language."""
+        prepared = InputPreprocessor().preprocess(
+            "  there is no header displayed on the main page, i can see error 404  "
+        )
+
+        assert prepared.text.startswith("there is no header")
+        assert prepared.language == LANGUAGE_EN
+
+    def test_urls_with_description_pass(self):
+        """Test that a description containing a link is accepted."""
+        prepared = InputPreprocessor().preprocess(
+            "Страница https://example.com/cart падает с ошибкой 500"
+        )
+
+        assert prepared.language == LANGUAGE_RU
+
+    @pytest.mark.parametrize(
+        "text,message",
+        [
+            ("   ", "empty"),
+            ("https://example.com/a https://example.com/b", "only links"),
+            ("!!!!!!!!!!!!!!!!", "too short"),
+            ("aaaaaaaaaaaaaaaaaaaaaa", "repeated characters"),
+            ("ababababababab", "repeated characters"),
+            ("asdfghjkl qwrtzxcv sdfgjkl", "does not look like"),
+            ("йцкнгшщзх фвпрлджэ", "does not look like"),
+        ],
+    )
+    def test_junk_is_rejected(self, text, message):
+        """Test that junk input raises ValidationError with a helpful message."""
+        with pytest.raises(ValidationError, match=message):
+            InputPreprocessor().preprocess(text)
+
+    def test_acronyms_do_not_count_as_gibberish(self):
+        """Test that vowel-less technical terms alongside words are accepted."""
+        prepared = InputPreprocessor().preprocess("HTTP 502 from SQL proxy on save")
+
+        assert prepared.language == LANGUAGE_EN
+
+    @pytest.mark.parametrize(
+        "text", ["XSS in src", "SQLi via sort param", "CSRF on logout"]
+    )
+    def test_security_reports_are_accepted(self, text):
+        """Test that terse vulnerability reports are not rejected as gibberish."""
+        assert InputPreprocessor().preprocess(text).text == text
+
+    def test_unknown_language(self):
+        """Test that text in neither script leaves the language undetermined."""
+        prepared = InputPreprocessor().preprocess("ログイン画面でエラーが発生する")
+
+        assert prepared.language is None
+
+
+class TestCompactPrompts:
+    """Tests for language-specific prompt selection."""
+
+    def test_known_language_uses_compact_prompt(self):
+        """Test that a detected language selects a shorter prompt."""
+        default_prompt = BugReportPrompts.create_bug_report_prompt("Login fails")
+        russian_prompt = BugReportPrompts.create_bug_report_prompt(
+            "Не работает вход", LANGUAGE_RU
+        )
+
+        assert len(russian_prompt) < len(default_prompt)
+        assert "Не работает вход" in russian_prompt
+        assert '"Expected result"' in russian_prompt
+
+    def test_unknown_language_uses_default_prompt(self):
+        """Test that an unknown language falls back to the bilingual prompt."""
+        assert BugReportPrompts.create_bug_report_prompt(
+            "Login fails", "de"
+        ) == BugReportPrompts.create_bug_report_prompt("Login fails")
+
+    def test_undetected_language_reaches_bilingual_prompt(self):
+        """Test that the service passes an undetermined language on as None."""
+        llm_service = Mock()
+        BugReportService(llm_service, Mock()).generate_formatted_report(
+            "ログイン画面でエラーが発生する"
+        )
+
+        assert llm_service.generate_bug_report.call_args.kwargs["language"] is None
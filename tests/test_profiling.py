@@ -0,0 +1,200 @@
+"""Tests for opt-in request profiling."""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import routes
+from src.api.app import app
+from src.cli.main import CLI
+from src.core.models import BugReport
+from src.profiling import Profiler, ProfileStore, fold_stack, profiled
+
+
+def busy_wait(seconds: float) -> None:
+    """Keep the current thread busy so samples land in this function."""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+class TestProfileStore:
+    """Tests for the profile ring buffer."""
+
+    def test_keeps_newest_files(self, tmp_path):
+        """Test that only the newest max_files profiles are kept."""
+        store = ProfileStore(str(tmp_path / "profiles"), max_files=3)
+
+        paths = [store.write("api", f"main {i}\n") for i in range(5)]
+
+        assert store.list() == paths[2:]
+        with open(paths[-1], encoding="utf-8") as profile_file:
+            assert profile_file.read() == "main 4\n"
+
+    def test_label_is_sanitized(self, tmp_path):
+        """Test that labels cannot escape the profile directory."""
+        store = ProfileStore(str(tmp_path))
+
+        path = store.write("../evil", "")
+
+        assert os.path.dirname(path) == str(tmp_path)
+
+
+class TestProfileSession:
+    """Tests for ProfileSession."""
+
+    def test_samples_current_thread(self, tmp_path):
+        """Test that the entering thread is sampled in collapsed-stack format."""
+        profiler = Profiler(ProfileStore(str(tmp_path)), interval=0.001)
+
+        with profiler.session("test") as session:
+            busy_wait(0.05)
+
+        assert session.path in session.store.list()
+        lines = session.folded().splitlines()
+        assert any("busy_wait (tests/test_profiling.py" in line for line in lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0 and ";" in stack
+
+    def test_profiled_function_joins_from_worker_thread(self, tmp_path):
+        """Test that work handed to another thread is sampled too."""
+        profiler = Profiler(ProfileStore(str(tmp_path)), interval=0.001)
+
+        with profiler.session("test") as session:
+            worker = threading.Thread(target=profiled(busy_wait), args=(0.05,))
+            worker.start()
+            worker.join()
+
+        assert any("busy_wait" in stack for stack in session.samples)
+        assert any(stack.startswith("_bootstrap") for stack in session.samples)
+
+    def test_async_session_samples_only_its_task(self, tmp_path):
+        """Test that other requests' coroutines on the loop are not sampled."""
+        profiler = Profiler(ProfileStore(str(tmp_path)), interval=0.001)
+
+        def other_request_work():
+            busy_wait(0.05)
+
+        async def other_request():
+            other_request_work()
+
+        async def run():
+            async with profiler.session("test") as session:
+                other = asyncio.ensure_future(other_request())
+                await asyncio.sleep(0)
+                busy_wait(0.05)
+                await other
+            return session
+
+        session = asyncio.run(run())
+
+        assert session.path in session.store.list()
+        assert any("busy_wait" in stack for stack in session.samples)
+        assert not any("other_request_work" in stack for stack in session.samples)
+
+    def test_no_session_costs_nothing(self):
+        """Test that functions are returned unchanged outside a session."""
+        assert profiled(busy_wait) is busy_wait
+
+    def test_fold_stack_outermost_first(self):
+        """Test that a folded stack ends with the innermost frame."""
+
+        def inner():
+            return fold_stack(sys._getframe())
+
+        assert inner().split(";")[-1].startswith("inner (tests/test_profiling.py")
+
+
+class TestProfilingAPI:
+    """Tests for profiling API requests."""
+
+    @pytest.fixture
+    def profiler(self, tmp_path):
+        """Enable API profiling with a known token."""
+        original = app.state.profiler
+        app.state.profiler = Profiler(
+            ProfileStore(str(tmp_path)), interval=0.001, token="secret"
+        )
+        yield app.state.profiler
+        app.state.profiler = original
+
+    @patch("src.api.routes.GeminiService")
+    def test_profiled_request(self, mock_gemini_class, profiler):
+        """Test that a profiled request writes a profile covering the LLM call."""
+
+        def generate(*args, **kwargs):
+            busy_wait(0.05)
+            return BugReport(
+                title="Test Bug",
+                description="Test description",
+                steps="1. Test step",
+                expected_result="Expected result",
+                actual_result="Actual result",
+            )
+
+        mock_gemini_class.return_value.generate_bug_report.side_effect = generate
+
+        response = TestClient(app).post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Test bug description"},
+            headers={"X-Profile": "secret"},
+        )
+
+        assert response.status_code == 200
+        (path,) = profiler.store.list()
+        assert response.headers[routes.PROFILE_HEADER] == os.path.basename(path)
+        with open(path, encoding="utf-8") as profile_file:
+            assert "busy_wait" in profile_file.read()
+
+    @patch("src.api.routes.GeminiService")
+    def test_wrong_token(self, mock_gemini_class, profiler):
+        """Test that the query flag requires the admin token."""
+        response = TestClient(app).post(
+            "/api/v1/bug-reports?profile=guess",
+            json={"user_input": "Test bug description"},
+        )
+
+        assert response.status_code == 403
+        assert profiler.store.list() == []
+
+    @patch("src.api.routes.GeminiService")
+    def test_profiling_disabled(self, mock_gemini_class):
+        """Test that profiling is refused when PROFILE_TOKEN is not set."""
+        with patch.object(app.state, "profiler", None):
+            response = TestClient(app).post(
+                "/api/v1/bug-reports",
+                json={"user_input": "Test bug description"},
+                headers={"X-Profile": "secret"},
+            )
+
+        assert response.status_code == 403
+        assert response.json()["detail"] == "Profiling is not enabled"
+
+
+class TestProfilingCLI:
+    """Tests for the --profile CLI option."""
+
+    @patch("src.cli.main.GeminiService")
+    @patch("src.cli.main.JiraFormatter")
+    @patch("src.cli.main.BugReportService")
+    def test_profile_option(
+        self, mock_bug_service_class, mock_formatter, mock_gemini, tmp_path, capsys
+    ):
+        """Test that --profile writes a profile of the run to PROFILE_DIR."""
+        mock_bug_service = Mock()
+        mock_bug_service.process_bug_report.side_effect = (
+            lambda *args, **kwargs: busy_wait(0.02)
+        )
+        mock_bug_service_class.return_value = mock_bug_service
+
+        with patch("src.cli.main.settings.profile_dir", str(tmp_path)):
+            CLI().run(["Export hangs on large projects", "--profile"])
+
+        (path,) = ProfileStore(str(tmp_path)).list()
+        assert f"Profile written to {path}" in capsys.readouterr().err
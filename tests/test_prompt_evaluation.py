@@ -0,0 +1,249 @@
+"""Tests for prompt A/B evaluation."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.cli.main import CLI
+from src.core.exceptions import LLMServiceError, ValidationError
+from src.core.interfaces import LLMService
+from src.core.models import AttemptUsage, BugReport
+from src.services.gemini_service import GeminiService
+from src.services.prompt_evaluation import (
+    ALL_LANGUAGES,
+    BUILTIN_VERSIONS,
+    EvaluationCase,
+    PromptEvaluator,
+    PromptVersion,
+    format_report,
+    load_corpus,
+    resolve_version,
+)
+
+CORPUS = Path(__file__).parent.parent / "benchmarks" / "prompt_corpus.jsonl"
+
+VALID_RESPONSE = (
+    '{"Title": "Test Bug", "Description": "Test description", '
+    '"Steps": "1. Test step", "Expected result": "Expected", '
+    '"Actual result": "Actual"}'
+)
+
+
+class ScriptedService(LLMService):
+    """LLM service whose attempts per prompt are given by a marker in it."""
+
+    def generate_bug_report(self, user_input, language=None, **kwargs):
+        """Not used by the evaluation."""
+        raise AssertionError("evaluation must send complete prompts")
+
+    def generate_bug_report_from_prompt(
+        self, prompt, prompt_version, deadline=None, on_attempt=None
+    ):
+        """Make as many attempts as the prompt's ATTEMPTS= marker says."""
+        if "FAIL" in prompt:
+            on_attempt(AttemptUsage("m", prompt_version, 10, 0, 0.01, False))
+            raise LLMServiceError("upstream down")
+        attempts = int(prompt.split("ATTEMPTS=")[1][0])
+        for _ in range(attempts):
+            on_attempt(AttemptUsage("m", prompt_version, 10, 20, 0.01, True))
+        return BugReport("Title", "Description", "Steps", "Expected", "Actual")
+
+
+def version(name, marker):
+    """A prompt version whose prompts carry a marker for ScriptedService."""
+    return PromptVersion.from_template(name, f"{marker}\n{{user_input}}")
+
+
+class TestCorpus:
+    """Tests for loading an evaluation corpus."""
+
+    def test_json_and_plain_lines(self):
+        """Test that JSON and plain lines are read and languages detected."""
+        cases = load_corpus(
+            [
+                '{"input": "Save fails", "language": "en"}',
+                "",
+                "Кнопка сохранения не работает",
+                '{"input": "Login fails"}',
+            ]
+        )
+
+        assert cases == [
+            EvaluationCase("Save fails", "en"),
+            EvaluationCase("Кнопка сохранения не работает", "ru"),
+            EvaluationCase("Login fails", "en"),
+        ]
+
+    def test_invalid_line(self):
+        """Test that a JSON line without an input is rejected with its number."""
+        with pytest.raises(ValidationError, match="line 2"):
+            load_corpus(["Save fails", '{"text": "Login fails"}'])
+
+    def test_bundled_corpus_covers_both_languages(self):
+        """Test that the bundled corpus has English and Russian inputs."""
+        with open(CORPUS, encoding="utf-8") as corpus:
+            languages = {case.language for case in load_corpus(corpus)}
+
+        assert languages == {"en", "ru"}
+
+
+class TestPromptVersions:
+    """Tests for resolving prompt versions."""
+
+    def test_builtin_versions(self):
+        """Test that current uses the compact prompt and bilingual does not."""
+        current = resolve_version("current").build("Save fails", "en")
+        bilingual = resolve_version("bilingual").build("Save fails", "en")
+
+        assert current.startswith("Generate a bug report.")
+        assert "Если текст описания на Русском" in bilingual
+
+    def test_template_file(self, tmp_path):
+        """Test that a template file is named after it and keeps JSON braces."""
+        path = tmp_path / "short-v2.txt"
+        path.write_text('Answer with {"Title": ...} for: {user_input}', "utf-8")
+
+        prompt_version = resolve_version(str(path))
+
+        assert prompt_version.name == "short-v2"
+        assert prompt_version.build("Save fails", "en") == (
+            'Answer with {"Title": ...} for: Save fails'
+        )
+
+    def test_template_without_placeholder(self, tmp_path):
+        """Test that a template that would drop the input is rejected."""
+        path = tmp_path / "broken.txt"
+        path.write_text("Write a bug report.", "utf-8")
+
+        with pytest.raises(ValidationError, match="placeholder"):
+            resolve_version(str(path))
+
+
+class TestPromptEvaluator:
+    """Tests for PromptEvaluator."""
+
+    def test_compares_versions(self):
+        """Test first-try rate, attempts, tokens and failures per version."""
+        evaluator = PromptEvaluator(
+            ScriptedService(),
+            [version("one-try", "ATTEMPTS=1"), version("retries", "ATTEMPTS=2")],
+        )
+        cases = [EvaluationCase("Save fails", "en"), EvaluationCase("Вход", "ru")]
+
+        rows = {(row.version, row.language): row for row in evaluator.run(cases)}
+
+        assert rows[("one-try", ALL_LANGUAGES)].first_try_rate == 1.0
+        assert rows[("retries", ALL_LANGUAGES)].first_try_rate == 0.0
+        assert rows[("retries", ALL_LANGUAGES)].success_rate == 1.0
+        assert rows[("retries", ALL_LANGUAGES)].mean_attempts == 2.0
+        assert rows[("retries", ALL_LANGUAGES)].mean_output_tokens == 40.0
+        assert rows[("retries", "ru")].cases == 1
+
+    def test_failures_are_counted(self):
+        """Test that a version whose calls fail is reported, not raised."""
+        evaluator = PromptEvaluator(
+            ScriptedService(), [version("ok", "ATTEMPTS=1"), version("down", "FAIL")]
+        )
+
+        rows = evaluator.run([EvaluationCase("Save fails", "en")])
+
+        down = next(row for row in rows if row.version == "down")
+        assert (down.cases, down.successes, down.attempts) == (1, 0, 1)
+
+    def test_rows_are_ordered(self):
+        """Test that each version's totals come before its languages."""
+        evaluator = PromptEvaluator(
+            ScriptedService(), [version("b", "ATTEMPTS=1"), version("a", "ATTEMPTS=1")]
+        )
+        cases = [EvaluationCase("Вход", "ru"), EvaluationCase("Save fails", "en")]
+
+        rows = evaluator.run(cases)
+
+        assert [(row.version, row.language) for row in rows] == [
+            ("b", ALL_LANGUAGES),
+            ("b", "en"),
+            ("b", "ru"),
+            ("a", ALL_LANGUAGES),
+            ("a", "en"),
+            ("a", "ru"),
+        ]
+        assert format_report(rows).count("\n") == len(rows)
+
+    def test_needs_two_distinct_versions(self):
+        """Test that a single version, or two with one name, is rejected."""
+        with pytest.raises(ValidationError):
+            PromptEvaluator(ScriptedService(), [BUILTIN_VERSIONS["current"]])
+        with pytest.raises(ValidationError):
+            PromptEvaluator(
+                ScriptedService(),
+                [BUILTIN_VERSIONS["current"], BUILTIN_VERSIONS["current"]],
+            )
+
+    def test_gemini_retries_are_counted(self):
+        """Test that GeminiService's retries on bad JSON count as attempts."""
+        model = MagicMock()
+        model.generate_content.side_effect = [
+            MagicMock(text="not json"),
+            MagicMock(text=VALID_RESPONSE),
+            MagicMock(text=VALID_RESPONSE),
+        ]
+        service = GeminiService(model=model)
+        service.max_retries = 3
+        evaluator = PromptEvaluator(
+            service,
+            [BUILTIN_VERSIONS["current"], BUILTIN_VERSIONS["bilingual"]],
+            workers=1,
+        )
+
+        rows = evaluator.run([EvaluationCase("Save fails", "en")])
+
+        assert [(row.version, row.mean_attempts) for row in rows[::2]] == [
+            ("current", 2.0),
+            ("bilingual", 1.0),
+        ]
+
+
+class TestEvaluationCLI:
+    """Tests for the --evaluate command."""
+
+    @pytest.fixture
+    def corpus(self, tmp_path):
+        """Write a one-line corpus and a template that needs two attempts."""
+        template = tmp_path / "v2.txt"
+        template.write_text("ATTEMPTS=2 {user_input}", "utf-8")
+        corpus = tmp_path / "corpus.txt"
+        corpus.write_text("ATTEMPTS=1 Save fails\n", "utf-8")
+        return str(corpus), str(template)
+
+    @patch("src.cli.main.GeminiService")
+    def test_prints_report(self, mock_gemini, corpus, capsys):
+        """Test that the given versions are compared on the corpus."""
+        mock_gemini.return_value = ScriptedService()
+        corpus_path, template = corpus
+
+        CLI().run(
+            ["--evaluate", corpus_path, "--prompt", "current", "--prompt", template]
+        )
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[1].split()[:6] == [
+            "current",
+            "all",
+            "1",
+            "100.0%",
+            "100.0%",
+            "1.00",
+        ]
+        assert lines[3].split()[:6] == ["v2", "all", "1", "0.0%", "100.0%", "2.00"]
+
+    @patch("src.cli.main.GeminiService")
+    def test_single_version_is_an_error(self, mock_gemini, corpus, capsys):
+        """Test that comparing one version exits with an error."""
+        mock_gemini.return_value = ScriptedService()
+        corpus_path, template = corpus
+
+        with pytest.raises(SystemExit):
+            CLI().run(["--evaluate", corpus_path, "--prompt", template])
+
+        assert "at least two prompt versions" in capsys.readouterr().err
@@ -0,0 +1,230 @@
+"""Tests for recording LLM traffic and replaying it offline."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.exceptions import CassetteMissError, LLMServiceError
+from src.replay import (
+    CassetteEntry,
+    CassetteWriter,
+    RecordingLLMService,
+    ReplayModel,
+    create_replay_service,
+    load_cassette,
+    prompt_key,
+    record_from_settings,
+    redact,
+    replay_model_from_settings,
+)
+from src.services.gemini_service import GeminiService
+
+VALID_RESPONSE = (
+    '{"Title": "Test Bug", "Description": "Test description", '
+    '"Steps": "1. Test step", "Expected result": "Expected", '
+    '"Actual result": "Actual"}'
+)
+
+
+def response(text, prompt_tokens=100, output_tokens=50):
+    """Build a generate_content response."""
+    result = MagicMock(text=text)
+    result.usage_metadata.prompt_token_count = prompt_tokens
+    result.usage_metadata.candidates_token_count = output_tokens
+    return result
+
+
+def record(path, responses, user_input="Save button crashes the app"):
+    """Generate a report through a recorder whose model returns responses."""
+    model = MagicMock()
+    model.generate_content.side_effect = responses
+    service = GeminiService(model=model)
+    service.max_retries = 3
+    recorder = RecordingLLMService(service, CassetteWriter(str(path)))
+    return recorder.generate_bug_report(user_input, language="en")
+
+
+class TestRedaction:
+    """Tests for secret redaction."""
+
+    def test_redacts_known_secrets(self):
+        """Test that configured secret values are removed."""
+        assert redact("key is hunter22", ["hunter22"]) == "key is [REDACTED]"
+
+    def test_redacts_secret_looking_tokens(self):
+        """Test that API keys, bearer tokens and assignments are removed."""
+        text = (
+            "AIza" + "x" * 35 + " Authorization: Bearer abc.def-123456 "
+            "password=swordfish ghp_" + "a" * 36
+        )
+
+        redacted = redact(text)
+
+        assert "AIza" not in redacted
+        assert "abc.def" not in redacted
+        assert "swordfish" not in redacted
+        assert "ghp_" not in redacted
+        assert "Authorization: Bearer [REDACTED]" in redacted
+        assert "password=[REDACTED]" in redacted
+
+    def test_keeps_ordinary_text(self):
+        """Test that text without secrets is unchanged."""
+        text = "The token counter shows 0 after login"
+
+        assert redact(text) == text
+
+
+class TestRecording:
+    """Tests for RecordingLLMService."""
+
+    def test_records_every_attempt(self, tmp_path):
+        """Test that malformed output is recorded along with the retry."""
+        path = tmp_path / "calls.jsonl"
+
+        bug_report = record(path, [response("not json"), response(VALID_RESPONSE)])
+
+        entries = load_cassette(str(path))
+        assert bug_report.title == "Test Bug"
+        assert [entry.text for entry in entries] == ["not json", VALID_RESPONSE]
+        assert entries[0].key == entries[1].key
+        assert (entries[1].prompt_tokens, entries[1].output_tokens) == (100, 50)
+
+    def test_records_failed_calls(self, tmp_path):
+        """Test that a failed call is recorded with its error and re-raised."""
+        path = tmp_path / "calls.jsonl"
+
+        record(path, [ConnectionError("reset"), response(VALID_RESPONSE)])
+
+        entries = load_cassette(str(path))
+        assert entries[0].error == "ConnectionError: reset"
+        assert entries[0].text is None
+
+    def test_redacts_prompts(self, tmp_path):
+        """Test that secrets in the user input never reach the cassette."""
+        path = tmp_path / "calls.jsonl"
+
+        record(path, [response(VALID_RESPONSE)], "Login fails with password=hunter2")
+
+        cassette = path.read_text(encoding="utf-8")
+        assert "hunter2" not in cassette
+        assert "password=[REDACTED]" in cassette
+
+    def test_compressed_cassette(self, tmp_path):
+        """Test that a .gz cassette round-trips across several writes."""
+        path = tmp_path / "calls.jsonl.gz"
+
+        record(path, [response("{}"), response(VALID_RESPONSE)])
+
+        assert path.read_bytes()[:2] == b"\x1f\x8b"
+        assert len(load_cassette(str(path))) == 2
+
+    def test_write_failure_does_not_fail_the_call(self, tmp_path):
+        """Test that a cassette that cannot be written only logs an error."""
+        path = tmp_path / "missing" / "calls.jsonl"
+
+        bug_report = record(path, [response(VALID_RESPONSE)])
+
+        assert bug_report.title == "Test Bug"
+
+    @patch("src.replay.recording.settings")
+    def test_disabled_without_record_path(self, mock_settings):
+        """Test that the service is returned as is when recording is off."""
+        mock_settings.llm_record_path = None
+        service = GeminiService(model=MagicMock())
+
+        assert record_from_settings(service) is service
+
+
+class TestReplay:
+    """Tests for ReplayModel."""
+
+    def test_reproduces_retries(self, tmp_path):
+        """Test that replay runs the recorded parse failure and retry."""
+        path = tmp_path / "calls.jsonl"
+        record(path, [response("not json"), response(VALID_RESPONSE)])
+        service = create_replay_service(str(path), latency_scale=0)
+        attempts = []
+
+        bug_report = service.generate_bug_report(
+            "Save button crashes the app", language="en", on_attempt=attempts.append
+        )
+
+        assert bug_report.title == "Test Bug"
+        assert len(attempts) == 2
+        assert attempts[1].prompt_tokens == 100
+
+    def test_reproduces_failed_calls(self, tmp_path):
+        """Test that a recorded error fails the attempt and is retried."""
+        path = tmp_path / "calls.jsonl"
+        record(path, [ConnectionError("reset"), response(VALID_RESPONSE)])
+        service = create_replay_service(str(path), latency_scale=0)
+        attempts = []
+
+        service.generate_bug_report(
+            "Save button crashes the app", language="en", on_attempt=attempts.append
+        )
+
+        assert [attempt.succeeded for attempt in attempts] == [False, True]
+
+    def test_unrecorded_prompt(self):
+        """Test that a prompt missing from the cassette is reported as a miss."""
+        model = ReplayModel([])
+
+        with pytest.raises(CassetteMissError):
+            model.generate_content("Unknown prompt")
+
+    def test_recorded_error(self):
+        """Test that a recorded error is raised on replay."""
+        entry = self.entry("Prompt", text=None, error="ConnectionError: reset")
+        model = ReplayModel([entry], latency_scale=0)
+
+        with pytest.raises(LLMServiceError, match="ConnectionError: reset"):
+            model.generate_content("Prompt")
+
+    def test_scales_latency(self):
+        """Test that recorded latencies are scaled before sleeping."""
+        sleeps = []
+        model = ReplayModel(
+            [self.entry("Prompt", latency=2.0)], latency_scale=0.5, sleep=sleeps.append
+        )
+
+        model.generate_content("Prompt")
+
+        assert sleeps == [1.0]
+
+    def test_timeout_cuts_latency_off(self):
+        """Test that a call slower than its timeout times out."""
+        sleeps = []
+        model = ReplayModel([self.entry("Prompt", latency=5.0)], sleep=sleeps.append)
+
+        with pytest.raises(TimeoutError):
+            model.generate_content("Prompt", request_options={"timeout": 2.0})
+        assert sleeps == [2.0]
+
+    def test_recorded_text_error(self):
+        """Test that a response whose text could not be read fails the same way."""
+        entry = self.entry("Prompt", text=None, text_error="Response was blocked")
+        response = ReplayModel([entry], latency_scale=0).generate_content("Prompt")
+
+        with pytest.raises(ValueError, match="blocked"):
+            _ = response.text
+
+    @patch("src.replay.replay.settings")
+    def test_from_settings(self, mock_settings, tmp_path):
+        """Test that LLM_REPLAY_PATH selects the cassette to replay."""
+        path = tmp_path / "calls.jsonl"
+        CassetteWriter(str(path)).write(self.entry("Prompt"))
+        mock_settings.llm_replay_path = str(path)
+        mock_settings.llm_replay_latency_scale = 0.0
+
+        model = replay_model_from_settings()
+
+        assert model.generate_content("Prompt").text == "{}"
+        mock_settings.llm_replay_path = None
+        assert replay_model_from_settings() is None
+
+    @staticmethod
+    def entry(prompt, latency=0.0, **fields):
+        """Build a recorded call for a prompt."""
+        fields.setdefault("text", "{}")
+        return CassetteEntry(prompt_key(prompt), "m", prompt, latency, **fields)
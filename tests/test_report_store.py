@@ -0,0 +1,117 @@
+"""Tests for the report store and on-demand rendering."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from src.core.exceptions import ValidationError
+from src.core.models import BugReport
+from src.formatters.registry import create_default_registry
+from src.services.report_rendering_service import ReportRenderingService
+from src.storage import SQLiteReportStore
+
+
+@pytest.fixture
+def bug_report():
+    """Sample bug report."""
+    return BugReport(
+        title="Test Bug",
+        description="Test description",
+        steps="1. Step one\n2. Step two",
+        expected_result="Expected result",
+        actual_result="Actual result",
+    )
+
+
+class TestSQLiteReportStore:
+    """Tests for SQLiteReportStore."""
+
+    def test_save_and_get(self, bug_report):
+        """Test that a saved report can be loaded by its ID."""
+        store = SQLiteReportStore()
+
+        stored = store.save("Test user input", bug_report)
+        loaded = store.get(stored.id)
+
+        assert loaded.id == stored.id
+        assert loaded.user_input == "Test user input"
+        assert loaded.bug_report == bug_report
+        assert loaded.created_at == stored.created_at
+
+    def test_get_missing(self):
+        """Test that unknown IDs return None."""
+        assert SQLiteReportStore().get("missing") is None
+
+    def test_persists_to_file(self, tmp_path, bug_report):
+        """Test that a file-backed store survives reopening."""
+        path = str(tmp_path / "reports.db")
+        stored = SQLiteReportStore(path).save("Test user input", bug_report)
+
+        assert SQLiteReportStore(path).get(stored.id).bug_report == bug_report
+
+
+class TestReportRenderingService:
+    """Tests for ReportRenderingService."""
+
+    def test_render_formats(self, bug_report):
+        """Test rendering a stored report in every built-in format."""
+        store = SQLiteReportStore()
+        stored = store.save("Test user input", bug_report)
+        service = ReportRenderingService(store, create_default_registry())
+
+        assert "*Title*:\nTest Bug" in service.render(stored.id, "jira")
+        assert service.render(stored.id, "markdown").startswith("# Test Bug")
+        assert "### Steps to reproduce" in service.render(stored.id, "github")
+        assert "<h1>Test Bug</h1>" in service.render(stored.id, "html")
+        assert service.render(stored.id, "text").startswith("Title:\nTest Bug")
+
+    def test_render_is_memoized(self, bug_report):
+        """Test that a (report, format) pair is loaded and formatted once."""
+        store = Mock()
+        store.get.return_value = Mock(bug_report=bug_report)
+        registry = create_default_registry()
+        service = ReportRenderingService(store, registry)
+
+        first = service.render("abc", "markdown")
+        second = service.render("abc", "MARKDOWN")
+        service.render("abc", "text")
+
+        assert first == second
+        assert store.get.call_count == 2
+
+    def test_invalidate(self, bug_report):
+        """Test that invalidation forces a fresh render."""
+        store = Mock()
+        store.get.return_value = Mock(bug_report=bug_report)
+        service = ReportRenderingService(store, create_default_registry())
+
+        service.render("abc", "jira")
+        service.invalidate("abc")
+        service.render("abc", "jira")
+
+        assert store.get.call_count == 2
+
+    def test_cache_is_bounded(self, bug_report):
+        """Test that the memo evicts the least recently used rendering."""
+        store = Mock()
+        store.get.return_value = Mock(bug_report=bug_report)
+        service = ReportRenderingService(store, create_default_registry(), 1)
+
+        service.render("a", "jira")
+        service.render("b", "jira")
+        service.render("a", "jira")
+
+        assert store.get.call_count == 3
+
+    def test_unknown_format(self):
+        """Test that unknown formats raise ValidationError."""
+        service = ReportRenderingService(Mock(), create_default_registry())
+
+        with pytest.raises(ValidationError, match="Unknown format"):
+            service.render("abc", "pdf")
+
+    def test_missing_report(self):
+        """Test that missing reports render as None."""
+        service = ReportRenderingService(SQLiteReportStore(), create_default_registry())
+
+        assert service.render("missing", "jira") is None
@@ -0,0 +1,260 @@
+"""Tests for the priority lane scheduler."""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.api.routes import call_until_disconnected
+from src.core.deadline import Deadline
+from src.core.exceptions import DeadlineExceededError, ValidationError
+from src.core.models import BugReport
+from src.monitoring import MetricsRegistry
+from src.services.scheduler import BULK, INTERACTIVE, PriorityScheduler
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+async def admit_order(scheduler, lanes):
+    """Queue one waiter per lane behind a held slot and return the grant order."""
+    order = []
+
+    async def worker(index, lane):
+        async with scheduler.slot(lane):
+            order.append(index)
+
+    await scheduler.acquire(INTERACTIVE)
+    tasks = [asyncio.create_task(worker(i, lane)) for i, lane in enumerate(lanes)]
+    await asyncio.sleep(0)
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+class TestPriorityScheduler:
+    """Tests for PriorityScheduler."""
+
+    def test_free_slot_is_granted_immediately(self):
+        """Test that requests do not queue while slots are free."""
+        scheduler = PriorityScheduler(max_concurrency=2)
+
+        async def run():
+            await scheduler.acquire(BULK)
+            await scheduler.acquire(INTERACTIVE)
+            assert scheduler.active == 2
+            scheduler.release()
+            scheduler.release()
+
+        asyncio.run(run())
+        assert scheduler.active == 0
+
+    def test_slots_are_shared_by_weight(self):
+        """Test that a busy bulk lane gets one slot per four interactive ones."""
+        scheduler = PriorityScheduler(max_concurrency=1)
+        lanes = [BULK] * 5 + [INTERACTIVE] * 8
+
+        order = asyncio.run(admit_order(scheduler, lanes))
+
+        granted = [lanes[i] for i in order]
+        # The held slot was interactive, so bulk goes first, then 4:1
+        cycle = [INTERACTIVE] * 4 + [BULK]
+        assert granted == [BULK] + cycle + cycle + [BULK, BULK]
+        # Within a lane, requests are served in arrival order
+        assert [i for i in order if lanes[i] == BULK] == [0, 1, 2, 3, 4]
+
+    def test_idle_lane_does_not_bank_credit(self):
+        """Test that a lane joining late starts level with the busy lanes."""
+        scheduler = PriorityScheduler(
+            max_concurrency=1, weights={INTERACTIVE: 1, BULK: 1}
+        )
+
+        async def run():
+            # Bulk runs alone for a while, then interactive joins
+            for _ in range(10):
+                async with scheduler.slot(BULK):
+                    pass
+            return await admit_order(scheduler, [BULK, BULK, INTERACTIVE, INTERACTIVE])
+
+        order = asyncio.run(run())
+
+        # Alternating, with ties going to the first lane; without levelling the
+        # idle interactive lane would take both of its requests first
+        assert order == [2, 0, 3, 1]
+
+    def test_starving_waiter_is_served_first(self):
+        """Test that a waiter past the starvation timeout jumps the queue."""
+        clock = FakeClock()
+        registry = MetricsRegistry()
+        scheduler = PriorityScheduler(
+            max_concurrency=1,
+            weights={INTERACTIVE: 1000, BULK: 1},
+            starvation_timeout=5,
+            registry=registry,
+            clock=clock,
+        )
+        order = []
+
+        async def worker(name, lane):
+            async with scheduler.slot(lane):
+                order.append(name)
+
+        async def run():
+            await scheduler.acquire(INTERACTIVE)
+            bulk = asyncio.create_task(worker("bulk", BULK))
+            await asyncio.sleep(0)
+            clock.now = 10
+            interactive = asyncio.create_task(worker("interactive", INTERACTIVE))
+            await asyncio.sleep(0)
+            # The bulk request has been queued for 10s; the interactive one just came
+            scheduler.release()
+            await asyncio.gather(bulk, interactive)
+
+        asyncio.run(run())
+
+        assert order == ["bulk", "interactive"]
+        assert scheduler._starved.value(lane=BULK) == 1
+
+    def test_deadline_while_queued(self):
+        """Test that a request stops queueing when its deadline passes."""
+        scheduler = PriorityScheduler(max_concurrency=1)
+
+        async def run():
+            await scheduler.acquire(INTERACTIVE)
+            with pytest.raises(DeadlineExceededError):
+                await scheduler.acquire(BULK, Deadline(0.01))
+            assert scheduler.depth(BULK) == 0
+            scheduler.release()
+
+        asyncio.run(run())
+        assert scheduler.active == 0
+
+    def test_abandoned_call_keeps_slot(self):
+        """Test that a timed-out worker thread holds its slot until it returns."""
+        scheduler = PriorityScheduler(max_concurrency=1)
+        release = threading.Event()
+
+        async def run():
+            with pytest.raises(DeadlineExceededError):
+                async with scheduler.slot(INTERACTIVE):
+                    await call_until_disconnected(None, Deadline(0.01), release.wait)
+            held_after_timeout = scheduler.active
+            release.set()
+            while scheduler.active:
+                await asyncio.sleep(0.01)
+            return held_after_timeout
+
+        assert asyncio.run(run()) == 1
+        assert scheduler.active == 0
+
+    def test_thread_wait_is_bounded(self):
+        """Test that a worker thread gives up its place in the queue on timeout."""
+        scheduler = PriorityScheduler(max_concurrency=1)
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(
+                scheduler.acquire(INTERACTIVE), loop
+            ).result()
+
+            slot = scheduler.thread_slot(loop, BULK, timeout=0.05)
+            with pytest.raises(DeadlineExceededError):
+                slot.__enter__()
+
+            async def depth():
+                """Read the queue once the cancellation has been handled."""
+                await asyncio.sleep(0.01)
+                return scheduler.depth(BULK)
+
+            assert asyncio.run_coroutine_threadsafe(depth(), loop).result() == 0
+            assert scheduler.active == 1
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def test_cancelled_waiter_is_skipped(self):
+        """Test that a cancelled waiter does not take a slot."""
+        scheduler = PriorityScheduler(max_concurrency=1)
+
+        async def run():
+            await scheduler.acquire(INTERACTIVE)
+            waiting = asyncio.create_task(scheduler.acquire(BULK))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.sleep(0)
+            scheduler.release()
+
+        asyncio.run(run())
+        assert scheduler.active == 0
+        assert scheduler.depth(BULK) == 0
+
+    def test_unknown_lane(self):
+        """Test that only configured lanes are accepted."""
+        scheduler = PriorityScheduler()
+
+        with pytest.raises(ValidationError):
+            asyncio.run(scheduler.acquire("urgent"))
+
+    def test_queue_metrics(self):
+        """Test that depth and wait time are recorded per lane."""
+        registry = MetricsRegistry()
+        scheduler = PriorityScheduler(max_concurrency=1, registry=registry)
+
+        asyncio.run(admit_order(scheduler, [BULK, BULK]))
+
+        text = registry.render()
+        assert 'llm_queue_depth{lane="bulk"} 0' in text
+        assert 'llm_queue_wait_seconds_count{lane="bulk"} 2' in text
+        assert 'llm_queue_wait_seconds_count{lane="interactive"} 1' in text
+
+
+class TestPriorityAPI:
+    """Tests for priority lanes on the bug report endpoints."""
+
+    @patch("src.api.routes.GeminiService")
+    def test_priority_header(self, mock_gemini_class):
+        """Test that X-Priority picks the lane the LLM call waits in."""
+        mock_gemini_class.return_value.generate_bug_report.return_value = BugReport(
+            title="Test Bug",
+            description="Test description",
+            steps="1. Test step",
+            expected_result="Expected result",
+            actual_result="Actual result",
+        )
+        histogram = app.state.scheduler._wait
+        before = histogram.count(lane=BULK)
+
+        response = TestClient(app).post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Test bug description"},
+            headers={"X-Priority": "bulk"},
+        )
+
+        assert response.status_code == 200
+        assert histogram.count(lane=BULK) == before + 1
+        assert app.state.scheduler.active == 0
+
+    def test_unknown_priority(self):
+        """Test that an unknown X-Priority is rejected."""
+        response = TestClient(app).post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Test bug description"},
+            headers={"X-Priority": "urgent"},
+        )
+
+        assert response.status_code == 400
+        assert "interactive, bulk" in response.json()["detail"]
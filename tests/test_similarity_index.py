@@ -0,0 +1,124 @@
+"""Tests for the duplicate-detection similarity index."""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from src.core.models import BugReport, StoredReport
+from src.services.similarity_index import MinHasher, SimilarityIndex, normalize_text
+from src.storage import SQLiteReportStore
+
+
+def make_report(report_id, user_input, title, description=""):
+    """Build a stored report for indexing."""
+    return StoredReport(
+        id=report_id,
+        user_input=user_input,
+        bug_report=BugReport(
+            title=title,
+            description=description,
+            steps="1. Step",
+            expected_result="Expected",
+            actual_result="Actual",
+        ),
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def index():
+    """Index with one English and one Russian report."""
+    index = SimilarityIndex()
+    index.add(
+        make_report(
+            "header",
+            "there is no header displayed on the main page, "
+            "i can see error 404 in js console",
+            "Missing header on main page",
+        )
+    )
+    index.add(
+        make_report(
+            "save",
+            "Кнопка сохранения не работает в редакторе документов",
+            "Не работает кнопка сохранения",
+        )
+    )
+    return index
+
+
+class TestMinHasher:
+    """Tests for MinHasher."""
+
+    def test_normalize_text(self):
+        """Test normalization of case, punctuation and Cyrillic yo."""
+        assert normalize_text("Ёлка, Header!!  404") == "елка header 404"
+
+    def test_identical_texts_have_identical_signatures(self):
+        """Test that signatures are deterministic."""
+        hasher = MinHasher()
+
+        assert np.array_equal(
+            hasher.signature("Save button broken"),
+            MinHasher().signature("save button, broken!"),
+        )
+
+    def test_empty_text_has_no_signature(self):
+        """Test that text without words has no signature."""
+        assert MinHasher().signature(" ... ") is None
+
+
+class TestSimilarityIndex:
+    """Tests for SimilarityIndex queries."""
+
+    def test_finds_english_duplicate(self, index):
+        """Test that a reworded English report is the top match."""
+        matches = index.query("no header on the main page, 404 error in the console")
+
+        assert matches[0].report_id == "header"
+        assert matches[0].score > 0.4
+
+    def test_finds_russian_duplicate(self, index):
+        """Test that a reworded Russian report is the top match."""
+        matches = index.query("не работает кнопка сохранения в редакторе")
+
+        assert matches[0].report_id == "save"
+        assert matches[0].title == "Не работает кнопка сохранения"
+
+    def test_min_score_filters_unrelated(self, index):
+        """Test that unrelated text yields no matches above the threshold."""
+        assert index.query("weather forecast for tomorrow", min_score=0.3) == []
+
+    def test_top_k_limits_results(self, index):
+        """Test that at most top_k matches are returned, best first."""
+        matches = index.query("main page header 404", top_k=1)
+
+        assert [m.report_id for m in matches] == ["header"]
+
+    def test_index_grows_past_capacity(self):
+        """Test that the index resizes beyond its initial capacity."""
+        index = SimilarityIndex(initial_capacity=2)
+        for i in range(5):
+            index.add(make_report(str(i), f"bug number {i} in module {i * 31}", "t"))
+
+        assert len(index) == 5
+        assert index.query("bug number 4 in module 124")[0].report_id == "4"
+
+    def test_from_store(self):
+        """Test building the index from stored reports."""
+        store = SQLiteReportStore()
+        stored = store.save(
+            "Login form doesn't validate email addresses",
+            BugReport(
+                title="Login email validation missing",
+                description="Invalid emails are accepted",
+                steps="1. Step",
+                expected_result="Expected",
+                actual_result="Actual",
+            ),
+        )
+
+        index = SimilarityIndex.from_store(store)
+
+        assert index.query("login form email validation")[0].report_id == stored.id
@@ -0,0 +1,164 @@
+"""Tests for pre-compressed static asset serving and API compression."""
+
+import gzip
+from unittest.mock import Mock, patch
+
+import brotli
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import create_app
+from src.api.static_assets import (
+    StaticAssetCache,
+    etag_matches,
+    negotiate_encoding,
+)
+from src.core.models import BugReport
+
+
+@pytest.fixture
+def asset_cache(tmp_path):
+    """Asset cache over a directory with one compressible and one tiny file."""
+    (tmp_path / "page.html").write_text("<p>bug reporter</p>\n" * 100)
+    (tmp_path / "tiny.css").write_text("a{}")
+    cache = StaticAssetCache(tmp_path)
+    cache.load()
+    return cache
+
+
+class TestStaticAssetCache:
+    """Tests for StaticAssetCache loading and variants."""
+
+    def test_compressed_variants_decode_to_original(self, asset_cache):
+        """Test that every variant decodes to the original bytes."""
+        asset = asset_cache.get("page.html")
+
+        assert set(asset.variants) == {"identity", "gzip", "br"}
+        assert gzip.decompress(asset.variants["gzip"]) == asset.variants["identity"]
+        assert brotli.decompress(asset.variants["br"]) == asset.variants["identity"]
+        assert asset.media_type == "text/html; charset=utf-8"
+
+    def test_small_files_are_not_compressed(self, asset_cache):
+        """Test that tiny files are only kept as identity."""
+        assert set(asset_cache.get("tiny.css").variants) == {"identity"}
+
+    def test_missing_asset(self, asset_cache):
+        """Test that unknown paths are not found."""
+        assert asset_cache.get("../secret.txt") is None
+
+
+class TestNegotiation:
+    """Tests for Accept-Encoding and If-None-Match handling."""
+
+    @pytest.mark.parametrize(
+        "header,expected",
+        [
+            ("gzip, deflate, br", "br"),
+            ("gzip", "gzip"),
+            ("br;q=0.5, gzip;q=0.8", "gzip"),
+            ("br;q=0, gzip;q=0", "identity"),
+            ("*", "br"),
+            ("", "identity"),
+        ],
+    )
+    def test_negotiate_encoding(self, header, expected):
+        """Test encoding selection by quality and preference."""
+        assert negotiate_encoding(header, ["identity", "gzip", "br"]) == expected
+
+    def test_negotiate_unavailable_encoding(self):
+        """Test that unavailable encodings are never chosen."""
+        assert negotiate_encoding("br", ["identity", "gzip"]) == "identity"
+
+    def test_etag_matches(self):
+        """Test strong, weak, list and wildcard If-None-Match values."""
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"x", "abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"x"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+
+
+class TestStaticRoutes:
+    """Tests for the index and /static routes."""
+
+    def test_index_served_compressed_with_etag(self):
+        """Test that the index page is served brotli-encoded with validators."""
+        client = TestClient(create_app())
+
+        response = client.get("/", headers={"Accept-Encoding": "br"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["cache-control"] == "no-cache"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert "ETag" in response.headers
+        assert "<html" in response.text.lower()
+
+    def test_conditional_get_returns_not_modified(self):
+        """Test that a matching If-None-Match yields 304 without a body."""
+        client = TestClient(create_app())
+        etag = client.get("/", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+        response = client.get(
+            "/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_versioned_static_path_uses_long_lived_cache(self):
+        """Test that /static URLs carrying the content digest get a max-age."""
+        test_app = create_app()
+        client = TestClient(test_app)
+
+        response = client.get(test_app.state.static_assets.url("index.html"))
+
+        assert response.status_code == 200
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        assert response.headers["cache-control"].endswith(", immutable")
+
+    def test_unversioned_static_path_is_revalidated(self):
+        """Test that plain or stale /static URLs are revalidated by ETag."""
+        client = TestClient(create_app())
+
+        for url in ("/static/index.html", "/static/index.html?v=stale"):
+            response = client.get(url)
+
+            assert response.status_code == 200
+            assert response.headers["cache-control"] == "no-cache"
+            assert "ETag" in response.headers
+
+    def test_static_path_not_found(self):
+        """Test that unknown static paths return 404."""
+        client = TestClient(create_app())
+
+        assert client.get("/static/missing.js").status_code == 404
+
+    @patch("src.api.routes.GeminiService")
+    @patch("src.api.routes.JiraFormatter")
+    def test_large_api_responses_are_gzipped(
+        self, mock_formatter_class, mock_gemini_class
+    ):
+        """Test that API payloads above the threshold are compressed."""
+        mock_gemini = Mock()
+        mock_gemini_class.return_value = mock_gemini
+        mock_gemini.generate_bug_report.return_value = BugReport(
+            title="Test Bug",
+            description="Long description " * 200,
+            steps="1. Test step",
+            expected_result="Expected result",
+            actual_result="Actual result",
+        )
+        mock_formatter_class.return_value.format.return_value = "Formatted report"
+
+        client = TestClient(create_app())
+        response = client.post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Test bug description"},
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["title"] == "Test Bug"
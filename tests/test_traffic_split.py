@@ -0,0 +1,272 @@
+"""Tests for canary and shadow routing of report generation."""
+
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.api.routes import create_llm_service
+from src.core.exceptions import LLMServiceError
+from src.core.models import AttemptUsage, BugReport, ImageAttachment
+from src.monitoring import MetricsRegistry
+from src.services.bug_report_service import BugReportService
+from src.services.prompt_evaluation import PromptVersion
+from src.services.traffic_split import (
+    CONTROL,
+    EMPTY,
+    ERROR,
+    VALID,
+    TrafficArm,
+    TrafficSplitService,
+)
+
+REPORT = BugReport("Title", "Description", "Steps", "Expected", "Actual")
+
+
+def arm_service(attempts=1, result=REPORT):
+    """Build an LLM service that makes the given number of attempts."""
+    service = Mock()
+
+    def generate(*args, on_attempt=None, **kwargs):
+        for _ in range(attempts):
+            on_attempt(AttemptUsage("m", "v", 10, 20, 0.01, True))
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    service.generate_bug_report.side_effect = generate
+    service.generate_bug_report_from_prompt.side_effect = (
+        lambda prompt, version, deadline, on_attempt: generate(on_attempt=on_attempt)
+    )
+    return service
+
+
+def split(control, arms, roll=0.5, **kwargs):
+    """Build a split whose random rolls all return roll."""
+    registry = MetricsRegistry()
+    service = TrafficSplitService(
+        control, arms, registry=registry, rng=lambda: roll, **kwargs
+    )
+    return service, registry
+
+
+def generations(registry, arm, outcome):
+    """Return the generation count of an arm and outcome."""
+    return registry.counter("llm_arm_generations_total", "", ["arm", "outcome"]).value(
+        arm=arm, outcome=outcome
+    )
+
+
+class TestCanary:
+    """Tests for canary arms."""
+
+    def test_canary_serves_its_share(self):
+        """Test that a roll inside the canary's percent is served by it."""
+        canary = arm_service(attempts=2)
+        service, registry = split(
+            arm_service(), [TrafficArm("canary", canary, 10)], roll=0.05
+        )
+        attempts = []
+
+        bug_report = service.generate_bug_report(
+            "Save fails", on_attempt=attempts.append
+        )
+
+        assert bug_report is REPORT
+        assert len(attempts) == 2
+        assert generations(registry, "canary", VALID) == 1
+        assert (
+            registry.counter("llm_arm_attempts_total", "", ["arm"]).value(arm="canary")
+            == 2
+        )
+
+    def test_control_serves_the_rest(self):
+        """Test that a roll past every canary is served by the control."""
+        control = arm_service()
+        canary = arm_service()
+        service, registry = split(control, [TrafficArm("canary", canary, 10)], 0.5)
+
+        service.generate_bug_report("Save fails", language="en")
+
+        canary.generate_bug_report.assert_not_called()
+        assert generations(registry, CONTROL, VALID) == 1
+        assert (
+            registry.histogram("llm_arm_latency_seconds", "", ["arm"]).count(
+                arm=CONTROL
+            )
+            == 1
+        )
+
+    def test_outcomes(self):
+        """Test that empty results and errors are counted per arm."""
+        service, registry = split(arm_service(result=None), [])
+        service.generate_bug_report("Save fails")
+        failing, registry_2 = split(arm_service(result=LLMServiceError("down")), [])
+
+        with pytest.raises(LLMServiceError):
+            failing.generate_bug_report("Save fails")
+
+        assert generations(registry, CONTROL, EMPTY) == 1
+        assert generations(registry_2, CONTROL, ERROR) == 1
+
+    def test_canary_prompt(self):
+        """Test that a canary prompt is built with the context prefix."""
+        canary = arm_service()
+        prompt = PromptVersion.from_template("v2", "V2 {user_input}")
+        service, _ = split(
+            arm_service(), [TrafficArm("canary", canary, 100, prompt=prompt)]
+        )
+
+        service.generate_bug_report("Save fails", context_prefix="CTX\n")
+
+        args = canary.generate_bug_report_from_prompt.call_args[0]
+        assert args[:2] == ("CTX\nV2 Save fails", "v2")
+
+    def test_screenshots_skip_prompt_arms(self):
+        """Test that requests with images stay on the control with a custom prompt."""
+        control = arm_service()
+        prompt = PromptVersion.from_template("v2", "V2 {user_input}")
+        canary = arm_service()
+        service, _ = split(control, [TrafficArm("canary", canary, 100, prompt=prompt)])
+        image = ImageAttachment("image/jpeg", b"jpeg", 1, 1, "digest", 4)
+
+        service.generate_bug_report("Save fails", images=[image])
+
+        canary.generate_bug_report_from_prompt.assert_not_called()
+        assert control.generate_bug_report.call_args[1]["images"] == [image]
+
+    def test_canaries_cannot_exceed_all_traffic(self):
+        """Test that canary percentages over 100 are rejected."""
+        with pytest.raises(ValueError):
+            split(
+                arm_service(),
+                [
+                    TrafficArm("a", arm_service(), 60),
+                    TrafficArm("b", arm_service(), 60),
+                ],
+            )
+
+
+class TestShadow:
+    """Tests for shadow arms."""
+
+    def test_shadow_runs_off_the_request_path(self):
+        """Test that the control answers while the shadow's result is discarded."""
+        release = threading.Event()
+        finished = threading.Event()
+        shadow = arm_service(result=BugReport("Shadow", "D", "S", "E", "A"))
+        generate = shadow.generate_bug_report.side_effect
+
+        def slow(*args, **kwargs):
+            release.wait(5)
+            try:
+                return generate(*args, **kwargs)
+            finally:
+                finished.set()
+
+        shadow.generate_bug_report.side_effect = slow
+        service, registry = split(
+            arm_service(), [TrafficArm("shadow", shadow, 100, shadow=True)]
+        )
+
+        bug_report = service.generate_bug_report("Save fails", deadline=None)
+
+        assert bug_report is REPORT
+        assert generations(registry, "shadow", VALID) == 0
+        release.set()
+        assert finished.wait(5)
+        service.close()
+        # The shadow had its own deadline, not the request's
+        assert shadow.generate_bug_report.call_args[1]["deadline"] is not None
+
+    def test_shadow_budget(self):
+        """Test that shadows beyond the budget are dropped, not queued."""
+        release = threading.Event()
+        shadow = Mock()
+        shadow.generate_bug_report.side_effect = lambda *args, **kwargs: release.wait(5)
+        service, registry = split(
+            arm_service(),
+            [TrafficArm("shadow", shadow, 100, shadow=True)],
+            shadow_workers=1,
+            shadow_max_pending=1,
+        )
+
+        service.generate_bug_report("Save fails")
+        service.generate_bug_report("Save fails")
+        release.set()
+        service.close()
+
+        dropped = registry.counter("llm_shadow_dropped_total", "", ["arm"])
+        assert dropped.value(arm="shadow") == 1
+
+    def test_shadow_share(self):
+        """Test that rolls past the shadow's percent send no copy."""
+        shadow = arm_service()
+        service, _ = split(
+            arm_service(), [TrafficArm("shadow", shadow, 10, shadow=True)], roll=0.5
+        )
+
+        service.generate_bug_report("Save fails")
+        service.close()
+
+        shadow.generate_bug_report.assert_not_called()
+
+
+class TestSplitDelegation:
+    """Tests for the calls that always use the control service."""
+
+    def test_other_calls_use_the_control(self):
+        """Test that enrichers and field regeneration stay on the control."""
+        control = Mock()
+        canary = Mock()
+        service, _ = split(control, [TrafficArm("canary", canary, 100)])
+
+        service.generate_text("Prompt", "v1")
+        service.regenerate_field(REPORT, "steps")
+        service.warm_up()
+
+        control.generate_text.assert_called_once()
+        control.regenerate_field.assert_called_once()
+        canary.warm_up.assert_called_once_with(False)
+
+    def test_bug_report_service_closes_the_split(self):
+        """Test that closing the report service closes the arms."""
+        canary = Mock()
+        service, _ = split(Mock(), [TrafficArm("canary", canary, 100)])
+
+        BugReportService(service, Mock()).close()
+
+        canary.close.assert_called_once()
+
+
+class TestSettings:
+    """Tests for building the split from settings."""
+
+    @patch("src.api.routes.GeminiService")
+    @patch("src.api.routes.settings")
+    def test_arms_from_settings(self, mock_settings, mock_gemini):
+        """Test that canary and shadow settings create their arms."""
+        mock_settings.canary_percent = 5.0
+        mock_settings.canary_model = "gemini-candidate"
+        mock_settings.canary_prompt = "bilingual"
+        mock_settings.shadow_percent = 0.0
+        mock_settings.shadow_max_concurrency = 2
+        mock_settings.shadow_max_pending = 100
+        mock_settings.shadow_timeout = 60.0
+
+        service = create_llm_service()
+
+        assert isinstance(service, TrafficSplitService)
+        assert [arm.name for arm in service.canaries] == ["canary"]
+        assert service.canaries[0].prompt.name == "bilingual"
+        assert service.shadows == []
+        assert mock_gemini.call_args[1]["model_name"] == "gemini-candidate"
+
+    @patch("src.api.routes.GeminiService")
+    @patch("src.api.routes.settings")
+    def test_no_arms(self, mock_settings, mock_gemini):
+        """Test that without arms the plain service is used."""
+        mock_settings.canary_percent = 0.0
+        mock_settings.shadow_percent = 0.0
+
+        assert create_llm_service() is mock_gemini.return_value
@@ -0,0 +1,200 @@
+"""Tests for token usage accounting and per-client quotas."""
+
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.core.exceptions import QuotaExceededError
+from src.core.models import AttemptUsage, BugReport
+from src.prompts import BugReportPrompts
+from src.services.gemini_service import GeminiService
+from src.services.usage_meter import UsageMeter
+
+VALID_RESPONSE = (
+    '{"Title": "Test Bug", "Description": "Test description", '
+    '"Steps": "1. Test step", "Expected result": "Expected", '
+    '"Actual result": "Actual"}'
+)
+
+
+class FakeClock:
+    """A manually advanced wall clock."""
+
+    def __init__(self):
+        """Start the clock at the beginning of a quota window."""
+        self.now = 86400.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def attempt(prompt_tokens=100, output_tokens=50, succeeded=True, version="v1"):
+    """Build the usage of one attempt."""
+    return AttemptUsage(
+        "gemini-test", version, prompt_tokens, output_tokens, 0.5, succeeded
+    )
+
+
+class TestUsageMeter:
+    """Tests for UsageMeter."""
+
+    def test_aggregates_per_client_model_and_version(self):
+        """Test that attempts are summed per client, model and prompt version."""
+        meter = UsageMeter()
+        meter.record("web", attempt())
+        meter.record("web", attempt(0, 0, succeeded=False))
+        meter.record("web", attempt(version="v2"))
+        meter.record("cli", attempt())
+
+        totals = {(t.client, t.prompt_version): t for t in meter.snapshot()}
+
+        assert totals[("web", "v1")].attempts == 2
+        assert totals[("web", "v1")].failed_attempts == 1
+        assert totals[("web", "v1")].total_tokens == 150
+        assert totals[("web", "v1")].latency == 1.0
+        assert totals[("web", "v2")].attempts == 1
+        assert [t.client for t in meter.snapshot("cli")] == ["cli"]
+
+    def test_threads_record_into_shards(self):
+        """Test that totals recorded by many threads are merged exactly."""
+        meter = UsageMeter()
+
+        def work():
+            for _ in range(500):
+                meter.record("web", attempt(1, 1))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        (totals,) = meter.snapshot()
+        assert totals.attempts == 2000
+        assert meter.used("web") == 4000
+
+    def test_shards_bounded_with_short_lived_threads(self):
+        """Test that threads recording once each do not add shards."""
+        meter = UsageMeter(shards=4)
+
+        for _ in range(200):
+            thread = threading.Thread(target=meter.record, args=("web", attempt(1, 1)))
+            thread.start()
+            thread.join()
+
+        assert len(meter._shards) == 4
+        assert meter.snapshot()[0].attempts == 200
+        assert meter.used("web") == 400
+
+    def test_quota(self):
+        """Test that a client over its quota is refused and others are not."""
+        meter = UsageMeter({"web": 200}, default_quota=None)
+        meter.record("web", attempt())
+
+        meter.check_quota("web", estimated_tokens=50)
+        with pytest.raises(QuotaExceededError, match="150 of its 200 tokens"):
+            meter.check_quota("web", estimated_tokens=51)
+        meter.check_quota("cli", estimated_tokens=10**9)
+
+    def test_quota_window_resets(self):
+        """Test that use counts against the quota only within its window."""
+        clock = FakeClock()
+        meter = UsageMeter(default_quota=100, window=3600, clock=clock)
+        meter.record("web", attempt())
+
+        with pytest.raises(QuotaExceededError):
+            meter.check_quota("web")
+        clock.now += 3600
+        meter.check_quota("web")
+        assert meter.snapshot()[0].total_tokens == 150
+
+
+@patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+@patch("src.services.gemini_service.genai")
+class TestGeminiUsage:
+    """Tests for per-attempt usage reported by GeminiService."""
+
+    def test_reports_every_attempt(self, mock_genai):
+        """Test that failed and successful attempts are both reported."""
+        response = MagicMock(text=VALID_RESPONSE)
+        response.usage_metadata.prompt_token_count = 120
+        response.usage_metadata.candidates_token_count = 80
+        mock_model = MagicMock()
+        mock_model.generate_content.side_effect = [ConnectionError("reset"), response]
+        mock_genai.GenerativeModel.return_value = mock_model
+        service = GeminiService()
+        service.max_retries = 3
+        attempts = []
+
+        service.generate_bug_report("Test", language="en", on_attempt=attempts.append)
+
+        assert [a.succeeded for a in attempts] == [False, True]
+        assert (attempts[1].prompt_tokens, attempts[1].output_tokens) == (120, 80)
+        assert attempts[1].prompt_version == BugReportPrompts.prompt_version("en")
+        assert attempts[1].model == service.model_name
+
+
+class TestUsageAPI:
+    """Tests for usage accounting in the API."""
+
+    @pytest.fixture
+    def meter(self):
+        """Install a fresh usage meter with a quota for one client."""
+        original = app.state.usage_meter
+        app.state.usage_meter = UsageMeter({"limited": 10})
+        yield app.state.usage_meter
+        app.state.usage_meter = original
+
+    @patch("src.api.routes.GeminiService")
+    def test_usage_is_billed_to_client(self, mock_gemini_class, meter):
+        """Test that the X-Client-ID header selects the client billed."""
+
+        def generate(*args, on_attempt, **kwargs):
+            on_attempt(attempt())
+            return BugReport(
+                title="Test Bug",
+                description="Test description",
+                steps="1. Test step",
+                expected_result="Expected result",
+                actual_result="Actual result",
+            )
+
+        mock_gemini_class.return_value.generate_bug_report.side_effect = generate
+        client = TestClient(app)
+
+        client.post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Test bug description"},
+            headers={"X-Client-ID": "web"},
+        )
+        response = client.get("/api/v1/usage")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["usage"][0]["client"] == "web"
+        assert body["usage"][0]["total_tokens"] == 150
+        assert body["clients"] == [
+            {
+                "client": "web",
+                "used": 150,
+                "quota": None,
+                "resets_at": body["clients"][0]["resets_at"],
+            }
+        ]
+
+    @patch("src.api.routes.GeminiService")
+    def test_quota_checked_before_llm_call(self, mock_gemini_class, meter):
+        """Test that a request the quota cannot cover never reaches the LLM."""
+        response = TestClient(app).post(
+            "/api/v1/bug-reports",
+            json={"user_input": "Test bug description that needs many tokens"},
+            headers={"X-Client-ID": "limited"},
+        )
+
+        assert response.status_code == 429
+        mock_gemini_class.return_value.generate_bug_report.assert_not_called()
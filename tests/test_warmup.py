@@ -0,0 +1,146 @@
+"""Tests for startup warm-up and the readiness endpoint."""
+
+import asyncio
+import time
+from unittest.mock import ANY, Mock, patch
+
+from fastapi.testclient import TestClient
+
+from src.api.app import create_app
+from src.api.warmup import DEGRADED, READY, ReadinessState, warm_up
+from src.services.bug_report_service import BugReportService
+
+
+class TestReadinessState:
+    """Tests for ReadinessState reports."""
+
+    def test_not_ready_before_warm_up(self):
+        """Test that a fresh state reports not ready."""
+        status_code, body = ReadinessState().report()
+
+        assert status_code == 503
+        assert body["status"] == "not_started"
+
+    def test_ready_after_warm_up(self):
+        """Test that a warmed-up state with an available upstream is ready."""
+        state = ReadinessState()
+        state.bug_report_service = Mock()
+        state.bug_report_service.llm_service.is_available.return_value = True
+        state.set_status(READY)
+
+        assert state.report() == (200, {"status": "ready"})
+
+    def test_degraded_while_circuit_open(self):
+        """Test that an open circuit is reported as degraded."""
+        state = ReadinessState()
+        state.bug_report_service = Mock()
+        state.bug_report_service.llm_service.is_available.return_value = False
+        state.set_status(READY)
+
+        status_code, body = state.report()
+
+        assert status_code == 503
+        assert body["status"] == "degraded"
+
+    def test_retry_backoff(self):
+        """Test that warm-up retries with doubling delays until it succeeds."""
+        state = ReadinessState()
+        service = Mock()
+        service.llm_service.warm_up.side_effect = [Exception("down")] * 3 + [None]
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+
+        with patch("src.api.warmup.asyncio.sleep", sleep):
+            asyncio.run(warm_up(state, service, retry_delay=1, max_retry_delay=3))
+
+        assert delays == [1, 2, 3]
+        assert state.report()[1]["status"] == READY
+
+
+class TestReadinessEndpoint:
+    """Tests for the /ready and /health endpoints."""
+
+    def test_health_is_always_healthy(self):
+        """Test that liveness does not depend on warm-up."""
+        client = TestClient(create_app())
+
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "healthy"
+
+    def test_ready_without_startup(self):
+        """Test that /ready is not ready when the app was never started."""
+        client = TestClient(create_app())
+
+        response = client.get("/ready")
+
+        assert response.status_code == 503
+
+    @patch("src.api.app.create_bug_report_service")
+    def test_ready_after_startup_warm_up(self, mock_create_service):
+        """Test that startup warms the shared service and becomes ready."""
+        service = Mock()
+        service.llm_service.is_available.return_value = True
+        mock_create_service.return_value = service
+
+        with TestClient(create_app()) as client:
+            for _ in range(50):
+                response = client.get("/ready")
+                if response.status_code == 200:
+                    break
+
+        assert response.json() == {"status": "ready"}
+        service.llm_service.warm_up.assert_called_once()
+
+    @patch("src.api.app.create_bug_report_service")
+    def test_failed_warm_up_is_reported(self, mock_create_service):
+        """Test that a warm-up failure keeps the app not ready while it retries."""
+        service = Mock()
+        service.llm_service.warm_up.side_effect = Exception("connection refused")
+        mock_create_service.return_value = service
+
+        with TestClient(create_app()) as client:
+            for _ in range(50):
+                response = client.get("/ready")
+                if response.json()["status"] == DEGRADED:
+                    break
+
+        assert response.status_code == 503
+        assert "connection refused" in response.json()["detail"]
+
+    @patch("src.api.app.settings.warmup_retry_delay", 0.01)
+    @patch("src.api.app.create_bug_report_service")
+    def test_ready_after_upstream_recovers(self, mock_create_service):
+        """Test that a failed warm-up is retried until the upstream answers."""
+        service = Mock()
+        service.llm_service.warm_up.side_effect = [Exception("unavailable"), None]
+        service.llm_service.is_available.return_value = True
+        mock_create_service.return_value = service
+
+        with TestClient(create_app()) as client:
+            for _ in range(100):
+                response = client.get("/ready")
+                if response.status_code == 200:
+                    break
+                time.sleep(0.01)
+
+        assert response.json() == {"status": "ready"}
+        assert service.llm_service.warm_up.call_count == 2
+
+    @patch("src.api.app.create_bug_report_service")
+    def test_routes_use_shared_service(self, mock_create_service):
+        """Test that bug report requests reuse the service built at startup."""
+        llm_service = Mock()
+        llm_service.generate_bug_report.return_value = None
+        mock_create_service.return_value = BugReportService(llm_service, Mock())
+
+        with TestClient(create_app()) as client:
+            client.post("/api/v1/bug-reports", json={"user_input": "Test bug"})
+
+        # The request's pipeline calls the shared service's LLM
+        llm_service.generate_bug_report.assert_called_once_with(
+            "Test bug", language="en", deadline=ANY, on_attempt=ANY
+        )